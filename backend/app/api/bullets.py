@@ -1,9 +1,10 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import not_modified
 from app.core.quality import compute_bullet_quality_score
 from app.db.session import get_db
 from app.models.bullet import Bullet
@@ -15,7 +16,12 @@ from app.schemas.bullet import (
     PaginatedBulletResponse,
 )
 from app.schemas.powder import ImportMode, ImportResult
-from app.services.pagination import paginate
+from app.services.bulk_import import bulk_upsert, commit_import
+from app.services.catalog import apply_delete, apply_upsert, bump_version, catalog_table, table_version
+from app.services.ndjson_import import import_ndjson
+from app.services.pagination import (
+    InvalidCursor, keyset_rows, order_by_sort, paginate, paginate_keyset, paginate_rows,
+)
 from app.services.search import apply_fuzzy_search, derive_caliber_family
 
 router = APIRouter(prefix="/bullets", tags=["bullets"])
@@ -38,6 +44,7 @@ _QUALITY_RANGES = {
 @router.get("", response_model=PaginatedBulletResponse)
 async def list_bullets(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     q: str | None = Query(None, min_length=3, description="Fuzzy search on name/manufacturer"),
     manufacturer: str | None = Query(None, description="Filter by exact manufacturer"),
@@ -48,19 +55,36 @@ async def list_bullets(
     order: str = Query("desc", description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     size: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: str | None = Query(None, description="Keyset cursor: next_cursor of the previous page, empty for the first (replaces page)"),
+    include_total: bool = Query(False, description="Count matching items in cursor mode"),
 ):
+    sort_key = sort if sort in _BULLET_SORT_COLUMNS else "quality_score"
+    descending = order != "asc"
+    if cursor is not None and q:
+        raise HTTPException(400, "Cursor pagination is not available with q (results are ranked); use page/size")
+    cached = await not_modified(request, response, db, "bullets")
+    if cached is not None:
+        return cached
+
+    filtered = q or manufacturer or caliber_family or quality_level in _QUALITY_RANGES or min_quality is not None
+    if not filtered:
+        # Unfiltered listing: sort and page the in-process catalog snapshot
+        rows = (await catalog_table(db, "bullets")).sorted_rows(sort_key, descending)
+        if cursor is None:
+            return paginate_rows(rows, page, size)
+        try:
+            return keyset_rows(rows, sort_key, descending, cursor, size, include_total)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+
     query = select(Bullet)
 
     # Fuzzy search (pg_trgm with ILIKE fallback)
     if q:
         query = apply_fuzzy_search(query, Bullet, q, has_trgm=getattr(request.app.state, "has_trgm", False))
-    else:
-        # Apply user sort when not searching
-        sort_col = _BULLET_SORT_COLUMNS.get(sort, Bullet.quality_score)
-        if order == "asc":
-            query = query.order_by(sort_col.asc())
-        else:
-            query = query.order_by(sort_col.desc())
+    elif cursor is None:
+        # Apply user sort when not searching (keyset mode adds its own)
+        query = order_by_sort(query, Bullet, sort_key, descending)
 
     # Exact manufacturer filter
     if manufacturer:
@@ -79,12 +103,21 @@ async def list_bullets(
     if min_quality is not None:
         query = query.where(Bullet.quality_score >= min_quality)
 
-    return await paginate(db, query, page, size)
+    if cursor is not None:
+        version = await table_version(db, "bullets") if include_total else None
+        try:
+            return await paginate_keyset(db, query, Bullet, sort_key, descending, cursor, size, include_total, version)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+    return await paginate(db, query, page, size, version=await table_version(db, "bullets"))
 
 
 @router.get("/manufacturers", response_model=list[str])
-async def list_bullet_manufacturers(db: AsyncSession = Depends(get_db)):
+async def list_bullet_manufacturers(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Return distinct manufacturer names for bullets."""
+    cached = await not_modified(request, response, db, "bullets")
+    if cached is not None:
+        return cached
     result = await db.execute(
         select(Bullet.manufacturer)
         .distinct()
@@ -95,8 +128,11 @@ async def list_bullet_manufacturers(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/caliber-families", response_model=list[str])
-async def list_bullet_caliber_families(db: AsyncSession = Depends(get_db)):
+async def list_bullet_caliber_families(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Return distinct caliber family values for bullets."""
+    cached = await not_modified(request, response, db, "bullets")
+    if cached is not None:
+        return cached
     result = await db.execute(
         select(Bullet.caliber_family)
         .distinct()
@@ -119,11 +155,18 @@ async def create_bullet(data: BulletCreate, db: AsyncSession = Depends(get_db)):
     bullet.quality_score = breakdown.score
 
     db.add(bullet)
+    version = await bump_version(db, "bullets")
     await db.commit()
     await db.refresh(bullet)
+    apply_upsert("bullets", version, bullet)
     return bullet
 
 
+def _derive_bullet_columns(row: dict) -> None:
+    row["caliber_family"] = derive_caliber_family(row["diameter_mm"])
+    row["quality_score"] = compute_bullet_quality_score(row, row["data_source"]).score
+
+
 @router.post("/import", response_model=ImportResult)
 async def import_bullets(
     data: BulletImportRequest,
@@ -136,68 +179,32 @@ async def import_bullets(
     User-created records (data_source='manual') are NEVER overwritten -- the imported
     version gets renamed with ' (Import)' suffix.
     """
-    # Pre-fetch existing bullets for collision detection
-    result = await db.execute(select(Bullet))
-    existing_map = {b.name.lower(): b for b in result.scalars().all()}
+    result = await bulk_upsert(
+        db, Bullet, [item.model_dump() for item in data.bullets], mode,
+        copy_suffix=" (Import)", derive=_derive_bullet_columns,
+    )
+
+    await commit_import(db, "bullets", result)
+    return ImportResult(
+        created=len(result.created), updated=len(result.updated), unchanged=result.unchanged,
+        skipped=result.skipped, errors=result.errors,
+    )
 
-    created_count = 0
-    updated_count = 0
-    skipped = []
-    errors = []
 
-    for bullet_data in data.bullets:
-        try:
-            name_lower = bullet_data.name.lower()
-            existing = existing_map.get(name_lower)
-            dump = bullet_data.model_dump()
-
-            if existing:
-                if existing.data_source == "manual":
-                    # Never overwrite user data -- create renamed copy
-                    new_name = f"{bullet_data.name} (Import)"
-                    bullet = Bullet(**{k: v for k, v in dump.items() if hasattr(Bullet, k)})
-                    bullet.name = new_name
-                    bullet.caliber_family = derive_caliber_family(bullet.diameter_mm)
-                    b_dict = dump.copy()
-                    breakdown = compute_bullet_quality_score(b_dict, bullet.data_source or "manufacturer")
-                    bullet.quality_score = breakdown.score
-                    db.add(bullet)
-                    existing_map[new_name.lower()] = bullet
-                    created_count += 1
-                elif mode == ImportMode.skip:
-                    skipped.append(bullet_data.name)
-                elif mode == ImportMode.overwrite:
-                    for key, value in dump.items():
-                        if hasattr(existing, key) and key not in ("name",):
-                            setattr(existing, key, value)
-                    existing.caliber_family = derive_caliber_family(existing.diameter_mm)
-                    b_dict = {c.key: getattr(existing, c.key) for c in Bullet.__table__.columns}
-                    breakdown = compute_bullet_quality_score(b_dict, existing.data_source)
-                    existing.quality_score = breakdown.score
-                    updated_count += 1
-                elif mode == ImportMode.merge:
-                    for key, value in dump.items():
-                        if hasattr(existing, key) and getattr(existing, key) is None and value is not None:
-                            setattr(existing, key, value)
-                    existing.caliber_family = derive_caliber_family(existing.diameter_mm)
-                    b_dict = {c.key: getattr(existing, c.key) for c in Bullet.__table__.columns}
-                    breakdown = compute_bullet_quality_score(b_dict, existing.data_source)
-                    existing.quality_score = breakdown.score
-                    updated_count += 1
-            else:
-                bullet = Bullet(**{k: v for k, v in dump.items() if hasattr(Bullet, k)})
-                bullet.caliber_family = derive_caliber_family(bullet.diameter_mm)
-                b_dict = dump.copy()
-                breakdown = compute_bullet_quality_score(b_dict, bullet.data_source or "manufacturer")
-                bullet.quality_score = breakdown.score
-                db.add(bullet)
-                existing_map[name_lower] = bullet
-                created_count += 1
-        except Exception as e:
-            errors.append(f"{bullet_data.name}: {e}")
+@router.post("/import-ndjson", response_model=ImportResult)
+async def import_bullets_ndjson(
+    request: Request,
+    mode: ImportMode = Query(ImportMode.skip),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import bullets from an NDJSON body (application/x-ndjson, one BulletCreate per line).
 
-    await db.commit()
-    return ImportResult(created=created_count, updated=updated_count, skipped=skipped, errors=errors)
+    Records are validated and imported in committed chunks while the body
+    streams in, so arbitrarily large dumps use bounded memory. Collision
+    handling is the same as /import; invalid lines are reported in errors
+    as "line N: ..." and do not stop the import.
+    """
+    return await import_ndjson(db, request.stream(), BulletCreate, Bullet, mode, derive=_derive_bullet_columns)
 
 
 @router.get("/{bullet_id}", response_model=BulletResponse)
@@ -215,6 +222,7 @@ async def update_bullet(bullet_id: uuid.UUID, data: BulletUpdate, db: AsyncSessi
         raise HTTPException(404, "Bullet not found")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(bullet, key, value)
+    bullet.import_hash = None  # a re-import must not treat the edited row as unchanged
 
     # Re-derive caliber family if diameter changed
     bullet.caliber_family = derive_caliber_family(bullet.diameter_mm)
@@ -224,8 +232,10 @@ async def update_bullet(bullet_id: uuid.UUID, data: BulletUpdate, db: AsyncSessi
     breakdown = compute_bullet_quality_score(bullet_dict, bullet.data_source)
     bullet.quality_score = breakdown.score
 
+    version = await bump_version(db, "bullets")
     await db.commit()
     await db.refresh(bullet)
+    apply_upsert("bullets", version, bullet)
     return bullet
 
 
@@ -235,4 +245,6 @@ async def delete_bullet(bullet_id: uuid.UUID, db: AsyncSession = Depends(get_db)
     if not bullet:
         raise HTTPException(404, "Bullet not found")
     await db.delete(bullet)
+    version = await bump_version(db, "bullets")
     await db.commit()
+    apply_delete("bullets", version, bullet_id)
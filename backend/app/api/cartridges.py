@@ -1,9 +1,10 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import not_modified
 from app.core.quality import compute_cartridge_quality_score
 from app.db.session import get_db
 from app.models.cartridge import Cartridge
@@ -15,7 +16,12 @@ from app.schemas.cartridge import (
     PaginatedCartridgeResponse,
 )
 from app.schemas.powder import ImportMode, ImportResult
-from app.services.pagination import paginate
+from app.services.bulk_import import bulk_upsert, commit_import
+from app.services.catalog import apply_delete, apply_upsert, bump_version, catalog_table, table_version
+from app.services.ndjson_import import import_ndjson
+from app.services.pagination import (
+    InvalidCursor, keyset_rows, order_by_sort, paginate, paginate_keyset, paginate_rows,
+)
 from app.services.search import apply_fuzzy_search, derive_caliber_family
 
 router = APIRouter(prefix="/cartridges", tags=["cartridges"])
@@ -37,6 +43,7 @@ _QUALITY_RANGES = {
 @router.get("", response_model=PaginatedCartridgeResponse)
 async def list_cartridges(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     q: str | None = Query(None, min_length=3, description="Fuzzy search on name"),
     caliber_family: str | None = Query(None, description="Filter by caliber family (e.g. .308)"),
@@ -46,19 +53,36 @@ async def list_cartridges(
     order: str = Query("desc", description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     size: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: str | None = Query(None, description="Keyset cursor: next_cursor of the previous page, empty for the first (replaces page)"),
+    include_total: bool = Query(False, description="Count matching items in cursor mode"),
 ):
+    sort_key = sort if sort in _CARTRIDGE_SORT_COLUMNS else "quality_score"
+    descending = order != "asc"
+    if cursor is not None and q:
+        raise HTTPException(400, "Cursor pagination is not available with q (results are ranked); use page/size")
+    cached = await not_modified(request, response, db, "cartridges")
+    if cached is not None:
+        return cached
+
+    filtered = q or caliber_family or quality_level in _QUALITY_RANGES or min_quality is not None
+    if not filtered:
+        # Unfiltered listing: sort and page the in-process catalog snapshot
+        rows = (await catalog_table(db, "cartridges")).sorted_rows(sort_key, descending)
+        if cursor is None:
+            return paginate_rows(rows, page, size)
+        try:
+            return keyset_rows(rows, sort_key, descending, cursor, size, include_total)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+
     query = select(Cartridge)
 
     # Fuzzy search on name only (cartridges have no manufacturer column)
     if q:
         query = apply_fuzzy_search(query, Cartridge, q, fields=["name"], has_trgm=getattr(request.app.state, "has_trgm", False))
-    else:
-        # Apply user sort when not searching
-        sort_col = _CARTRIDGE_SORT_COLUMNS.get(sort, Cartridge.quality_score)
-        if order == "asc":
-            query = query.order_by(sort_col.asc())
-        else:
-            query = query.order_by(sort_col.desc())
+    elif cursor is None:
+        # Apply user sort when not searching (keyset mode adds its own)
+        query = order_by_sort(query, Cartridge, sort_key, descending)
 
     # Caliber family filter
     if caliber_family:
@@ -73,12 +97,21 @@ async def list_cartridges(
     if min_quality is not None:
         query = query.where(Cartridge.quality_score >= min_quality)
 
-    return await paginate(db, query, page, size)
+    if cursor is not None:
+        version = await table_version(db, "cartridges") if include_total else None
+        try:
+            return await paginate_keyset(db, query, Cartridge, sort_key, descending, cursor, size, include_total, version)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+    return await paginate(db, query, page, size, version=await table_version(db, "cartridges"))
 
 
 @router.get("/caliber-families", response_model=list[str])
-async def list_cartridge_caliber_families(db: AsyncSession = Depends(get_db)):
+async def list_cartridge_caliber_families(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Return distinct caliber family values for cartridges."""
+    cached = await not_modified(request, response, db, "cartridges")
+    if cached is not None:
+        return cached
     result = await db.execute(
         select(Cartridge.caliber_family)
         .distinct()
@@ -101,11 +134,18 @@ async def create_cartridge(data: CartridgeCreate, db: AsyncSession = Depends(get
     cartridge.quality_score = breakdown.score
 
     db.add(cartridge)
+    version = await bump_version(db, "cartridges")
     await db.commit()
     await db.refresh(cartridge)
+    apply_upsert("cartridges", version, cartridge)
     return cartridge
 
 
+def _derive_cartridge_columns(row: dict) -> None:
+    row["caliber_family"] = derive_caliber_family(row["groove_diameter_mm"])
+    row["quality_score"] = compute_cartridge_quality_score(row, row["data_source"]).score
+
+
 @router.post("/import", response_model=ImportResult)
 async def import_cartridges(
     data: CartridgeImportRequest,
@@ -118,68 +158,32 @@ async def import_cartridges(
     User-created records (data_source='manual') are NEVER overwritten -- the imported
     version gets renamed with ' (Import)' suffix.
     """
-    # Pre-fetch existing cartridges for collision detection
-    result = await db.execute(select(Cartridge))
-    existing_map = {c.name.lower(): c for c in result.scalars().all()}
+    result = await bulk_upsert(
+        db, Cartridge, [item.model_dump() for item in data.cartridges], mode,
+        copy_suffix=" (Import)", derive=_derive_cartridge_columns,
+    )
+
+    await commit_import(db, "cartridges", result)
+    return ImportResult(
+        created=len(result.created), updated=len(result.updated), unchanged=result.unchanged,
+        skipped=result.skipped, errors=result.errors,
+    )
 
-    created_count = 0
-    updated_count = 0
-    skipped = []
-    errors = []
 
-    for cart_data in data.cartridges:
-        try:
-            name_lower = cart_data.name.lower()
-            existing = existing_map.get(name_lower)
-            dump = cart_data.model_dump()
-
-            if existing:
-                if existing.data_source == "manual":
-                    # Never overwrite user data -- create renamed copy
-                    new_name = f"{cart_data.name} (Import)"
-                    cart = Cartridge(**{k: v for k, v in dump.items() if hasattr(Cartridge, k)})
-                    cart.name = new_name
-                    cart.caliber_family = derive_caliber_family(cart.groove_diameter_mm)
-                    c_dict = dump.copy()
-                    breakdown = compute_cartridge_quality_score(c_dict, cart.data_source or "saami")
-                    cart.quality_score = breakdown.score
-                    db.add(cart)
-                    existing_map[new_name.lower()] = cart
-                    created_count += 1
-                elif mode == ImportMode.skip:
-                    skipped.append(cart_data.name)
-                elif mode == ImportMode.overwrite:
-                    for key, value in dump.items():
-                        if hasattr(existing, key) and key not in ("name",):
-                            setattr(existing, key, value)
-                    existing.caliber_family = derive_caliber_family(existing.groove_diameter_mm)
-                    c_dict = {c.key: getattr(existing, c.key) for c in Cartridge.__table__.columns}
-                    breakdown = compute_cartridge_quality_score(c_dict, existing.data_source)
-                    existing.quality_score = breakdown.score
-                    updated_count += 1
-                elif mode == ImportMode.merge:
-                    for key, value in dump.items():
-                        if hasattr(existing, key) and getattr(existing, key) is None and value is not None:
-                            setattr(existing, key, value)
-                    existing.caliber_family = derive_caliber_family(existing.groove_diameter_mm)
-                    c_dict = {c.key: getattr(existing, c.key) for c in Cartridge.__table__.columns}
-                    breakdown = compute_cartridge_quality_score(c_dict, existing.data_source)
-                    existing.quality_score = breakdown.score
-                    updated_count += 1
-            else:
-                cart = Cartridge(**{k: v for k, v in dump.items() if hasattr(Cartridge, k)})
-                cart.caliber_family = derive_caliber_family(cart.groove_diameter_mm)
-                c_dict = dump.copy()
-                breakdown = compute_cartridge_quality_score(c_dict, cart.data_source or "saami")
-                cart.quality_score = breakdown.score
-                db.add(cart)
-                existing_map[name_lower] = cart
-                created_count += 1
-        except Exception as e:
-            errors.append(f"{cart_data.name}: {e}")
+@router.post("/import-ndjson", response_model=ImportResult)
+async def import_cartridges_ndjson(
+    request: Request,
+    mode: ImportMode = Query(ImportMode.skip),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import cartridges from an NDJSON body (application/x-ndjson, one CartridgeCreate per line).
 
-    await db.commit()
-    return ImportResult(created=created_count, updated=updated_count, skipped=skipped, errors=errors)
+    Records are validated and imported in committed chunks while the body
+    streams in, so arbitrarily large dumps use bounded memory. Collision
+    handling is the same as /import; invalid lines are reported in errors
+    as "line N: ..." and do not stop the import.
+    """
+    return await import_ndjson(db, request.stream(), CartridgeCreate, Cartridge, mode, derive=_derive_cartridge_columns)
 
 
 @router.get("/{cartridge_id}", response_model=CartridgeResponse)
@@ -197,6 +201,7 @@ async def update_cartridge(cartridge_id: uuid.UUID, data: CartridgeUpdate, db: A
         raise HTTPException(404, "Cartridge not found")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(cartridge, key, value)
+    cartridge.import_hash = None  # a re-import must not treat the edited row as unchanged
 
     # Re-derive caliber family if bore diameter changed
     cartridge.caliber_family = derive_caliber_family(cartridge.groove_diameter_mm)
@@ -206,8 +211,10 @@ async def update_cartridge(cartridge_id: uuid.UUID, data: CartridgeUpdate, db: A
     breakdown = compute_cartridge_quality_score(cartridge_dict, cartridge.data_source)
     cartridge.quality_score = breakdown.score
 
+    version = await bump_version(db, "cartridges")
     await db.commit()
     await db.refresh(cartridge)
+    apply_upsert("cartridges", version, cartridge)
     return cartridge
 
 
@@ -217,4 +224,6 @@ async def delete_cartridge(cartridge_id: uuid.UUID, db: AsyncSession = Depends(g
     if not cartridge:
         raise HTTPException(404, "Cartridge not found")
     await db.delete(cartridge)
+    version = await bump_version(db, "cartridges")
     await db.commit()
+    apply_delete("cartridges", version, cartridge_id)
@@ -1,22 +1,29 @@
 """Chronograph data import endpoint.
 
-Parses CSV uploads from Labradar or MagnetoSpeed chronographs
-and returns statistical summary (average, SD, ES).
+Parses CSV uploads from Labradar or MagnetoSpeed chronographs (one or
+several files, each holding one or more strings) and returns a statistical
+summary (average, SD, ES) per series and over all shots.
 """
 
-import csv
+import asyncio
 import io
-import math
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 from pydantic import BaseModel
 
+from app.core.chrono_parser import ChronoSeries, RunningStats, parse_chrono_lines
+
 router = APIRouter(prefix="/chrono", tags=["chronograph"])
 
+_CONTENT_TYPES = ("text/csv", "text/plain", "application/octet-stream", "application/vnd.ms-excel")
 
-class ChronoImportResponse(BaseModel):
+
+class ChronoSeriesSummary(BaseModel):
+    name: str
+    file: str
+    device: str | None
     shot_count: int
-    velocities_fps: list[float]
+    velocities_fps: list[float] | None
     average_fps: float
     sd_fps: float
     es_fps: float
@@ -24,97 +31,83 @@ class ChronoImportResponse(BaseModel):
     max_fps: float
 
 
-def _parse_velocities(text: str) -> list[float]:
-    """Extract velocity values from CSV text.
-
-    Supports common formats:
-    - Single column of numbers (one velocity per line)
-    - Labradar format: multi-column CSV with a 'Velocity' or 'V1' header
-    - MagnetoSpeed format: multi-column with 'Velocity' header
-    """
-    velocities: list[float] = []
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
-
-    if not rows:
-        return velocities
-
-    # Try to find a velocity column by header
-    header = [col.strip().lower() for col in rows[0]]
-    vel_col = None
-    for i, h in enumerate(header):
-        if h in ("velocity", "v1", "vel", "speed", "fps", "velocity(fps)", "v1(fps)"):
-            vel_col = i
-            break
-
-    if vel_col is not None:
-        # Header-based parsing
-        for row in rows[1:]:
-            if vel_col < len(row):
-                val = row[vel_col].strip()
-                if val:
-                    try:
-                        velocities.append(float(val))
-                    except ValueError:
-                        continue
-    else:
-        # Try single-column or first-column numeric parsing
-        for row in rows:
-            if not row:
-                continue
-            val = row[0].strip()
-            # Skip comment lines and obvious headers
-            if val.startswith("#") or val.startswith("//"):
-                continue
-            try:
-                v = float(val)
-                if 100.0 < v < 5000.0:  # reasonable velocity range in FPS
-                    velocities.append(v)
-            except ValueError:
-                continue
-
-    return velocities
+class ChronoImportResponse(BaseModel):
+    shot_count: int
+    velocities_fps: list[float] | None
+    average_fps: float
+    sd_fps: float
+    es_fps: float
+    min_fps: float
+    max_fps: float
+    series: list[ChronoSeriesSummary] = []
+
+
+def _read_series(upload: UploadFile, keep_velocities: bool) -> list[ChronoSeries]:
+    """Parse an upload line by line from its spooled file, as UTF-8 or else Latin-1."""
+    name = upload.filename or "chrono.csv"
+    for encoding in ("utf-8-sig", "latin-1"):
+        upload.file.seek(0)
+        text = io.TextIOWrapper(upload.file, encoding=encoding, newline="")
+        try:
+            return parse_chrono_lines(text, name, keep_velocities)
+        except UnicodeDecodeError:
+            continue
+        finally:
+            text.detach()  # leave the upload open; FastAPI closes it
+    return []  # unreachable: Latin-1 decodes any byte
+
+
+def _summary(stats: RunningStats) -> dict:
+    return {
+        "shot_count": stats.count,
+        "average_fps": round(stats.mean, 1),
+        "sd_fps": round(stats.sd, 1),
+        "es_fps": round(stats.es, 1),
+        "min_fps": round(stats.min, 1),
+        "max_fps": round(stats.max, 1),
+    }
 
 
 @router.post("/import", response_model=ChronoImportResponse)
-async def import_chrono_data(file: UploadFile = File(...)):
+async def import_chrono_data(
+    file: UploadFile | None = File(None),
+    files: list[UploadFile] = File([]),
+    include_velocities: bool = Query(True, description="List individual velocities (memory grows with shots)"),
+):
     """Import chronograph CSV data and return velocity statistics.
 
     Accepts CSV files from Labradar, MagnetoSpeed, or simple
-    single-column velocity lists (values in FPS).
+    single-column velocity lists (values in FPS), as `file` and/or any
+    number of `files`. Every string found is summarised on its own; the
+    top-level figures cover all shots. Files are streamed, so with
+    include_velocities=false season-long exports use constant memory.
     """
-    if file.content_type and file.content_type not in (
-        "text/csv", "text/plain", "application/octet-stream",
-        "application/vnd.ms-excel",
-    ):
-        raise HTTPException(400, f"Unsupported file type: {file.content_type}")
-
-    content = await file.read()
-    try:
-        text = content.decode("utf-8")
-    except UnicodeDecodeError:
-        text = content.decode("latin-1")
-
-    velocities = _parse_velocities(text)
-
-    if len(velocities) < 2:
+    uploads = ([file] if file is not None else []) + list(files)
+    if not uploads:
+        raise HTTPException(422, "No file uploaded")
+    for upload in uploads:
+        if upload.content_type and upload.content_type not in _CONTENT_TYPES:
+            raise HTTPException(400, f"Unsupported file type: {upload.content_type}")
+
+    series: list[ChronoSeriesSummary] = []
+    velocities: list[float] | None = [] if include_velocities else None
+    total = RunningStats()
+    for upload in uploads:
+        for s in await asyncio.to_thread(_read_series, upload, include_velocities):
+            total.merge(s.stats)
+            if velocities is not None:
+                velocities.extend(s.velocities)
+            series.append(ChronoSeriesSummary(
+                name=s.name,
+                file=upload.filename or "",
+                device=s.device,
+                velocities_fps=s.velocities,
+                **_summary(s.stats),
+            ))
+
+    if total.count < 2:
         raise HTTPException(
             422, "Could not extract at least 2 velocity readings from the file"
         )
 
-    avg = sum(velocities) / len(velocities)
-    variance = sum((v - avg) ** 2 for v in velocities) / (len(velocities) - 1)
-    sd = math.sqrt(variance)
-    min_v = min(velocities)
-    max_v = max(velocities)
-    es = max_v - min_v
-
-    return ChronoImportResponse(
-        shot_count=len(velocities),
-        velocities_fps=velocities,
-        average_fps=round(avg, 1),
-        sd_fps=round(sd, 1),
-        es_fps=round(es, 1),
-        min_fps=round(min_v, 1),
-        max_fps=round(max_v, 1),
-    )
+    return ChronoImportResponse(velocities_fps=velocities, series=series, **_summary(total))
@@ -0,0 +1,45 @@
+"""Conditional GET for catalog reads: strong ETags, Cache-Control and 304s.
+
+A catalog response depends only on its table's version (app.services.catalog)
+and the request URL, so the ETag combines the two. Clients must revalidate
+every time (no-cache); a matching If-None-Match is answered with 304 from the
+in-process version, without a database query while that version is recent.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.catalog import recent_version
+
+CACHE_CONTROL = "no-cache"
+
+
+def catalog_etag(request: Request, table: str, version: int) -> str:
+    """Strong ETag for a catalog read: table version plus a hash of path and query."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha256(f"{request.url.path}?{query}".encode()).hexdigest()[:16]
+    return f'"{table}-v{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110): any listed tag or *."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+async def not_modified(request: Request, response: Response, db: AsyncSession, table: str) -> Response | None:
+    """A 304 response if the client's copy is current, else None after tagging `response`.
+
+    Call first in a catalog GET handler and return the result when it is not None.
+    """
+    version = await recent_version(db, table, settings.catalog_version_max_age)
+    headers = {"ETag": catalog_etag(request, table, version), "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
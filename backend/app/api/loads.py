@@ -1,18 +1,31 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.models.load import Load
-from app.schemas.load import LoadCreate, LoadResponse, LoadUpdate
+from app.schemas.load import LoadCreate, LoadResponse, LoadUpdate, PaginatedLoadResponse
+from app.services.pagination import InvalidCursor, paginate_keyset
 
 router = APIRouter(prefix="/loads", tags=["loads"])
 
 
-@router.get("", response_model=list[LoadResponse])
-async def list_loads(db: AsyncSession = Depends(get_db)):
+@router.get("", response_model=list[LoadResponse] | PaginatedLoadResponse)
+async def list_loads(
+    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="Keyset cursor: next_cursor of the previous page, empty for the first. Omit for the full list"),
+    size: int = Query(50, ge=1, le=200, description="Items per page in cursor mode (max 200)"),
+    include_total: bool = Query(False, description="Count all loads in cursor mode (a planner estimate on large tables)"),
+):
+    if cursor is not None:
+        try:
+            return await paginate_keyset(
+                db, select(Load), Load, "name", cursor=cursor, size=size, include_total=include_total, estimate_total=True,
+            )
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
     result = await db.execute(select(Load).order_by(Load.name))
     return result.scalars().all()
 
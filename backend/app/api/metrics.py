@@ -0,0 +1,14 @@
+"""Prometheus scrape endpoint for the in-process metrics registry."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """In-process metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -3,24 +3,31 @@ import logging
 import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.grt_converter import convert_grt_to_powder
-from app.core.grt_parser import parse_propellant_file, parse_propellant_zip
+from app.api.conditional import not_modified
 from app.core.quality import compute_quality_score
 from app.db.session import get_db
 from app.models.powder import Powder
 from app.schemas.powder import (
+    GrtImportProgress,
     GrtImportResult,
+    ImportResult,
     ImportMode,
     PaginatedPowderResponse,
     PowderCreate,
     PowderResponse,
     PowderUpdate,
 )
-from app.services.pagination import paginate
+from app.services.catalog import apply_delete, apply_upsert, bump_version, catalog_table, table_version
+from app.services.grt_import import PropellantSource, import_propellants, spool_upload
+from app.services.ndjson_import import import_ndjson
+from app.services.pagination import (
+    InvalidCursor, keyset_rows, order_by_sort, paginate, paginate_keyset, paginate_rows,
+)
 from app.services.search import apply_fuzzy_search
 
 logger = logging.getLogger(__name__)
@@ -82,6 +89,7 @@ _QUALITY_RANGES = {
 @router.get("", response_model=PaginatedPowderResponse)
 async def list_powders(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     q: str | None = Query(None, min_length=3, description="Fuzzy search on name/manufacturer"),
     manufacturer: str | None = Query(None, description="Filter by exact manufacturer"),
@@ -93,19 +101,39 @@ async def list_powders(
     order: str = Query("desc", description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     size: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: str | None = Query(None, description="Keyset cursor: next_cursor of the previous page, empty for the first (replaces page)"),
+    include_total: bool = Query(False, description="Count matching items in cursor mode"),
 ):
+    sort_key = sort if sort in _POWDER_SORT_COLUMNS else "quality_score"
+    descending = order != "asc"
+    if cursor is not None and q:
+        raise HTTPException(400, "Cursor pagination is not available with q (results are ranked); use page/size")
+    cached = await not_modified(request, response, db, "powders")
+    if cached is not None:
+        return cached
+
+    filtered = (
+        q or manufacturer or burn_rate_min is not None or burn_rate_max is not None
+        or quality_level in _QUALITY_RANGES or min_quality is not None
+    )
+    if not filtered:
+        # Unfiltered listing: sort and page the in-process catalog snapshot
+        rows = (await catalog_table(db, "powders")).sorted_rows(sort_key, descending)
+        if cursor is None:
+            return paginate_rows(rows, page, size)
+        try:
+            return keyset_rows(rows, sort_key, descending, cursor, size, include_total)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+
     query = select(Powder)
 
     # Fuzzy search (pg_trgm with ILIKE fallback)
     if q:
         query = apply_fuzzy_search(query, Powder, q, has_trgm=getattr(request.app.state, "has_trgm", False))
-    else:
-        # Apply user sort when not searching (search has its own ordering)
-        sort_col = _POWDER_SORT_COLUMNS.get(sort, Powder.quality_score)
-        if order == "asc":
-            query = query.order_by(sort_col.asc())
-        else:
-            query = query.order_by(sort_col.desc())
+    elif cursor is None:
+        # Apply user sort when not searching (search has its own ordering; keyset mode adds its own)
+        query = order_by_sort(query, Powder, sort_key, descending)
 
     # Exact manufacturer filter
     if manufacturer:
@@ -126,12 +154,21 @@ async def list_powders(
     if min_quality is not None:
         query = query.where(Powder.quality_score >= min_quality)
 
-    return await paginate(db, query, page, size)
+    if cursor is not None:
+        version = await table_version(db, "powders") if include_total else None
+        try:
+            return await paginate_keyset(db, query, Powder, sort_key, descending, cursor, size, include_total, version)
+        except InvalidCursor as e:
+            raise HTTPException(400, str(e))
+    return await paginate(db, query, page, size, version=await table_version(db, "powders"))
 
 
 @router.get("/manufacturers", response_model=list[str])
-async def list_powder_manufacturers(db: AsyncSession = Depends(get_db)):
+async def list_powder_manufacturers(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Return distinct manufacturer names for powders."""
+    cached = await not_modified(request, response, db, "powders")
+    if cached is not None:
+        return cached
     result = await db.execute(
         select(Powder.manufacturer)
         .distinct()
@@ -149,11 +186,35 @@ async def create_powder(data: PowderCreate, db: AsyncSession = Depends(get_db)):
     breakdown = compute_quality_score(powder_dict, powder.data_source)
     powder.quality_score = breakdown.score
     db.add(powder)
+    version = await bump_version(db, "powders")
     await db.commit()
     await db.refresh(powder)
+    apply_upsert("powders", version, powder)
     return powder
 
 
+def _derive_powder_columns(row: dict) -> None:
+    """Alias group from powder_aliases.json and quality score of an imported powder."""
+    group = _load_alias_map().get(row["name"].lower())
+    if group:
+        row["alias_group"] = group
+    row["quality_score"] = compute_quality_score(row, row["data_source"]).score
+
+
+def _aliases_linked(rows) -> int:
+    alias_map = _load_alias_map()
+    return sum(1 for p in rows if alias_map.get(p.name.lower()))
+
+
+async def _spool_grt_upload(file: UploadFile) -> PropellantSource:
+    if not file.filename:
+        raise HTTPException(400, "No filename provided")
+    try:
+        return await spool_upload(file, file.filename)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
 @router.post("/import-grt", response_model=GrtImportResult)
 async def import_grt(
     file: UploadFile,
@@ -170,129 +231,98 @@ async def import_grt(
 
     User-created records (data_source='manual') are NEVER overwritten. Instead,
     the imported version is created as a new record with ' (GRT Import)' suffix.
-    """
-    if not file.filename:
-        raise HTTPException(400, "No filename provided")
-
-    content = await file.read()
-    if not content:
-        raise HTTPException(400, "Empty file")
 
-    # Size limit: 10 MB
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(400, "File too large (max 10 MB)")
-
-    filename_lower = file.filename.lower()
-
-    # Parse the file(s)
-    grt_list: list[dict] = []
-    parse_errors: list[str] = []
-
-    if filename_lower.endswith(".zip"):
-        try:
-            grt_list = parse_propellant_zip(content)
-        except ValueError as e:
-            raise HTTPException(400, str(e))
-    elif filename_lower.endswith(".propellant"):
-        try:
-            grt_list = [parse_propellant_file(content)]
-        except ValueError as e:
-            raise HTTPException(400, str(e))
-    else:
-        raise HTTPException(400, "Unsupported file type. Use .propellant or .zip")
-
-    # Convert and insert
-    created: list[Powder] = []
-    updated: list[Powder] = []
-    skipped: list[str] = []
-
-    # Pre-fetch existing powders for duplicate detection
-    existing_result = await db.execute(select(Powder))
-    existing_powders = {p.name.lower(): p for p in existing_result.scalars().all()}
-
-    for grt_params in grt_list:
-        try:
-            powder_data = convert_grt_to_powder(grt_params)
-        except (KeyError, ValueError, TypeError) as e:
-            parse_errors.append(f"{grt_params.get('pname', '?')}: conversion error - {e}")
-            continue
-
-        name = powder_data["name"]
-        existing = existing_powders.get(name.lower())
-
-        if existing:
-            # User-created records are NEVER overwritten
-            if existing.data_source == "manual":
-                # Create a renamed copy instead
-                new_name = f"{name} (GRT Import)"
-                powder = Powder(**powder_data)
-                powder.name = new_name
-                powder.data_source = "grt_community"
-                powder_dict = {c.key: getattr(powder, c.key) for c in Powder.__table__.columns}
-                breakdown = compute_quality_score(powder_dict, powder.data_source)
-                powder.quality_score = breakdown.score
-                db.add(powder)
-                existing_powders[new_name.lower()] = powder
-                created.append(powder)
-            elif mode == ImportMode.skip:
-                skipped.append(name)
-            elif mode == ImportMode.overwrite:
-                # Update ALL fields on existing record
-                for key, value in powder_data.items():
-                    if hasattr(existing, key) and key not in ("name",):
-                        setattr(existing, key, value)
-                existing.data_source = "grt_community"
-                powder_dict = {c.key: getattr(existing, c.key) for c in Powder.__table__.columns}
-                breakdown = compute_quality_score(powder_dict, existing.data_source)
-                existing.quality_score = breakdown.score
-                updated.append(existing)
-            elif mode == ImportMode.merge:
-                # Only update fields that are currently NULL
-                for key, value in powder_data.items():
-                    if hasattr(existing, key) and getattr(existing, key) is None and value is not None:
-                        setattr(existing, key, value)
-                # Leave data_source unchanged for merge
-                powder_dict = {c.key: getattr(existing, c.key) for c in Powder.__table__.columns}
-                breakdown = compute_quality_score(powder_dict, existing.data_source)
-                existing.quality_score = breakdown.score
-                updated.append(existing)
-        else:
-            powder = Powder(**powder_data)
-            powder.data_source = "grt_community"
-            powder_dict = {c.key: getattr(powder, c.key) for c in Powder.__table__.columns}
-            breakdown = compute_quality_score(powder_dict, powder.data_source)
-            powder.quality_score = breakdown.score
-            db.add(powder)
-            existing_powders[name.lower()] = powder
-            created.append(powder)
-
-    # Apply alias groups from powder_aliases.json to created + updated powders
-    alias_map = _load_alias_map()
-    aliases_linked = 0
-    for powder in created + updated:
-        group = alias_map.get(powder.name.lower())
-        if group:
-            powder.alias_group = group
-            aliases_linked += 1
-
-    if created or updated:
-        await db.commit()
-        for p in created + updated:
-            await db.refresh(p)
-
-    logger.info("GRT import (mode=%s): %d created, %d updated, %d skipped, %d errors, %d aliases linked",
-                mode.value, len(created), len(updated), len(skipped), len(parse_errors), aliases_linked)
+    There is no size limit: the upload is spooled to disk and imported in
+    committed batches (see /import-grt/stream for progress while it runs).
+    """
+    source = await _spool_grt_upload(file)
+    created, updated, skipped, errors = [], [], [], []
+    unchanged = 0
+    try:
+        async for batch in import_propellants(db, source, mode, _derive_powder_columns):
+            created += batch.result.created
+            updated += batch.result.updated
+            unchanged += batch.result.unchanged
+            skipped += batch.result.skipped
+            errors += batch.result.errors
+    finally:
+        source.close()
+
+    if errors and not (created or updated or unchanged or skipped):
+        raise HTTPException(400, f"All files failed to parse: {'; '.join(errors)}")
+
+    aliases_linked = _aliases_linked(created + updated)
+    logger.info("GRT import (mode=%s): %d created, %d updated, %d unchanged, %d skipped, %d errors, "
+                "%d aliases linked", mode.value, len(created), len(updated), unchanged, len(skipped), len(errors),
+                aliases_linked)
 
     return GrtImportResult(
         created=[PowderResponse.model_validate(p) for p in created],
         updated=[PowderResponse.model_validate(p) for p in updated],
+        unchanged=unchanged,
         skipped=skipped,
-        errors=parse_errors,
+        errors=errors,
         mode=mode.value,
         aliases_linked=aliases_linked,
     )
 
 
+@router.post("/import-grt/stream")
+async def import_grt_stream(
+    file: UploadFile,
+    mode: ImportMode = Query(ImportMode.skip),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import like /import-grt, streaming one GrtImportProgress line per committed batch.
+
+    The response is application/x-ndjson. Upload errors (empty, unsupported or
+    corrupt file) are still answered with 400 before the stream starts.
+    """
+    source = await _spool_grt_upload(file)
+
+    async def progress_lines():
+        progress = GrtImportProgress(files_total=len(source.names))
+        try:
+            # The request's session is closed before the body streams: use a new one on its engine
+            async with AsyncSession(db.bind, expire_on_commit=False) as import_db:
+                async for batch in import_propellants(import_db, source, mode, _derive_powder_columns):
+                    progress.files_done = batch.files_done
+                    progress.created += len(batch.result.created)
+                    progress.updated += len(batch.result.updated)
+                    progress.unchanged += batch.result.unchanged
+                    progress.aliases_linked += _aliases_linked(batch.result.created + batch.result.updated)
+                    progress.skipped = batch.result.skipped
+                    progress.errors = batch.result.errors
+                    yield progress.model_dump_json() + "\n"
+            progress.status = "done"
+            progress.skipped, progress.errors = [], []
+        except Exception as e:
+            logger.exception("Streamed GRT import failed after %d files", progress.files_done)
+            progress.status = "failed"
+            progress.skipped, progress.errors = [], [str(e)]
+        finally:
+            source.close()
+        yield progress.model_dump_json() + "\n"
+
+    return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/import-ndjson", response_model=ImportResult)
+async def import_powders_ndjson(
+    request: Request,
+    mode: ImportMode = Query(ImportMode.skip),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import powders from an NDJSON body (application/x-ndjson, one PowderCreate per line).
+
+    Records are validated and imported in committed chunks while the body
+    streams in, so arbitrarily large dumps use bounded memory. Collision
+    handling is the same as /import; invalid lines are reported in errors
+    as "line N: ..." and do not stop the import.
+    """
+    return await import_ndjson(db, request.stream(), PowderCreate, Powder, mode, derive=_derive_powder_columns)
+
+
 @router.get("/{powder_id}/aliases", response_model=list[PowderResponse])
 async def get_powder_aliases(powder_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """Return other powders in the same alias group as the given powder."""
@@ -322,6 +352,7 @@ async def update_powder(powder_id: uuid.UUID, data: PowderUpdate, db: AsyncSessi
         raise HTTPException(404, "Powder not found")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(powder, key, value)
+    powder.import_hash = None  # a re-import must not treat the edited row as unchanged
 
     # Track source modification: GRT -> grt_modified on edit
     if powder.data_source == "grt_community":
@@ -332,8 +363,10 @@ async def update_powder(powder_id: uuid.UUID, data: PowderUpdate, db: AsyncSessi
     breakdown = compute_quality_score(powder_dict, powder.data_source)
     powder.quality_score = breakdown.score
 
+    version = await bump_version(db, "powders")
     await db.commit()
     await db.refresh(powder)
+    apply_upsert("powders", version, powder)
     return powder
 
 
@@ -343,4 +376,6 @@ async def delete_powder(powder_id: uuid.UUID, db: AsyncSession = Depends(get_db)
     if not powder:
         raise HTTPException(404, "Powder not found")
     await db.delete(powder)
+    version = await bump_version(db, "powders")
     await db.commit()
+    apply_delete("powders", version, powder_id)
@@ -4,40 +4,47 @@ import time
 import uuid
 
 import numpy as np
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
 from app.middleware import limiter
-from app.core.solver import (
-    BulletParams,
-    CartridgeParams,
-    LoadParams,
-    PowderParams,
-    RifleParams,
-    simulate,
-    J_TO_FT_LBS,
-)
-from app.core.solver import GRAINS_TO_KG, MM_TO_M, MM3_TO_M3, GCM3_TO_KGM3
+from app.core.calibration import calibrate_powder
+from app.core.diagnostics import record_simulations
+from app.core.solver import GRAINS_TO_KG, H_COEFF_DEFAULT, J_TO_FT_LBS, CompiledLoadContext
 from app.db.session import get_db
-from app.models.bullet import Bullet
-from app.models.cartridge import Cartridge
-from app.models.load import Load
-from app.models.powder import Powder
-from app.models.rifle import Rifle
-from app.models.simulation import SimulationResult
+from app.models.calibration import PowderCalibration
+from app.models.simulation import CURVES, SimulationResult
+from app.services.simulation_inputs import (
+    SimulationInputNotFound,
+    SimulationInputs,
+    compile_context,
+    fetch_inputs,
+    fetch_load_inputs,
+    fetch_search_inputs,
+)
+from app.services.validation import compute_validation_report, filter_results
 from app.schemas.simulation import (
+    CalibrationPointResult,
+    CalibrationRequest,
+    CalibrationResponse,
     DirectSimulationRequest,
     DirectSimulationResponse,
+    FittedParameter,
     LadderTestRequest,
     LadderTestResponse,
     ParametricSearchRequest,
     ParametricSearchResponse,
+    PowderCalibrationResponse,
     PowderChargeResult,
+    PreflightScreening,
     PowderSearchResult,
     SensitivityRequest,
     SensitivityResponse,
+    SimulationDiagnostics,
     SimulationRequest,
     SimulationResultResponse,
     ValidationLoadResult,
@@ -48,80 +55,49 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/simulate", tags=["simulation"])
 
+_DIAGNOSTICS_QUERY = Query(False, description="Include per-phase timings and solver statistics in each result")
 
-async def _load_simulation_data(db: AsyncSession, load: Load):
-    """Load all related entities for a simulation."""
-    powder = await db.get(Powder, load.powder_id)
-    bullet = await db.get(Bullet, load.bullet_id)
-    rifle = await db.get(Rifle, load.rifle_id)
-    if not powder or not bullet or not rifle:
-        raise HTTPException(404, "Related powder, bullet, or rifle not found")
-    cartridge = await db.get(Cartridge, rifle.cartridge_id)
-    if not cartridge:
-        raise HTTPException(404, "Cartridge not found for rifle")
-    return powder, bullet, cartridge, rifle
 
+async def _fetch_request_inputs(db: AsyncSession, req) -> SimulationInputs:
+    """Powder, bullet, rifle and the rifle's cartridge for a request (see fetch_inputs)."""
+    try:
+        return await fetch_inputs(db, req.powder_id, req.bullet_id, req.rifle_id)
+    except SimulationInputNotFound as e:
+        raise HTTPException(404, str(e))
 
-def _make_params(powder_row, bullet_row, cartridge_row, rifle_row, charge_grains: float, barrel_length_mm_override: float | None = None):
-    """Convert DB rows to simulation parameter dataclasses.
 
-    Returns:
-        Tuple of (powder, bullet, cartridge, rifle, load, extra_warnings).
-        extra_warnings is a list of warning strings to append to simulation results.
-    """
-    extra_warnings: list[str] = []
-    case_capacity_m3 = cartridge_row.case_capacity_grains_h2o * GRAINS_TO_KG / 1000.0
-    chamber_vol = rifle_row.chamber_volume_mm3 * MM3_TO_M3 if rifle_row.chamber_volume_mm3 > 0 else case_capacity_m3
-
-    # Read per-powder web_thickness from DB, with fallback to legacy default
-    if powder_row.web_thickness_mm is not None:
-        web_thickness_m = powder_row.web_thickness_mm * 0.001
-    else:
-        web_thickness_m = 0.0004  # legacy default
-        extra_warnings.append(
-            "Usando espesor de alma predeterminado (0.4 mm). "
-            "Para mayor precision, configure web_thickness en la polvora."
+def _compile_request_context(powder_row, bullet_row, cartridge_row, rifle_row, req) -> CompiledLoadContext:
+    """compile_context() with the request's burn model (and barrel override, if it has one)."""
+    try:
+        return compile_context(
+            powder_row, bullet_row, cartridge_row, rifle_row,
+            barrel_length_mm_override=getattr(req, "barrel_length_mm_override", None),
+            burn_model=req.burn_model,
         )
-
-    powder = PowderParams(
-        force_j_kg=powder_row.force_constant_j_kg,
-        covolume_m3_kg=powder_row.covolume_m3_kg,
-        burn_rate_coeff=powder_row.burn_rate_coeff,
-        burn_rate_exp=powder_row.burn_rate_exp,
-        gamma=powder_row.gamma,
-        density_kg_m3=powder_row.density_g_cm3 * GCM3_TO_KGM3,
-        flame_temp_k=powder_row.flame_temp_k,
-        web_thickness_m=web_thickness_m,
-        # 3-curve fields (None if not present -> 2-curve fallback)
-        ba=powder_row.ba,
-        bp=powder_row.bp,
-        br=powder_row.br,
-        brp=powder_row.brp,
-        z1=powder_row.z1,
-        z2=powder_row.z2,
-    )
-    bullet = BulletParams(
-        mass_kg=bullet_row.weight_grains * GRAINS_TO_KG,
-        diameter_m=bullet_row.diameter_mm * MM_TO_M,
-    )
-    cart = CartridgeParams(
-        saami_max_pressure_psi=cartridge_row.saami_max_pressure_psi,
-        chamber_volume_m3=chamber_vol,
-        bore_diameter_m=cartridge_row.bore_diameter_mm * MM_TO_M,
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+
+def _preflight_to_response(preflight) -> PreflightScreening | None:
+    if preflight is None:
+        return None
+    return PreflightScreening(
+        verdict=preflight.verdict,
+        fill_ratio=round(preflight.fill_ratio, 4),
+        loading_density_kg_m3=round(preflight.loading_density_kg_m3, 1),
+        pressure_upper_bound_psi=round(preflight.pressure_upper_bound_psi, 1) if preflight.pressure_upper_bound_psi is not None else None,
+        pressure_lower_bound_psi=round(preflight.pressure_lower_bound_psi, 1),
     )
-    barrel_length_m = (barrel_length_mm_override * MM_TO_M) if barrel_length_mm_override else (rifle_row.barrel_length_mm * MM_TO_M)
-    rif = RifleParams(
-        barrel_length_m=barrel_length_m,
-        twist_rate_m=rifle_row.twist_rate_mm * MM_TO_M,
-        rifle_mass_kg=rifle_row.weight_kg if rifle_row.weight_kg else 3.5,
-    )
-    ld = LoadParams(charge_mass_kg=charge_grains * GRAINS_TO_KG)
-    return powder, bullet, cart, rif, ld, extra_warnings
 
 
-def _sim_result_to_response(result) -> DirectSimulationResponse:
-    """Convert a SimResult to a DirectSimulationResponse."""
-    return DirectSimulationResponse(
+def _sim_result_to_response(result, include_diagnostics: bool = False) -> DirectSimulationResponse:
+    """Convert a SimResult to a DirectSimulationResponse.
+
+    With include_diagnostics, the result's SimDiagnostics are attached, plus
+    the time spent building this response model (serialization_ms).
+    """
+    t_start = time.perf_counter()
+    response = DirectSimulationResponse(
         peak_pressure_psi=result.peak_pressure_psi,
         muzzle_velocity_fps=result.muzzle_velocity_fps,
         pressure_curve=result.pressure_curve,
@@ -142,23 +118,35 @@ def _sim_result_to_response(result) -> DirectSimulationResponse:
         energy_curve=result.energy_curve or [],
         temperature_curve=result.temperature_curve or [],
         recoil_curve=result.recoil_curve or [],
+        preflight=_preflight_to_response(result.preflight),
+        burn_model=result.burn_model,
     )
+    if include_diagnostics and result.diagnostics is not None:
+        response.diagnostics = SimulationDiagnostics(
+            **result.diagnostics.as_dict(),
+            serialization_ms=(time.perf_counter() - t_start) * 1000.0,
+        )
+    return response
+
+
+def _timed_responses(results, include_diagnostics: bool) -> tuple[list[DirectSimulationResponse], float]:
+    """Convert SimResults to responses; returns them with the total serialization time (ms)."""
+    t_start = time.perf_counter()
+    responses = [_sim_result_to_response(r, include_diagnostics) for r in results]
+    return responses, (time.perf_counter() - t_start) * 1000.0
 
 
 @router.post("", response_model=SimulationResultResponse, status_code=201)
 @limiter.limit("10/minute")
 async def run_simulation(request: Request, req: SimulationRequest, db: AsyncSession = Depends(get_db)):
-    load = await db.get(Load, req.load_id)
-    if not load:
-        raise HTTPException(404, "Load not found")
-
-    powder_row, bullet_row, cartridge_row, rifle_row = await _load_simulation_data(db, load)
-    powder, bullet, cart, rif, ld, extra_warnings = _make_params(
-        powder_row, bullet_row, cartridge_row, rifle_row, load.powder_charge_grains
-    )
-
-    result = simulate(powder, bullet, cart, rif, ld)
-    result.warnings.extend(extra_warnings)
+    try:
+        inputs = await fetch_load_inputs(db, req.load_id)
+    except SimulationInputNotFound as e:
+        raise HTTPException(404, str(e))
+    load = inputs.load
+    ctx = compile_context(*inputs.components)
+    result = ctx.run(load.powder_charge_grains * GRAINS_TO_KG)
+    record_simulations("simulate", [result.diagnostics])
 
     sim_record = SimulationResult(
         load_id=load.id,
@@ -181,94 +169,78 @@ async def run_simulation(request: Request, req: SimulationRequest, db: AsyncSess
     )
     db.add(sim_record)
     await db.commit()
-    await db.refresh(sim_record)
+    # Every column is set client-side; no refresh (it would expire the deferred curves)
     return sim_record
 
 
 @router.post("/ladder", response_model=LadderTestResponse)
 @limiter.limit("5/minute")
-async def run_ladder_test(request: Request, req: LadderTestRequest, db: AsyncSession = Depends(get_db)):
-    powder_row = await db.get(Powder, req.powder_id)
-    bullet_row = await db.get(Bullet, req.bullet_id)
-    rifle_row = await db.get(Rifle, req.rifle_id)
-    if not powder_row or not bullet_row or not rifle_row:
-        raise HTTPException(404, "Powder, bullet, or rifle not found")
-    cartridge_row = await db.get(Cartridge, rifle_row.cartridge_id)
-    if not cartridge_row:
-        raise HTTPException(404, "Cartridge not found")
+async def run_ladder_test(
+    request: Request,
+    req: LadderTestRequest,
+    diagnostics: bool = _DIAGNOSTICS_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    powder_row, bullet_row, cartridge_row, rifle_row = (await _fetch_request_inputs(db, req)).components
 
     charges = np.arange(req.charge_start_grains, req.charge_end_grains + req.charge_step_grains / 2, req.charge_step_grains)
 
-    results = []
+    sim_results = []
     charge_weights = []
 
+    ctx = _compile_request_context(powder_row, bullet_row, cartridge_row, rifle_row, req)
     for charge_gr in charges:
         charge_gr = float(charge_gr)
-        powder, bullet, cart, rif, ld, extra_warnings = _make_params(
-            powder_row, bullet_row, cartridge_row, rifle_row, charge_gr
-        )
-        sim_result = simulate(powder, bullet, cart, rif, ld)
-        sim_result.warnings.extend(extra_warnings)
-
-        results.append(_sim_result_to_response(sim_result))
+        sim_results.append(ctx.run(charge_gr * GRAINS_TO_KG))
         charge_weights.append(charge_gr)
 
+    results, serialization_ms = _timed_responses(sim_results, diagnostics)
+    record_simulations("ladder", [r.diagnostics for r in sim_results], {"serialization": serialization_ms})
+
     return LadderTestResponse(results=results, charge_weights=charge_weights)
 
 
 @router.post("/direct", response_model=DirectSimulationResponse)
 @limiter.limit("10/minute")
-async def run_direct_simulation(request: Request, req: DirectSimulationRequest, db: AsyncSession = Depends(get_db)):
+async def run_direct_simulation(
+    request: Request,
+    req: DirectSimulationRequest,
+    diagnostics: bool = _DIAGNOSTICS_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
     """Run a simulation directly from component IDs without creating a Load."""
-    powder_row = await db.get(Powder, req.powder_id)
-    bullet_row = await db.get(Bullet, req.bullet_id)
-    rifle_row = await db.get(Rifle, req.rifle_id)
-    if not powder_row or not bullet_row or not rifle_row:
-        raise HTTPException(404, "Powder, bullet, or rifle not found")
-
-    cartridge_row = await db.get(Cartridge, rifle_row.cartridge_id)
-    if not cartridge_row:
-        raise HTTPException(404, "Cartridge not found for rifle")
-
-    powder, bullet, cart, rif, ld, extra_warnings = _make_params(
-        powder_row, bullet_row, cartridge_row, rifle_row, req.powder_charge_grains,
-        barrel_length_mm_override=req.barrel_length_mm_override,
-    )
+    powder_row, bullet_row, cartridge_row, rifle_row = (await _fetch_request_inputs(db, req)).components
 
-    result = simulate(powder, bullet, cart, rif, ld)
-    result.warnings.extend(extra_warnings)
+    ctx = _compile_request_context(powder_row, bullet_row, cartridge_row, rifle_row, req)
+    result = ctx.run(req.powder_charge_grains * GRAINS_TO_KG)
 
-    return _sim_result_to_response(result)
+    (response,), serialization_ms = _timed_responses([result], diagnostics)
+    record_simulations("direct", [result.diagnostics], {"serialization": serialization_ms})
+    return response
 
 
 @router.post("/sensitivity", response_model=SensitivityResponse)
 @limiter.limit("10/minute")
-async def run_sensitivity(request: Request, req: SensitivityRequest, db: AsyncSession = Depends(get_db)):
+async def run_sensitivity(
+    request: Request,
+    req: SensitivityRequest,
+    diagnostics: bool = _DIAGNOSTICS_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
     """Run 3 simulations (center, +delta, -delta) for sensitivity/error band visualization."""
-    powder_row = await db.get(Powder, req.powder_id)
-    bullet_row = await db.get(Bullet, req.bullet_id)
-    rifle_row = await db.get(Rifle, req.rifle_id)
-    if not powder_row or not bullet_row or not rifle_row:
-        raise HTTPException(404, "Powder, bullet, or rifle not found")
-
-    cartridge_row = await db.get(Cartridge, rifle_row.cartridge_id)
-    if not cartridge_row:
-        raise HTTPException(404, "Cartridge not found for rifle")
+    powder_row, bullet_row, cartridge_row, rifle_row = (await _fetch_request_inputs(db, req)).components
 
     charge_center = req.powder_charge_grains
     charge_upper = charge_center + req.charge_delta_grains
     charge_lower = max(0.1, charge_center - req.charge_delta_grains)
 
     # Run 3 simulations: center, upper, lower
-    results = {}
-    for label, charge_gr in [("center", charge_center), ("upper", charge_upper), ("lower", charge_lower)]:
-        powder, bullet, cart, rif, ld, extra_warnings = _make_params(
-            powder_row, bullet_row, cartridge_row, rifle_row, charge_gr,
-            barrel_length_mm_override=req.barrel_length_mm_override,
-        )
-        sim_result = simulate(powder, bullet, cart, rif, ld)
-        sim_result.warnings.extend(extra_warnings)
-        results[label] = _sim_result_to_response(sim_result)
+    ctx = _compile_request_context(powder_row, bullet_row, cartridge_row, rifle_row, req)
+    labels = ("center", "upper", "lower")
+    sim_results = [ctx.run(charge_gr * GRAINS_TO_KG) for charge_gr in (charge_center, charge_upper, charge_lower)]
+    responses, serialization_ms = _timed_responses(sim_results, diagnostics)
+    results = dict(zip(labels, responses))
+    record_simulations("sensitivity", [r.diagnostics for r in sim_results], {"serialization": serialization_ms})
 
     return SensitivityResponse(
         center=results["center"],
@@ -283,7 +255,7 @@ async def run_sensitivity(request: Request, req: SensitivityRequest, db: AsyncSe
 @router.get("/export/{simulation_id}")
 async def export_simulation_csv(simulation_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """Export a simulation result as CSV with pressure and velocity curves."""
-    sim = await db.get(SimulationResult, simulation_id)
+    sim = await db.get(SimulationResult, simulation_id, options=[undefer_group(CURVES)])
     if not sim:
         raise HTTPException(404, "Simulation result not found")
 
@@ -298,16 +270,18 @@ async def export_simulation_csv(simulation_id: uuid.UUID, db: AsyncSession = Dep
     # Pressure curve
     buf.write("# Pressure Curve\n")
     buf.write("t_ms,p_psi\n")
-    for pt in sim.pressure_curve:
-        buf.write(f"{pt['t_ms']:.4f},{pt['p_psi']:.1f}\n")
+    pressure = sim.pressure_curve.columns
+    for t_ms, p_psi in zip(pressure["t_ms"].tolist(), pressure["p_psi"].tolist()):
+        buf.write(f"{t_ms:.4f},{p_psi:.1f}\n")
 
     buf.write("\n")
 
     # Velocity curve
     buf.write("# Velocity Curve\n")
     buf.write("x_mm,v_fps\n")
-    for pt in sim.velocity_curve:
-        buf.write(f"{pt['x_mm']:.2f},{pt['v_fps']:.1f}\n")
+    velocity = sim.velocity_curve.columns
+    for x_mm, v_fps in zip(velocity["x_mm"].tolist(), velocity["v_fps"].tolist()):
+        buf.write(f"{x_mm:.2f},{v_fps:.1f}\n")
 
     buf.seek(0)
     return StreamingResponse(
@@ -327,22 +301,13 @@ async def run_parametric_search(request: Request, req: ParametricSearchRequest,
     """Search across all powders to find optimal loads for a given rifle/bullet/cartridge combination."""
     t_start = time.perf_counter()
 
-    # Load rifle, bullet, cartridge from DB
-    rifle_row = await db.get(Rifle, req.rifle_id)
-    if not rifle_row:
-        raise HTTPException(404, "Rifle not found")
-
-    bullet_row = await db.get(Bullet, req.bullet_id)
-    if not bullet_row:
-        raise HTTPException(404, "Bullet not found")
-
-    cartridge_row = await db.get(Cartridge, req.cartridge_id)
-    if not cartridge_row:
-        raise HTTPException(404, "Cartridge not found")
-
-    # Get all powders
-    result = await db.execute(select(Powder).order_by(Powder.name))
-    all_powders = result.scalars().all()
+    # Rifle from DB; bullet, cartridge and all powders (by name) from the catalog snapshot
+    try:
+        rifle_row, bullet_row, cartridge_row, all_powders = await fetch_search_inputs(
+            db, req.rifle_id, req.bullet_id, req.cartridge_id,
+        )
+    except SimulationInputNotFound as e:
+        raise HTTPException(404, str(e))
 
     if not all_powders:
         raise HTTPException(404, "No powders found in database")
@@ -351,6 +316,7 @@ async def run_parametric_search(request: Request, req: ParametricSearchRequest,
     case_capacity_cm3 = cartridge_row.case_capacity_grains_h2o * _GRAINS_H2O_TO_CM3
 
     powder_results: list[PowderSearchResult] = []
+    sim_diagnostics = []
 
     for powder_row in all_powders:
         try:
@@ -369,12 +335,23 @@ async def run_parametric_search(request: Request, req: ParametricSearchRequest,
             best_safe_result = None
             best_safe_charge = None
 
+            ctx = compile_context(powder_row, bullet_row, cartridge_row, rifle_row)
             for charge_gr in charges:
                 charge_gr = float(charge_gr)
-                powder, bullet, cart, rif, ld, _extra_warnings = _make_params(
-                    powder_row, bullet_row, cartridge_row, rifle_row, charge_gr
-                )
-                sim_result = simulate(powder, bullet, cart, rif, ld)
+                # Screen first: overfilled or impossible charges are unsafe
+                # whatever the pressure, so report them without integrating.
+                preflight = ctx.preflight(charge_gr * GRAINS_TO_KG)
+                if preflight.charge_unsafe:
+                    charge_results.append(PowderChargeResult(
+                        charge_grains=round(charge_gr, 2),
+                        peak_pressure_psi=round(preflight.pressure_lower_bound_psi, 1),
+                        is_safe=False,
+                        screened=True,
+                    ))
+                    continue
+
+                sim_result = ctx.run(charge_gr * GRAINS_TO_KG)
+                sim_diagnostics.append(sim_result.diagnostics)
 
                 cr = PowderChargeResult(
                     charge_grains=round(charge_gr, 2),
@@ -442,6 +419,7 @@ async def run_parametric_search(request: Request, req: ParametricSearchRequest,
     sorted_results = viable + non_viable
 
     total_time_ms = (time.perf_counter() - t_start) * 1000.0
+    record_simulations("parametric", sim_diagnostics)
 
     return ParametricSearchResponse(
         results=sorted_results,
@@ -457,33 +435,25 @@ async def run_parametric_search(request: Request, req: ParametricSearchRequest,
 
 @router.post("/validate", response_model=ValidationResponse)
 @limiter.limit("3/minute")
-async def run_validation(request: Request):
+async def run_validation(
+    request: Request,
+    caliber: str | None = Query(None, description="Only loads of this caliber (e.g. '.308 Win')"),
+    powder: str | None = Query(None, description="Only loads whose powder name contains this text"),
+):
     """Run all reference loads and return comparison results.
 
-    Uses the shared VALIDATION_LOADS fixture to simulate each load
-    and compare predicted vs published muzzle velocity.
+    Simulates the validation corpus (app.core.validation_loads) in the solver
+    process pool and compares predicted vs published muzzle velocity. The
+    report is cached per corpus/solver/model-constants version, so repeated
+    calls return immediately; filters apply to the cached report.
     """
-    from tests.fixtures.validation_loads import VALIDATION_LOADS, run_validation_load
-
-    results: list[ValidationLoadResult] = []
-    errors: list[float] = []
-
-    for load in VALIDATION_LOADS:
-        r = run_validation_load(load)
-        results.append(ValidationLoadResult(
-            load_id=r["load_id"],
-            caliber=r["caliber"],
-            bullet_desc=r["bullet_desc"],
-            powder_name=r["powder_name"],
-            charge_gr=r["charge_gr"],
-            barrel_length_mm=r["barrel_length_mm"],
-            published_velocity_fps=r["published_velocity_fps"],
-            predicted_velocity_fps=r["predicted_velocity_fps"],
-            error_pct=r["error_pct"],
-            is_pass=r["is_pass"],
-            source=r["source"],
-        ))
-        errors.append(r["error_pct"])
+    report, cached = await run_in_threadpool(compute_validation_report)
+
+    results = [
+        ValidationLoadResult(**{k: r[k] for k in ValidationLoadResult.model_fields})
+        for r in filter_results(report.results, caliber=caliber, powder=powder)
+    ]
+    errors = [r.error_pct for r in results]
 
     passing = sum(1 for r in results if r.is_pass)
     max_error = max(errors) if errors else 0.0
@@ -498,4 +468,117 @@ async def run_validation(request: Request):
         mean_error_pct=round(sum(errors) / len(errors), 2) if errors else 0.0,
         max_error_pct=round(max_error, 2),
         worst_load_id=worst_id,
+        cached=cached,
+        cache_key=report.cache_key,
+        compute_time_ms=report.elapsed_ms,
+    )
+
+
+# API parameter names -> app.core.calibration parameter names
+_CALIBRATION_PARAM_MAP = {
+    "burn_rate_coeff": "burn_rate_coeff",
+    "force_constant_j_kg": "force_j_kg",
+    "h_coeff": "h_coeff",
+}
+
+
+@router.post("/calibrate", response_model=CalibrationResponse)
+@limiter.limit("3/minute")
+async def run_calibration(request: Request, req: CalibrationRequest, db: AsyncSession = Depends(get_db)):
+    """Fit powder parameters to measured chronograph velocities.
+
+    Runs bounded least squares over the solver (parallel finite-difference
+    Jacobians) and returns fitted values with confidence intervals. With
+    save=true the result is stored as a per-rifle or per-powder calibration.
+    """
+    powder_row, bullet_row, cartridge_row, rifle_row = (await _fetch_request_inputs(db, req)).components
+
+    ctx = _compile_request_context(powder_row, bullet_row, cartridge_row, rifle_row, req)
+
+    fit_names = tuple(_CALIBRATION_PARAM_MAP[name] for name in dict.fromkeys(req.fit_parameters))
+    try:
+        fit = await run_in_threadpool(
+            calibrate_powder,
+            ctx.powder, ctx.bullet, ctx.cartridge, ctx.rifle,
+            [pt.charge_grains * GRAINS_TO_KG for pt in req.points],
+            [pt.velocity_fps for pt in req.points],
+            fit_parameters=fit_names,
+            h_coeff=H_COEFF_DEFAULT,
+            confidence_level=req.confidence_level,
+            burn_model=req.burn_model,
+        )
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+    parameters = []
+    for api_name, core_name in _CALIBRATION_PARAM_MAP.items():
+        if core_name not in fit.parameters:
+            continue
+        ci = fit.confidence_intervals[core_name]
+        parameters.append(FittedParameter(
+            name=api_name,
+            initial_value=fit.initial_parameters[core_name],
+            value=fit.parameters[core_name],
+            std_error=fit.std_errors[core_name],
+            ci_lower=ci[0] if ci else None,
+            ci_upper=ci[1] if ci else None,
+        ))
+
+    points = [
+        CalibrationPointResult(
+            charge_grains=pt.charge_grains,
+            measured_velocity_fps=pt.velocity_fps,
+            predicted_velocity_fps=round(pred, 1),
+            residual_fps=round(res, 1),
+        )
+        for pt, pred, res in zip(req.points, fit.predicted_velocities_fps, fit.residuals_fps)
+    ]
+
+    calibration_id = None
+    if req.save:
+        record = PowderCalibration(
+            powder_id=powder_row.id,
+            bullet_id=bullet_row.id,
+            rifle_id=rifle_row.id if req.scope == "rifle" else None,
+            scope=req.scope,
+            burn_rate_coeff=fit.parameters.get("burn_rate_coeff", ctx.powder.burn_rate_coeff),
+            force_constant_j_kg=fit.parameters.get("force_j_kg", ctx.powder.force_j_kg),
+            h_coeff=fit.parameters.get("h_coeff", H_COEFF_DEFAULT),
+            fitted_parameters=[p.name for p in parameters],
+            rms_residual_fps=fit.rms_residual_fps,
+            point_count=len(req.points),
+            points=[pt.model_dump() for pt in req.points],
+        )
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+        calibration_id = record.id
+
+    return CalibrationResponse(
+        parameters=parameters,
+        points=points,
+        rms_residual_fps=round(fit.rms_residual_fps, 2),
+        degrees_of_freedom=fit.degrees_of_freedom,
+        confidence_level=fit.confidence_level,
+        converged=fit.converged,
+        message=fit.message,
+        solver_runs=fit.solver_runs,
+        warnings=fit.warnings + ctx.extra_warnings,
+        calibration_id=calibration_id,
     )
+
+
+@router.get("/calibrations", response_model=list[PowderCalibrationResponse])
+async def list_calibrations(
+    powder_id: uuid.UUID | None = Query(None, description="Filter by powder"),
+    rifle_id: uuid.UUID | None = Query(None, description="Filter by rifle (per-rifle records only)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """List stored chronograph calibrations, newest first."""
+    query = select(PowderCalibration).order_by(PowderCalibration.created_at.desc())
+    if powder_id:
+        query = query.where(PowderCalibration.powder_id == powder_id)
+    if rifle_id:
+        query = query.where(PowderCalibration.rifle_id == rifle_id)
+    result = await db.execute(query)
+    return result.scalars().all()
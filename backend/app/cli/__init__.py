@@ -0,0 +1 @@
+"""Offline command-line tools: `python -m app.cli <command> --help`."""
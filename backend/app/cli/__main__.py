@@ -0,0 +1,22 @@
+"""Entry point for `python -m app.cli`."""
+
+import argparse
+import logging
+import sys
+
+from app.cli import calibrate_constants, simulate
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Ballistics simulator tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    calibrate_constants.register(subparsers)
+    simulate.register(subparsers)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
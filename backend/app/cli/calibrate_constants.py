@@ -0,0 +1,93 @@
+"""`calibrate-constants`: re-fit the global model constants against the validation corpus.
+
+Runs the reference loads through the process pool on every optimizer
+evaluation and writes a new version of the model constants file that the
+solver loads at startup:
+
+  cd backend && python -m app.cli calibrate-constants --workers 8
+"""
+
+import argparse
+from dataclasses import asdict
+from pathlib import Path
+
+from app.core.calibration import MODEL_CONSTANT_NAMES, calibrate_model_constants
+from app.core.model_constants import ModelConstants, constants_path, load_model_constants, save_model_constants
+from app.core.validation_loads import VALIDATION_LOADS, run_validation_load
+
+
+def _predict_reference_velocity(task: tuple[dict, ModelConstants]) -> float:
+    """Worker: predicted muzzle velocity (fps) of one reference load."""
+    load, constants = task
+    return run_validation_load(load, constants)["predicted_velocity_fps"]
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "calibrate-constants",
+        help="Fit h_coeff, friction, primer seed and shot-start pressure to the validation corpus",
+    )
+    parser.add_argument(
+        "--fit", nargs="+", choices=MODEL_CONSTANT_NAMES, default=list(MODEL_CONSTANT_NAMES),
+        help="Constants to fit (default: all)",
+    )
+    parser.add_argument("--max-evaluations", type=int, default=200, help="Corpus evaluations budget")
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes (default: SOLVER_WORKERS)")
+    parser.add_argument("--output", type=Path, default=None, help="Calibration file (default: MODEL_CONSTANTS_FILE)")
+    parser.add_argument(
+        "--from-defaults", action="store_true",
+        help="Start from the built-in defaults instead of the current calibration file",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report the fit without writing the file")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    output = args.output or constants_path()
+    start, start_version = (ModelConstants(), 0) if args.from_defaults else load_model_constants(output)
+
+    fit = calibrate_model_constants(
+        VALIDATION_LOADS,
+        _predict_reference_velocity,
+        fit_constants=tuple(args.fit),
+        start=start,
+        max_evaluations=args.max_evaluations,
+        max_workers=args.workers,
+    )
+
+    print(f"Reference loads: {len(VALIDATION_LOADS)}  evaluations: {fit.evaluations}  solver runs: {fit.solver_runs}")
+    print(f"Mean error: {fit.mean_error_pct_before:.2f}% -> {fit.mean_error_pct_after:.2f}% "
+          f"(max {fit.max_error_pct_after:.2f}%)")
+    initial = asdict(fit.initial_constants)
+    for name, value in asdict(fit.constants).items():
+        marker = "*" if name in fit.fitted else " "
+        print(f" {marker} {name:<15} {initial[name]:>14.6g} -> {value:<14.6g}")
+
+    if args.dry_run:
+        print("Dry run: calibration file not written")
+        return 0
+
+    version = save_model_constants(
+        fit.constants,
+        {
+            "fitted": fit.fitted,
+            "started_from_version": start_version,
+            "corpus": {
+                "loads": len(VALIDATION_LOADS),
+                "mean_error_pct_before": round(fit.mean_error_pct_before, 3),
+                "mean_error_pct_after": round(fit.mean_error_pct_after, 3),
+                "max_error_pct_after": round(fit.max_error_pct_after, 3),
+                "load_errors_pct": {k: round(v, 3) for k, v in fit.load_errors_pct.items()},
+            },
+            "optimizer": {
+                "method": "Nelder-Mead",
+                "evaluations": fit.evaluations,
+                "solver_runs": fit.solver_runs,
+                "converged": fit.converged,
+                "message": fit.message,
+            },
+        },
+        output,
+    )
+    print(f"Wrote model constants v{version} to {output} (restart the API to load them)")
+    return 0
@@ -0,0 +1,392 @@
+"""`simulate`: run a list of loads through the solver without the API.
+
+Reads a CSV, JSON (array of objects) or NDJSON file with one load per row,
+runs the loads across the solver process pool and streams one result per
+row, in input order, to CSV or NDJSON:
+
+  cd backend && python -m app.cli simulate loads.csv --output results.ndjson --workers 8
+
+Columns (CSV header or JSON keys):
+  id         Row label copied to the output (default: 1-based row number)
+  charge_gr  Powder charge in grains (default: the saved load's charge)
+  load       UUID of a saved load: supplies powder, bullet, rifle and charge
+  powder, bullet, cartridge
+             Database UUID or seed fixture name (e.g. "Hodgdon Varget")
+  rifle      Database UUID; supplies the cartridge unless one is given
+  <component>_<field>
+             Inline value for any field the solver reads, e.g. powder_burn_rate_coeff,
+             bullet_weight_grains, rifle_barrel_length_mm. Sets the field on a
+             referenced component, or defines the component when it has no reference
+             (see COMPONENT_FIELDS for the names and the optional fields).
+
+The database is only contacted when a row references a UUID. Rows that cannot
+be resolved or simulated are reported with status "error" and do not stop
+the batch; the exit code is 1 if any row failed.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.core.parallel import parallel_imap
+from app.core.solver import GRAINS_TO_KG
+from app.db import session as db_session
+from app.models.bullet import Bullet
+from app.models.cartridge import Cartridge
+from app.models.load import Load
+from app.models.powder import Powder
+from app.models.rifle import Rifle
+from app.seed.initial_data import BULLET_MANUFACTURERS, FIXTURES_DIR
+from app.services.simulation_inputs import compile_context
+
+_REQUIRED = object()
+
+# Fields compile_context() reads from each component, with defaults for the optional ones
+COMPONENT_FIELDS: dict[str, dict[str, object]] = {
+    "powder": {
+        "force_constant_j_kg": _REQUIRED,
+        "covolume_m3_kg": _REQUIRED,
+        "burn_rate_coeff": _REQUIRED,
+        "burn_rate_exp": _REQUIRED,
+        "gamma": _REQUIRED,
+        "density_g_cm3": _REQUIRED,
+        "flame_temp_k": _REQUIRED,
+        "web_thickness_mm": None,
+        "ba": None,
+        "bp": None,
+        "br": None,
+        "brp": None,
+        "z1": None,
+        "z2": None,
+    },
+    "bullet": {
+        "weight_grains": _REQUIRED,
+        "diameter_mm": _REQUIRED,
+    },
+    "cartridge": {
+        "saami_max_pressure_psi": _REQUIRED,
+        "case_capacity_grains_h2o": _REQUIRED,
+        "bore_diameter_mm": _REQUIRED,
+    },
+    "rifle": {
+        "barrel_length_mm": _REQUIRED,
+        "twist_rate_mm": _REQUIRED,
+        "chamber_volume_mm3": 0.0,  # 0: use the cartridge case capacity
+        "weight_kg": None,          # None: 3.5 kg
+    },
+}
+COMPONENTS = tuple(COMPONENT_FIELDS)
+
+OUTPUT_FIELDS = (
+    "id", "charge_gr", "status",
+    "peak_pressure_psi", "muzzle_velocity_fps", "barrel_time_ms", "is_safe",
+    "preflight", "pressure_lower_bound_psi", "pressure_upper_bound_psi", "recoil_energy_ft_lbs",
+    "nfev", "solve_ms", "elapsed_ms", "warnings", "error",
+)
+
+# Component fields as hashable (name, value) pairs, in COMPONENTS order
+ComponentKey = tuple[tuple[tuple[str, object], ...], ...]
+
+
+@dataclass(frozen=True)
+class BatchLoad:
+    """One resolved input row, sent to a worker process."""
+
+    row_id: str
+    charge_grains: float | None
+    components: ComponentKey | None
+    error: str | None = None
+
+
+# ============================================================================
+# Input
+# ============================================================================
+
+def read_rows(path: Path) -> list[dict]:
+    """Read input rows from a .csv, .json (array of objects) or .ndjson/.jsonl file."""
+    suffix = path.suffix.lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            return [{k.strip(): v for k, v in row.items() if k and v not in (None, "")} for row in csv.DictReader(f)]
+        if suffix == ".json":
+            rows = json.load(f)
+            if not isinstance(rows, list):
+                raise ValueError(f"{path}: expected a JSON array of load objects")
+            return rows
+        if suffix in (".ndjson", ".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+    raise ValueError(f"{path}: unsupported input format {suffix!r} (use .csv, .json or .ndjson)")
+
+
+def _as_uuid(value) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _number(column: str, value) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{column}: expected a number, got {value!r}") from None
+
+
+def _inline_fields(row: dict, component: str) -> dict:
+    """Collect <component>_<field> columns, rejecting unknown field names."""
+    prefix = f"{component}_"
+    fields = {}
+    for column, value in row.items():
+        if not column.startswith(prefix):
+            continue
+        name = column[len(prefix):]
+        if name not in COMPONENT_FIELDS[component]:
+            raise ValueError(f"Unknown column {column!r}")
+        fields[name] = _number(column, value)
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _fixture_index(component: str) -> dict[str, dict]:
+    """Seed fixture entries by lower-cased name."""
+    if component == "powder":
+        entries = json.loads((FIXTURES_DIR / "powders.json").read_text(encoding="utf-8"))
+    elif component == "cartridge":
+        entries = json.loads((FIXTURES_DIR / "cartridges.json").read_text(encoding="utf-8"))
+    elif component == "bullet":
+        entries = []
+        for manufacturer in BULLET_MANUFACTURERS:
+            path = FIXTURES_DIR / "bullets" / f"{manufacturer}.json"
+            if path.exists():
+                entries.extend(json.loads(path.read_text(encoding="utf-8")))
+    else:
+        entries = []
+    return {entry["name"].lower(): entry for entry in entries}
+
+
+async def _fetch_db_components(rows: list[dict]) -> dict[tuple[str, uuid.UUID], object]:
+    """Fetch every load, rifle, powder, bullet and cartridge referenced by UUID.
+
+    Saved loads and rifles are fetched first since they reference the others.
+    """
+    models = {"load": Load, "rifle": Rifle, "powder": Powder, "bullet": Bullet, "cartridge": Cartridge}
+    found: dict[tuple[str, uuid.UUID], object] = {}
+
+    def refs(kind: str) -> set[uuid.UUID]:
+        ids = {_as_uuid(row.get(kind)) for row in rows} - {None}
+        if kind in ("powder", "bullet", "rifle"):
+            ids |= {getattr(obj, f"{kind}_id") for (k, _), obj in found.items() if k == "load"}
+        if kind == "cartridge":
+            ids |= {obj.cartridge_id for (k, _), obj in found.items() if k == "rifle"}
+        return ids
+
+    try:
+        async with db_session.async_session_factory() as db:
+            for kind, model in models.items():
+                ids = refs(kind)
+                if ids:
+                    result = await db.execute(select(model).where(model.id.in_(ids)))
+                    for obj in result.scalars():
+                        found[(kind, obj.id)] = obj
+    finally:
+        await db_session.engine.dispose()
+    return found
+
+
+def _resolve_reference(component: str, ref, db_rows: dict) -> dict:
+    """Fields of a component referenced by UUID (database) or name (seed fixtures)."""
+    ref_id = _as_uuid(ref)
+    if ref_id is not None:
+        obj = db_rows.get((component, ref_id))
+        if obj is None:
+            raise ValueError(f"{component.capitalize()} {ref_id} not found")
+        return {name: getattr(obj, name) for name in COMPONENT_FIELDS[component]}
+    entry = _fixture_index(component).get(str(ref).strip().lower())
+    if entry is None:
+        raise ValueError(f"{component.capitalize()} {ref!r} not found in the seed fixtures")
+    return {name: entry.get(name) for name in COMPONENT_FIELDS[component] if name in entry}
+
+
+def resolve_row(row: dict, db_rows: dict) -> tuple[float, ComponentKey]:
+    """Resolve one input row to its charge (grains) and the fields of each component.
+
+    Raises:
+        ValueError: On unknown references or columns, or missing required fields.
+    """
+    refs = {component: row.get(component) for component in COMPONENTS}
+    charge = _number("charge_gr", row.get("charge_gr"))
+
+    if row.get("load") is not None:
+        load_id = _as_uuid(row["load"])
+        saved = db_rows.get(("load", load_id)) if load_id else None
+        if saved is None:
+            raise ValueError(f"Load {row['load']!r} not found")
+        refs["powder"] = refs["powder"] or str(saved.powder_id)
+        refs["bullet"] = refs["bullet"] or str(saved.bullet_id)
+        refs["rifle"] = refs["rifle"] or str(saved.rifle_id)
+        charge = saved.powder_charge_grains if charge is None else charge
+
+    if refs["rifle"] is not None and refs["cartridge"] is None:
+        rifle_id = _as_uuid(refs["rifle"])
+        if rifle_id is None:
+            raise ValueError("rifle: expected a database UUID (rifles are not in the seed fixtures)")
+        rifle = db_rows.get(("rifle", rifle_id))
+        if rifle is not None:
+            refs["cartridge"] = str(rifle.cartridge_id)
+
+    if charge is None or charge <= 0:
+        raise ValueError("charge_gr: a positive charge is required")
+
+    components = []
+    for component in COMPONENTS:
+        fields = _resolve_reference(component, refs[component], db_rows) if refs[component] is not None else {}
+        fields.update(_inline_fields(row, component))
+        missing = [n for n, default in COMPONENT_FIELDS[component].items() if default is _REQUIRED and fields.get(n) is None]
+        if missing:
+            raise ValueError(f"{component}: missing {', '.join(missing)}")
+        for name, default in COMPONENT_FIELDS[component].items():
+            if fields.get(name) is None:
+                fields[name] = default
+        components.append(tuple((name, fields[name]) for name in COMPONENT_FIELDS[component]))
+    return charge, tuple(components)
+
+
+def build_batch(rows: list[dict], db_rows: dict | None = None) -> list[BatchLoad]:
+    """Resolve every row; rows that fail carry their error instead of components."""
+    batch = []
+    for index, row in enumerate(rows, start=1):
+        row_id = str(row.get("id", index))
+        try:
+            charge, components = resolve_row(row, db_rows or {})
+            batch.append(BatchLoad(row_id=row_id, charge_grains=charge, components=components))
+        except ValueError as e:
+            try:
+                charge = _number("charge_gr", row.get("charge_gr"))
+            except ValueError:
+                charge = None
+            batch.append(BatchLoad(row_id=row_id, charge_grains=charge, components=None, error=str(e)))
+    return batch
+
+
+# ============================================================================
+# Worker
+# ============================================================================
+
+@lru_cache(maxsize=64)
+def _context(components: ComponentKey):
+    """Compiled context per component set, reused by every row that shares it."""
+    return compile_context(*(SimpleNamespace(**dict(fields)) for fields in components))
+
+
+def simulate_batch_load(task: BatchLoad) -> dict:
+    """Worker: simulate one row and return its output record."""
+    t_start = time.perf_counter()
+    record = dict.fromkeys(OUTPUT_FIELDS)
+    record.update(id=task.row_id, charge_gr=task.charge_grains, status="error", error=task.error)
+    if task.error is None:
+        try:
+            result = _context(task.components).run(task.charge_grains * GRAINS_TO_KG)
+            preflight = result.preflight
+            record.update(
+                status="ok",
+                peak_pressure_psi=round(float(result.peak_pressure_psi), 1),
+                muzzle_velocity_fps=round(float(result.muzzle_velocity_fps), 1),
+                barrel_time_ms=round(float(result.barrel_time_ms), 4),
+                is_safe=bool(result.is_safe),
+                preflight=preflight.verdict,
+                pressure_lower_bound_psi=round(preflight.pressure_lower_bound_psi, 1),
+                pressure_upper_bound_psi=(
+                    round(preflight.pressure_upper_bound_psi, 1)
+                    if preflight.pressure_upper_bound_psi is not None else None
+                ),
+                recoil_energy_ft_lbs=round(float(result.recoil_energy_ft_lbs), 2),
+                nfev=result.diagnostics.nfev,
+                solve_ms=round(result.diagnostics.total_ms, 2),
+                warnings=list(result.warnings),
+            )
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+    record["elapsed_ms"] = round((time.perf_counter() - t_start) * 1000.0, 2)
+    return record
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def write_records(records: Iterator[dict], out, fmt: str) -> tuple[int, int]:
+    """Write records as they arrive, flushing each one; returns (rows, errors)."""
+    rows = errors = 0
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+    for record in records:
+        rows += 1
+        errors += record["status"] == "error"
+        if writer is not None:
+            writer.writerow({**record, "warnings": " | ".join(record["warnings"] or [])})
+        else:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+    return rows, errors
+
+
+def _output_format(args: argparse.Namespace) -> str:
+    if args.format:
+        return args.format
+    if args.output is not None and args.output.suffix.lower() == ".csv":
+        return "csv"
+    return "ndjson"
+
+
+def register(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "simulate",
+        help="Simulate a CSV/JSON list of loads and stream the results (no API server)",
+    )
+    parser.add_argument("input", type=Path, help="Loads file (.csv, .json or .ndjson)")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: stdout)")
+    parser.add_argument(
+        "--format", choices=("csv", "ndjson"), default=None,
+        help="Results format (default: csv for a .csv output file, else ndjson)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes (default: SOLVER_WORKERS)")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    t_start = time.perf_counter()
+    rows = read_rows(args.input)
+    uses_db = any(_as_uuid(row.get(k)) for row in rows for k in ("load", *COMPONENTS))
+    db_rows = asyncio.run(_fetch_db_components(rows)) if uses_db else {}
+    batch = build_batch(rows, db_rows)
+
+    records = parallel_imap(simulate_batch_load, batch, max_workers=args.workers)
+    fmt = _output_format(args)
+    if args.output is None:
+        count, errors = write_records(records, sys.stdout, fmt)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            count, errors = write_records(records, out, fmt)
+
+    elapsed = time.perf_counter() - t_start
+    print(
+        f"Simulated {count} loads ({errors} errors) in {elapsed:.1f} s "
+        f"({elapsed * 1000.0 / max(count, 1):.1f} ms/load)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
@@ -4,6 +4,13 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://balistica:balistica_dev_2024@db:5432/balistica"
     environment: str = "development"
+    # Worker processes for parallel solver runs (0 = one per CPU core)
+    solver_workers: int = 0
+    # Simulate the validation corpus in the background at startup
+    validation_precompute: bool = False
+    # Seconds a catalog table version may be reused to answer If-None-Match without
+    # a database read (this process's own writes update it immediately)
+    catalog_version_max_age: float = 5.0
 
     model_config = {"env_file": ".env"}
 
@@ -0,0 +1,32 @@
+"""Helpers for physics kernels that accept Python scalars or NumPy arrays.
+
+Array contract of the physics modules (thermodynamics, internal_ballistics,
+heat_transfer, structural, harmonics): every function accepts Python scalars
+or NumPy arrays, broadcast element-wise, and returns a float for all-scalar
+inputs, an array otherwise.
+
+The kernels evaluate element-wise with np.where guards, so they apply to
+whole arrays (curve samples, ensemble members, sweeps) with NumPy
+broadcasting. scalar_or_array() keeps the scalar API: all-scalar inputs give
+a 0-d result, which is returned as a Python float.
+"""
+
+import numpy as np
+
+# Annotation for kernel arguments and results: a scalar or an array of samples
+FloatOrArray = float | np.ndarray
+
+
+def scalar_or_array(value):
+    """Return a float for a 0-d result and the array otherwise."""
+    value = np.asarray(value, dtype=float)
+    return float(value) if value.ndim == 0 else value
+
+
+def ignore_fp_errors():
+    """Context silencing floating-point warnings from discarded np.where branches.
+
+    Element-wise guards evaluate both branches; the rejected one may divide by
+    zero or overflow without affecting the result.
+    """
+    return np.errstate(divide="ignore", invalid="ignore", over="ignore")
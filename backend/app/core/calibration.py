@@ -0,0 +1,386 @@
+"""Calibration of solver inputs against measured velocities.
+
+calibrate_powder(): chronograph-driven fit of one powder's parameters.
+calibrate_model_constants(): offline fit of the global model constants
+(app.core.model_constants) against a reference-load corpus.
+
+calibrate_powder fits a subset of {burn_rate_coeff, force_j_kg, h_coeff} so that the solver
+reproduces measured muzzle velocities at several charge weights:
+
+  min_p  sum_i (v_pred(charge_i; p) - v_meas_i)^2    subject to  lo <= p <= hi
+
+Predictions use the caller's burn model. burn_rate_coeff only enters the z
+(Vieille) law; under the psi model the powder's Ba sets the burn rate, so
+burn_rate_coeff is not a fittable parameter there.
+
+Parameters are optimized in scaled form (p / p_start) so all unknowns are O(1)
+for the trust-region solver. Each Jacobian is a forward-difference over the
+solver: one run per (parameter, charge) pair, all dispatched together through
+the shared process pool.
+
+Confidence intervals come from the linearized covariance at the optimum:
+  cov = s^2 * (J^T J)^-1,  s^2 = SSR / (N - p)
+and a Student-t quantile with N - p degrees of freedom.
+
+calibrate_model_constants minimizes the mean absolute velocity error (%) over
+the corpus with bounded Nelder-Mead: the objective is not differentiable, and
+each evaluation runs the whole corpus through the process pool in one batch.
+"""
+
+import logging
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable
+
+import numpy as np
+from scipy import stats
+from scipy.optimize import least_squares, minimize
+
+from app.core.kernels import BURN_MODEL_PSI, BURN_MODEL_Z, BURN_MODELS
+from app.core.model_constants import CONSTANT_BOUNDS, ModelConstants
+from app.core.parallel import parallel_map
+from app.core.solver import (
+    H_COEFF_DEFAULT,
+    BulletParams,
+    CartridgeParams,
+    LoadParams,
+    PowderParams,
+    RifleParams,
+    simulate,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parameters that can be fitted, in canonical order
+CALIBRATION_PARAMETERS = ("burn_rate_coeff", "force_j_kg", "h_coeff")
+
+# Bounds as multiples of the starting value
+PARAMETER_BOUNDS = {
+    "burn_rate_coeff": (0.2, 5.0),
+    "force_j_kg": (0.8, 1.25),
+    "h_coeff": (0.0, 5.0),
+}
+
+FD_REL_STEP = 1e-3  # forward-difference step on the scaled parameters
+MAX_SOLVER_ITERATIONS = 20
+
+# Global model constants that calibrate_model_constants can fit, in canonical order
+MODEL_CONSTANT_NAMES = tuple(CONSTANT_BOUNDS)
+CONSTANTS_SIMPLEX_STEP = 0.1   # initial simplex edge, as a fraction of each bound range
+CONSTANTS_XATOL = 1e-3         # convergence tolerance on the normalized constants
+CONSTANTS_FATOL = 1e-3         # convergence tolerance on the mean error (%)
+
+
+@dataclass
+class CalibrationResult:
+    parameters: dict[str, float]
+    initial_parameters: dict[str, float]
+    std_errors: dict[str, float | None]
+    confidence_intervals: dict[str, tuple[float, float] | None]
+    predicted_velocities_fps: list[float]
+    residuals_fps: list[float]  # predicted - measured
+    rms_residual_fps: float
+    degrees_of_freedom: int
+    confidence_level: float
+    converged: bool
+    message: str
+    solver_runs: int
+    warnings: list[str] = field(default_factory=list)
+
+
+def _predict_velocity(task: tuple) -> float:
+    """Worker: run one simulation and return the muzzle velocity (fps)."""
+    powder, bullet, cartridge, rifle, charge_kg, h_coeff, burn_model = task
+    result = simulate(
+        powder, bullet, cartridge, rifle, LoadParams(charge_mass_kg=charge_kg),
+        h_coeff=h_coeff, burn_model=burn_model,
+    )
+    return result.muzzle_velocity_fps
+
+
+def calibrate_powder(
+    powder: PowderParams,
+    bullet: BulletParams,
+    cartridge: CartridgeParams,
+    rifle: RifleParams,
+    charges_kg: list[float],
+    measured_velocities_fps: list[float],
+    fit_parameters: tuple[str, ...] = CALIBRATION_PARAMETERS,
+    h_coeff: float = H_COEFF_DEFAULT,
+    confidence_level: float = 0.95,
+    max_workers: int | None = None,
+    burn_model: str = BURN_MODEL_Z,
+) -> CalibrationResult:
+    """Fit powder parameters to chronograph velocities with bounded least squares.
+
+    Args:
+        powder, bullet, cartridge, rifle: Starting simulation parameters.
+        charges_kg: Charge mass for each measured point (kg).
+        measured_velocities_fps: Measured mean muzzle velocity for each charge (fps).
+        fit_parameters: Names from CALIBRATION_PARAMETERS to fit; others stay fixed.
+        h_coeff: Starting (or fixed) heat transfer coefficient (W/m^2/K).
+        confidence_level: Two-sided confidence level for the parameter intervals.
+        max_workers: Override for the process pool size.
+        burn_model: Burn law the predictions use (BURN_MODEL_Z or BURN_MODEL_PSI).
+            burn_rate_coeff has no effect under BURN_MODEL_PSI and cannot be fitted.
+
+    Returns:
+        CalibrationResult with fitted values, residuals and confidence intervals.
+
+    Raises:
+        ValueError: On unknown parameter names or burn model, a parameter the
+            burn model ignores, or mismatched/insufficient data.
+    """
+    names = [p for p in CALIBRATION_PARAMETERS if p in fit_parameters]
+    unknown = set(fit_parameters) - set(CALIBRATION_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown calibration parameters: {sorted(unknown)}")
+    if burn_model not in BURN_MODELS:
+        raise ValueError(f"Unknown burn model: {burn_model!r}")
+    if burn_model == BURN_MODEL_PSI and "burn_rate_coeff" in names:
+        raise ValueError("burn_rate_coeff cannot be fitted under the psi burn model (Ba sets the burn rate)")
+    if not names:
+        raise ValueError("At least one parameter must be fitted")
+    if len(charges_kg) != len(measured_velocities_fps):
+        raise ValueError("charges and velocities must have the same length")
+    if len(charges_kg) < len(names):
+        raise ValueError(
+            f"Need at least {len(names)} measured charges to fit {len(names)} parameters"
+        )
+
+    start = {
+        "burn_rate_coeff": powder.burn_rate_coeff,
+        "force_j_kg": powder.force_j_kg,
+        "h_coeff": h_coeff,
+    }
+    # h_coeff may legitimately start at 0 (adiabatic); scale from the default instead
+    scale = np.array([start[n] if start[n] > 0 else H_COEFF_DEFAULT for n in names])
+    x0 = np.array([start[n] for n in names]) / scale
+    lower = np.array([PARAMETER_BOUNDS[n][0] * scale[i] for i, n in enumerate(names)]) / scale
+    upper = np.array([PARAMETER_BOUNDS[n][1] * scale[i] for i, n in enumerate(names)]) / scale
+    x0 = np.clip(x0, lower, upper)
+
+    measured = np.asarray(measured_velocities_fps, dtype=float)
+    solver_runs = 0
+
+    def _params_at(x: np.ndarray) -> tuple[PowderParams, float]:
+        values = dict(start)
+        values.update({n: float(x[i] * scale[i]) for i, n in enumerate(names)})
+        p = replace(powder, burn_rate_coeff=values["burn_rate_coeff"], force_j_kg=values["force_j_kg"])
+        return p, values["h_coeff"]
+
+    def _tasks(x: np.ndarray) -> list[tuple]:
+        p, h = _params_at(x)
+        return [(p, bullet, cartridge, rifle, c, h, burn_model) for c in charges_kg]
+
+    cache: dict[bytes, np.ndarray] = {}
+
+    def residuals(x: np.ndarray) -> np.ndarray:
+        nonlocal solver_runs
+        key = x.tobytes()
+        if key not in cache:
+            solver_runs += len(charges_kg)
+            cache[key] = np.asarray(parallel_map(_predict_velocity, _tasks(x), max_workers)) - measured
+        return cache[key]
+
+    def jacobian(x: np.ndarray) -> np.ndarray:
+        nonlocal solver_runs
+        f0 = residuals(x)
+        steps = []
+        tasks = []
+        for j in range(len(names)):
+            h = FD_REL_STEP * max(abs(x[j]), 1.0)
+            if x[j] + h > upper[j]:
+                h = -h  # step backwards when pinned at the upper bound
+            xp = x.copy()
+            xp[j] += h
+            steps.append(h)
+            tasks.extend(_tasks(xp))
+        solver_runs += len(tasks)
+        # One batch for all columns so the pool stays saturated
+        f_pert = np.asarray(parallel_map(_predict_velocity, tasks, max_workers)) - measured
+        f_pert = f_pert.reshape(len(names), len(charges_kg))
+        return ((f_pert - f0) / np.asarray(steps)[:, None]).T
+
+    sol = least_squares(
+        residuals,
+        x0,
+        jac=jacobian,
+        bounds=(lower, upper),
+        method="trf",
+        x_scale=1.0,
+        max_nfev=MAX_SOLVER_ITERATIONS,
+    )
+
+    fitted = {n: float(sol.x[i] * scale[i]) for i, n in enumerate(names)}
+    r = residuals(sol.x)
+    n_points = len(charges_kg)
+    dof = n_points - len(names)
+    rms = float(np.sqrt(np.mean(r ** 2)))
+
+    std_errors: dict[str, float | None] = {n: None for n in names}
+    intervals: dict[str, tuple[float, float] | None] = {n: None for n in names}
+    warnings: list[str] = []
+    if dof > 0:
+        J = sol.jac
+        s2 = float(np.sum(r ** 2)) / dof
+        cov = s2 * np.linalg.pinv(J.T @ J)
+        t_q = float(stats.t.ppf(0.5 + confidence_level / 2.0, dof))
+        for i, n in enumerate(names):
+            se = float(np.sqrt(max(cov[i, i], 0.0)) * scale[i])
+            std_errors[n] = se
+            intervals[n] = (fitted[n] - t_q * se, fitted[n] + t_q * se)
+    else:
+        warnings.append(
+            "Sin grados de libertad: se necesitan mas cargas medidas que parametros "
+            "para estimar intervalos de confianza."
+        )
+
+    for i, n in enumerate(names):
+        if np.isclose(sol.x[i], lower[i]) or np.isclose(sol.x[i], upper[i]):
+            warnings.append(f"{n} quedo en el limite del rango permitido; revise los datos medidos.")
+
+    logger.info(
+        "Calibration fit %s: rms=%.1f fps, %d solver runs, status=%d",
+        names, rms, solver_runs, sol.status,
+    )
+
+    return CalibrationResult(
+        parameters=fitted,
+        initial_parameters={n: start[n] for n in names},
+        std_errors=std_errors,
+        confidence_intervals=intervals,
+        predicted_velocities_fps=[float(v) for v in r + measured],
+        residuals_fps=[float(v) for v in r],
+        rms_residual_fps=rms,
+        degrees_of_freedom=dof,
+        confidence_level=confidence_level,
+        converged=bool(sol.status > 0),
+        message=str(sol.message),
+        solver_runs=solver_runs,
+        warnings=warnings,
+    )
+
+
+@dataclass
+class ConstantsCalibrationResult:
+    constants: ModelConstants
+    initial_constants: ModelConstants
+    fitted: list[str]
+    mean_error_pct_before: float
+    mean_error_pct_after: float
+    max_error_pct_after: float
+    load_errors_pct: dict[str, float]  # signed (predicted - published) / published, per load id
+    evaluations: int
+    solver_runs: int
+    converged: bool
+    message: str
+
+
+def calibrate_model_constants(
+    loads: list[dict],
+    predict_velocity: Callable[[tuple[dict, ModelConstants]], float],
+    fit_constants: tuple[str, ...] = MODEL_CONSTANT_NAMES,
+    start: ModelConstants | None = None,
+    max_evaluations: int = 200,
+    max_workers: int | None = None,
+) -> ConstantsCalibrationResult:
+    """Fit the global model constants to a reference-load corpus.
+
+    Args:
+        loads: Reference loads; each needs "id" and "published_velocity_fps".
+        predict_velocity: Picklable worker mapping (load, constants) to the
+            predicted muzzle velocity (fps).
+        fit_constants: Names from MODEL_CONSTANT_NAMES to fit; others stay at start.
+        start: Starting constants (default: built-in defaults).
+        max_evaluations: Cap on corpus evaluations (each is len(loads) solver runs).
+        max_workers: Override for the process pool size.
+
+    Returns:
+        ConstantsCalibrationResult with the fitted constants and corpus errors.
+
+    Raises:
+        ValueError: On unknown constant names or an empty corpus.
+    """
+    names = [n for n in MODEL_CONSTANT_NAMES if n in fit_constants]
+    unknown = set(fit_constants) - set(MODEL_CONSTANT_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown model constants: {sorted(unknown)}")
+    if not names:
+        raise ValueError("At least one constant must be fitted")
+    if not loads:
+        raise ValueError("The reference corpus is empty")
+
+    start = start or ModelConstants()
+    start_values = asdict(start)
+    # Optimize on [0, 1]-normalized constants so the simplex is well shaped
+    lower = np.array([CONSTANT_BOUNDS[n][0] for n in names])
+    width = np.array([CONSTANT_BOUNDS[n][1] - CONSTANT_BOUNDS[n][0] for n in names])
+    x0 = np.clip((np.array([start_values[n] for n in names]) - lower) / width, 0.0, 1.0)
+
+    published = np.array([float(load["published_velocity_fps"]) for load in loads])
+    solver_runs = 0
+
+    def _constants_at(x: np.ndarray) -> ModelConstants:
+        values = dict(start_values)
+        values.update({n: float(lower[i] + x[i] * width[i]) for i, n in enumerate(names)})
+        return ModelConstants(**values)
+
+    cache: dict[bytes, np.ndarray] = {}
+
+    def signed_errors(x: np.ndarray) -> np.ndarray:
+        nonlocal solver_runs
+        key = x.tobytes()
+        if key not in cache:
+            constants = _constants_at(x)
+            solver_runs += len(loads)
+            predicted = parallel_map(predict_velocity, [(load, constants) for load in loads], max_workers)
+            cache[key] = (np.asarray(predicted, dtype=float) - published) / published * 100.0
+        return cache[key]
+
+    def objective(x: np.ndarray) -> float:
+        return float(np.mean(np.abs(signed_errors(x))))
+
+    # Initial simplex steps inward from whichever bound x0 is closer to
+    simplex = [x0]
+    for j in range(len(names)):
+        xj = x0.copy()
+        xj[j] += CONSTANTS_SIMPLEX_STEP if x0[j] <= 0.5 else -CONSTANTS_SIMPLEX_STEP
+        simplex.append(xj)
+
+    before = objective(x0)
+    sol = minimize(
+        objective,
+        x0,
+        method="Nelder-Mead",
+        bounds=[(0.0, 1.0)] * len(names),
+        options={
+            "initial_simplex": np.array(simplex),
+            "maxfev": max_evaluations,
+            "xatol": CONSTANTS_XATOL,
+            "fatol": CONSTANTS_FATOL,
+        },
+    )
+
+    # Never report a result worse than where we started
+    best_x = sol.x if sol.fun <= before else x0
+    errors = signed_errors(best_x)
+    constants = _constants_at(best_x)
+
+    logger.info(
+        "Model constant calibration %s: mean error %.2f%% -> %.2f%%, %d evaluations, %d solver runs",
+        names, before, float(np.mean(np.abs(errors))), sol.nfev, solver_runs,
+    )
+
+    return ConstantsCalibrationResult(
+        constants=constants,
+        initial_constants=start,
+        fitted=names,
+        mean_error_pct_before=before,
+        mean_error_pct_after=float(np.mean(np.abs(errors))),
+        max_error_pct_after=float(np.max(np.abs(errors))),
+        load_errors_pct={str(load["id"]): float(e) for load, e in zip(loads, errors)},
+        evaluations=int(sol.nfev),
+        solver_runs=solver_runs,
+        converged=bool(sol.success),
+        message=str(sol.message),
+    )
@@ -0,0 +1,233 @@
+"""Streaming parser for chronograph exports (Labradar, MagnetoSpeed, plain CSV).
+
+Files are read one line at a time and never held in memory: each line is
+classified on its own (device preamble, column header, shot row, or noise),
+so concatenated reports and season-long exports with many strings are split
+into one series per string. Statistics are accumulated per series in a
+single pass (RunningStats, Welford's algorithm); individual velocities are
+kept only when the caller asks for them.
+
+Recognised layouts:
+- Labradar reports: optional "sep=;" line, a preamble with "Device ID",
+  "Series No" and "Units velocity" rows, summary "Stats - ..." rows, then a
+  "Shot ID;V0;V1;..." header. Each "Series No" row starts a series; the
+  muzzle velocity (V0) column is read. Semicolon files may use decimal commas.
+- MagnetoSpeed exports: "Series,N" rows start a series, summary rows
+  (Min/Max/Avg/ES/SD), then a "Shot,Speed,..." header.
+- Any CSV with a velocity-like header (velocity, speed, v0, v1, fps, ...),
+  optionally with a unit such as "Velocity (m/s)". A header repeated after
+  shot rows starts a new series.
+- A single column of numbers; values outside 100-5000 fps are ignored.
+
+All velocities are returned in fps; m/s series are converted.
+"""
+
+import csv
+import math
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+MPS_TO_FPS = 3.28084
+
+# Velocity column names, most preferred first (Labradar V0 is the muzzle velocity)
+_VELOCITY_COLUMNS = ("velocity", "v0", "speed", "v1", "vel", "fps")
+# Names of a leading shot-number column; rows under such a header must start with an integer
+_INDEX_COLUMNS = {"shot", "shot id", "shot #", "shot no", "#", "no", "no.", "n"}
+_UNITS = {"fps": 1.0, "ft/s": 1.0, "m/s": MPS_TO_FPS, "mps": MPS_TO_FPS}
+# "Velocity (m/s)" -> ("velocity", "m/s")
+_HEADER_CELL = re.compile(r"^(?P<name>[^()\[\]]+?)\s*(?:[(\[](?P<unit>[^)\]]+)[)\]])?$")
+# Headerless single-column values accepted as velocities (fps)
+_PLAIN_RANGE = (100.0, 5000.0)
+
+
+@dataclass
+class RunningStats:
+    """Count, mean, sample variance and extremes of a stream, in O(1) memory."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold in the statistics of another stream (Chan et al. pairwise update)."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def sd(self) -> float:
+        """Sample standard deviation (0 below two values)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def es(self) -> float:
+        """Extreme spread (0 without values)."""
+        return self.max - self.min if self.count else 0.0
+
+
+@dataclass
+class ChronoSeries:
+    """One string of shots."""
+
+    name: str
+    device: str | None = None  # "labradar", "magnetospeed", or None for plain CSV
+    stats: RunningStats = field(default_factory=RunningStats)
+    velocities: list[float] | None = None  # fps, only when requested
+
+
+class _SeriesReader:
+    """Line-by-line state machine over one file."""
+
+    def __init__(self, name: str, keep_velocities: bool):
+        self.name = name
+        self.keep_velocities = keep_velocities
+        self.series: list[ChronoSeries] = []
+        self.delimiter: str | None = None  # from a "sep=" line, else guessed per line
+        self.device: str | None = None
+        self.scale = 1.0  # unit conversion to fps of the current series
+        self.column: int | None = None  # velocity column of the current header
+        self.indexed = False
+        self._decimal_comma = False  # the current line is ';'-separated
+        self._start(None)
+
+    def _start(self, label: str | None) -> None:
+        """Begin a series; an empty current one is reused (and renamed)."""
+        current = self.series[-1] if self.series else None
+        if current is None or current.stats.count:
+            current = ChronoSeries(name="", velocities=[] if self.keep_velocities else None)
+            self.series.append(current)
+            self.column = None
+            self.indexed = False
+        current.name = label or self.name
+        current.device = self.device
+
+    def _split(self, line: str) -> list[str]:
+        delimiter = self.delimiter or (";" if ";" in line else "\t" if "\t" in line else ",")
+        self._decimal_comma = delimiter == ";"
+        cells = next(csv.reader([line], delimiter=delimiter), [])
+        return [cell.strip() for cell in cells]
+
+    def _number(self, cell: str) -> float | None:
+        if self._decimal_comma:
+            cell = cell.replace(",", ".")
+        try:
+            value = float(cell)
+        except ValueError:
+            return None
+        return value if math.isfinite(value) else None
+
+    def _header(self, cells: list[str]) -> bool:
+        """Take a velocity column header; True when the row is one."""
+        found: tuple[int, int, str | None] | None = None  # (preference, column, unit)
+        for i, cell in enumerate(cells):
+            match = _HEADER_CELL.match(cell.lower())
+            if match is None:
+                continue
+            name = match["name"].strip()
+            if name in _VELOCITY_COLUMNS:
+                rank = _VELOCITY_COLUMNS.index(name)
+                if found is None or rank < found[0]:
+                    unit = match["unit"] or ("fps" if name == "fps" else None)
+                    found = (rank, i, unit)
+        if found is None:
+            return False
+        if self.series[-1].stats.count:
+            self._start(None)  # a header after shots: concatenated export
+        self.column = found[1]
+        self.indexed = cells[0].lower() in _INDEX_COLUMNS and found[1] != 0
+        if found[2] is not None and found[2].strip() in _UNITS:
+            self.scale = _UNITS[found[2].strip()]
+        return True
+
+    def _preamble(self, key: str, cells: list[str]) -> bool:
+        """Handle device preamble rows; True when the row is one."""
+        value = cells[1] if len(cells) > 1 else ""
+        if key == "device id":
+            if value.upper().startswith("LBR"):
+                self.device = "labradar"
+            return True
+        if key in ("series no", "series no.", "series number"):
+            self.device = self.device or "labradar"
+            self._start(f"{self.name} - Series {value}" if value else None)
+            return True
+        if key == "series" and value:
+            self.device = "magnetospeed"
+            self._start(f"{self.name} - Series {value}")
+            return True
+        if "unit" in key and not any(word in key for word in ("distance", "energy", "weight")):
+            unit = value.lower()
+            if unit in _UNITS:
+                self.scale = _UNITS[unit]
+            return True
+        return False
+
+    def _add(self, velocity: float) -> None:
+        current = self.series[-1]
+        current.stats.add(velocity)
+        if current.velocities is not None:
+            current.velocities.append(velocity)
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if not line or line.startswith(("#", "//")) or set(line) <= {"-", "=", ",", ";"}:
+            return
+        if line.lower().startswith("sep=") and len(line) == 5:
+            self.delimiter = line[4]
+            return
+        cells = self._split(line)
+        if not cells:
+            return
+        key = cells[0].lower().rstrip(":")
+        if self._preamble(key, cells) or self._header(cells):
+            return
+
+        if self.column is None:
+            value = self._number(cells[0])
+            if value is not None and _PLAIN_RANGE[0] < value < _PLAIN_RANGE[1]:
+                self._add(value)
+            return
+        if self.column >= len(cells):
+            return
+        if self.indexed and not cells[0].isdigit():
+            return  # summary rows (Avg, SD, Stats - ...) laid out like shots
+        value = self._number(cells[self.column])
+        if value is not None:
+            self._add(round(value * self.scale, 2) if self.scale != 1.0 else value)
+
+    def finish(self) -> list[ChronoSeries]:
+        return [s for s in self.series if s.stats.count]
+
+
+def parse_chrono_lines(lines: Iterable[str], name: str, keep_velocities: bool = True) -> list[ChronoSeries]:
+    """Split a chronograph export into series of shots.
+
+    Args:
+        lines: The file's text lines, consumed lazily (a text file object works).
+        name: Label of the file; series are named after it.
+        keep_velocities: Also collect each series' velocities (memory grows
+            with the shot count); statistics alone use constant memory.
+
+    Returns:
+        The series that contain at least one shot, in file order.
+    """
+    reader = _SeriesReader(name, keep_velocities)
+    for line in lines:
+        reader.feed(line)
+    return reader.finish()
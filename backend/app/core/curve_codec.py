@@ -0,0 +1,111 @@
+"""Compact binary encoding of stored simulation curves.
+
+A curve (e.g. [{"t_ms": ..., "p_psi": ...}, ...]) is stored column by column
+as float32, byte-shuffled (all first bytes, then all second bytes, ...) and
+zlib-compressed, behind a small JSON header naming the columns, their units
+and the point count:
+
+    b"CRV1" | header length (uint16 LE) | header JSON | zlib(shuffled float32 columns)
+
+float32 keeps ~7 significant digits, well beyond what the solver's curves
+resolve or what the CSV export prints. A stored curve is about a tenth of
+its JSON form.
+
+PackedCurve wraps a blob read from the database and decodes it only when
+its points are first accessed; its header (names, units, length) is
+readable without decompressing anything.
+"""
+
+import json
+import struct
+import zlib
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+MAGIC = b"CRV1"
+_PREFIX = struct.Struct("<4sH")
+_DTYPE = np.dtype("<f4")
+_LEVEL = 6
+
+
+def encode_curve(points: Sequence[dict], units: dict[str, str]) -> bytes:
+    """Pack a list of points into a curve blob.
+
+    Args:
+        points: Curve samples, each holding every key of units.
+        units: Column name -> unit, in storage order.
+    """
+    names = list(units)
+    columns = np.array([[point[name] for point in points] for name in names], dtype=_DTYPE)
+    header = json.dumps(
+        {"names": names, "units": [units[n] for n in names], "length": len(points)}, separators=(",", ":"),
+    ).encode()
+    shuffled = columns.reshape(-1).view(np.uint8).reshape(-1, _DTYPE.itemsize).T.tobytes()
+    return _PREFIX.pack(MAGIC, len(header)) + header + zlib.compress(shuffled, _LEVEL)
+
+
+def _read_header(blob: bytes) -> tuple[dict, int]:
+    magic, size = _PREFIX.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a curve blob")
+    start = _PREFIX.size
+    return json.loads(blob[start:start + size]), start + size
+
+
+class PackedCurve(Sequence):
+    """A stored curve, decoded on first access to its points.
+
+    Behaves as the read-only list of point dicts it was encoded from; columns
+    gives the samples as float32 arrays keyed by name.
+    """
+
+    __slots__ = ("blob", "_header", "_payload_start", "_columns")
+
+    def __init__(self, blob: bytes):
+        self.blob = blob
+        self._header, self._payload_start = _read_header(blob)
+        self._columns: dict[str, np.ndarray] | None = None
+
+    @property
+    def names(self) -> list[str]:
+        return self._header["names"]
+
+    @property
+    def units(self) -> dict[str, str]:
+        return dict(zip(self._header["names"], self._header["units"]))
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        if self._columns is None:
+            shape = (len(self.names), len(self))
+            raw = np.frombuffer(zlib.decompress(self.blob[self._payload_start:]), dtype=np.uint8)
+            values = raw.reshape(_DTYPE.itemsize, shape[0] * shape[1]).T.copy().view(_DTYPE).reshape(shape)
+            self._columns = dict(zip(self.names, values))
+        return self._columns
+
+    def __len__(self) -> int:
+        return self._header["length"]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        return {name: float(str(column[index])) for name, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_list())
+
+    def to_list(self) -> list[dict]:
+        """The points as dicts of Python floats (shortest repr of each float32)."""
+        columns = [[float(str(v)) for v in column] for column in self.columns.values()]
+        return [dict(zip(self.names, values)) for values in zip(*columns)]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedCurve):
+            return self.blob == other.blob
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PackedCurve({', '.join(self.names)}; {len(self)} points)"
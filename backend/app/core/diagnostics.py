@@ -0,0 +1,138 @@
+"""Per-simulation timing and solver statistics, aggregated per endpoint.
+
+simulate() fills a SimDiagnostics for every run. API handlers pass the
+diagnostics of each request to record_simulations(), which logs one summary
+line per request, keeps cumulative per-endpoint totals (endpoint_stats()) and
+feeds the solver histograms exposed at /api/v1/metrics.
+Runs slower than SLOW_SIMULATION_MS are logged with their inputs so they can
+be reproduced offline.
+"""
+
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+
+from app.core.metrics import SIMULATION_SECONDS, SIMULATIONS_PER_REQUEST, SOLVER_NFEV, SOLVER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SLOW_SIMULATION_MS = 2000.0
+
+# RK45 evaluates the RHS twice before the first step (initial value and
+# initial step selection) and six times per step attempt (FSAL).
+RK45_STARTUP_EVALS = 2
+RK45_EVALS_PER_ATTEMPT = 6
+
+
+@dataclass
+class SimDiagnostics:
+    """Wall time per phase (ms) and solver work of one simulation."""
+
+    setup_ms: float = 0.0         # charge-density checks and ODE system build
+    integration_ms: float = 0.0   # solve_ivp, including event checks
+    event_ms: float = 0.0         # locating the exit/burnout crossings (dense output + root solve)
+    postprocess_ms: float = 0.0   # 200-point curve reconstruction
+    structural_ms: float = 0.0    # structural, erosion, harmonics and recoil
+    total_ms: float = 0.0
+    nfev: int = 0
+    steps: int = 0                # accepted steps
+    rejected_steps: int = 0
+    event_calls: int = 0
+    tail_steps: int = 0           # accepted steps on the post-burnout system
+    burnout_ms: float | None = None  # time of burnout (Z = 1); None if the bullet exits first
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def rk45_rejected_steps(nfev: int, accepted_steps: int) -> int:
+    """Rejected RK45 step attempts implied by the RHS evaluation count."""
+    attempts = max(nfev - RK45_STARTUP_EVALS, 0) // RK45_EVALS_PER_ATTEMPT
+    return max(attempts - accepted_steps, 0)
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    simulations: int = 0
+    total_ms: float = 0.0
+    integration_ms: float = 0.0
+    postprocess_ms: float = 0.0
+    nfev: int = 0
+    steps: int = 0
+    rejected_steps: int = 0
+    max_simulation_ms: float = 0.0
+    slow_simulations: int = 0
+    phase_ms: dict[str, float] = field(default_factory=dict)
+
+
+_stats: dict[str, EndpointStats] = {}
+_lock = threading.Lock()
+
+
+def log_slow_simulation(diag: SimDiagnostics, inputs: dict) -> None:
+    """Log a slow run with everything needed to reproduce it."""
+    logger.warning(
+        "Slow simulation: %.0f ms (integration %.0f ms, nfev=%d, steps=%d, rejected=%d); inputs=%s",
+        diag.total_ms, diag.integration_ms, diag.nfev, diag.steps, diag.rejected_steps, inputs,
+    )
+
+
+def record_simulations(endpoint: str, diagnostics: list[SimDiagnostics], extra_ms: dict[str, float] | None = None) -> None:
+    """Aggregate one request's simulations into the per-endpoint totals and log a summary.
+
+    Args:
+        endpoint: Endpoint label (e.g. "ladder").
+        diagnostics: Diagnostics of every simulation run by the request.
+        extra_ms: Request-level phases outside simulate() (e.g. {"serialization": 3.2}).
+    """
+    diagnostics = [d for d in diagnostics if d is not None]
+    total = sum(d.total_ms for d in diagnostics)
+    integration = sum(d.integration_ms for d in diagnostics)
+    postprocess = sum(d.postprocess_ms for d in diagnostics)
+    nfev = sum(d.nfev for d in diagnostics)
+    steps = sum(d.steps for d in diagnostics)
+    rejected = sum(d.rejected_steps for d in diagnostics)
+    slowest = max((d.total_ms for d in diagnostics), default=0.0)
+    slow = sum(1 for d in diagnostics if d.total_ms > SLOW_SIMULATION_MS)
+
+    SIMULATIONS_PER_REQUEST.observe(len(diagnostics), endpoint=endpoint)
+    for d in diagnostics:
+        SOLVER_NFEV.observe(d.nfev, endpoint=endpoint)
+        SOLVER_SECONDS.observe(d.integration_ms / 1000.0, endpoint=endpoint)
+        SIMULATION_SECONDS.observe(d.total_ms / 1000.0, endpoint=endpoint)
+
+    with _lock:
+        s = _stats.setdefault(endpoint, EndpointStats())
+        s.requests += 1
+        s.simulations += len(diagnostics)
+        s.total_ms += total
+        s.integration_ms += integration
+        s.postprocess_ms += postprocess
+        s.nfev += nfev
+        s.steps += steps
+        s.rejected_steps += rejected
+        s.max_simulation_ms = max(s.max_simulation_ms, slowest)
+        s.slow_simulations += slow
+        for phase, ms in (extra_ms or {}).items():
+            s.phase_ms[phase] = s.phase_ms.get(phase, 0.0) + ms
+        cumulative = (s.requests, s.simulations, s.total_ms / s.simulations if s.simulations else 0.0)
+
+    extra = "".join(f", {phase} {ms:.1f} ms" for phase, ms in (extra_ms or {}).items())
+    logger.info(
+        "%s: %d simulations in %.0f ms (integration %.0f ms, post-processing %.0f ms%s), "
+        "nfev=%d, steps=%d, rejected=%d, slowest %.0f ms | cumulative %d requests, %d simulations, %.0f ms/simulation",
+        endpoint, len(diagnostics), total, integration, postprocess, extra,
+        nfev, steps, rejected, slowest, *cumulative,
+    )
+
+
+def endpoint_stats() -> dict[str, EndpointStats]:
+    """Snapshot of the cumulative per-endpoint totals."""
+    with _lock:
+        return {k: EndpointStats(**asdict(v)) for k, v in _stats.items()}
+
+
+def reset_endpoint_stats() -> None:
+    with _lock:
+        _stats.clear()
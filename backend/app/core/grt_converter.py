@@ -24,6 +24,8 @@ Burn rate conversion (GRT vivacity -> Vieille):
   and published Vieille coefficients.
 """
 
+from app.core.grt_parser import parse_propellant_file
+
 R_UNIVERSAL = 8.314      # J/(mol*K)
 M_GAS_DEFAULT = 0.026    # kg/mol, typical for NC-based propellant gases
 
@@ -127,3 +129,24 @@ def convert_grt_to_powder(grt_params: dict) -> dict:
 def _build_grt_storage(grt_params: dict) -> dict:
     """Build a clean dict of GRT params for JSON storage, excluding internal keys."""
     return {k: v for k, v in grt_params.items() if not k.startswith("_")}
+
+
+def convert_propellant_member(member: tuple[str, bytes]) -> tuple[dict | None, str | None]:
+    """Parse and convert one .propellant file; picklable for the process pool.
+
+    Args:
+        member: (file name, raw XML content).
+
+    Returns:
+        (powder data, None) on success, (None, error message) otherwise.
+    """
+    filename, content = member
+    try:
+        grt_params = parse_propellant_file(content)
+    except ValueError as e:  # includes undecodable content
+        return None, f"{filename}: {e}"
+    grt_params["_source_file"] = filename
+    try:
+        return convert_grt_to_powder(grt_params), None
+    except (KeyError, ValueError, TypeError) as e:
+        return None, f"{grt_params.get('pname', '?')}: conversion error - {e}"
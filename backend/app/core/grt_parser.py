@@ -68,6 +68,18 @@ def parse_propellant_file(xml_content: str | bytes) -> dict:
     return params
 
 
+def propellant_member_names(zf: zipfile.ZipFile) -> list[str]:
+    """Sorted names of the .propellant files in an archive (read from its directory only).
+
+    Raises:
+        ValueError: If the archive contains no .propellant files.
+    """
+    names = sorted(n for n in zf.namelist() if n.lower().endswith(".propellant"))
+    if not names:
+        raise ValueError("ZIP archive contains no .propellant files")
+    return names
+
+
 def parse_propellant_zip(zip_bytes: bytes) -> list[dict]:
     """Parse a ZIP archive containing multiple .propellant files.
 
@@ -88,11 +100,7 @@ def parse_propellant_zip(zip_bytes: bytes) -> list[dict]:
     results = []
     errors = []
 
-    propellant_files = [n for n in zf.namelist() if n.lower().endswith(".propellant")]
-    if not propellant_files:
-        raise ValueError("ZIP archive contains no .propellant files")
-
-    for filename in sorted(propellant_files):
+    for filename in propellant_member_names(zf):
         try:
             content = zf.read(filename)
             params = parse_propellant_file(content)
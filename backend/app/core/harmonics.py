@@ -1,25 +1,33 @@
-"""Barrel harmonics: Euler-Bernoulli cantilever vibration modes, OCW barrel times."""
+"""Barrel harmonics: Euler-Bernoulli cantilever vibration modes, OCW barrel times.
+
+Mode lists are exempt from the array contract (app.core.arrays):
+muzzle_deflection() takes per-mode sequences, and ocw_barrel_times() returns
+a list for a scalar frequency.
+"""
 
 import numpy as np
 
+from app.core.arrays import FloatOrArray, scalar_or_array
+
 CANTILEVER_EIGENVALUES = [1.8751, 4.6941, 7.8548, 10.996]
 
 
-def _eigenvalue(mode: int) -> float:
+def _eigenvalue(mode: int | np.ndarray) -> FloatOrArray:
     """Get eigenvalue lambda_n for cantilever beam mode n (1-indexed)."""
-    if mode <= len(CANTILEVER_EIGENVALUES):
-        return CANTILEVER_EIGENVALUES[mode - 1]
-    return (2 * mode - 1) * np.pi / 2.0
+    mode = np.asarray(mode)
+    table = np.asarray(CANTILEVER_EIGENVALUES)
+    tabulated = table[np.clip(mode, 1, len(table)) - 1]
+    return np.where(mode <= len(table), tabulated, (2 * mode - 1) * np.pi / 2.0)
 
 
 def cantilever_frequency(
-    mode: int,
-    length: float,
-    E: float,
-    I: float,
-    rho: float,
-    A: float,
-) -> float:
+    mode: int | np.ndarray,
+    length: FloatOrArray,
+    E: FloatOrArray,
+    I: FloatOrArray,
+    rho: FloatOrArray,
+    A: FloatOrArray,
+) -> FloatOrArray:
     """Calculate natural frequency of a cantilever beam (Euler-Bernoulli).
 
     f_n = lambda_n^2 / (2 * pi * L^2) * sqrt(E * I / (rho * A))
@@ -36,15 +44,15 @@ def cantilever_frequency(
         Natural frequency f_n (Hz).
     """
     lam = _eigenvalue(mode)
-    return (lam ** 2 / (2.0 * np.pi * length ** 2)) * np.sqrt(E * I / (rho * A))
+    return scalar_or_array((lam ** 2 / (2.0 * np.pi * np.square(length))) * np.sqrt(np.multiply(E, I) / np.multiply(rho, A)))
 
 
 def muzzle_deflection(
     mode_amplitudes: list[float],
     frequencies: list[float],
-    time: float,
-    length: float,
-) -> float:
+    time: FloatOrArray,
+    length: FloatOrArray,
+) -> FloatOrArray:
     """Calculate muzzle deflection as superposition of vibration modes.
 
     delta = sum(A_n * sin(2*pi*f_n*t))
@@ -60,13 +68,14 @@ def muzzle_deflection(
     Returns:
         Muzzle deflection (m).
     """
-    deflection = 0.0
-    for amp, freq in zip(mode_amplitudes, frequencies):
-        deflection += amp * np.sin(2.0 * np.pi * freq * time)
-    return deflection
+    # Modes on the first axis, summed out; the result has the shape of time
+    amplitudes = np.asarray(mode_amplitudes, dtype=float).reshape((-1,) + (1,) * np.ndim(time))
+    frequencies = np.asarray(frequencies, dtype=float).reshape(amplitudes.shape)
+    modes = amplitudes * np.sin(2.0 * np.pi * frequencies * time)
+    return scalar_or_array(modes.sum(axis=0))
 
 
-def ocw_barrel_times(dominant_frequency: float, n_nodes: int = 6) -> list[float]:
+def ocw_barrel_times(dominant_frequency: FloatOrArray, n_nodes: int = 6) -> list[float] | np.ndarray:
     """Calculate optimal barrel times (OBT) where muzzle velocity is at a vibration node.
 
     t_OBT_k = (2k - 1) / (4 * f_n)   for k = 1, 2, 3, ...
@@ -76,6 +85,10 @@ def ocw_barrel_times(dominant_frequency: float, n_nodes: int = 6) -> list[float]
         n_nodes: Number of nodes to calculate.
 
     Returns:
-        List of optimal barrel times (s).
+        List of optimal barrel times (s); for an array of frequencies, an
+        array with the nodes on the last axis.
     """
-    return [(2 * k - 1) / (4.0 * dominant_frequency) for k in range(1, n_nodes + 1)]
+    if np.ndim(dominant_frequency) == 0:
+        return [(2 * k - 1) / (4.0 * dominant_frequency) for k in range(1, n_nodes + 1)]
+    odd = 2.0 * np.arange(1, n_nodes + 1) - 1.0
+    return odd / (4.0 * np.asarray(dominant_frequency, dtype=float)[..., np.newaxis])
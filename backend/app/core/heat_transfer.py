@@ -12,15 +12,17 @@ where:
 
 import numpy as np
 
+from app.core.arrays import FloatOrArray, ignore_fp_errors, scalar_or_array
+
 R_UNIVERSAL = 8.314  # J/(mol*K)
 
 
 def wall_heat_flux(
-    T_gas: float,
-    T_wall: float,
-    h_coeff: float,
-    A_wall: float,
-) -> float:
+    T_gas: FloatOrArray,
+    T_wall: FloatOrArray,
+    h_coeff: FloatOrArray,
+    A_wall: FloatOrArray,
+) -> FloatOrArray:
     """Calculate instantaneous heat loss rate to barrel wall.
 
     Args:
@@ -32,12 +34,11 @@ def wall_heat_flux(
     Returns:
         Heat loss rate dQ/dt (W).
     """
-    if T_gas <= T_wall:
-        return 0.0
-    return h_coeff * A_wall * (T_gas - T_wall)
+    excess = np.subtract(T_gas, T_wall)
+    return scalar_or_array(np.where(excess <= 0.0, 0.0, np.multiply(h_coeff, A_wall) * excess))
 
 
-def convective_area(bore_diameter: float, bullet_position: float) -> float:
+def convective_area(bore_diameter: FloatOrArray, bullet_position: FloatOrArray) -> FloatOrArray:
     """Calculate barrel wall area exposed to propellant gas.
 
     Args:
@@ -47,18 +48,17 @@ def convective_area(bore_diameter: float, bullet_position: float) -> float:
     Returns:
         Exposed cylindrical wall area (m^2).
     """
-    if bullet_position <= 0.0:
-        return 0.0
-    return np.pi * bore_diameter * bullet_position
+    area = np.pi * np.multiply(bore_diameter, bullet_position)
+    return scalar_or_array(np.where(np.asarray(bullet_position) <= 0.0, 0.0, area))
 
 
 def gas_temperature(
-    pressure: float,
-    free_volume: float,
-    gas_mass: float,
-    covolume: float,
-    molecular_weight: float,
-) -> float:
+    pressure: FloatOrArray,
+    free_volume: FloatOrArray,
+    gas_mass: FloatOrArray,
+    covolume: FloatOrArray,
+    molecular_weight: FloatOrArray,
+) -> FloatOrArray:
     """Calculate gas temperature from Noble-Abel equation of state.
 
     P * (V - m*eta) = m * (R_u / M_w) * T
@@ -74,9 +74,8 @@ def gas_temperature(
     Returns:
         Gas temperature (K).
     """
-    if gas_mass <= 0.0:
-        return 0.0
-    V_corrected = free_volume - gas_mass * covolume
-    if V_corrected <= 0.0:
-        return 0.0
-    return pressure * V_corrected * molecular_weight / (gas_mass * R_UNIVERSAL)
+    V_corrected = free_volume - np.multiply(gas_mass, covolume)
+    with ignore_fp_errors():
+        temperature = pressure * V_corrected * molecular_weight / (np.multiply(gas_mass, R_UNIVERSAL))
+    valid = (np.asarray(gas_mass) > 0.0) & (V_corrected > 0.0)
+    return scalar_or_array(np.where(valid, temperature, 0.0))
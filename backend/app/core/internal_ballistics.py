@@ -2,8 +2,10 @@
 
 import numpy as np
 
+from app.core.arrays import FloatOrArray, scalar_or_array
 
-def lagrange_base_pressure(avg_pressure: float, charge_mass: float, bullet_mass: float) -> float:
+
+def lagrange_base_pressure(avg_pressure: FloatOrArray, charge_mass: FloatOrArray, bullet_mass: FloatOrArray) -> FloatOrArray:
     """Calculate shot-base pressure from average pressure using Lagrange gradient.
 
     P_s = P_avg / (1 + omega / (3 * m))
@@ -16,10 +18,10 @@ def lagrange_base_pressure(avg_pressure: float, charge_mass: float, bullet_mass:
     Returns:
         Shot-base pressure P_s (Pa).
     """
-    return avg_pressure / (1.0 + charge_mass / (3.0 * bullet_mass))
+    return scalar_or_array(avg_pressure / (1.0 + np.divide(charge_mass, 3.0 * np.asarray(bullet_mass))))
 
 
-def lagrange_breech_pressure(base_pressure: float, charge_mass: float, bullet_mass: float) -> float:
+def lagrange_breech_pressure(base_pressure: FloatOrArray, charge_mass: FloatOrArray, bullet_mass: FloatOrArray) -> FloatOrArray:
     """Calculate breech pressure from shot-base pressure using Lagrange gradient.
 
     P_b = P_s * (1 + omega / (2 * m))
@@ -32,15 +34,15 @@ def lagrange_breech_pressure(base_pressure: float, charge_mass: float, bullet_ma
     Returns:
         Breech pressure P_b (Pa).
     """
-    return base_pressure * (1.0 + charge_mass / (2.0 * bullet_mass))
+    return scalar_or_array(base_pressure * (1.0 + np.divide(charge_mass, 2.0 * np.asarray(bullet_mass))))
 
 
 def bullet_acceleration(
-    base_pressure: float,
-    bore_area: float,
-    friction_force: float,
-    effective_mass: float,
-) -> float:
+    base_pressure: FloatOrArray,
+    bore_area: FloatOrArray,
+    friction_force: FloatOrArray,
+    effective_mass: FloatOrArray,
+) -> FloatOrArray:
     """Calculate bullet acceleration from Newton's second law.
 
     a = (P_s * A_b - F_friction) / m_eff
@@ -54,20 +56,18 @@ def bullet_acceleration(
     Returns:
         Acceleration (m/s^2).
     """
-    net_force = base_pressure * bore_area - friction_force
-    if net_force < 0.0:
-        return 0.0
-    return net_force / effective_mass
+    net_force = np.multiply(base_pressure, bore_area) - friction_force
+    return scalar_or_array(np.where(net_force < 0.0, 0.0, net_force / effective_mass))
 
 
 def free_volume(
-    chamber_vol: float,
-    bore_area: float,
-    displacement: float,
-    charge_mass: float,
-    density: float,
-    fraction_burned: float,
-) -> float:
+    chamber_vol: FloatOrArray,
+    bore_area: FloatOrArray,
+    displacement: FloatOrArray,
+    charge_mass: FloatOrArray,
+    density: FloatOrArray,
+    fraction_burned: FloatOrArray,
+) -> FloatOrArray:
     """Calculate free volume available for gas expansion.
 
     V_free = V_0 + A_b * x - (omega / rho_p) * (1 - psi)
@@ -83,5 +83,5 @@ def free_volume(
     Returns:
         Free volume V_free (m^3).
     """
-    solid_volume = (charge_mass / density) * (1.0 - fraction_burned)
-    return chamber_vol + bore_area * displacement - solid_volume
+    solid_volume = np.divide(charge_mass, density) * (1.0 - np.asarray(fraction_burned))
+    return scalar_or_array(chamber_vol + np.multiply(bore_area, displacement) - solid_volume)
@@ -0,0 +1,312 @@
+"""Code-generated right-hand-side kernels for the interior ballistics ODE.
+
+The reference RHS (solver._build_ode_system) is a closure that branches on the
+burn model and calls form_function / free_volume / vieille_burn_rate /
+convective_area / wall_heat_flux for every evaluation. At thousands of
+evaluations per shot that call overhead dominates, so build_kernels()
+generates flat Python source for one powder model (2-curve Vieille or GRT
+3-curve) and burn model (Z or psi state) with every charge-independent parameter folded in as a literal,
+compiles it once, and returns factories that bind the charge-dependent
+constants per run:
+
+    kernels = build_kernels(powder, bullet, cartridge, h_coeff, constants, t_wall, molecular_weight)
+    rhs = kernels.ignition(omega)   # state [Z, x, v, Q_loss] (psi in place of Z for the psi model)
+    tail = kernels.tail(omega)      # post-burnout state [x, v, Q_loss]
+
+The generated code evaluates the same equations as the reference closures,
+differing only by floating-point rounding from the reordered arithmetic.
+CompiledLoadContext builds its kernels once; identical sources (same
+components) share one compiled code object.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from app.core.thermodynamics import BA_PRESSURE_UNIT_PA, three_curve_levels, vivacity_3curve_terms
+
+# Burn models: Vieille law on the normalized burn depth Z (psi from the form
+# function), or GRT vivacity integrated on the burnt fraction psi directly
+BURN_MODEL_Z = "z"
+BURN_MODEL_PSI = "psi"
+BURN_MODELS = (BURN_MODEL_Z, BURN_MODEL_PSI)
+
+# Same gas constant and pressure-denominator floor as the reference RHS
+_R_GAS = 8.314
+_DENOM_FLOOR = 1e-12
+
+
+def _lit(value: float) -> str:
+    """Float literal that round-trips exactly."""
+    return repr(float(value))
+
+
+_PSI_2CURVE = """\
+        psi = {theta_plus_1} * Z_c - {theta} * Z_c * Z_c
+        if psi < 0.0:
+            psi = 0.0
+        elif psi > 1.0:
+            psi = 1.0
+"""
+
+_PSI_3CURVE = """\
+        if Z_c <= {z1}:
+            psi_raw = Z_c + {bp} * Z_c * Z_c
+        elif Z_c <= {z2}:
+            dz = Z_c - {z1}
+            psi_raw = {psi_z1} + dz + {brp} * dz * (Z_c + {z1})
+        else:
+            dz = Z_c - {z2}
+            psi_raw = {psi_z2} + dz + {br} * dz * (Z_c + {z2})
+        psi = psi_raw * {inv_psi_total}
+        if psi < 0.0:
+            psi = 0.0
+        elif psi > 1.0:
+            psi = 1.0
+"""
+
+_PSI_ZERO = """\
+        psi = 0.0
+"""
+
+# psi-state model: the burn state is the burnt fraction itself
+_PSI_STATE = """\
+        psi = Z_c
+"""
+
+_BURN_VIEILLE = """\
+        if Z_c < 1.0 and P_avg > 0.0:
+            dZ_dt = {burn_coeff} * P_avg ** {burn_exp}
+        else:
+            dZ_dt = 0.0
+"""
+
+_BURN_VIVACITY_2CURVE = """\
+        if Z_c < 1.0 and P_avg > 0.0:
+            phi_sq = {phi_sq_0} - {phi_sq_slope} * psi
+            dZ_dt = {vivacity} * P_avg * sqrt(phi_sq) if phi_sq > 0.0 else 0.0
+        else:
+            dZ_dt = 0.0
+"""
+
+_BURN_VIVACITY_3CURVE = """\
+        if Z_c < 1.0 and P_avg > 0.0:
+            if psi <= {psi_1}:
+                phi_sq = {a1} + {b1} * psi
+            elif psi <= {psi_2}:
+                phi_sq = {a2} + {b2} * psi
+            else:
+                phi_sq = {a3} + {b3} * psi
+            dZ_dt = {vivacity} * P_avg * sqrt(phi_sq) if phi_sq > 0.0 else 0.0
+        else:
+            dZ_dt = 0.0
+"""
+
+_TEMPLATE = """\
+from math import sqrt
+
+
+def make_ignition(omega):
+    solid_volume = omega / {rho_p}
+    total_energy = omega * {force}
+    omega_eta = omega * {covolume}
+    lagrange = 1.0 + omega / {three_m}
+    m_eff = {m} + omega / 3.0
+    temp_coeff = {molecular_weight} / (omega * {r_gas})
+
+    def rhs(t, y):
+        Z, x, v, Q_loss = y
+
+        Z_c = 0.0 if Z < 0.0 else (1.0 if Z > 1.0 else Z)
+{psi_code}
+        V_f = {v0} + {bore_area} * x - solid_volume * (1.0 - psi)
+
+        effective_energy = total_energy * psi - Q_loss
+        if effective_energy < 0.0:
+            effective_energy = 0.0
+        gas_volume = V_f - omega_eta * psi
+        denom = gas_volume if gas_volume > 0.0 else {denom_floor}
+        P_avg = effective_energy / denom
+        P_s = P_avg / lagrange
+
+{burn_code}
+        if P_s > {p_start} or v > 0.0:
+            thrust = P_s * {net_area}
+            dv_dt = thrust / m_eff if thrust > 0.0 else 0.0
+        else:
+            dv_dt = 0.0
+
+        if psi > 0.0 and P_avg > 0.0:
+            if gas_volume > 0.0:
+                T_gas = P_avg * gas_volume * temp_coeff / psi
+            else:
+                T_gas = {t_flame}
+        else:
+            T_gas = {t_flame} * psi
+
+        if x > 0.0 and T_gas > {t_wall}:
+            dQ_dt = {wall_coeff} * x * (T_gas - {t_wall})
+        else:
+            dQ_dt = 0.0
+
+        return [dZ_dt, v, dv_dt, dQ_dt]
+
+    return rhs
+
+
+def make_tail(omega):
+    total_energy = omega * {force}
+    gas_volume_0 = {v0} - omega * {covolume}
+    lagrange = 1.0 + omega / {three_m}
+    m_eff = {m} + omega / 3.0
+    temp_per_joule = {molecular_weight} / (omega * {r_gas})
+
+    def rhs(t, y):
+        x, v, Q_loss = y
+
+        effective_energy = total_energy - Q_loss
+        if effective_energy < 0.0:
+            effective_energy = 0.0
+        gas_volume = gas_volume_0 + {bore_area} * x
+        denom = gas_volume if gas_volume > 0.0 else {denom_floor}
+        P_avg = effective_energy / denom
+        P_s = P_avg / lagrange
+
+        if P_s > {p_start} or v > 0.0:
+            thrust = P_s * {net_area}
+            dv_dt = thrust / m_eff if thrust > 0.0 else 0.0
+        else:
+            dv_dt = 0.0
+
+        if P_avg > 0.0 and gas_volume > 0.0:
+            T_gas = effective_energy * temp_per_joule
+        else:
+            T_gas = {t_flame}
+
+        if x > 0.0 and T_gas > {t_wall}:
+            dQ_dt = {wall_coeff} * x * (T_gas - {t_wall})
+        else:
+            dQ_dt = 0.0
+
+        return [v, dv_dt, dQ_dt]
+
+    return rhs
+"""
+
+
+@dataclass(frozen=True)
+class RhsKernels:
+    """Compiled kernel factories for one component set."""
+
+    model: str  # "2curve", "3curve", "psi-2curve" or "psi-3curve"
+    source: str
+    ignition: Callable[[float], Callable]
+    tail: Callable[[float], Callable]
+
+
+def _psi_code(powder) -> tuple[str, str]:
+    """Form-function snippet (and model name) with the grain geometry folded in."""
+    if not powder.has_3curve:
+        theta = powder.theta
+        return "2curve", _PSI_2CURVE.format(theta_plus_1=_lit(theta + 1.0), theta=_lit(theta))
+
+    z1, z2, bp, br, brp = powder.z1, powder.z2, powder.bp, powder.br, powder.brp
+    psi_z1, psi_z2, psi_total = three_curve_levels(z1, z2, bp, br, brp)
+    if psi_total <= 0.0:
+        return "3curve", _PSI_ZERO
+    return "3curve", _PSI_3CURVE.format(
+        z1=_lit(z1), z2=_lit(z2), bp=_lit(bp), br=_lit(br), brp=_lit(brp),
+        psi_z1=_lit(psi_z1), psi_z2=_lit(psi_z2), inv_psi_total=_lit(1.0 / psi_total),
+    )
+
+
+def _vivacity_code(powder) -> tuple[str, str]:
+    """Vivacity-law snippet (and model name) for the psi-state burn model."""
+    vivacity = powder.ba / BA_PRESSURE_UNIT_PA
+    if not powder.has_3curve:
+        theta = powder.theta
+        return "psi-2curve", _BURN_VIVACITY_2CURVE.format(
+            vivacity=_lit(vivacity), phi_sq_0=_lit((theta + 1.0) ** 2), phi_sq_slope=_lit(4.0 * theta),
+        )
+
+    psi_1, psi_2, phases, psi_total = vivacity_3curve_terms(powder.z1, powder.z2, powder.bp, powder.br, powder.brp)
+    if psi_total <= 0.0:
+        # Degenerate geometry: no burning, as in vivacity_function_3curve()
+        psi_1, psi_2, phases, psi_total = 1.0, 1.0, ((0.0, 0.0),) * 3, 1.0
+        vivacity = 0.0
+    (a1, b1), (a2, b2), (a3, b3) = phases
+    # Normalization by psi_total folded into the vivacity
+    return "psi-3curve", _BURN_VIVACITY_3CURVE.format(
+        psi_1=_lit(psi_1), psi_2=_lit(psi_2),
+        a1=_lit(a1), b1=_lit(b1), a2=_lit(a2), b2=_lit(b2), a3=_lit(a3), b3=_lit(b3),
+        vivacity=_lit(vivacity / psi_total),
+    )
+
+
+def kernel_source(
+    powder, bullet, cartridge, h_coeff: float, constants, t_wall: float, molecular_weight: float,
+    burn_model: str = BURN_MODEL_Z,
+) -> tuple[str, str]:
+    """Generate the kernel module source for one component set.
+
+    Returns:
+        Tuple of (model name, Python source defining make_ignition and make_tail).
+    """
+    if burn_model == BURN_MODEL_PSI:
+        model, burn_code = _vivacity_code(powder)
+        psi_code = _PSI_STATE
+    else:
+        model, psi_code = _psi_code(powder)
+        burn_code = _BURN_VIEILLE.format(
+            burn_coeff=_lit(powder.burn_rate_coeff / (powder.web_thickness_m / 2.0)),
+            burn_exp=_lit(powder.burn_rate_exp),
+        )
+    bore_area = math.pi * (cartridge.bore_diameter_m / 2.0) ** 2
+    source = _TEMPLATE.format(
+        psi_code=psi_code,
+        burn_code=burn_code,
+        rho_p=_lit(powder.density_kg_m3),
+        force=_lit(powder.force_j_kg),
+        covolume=_lit(powder.covolume_m3_kg),
+        t_flame=_lit(powder.flame_temp_k),
+        m=_lit(bullet.mass_kg),
+        three_m=_lit(3.0 * bullet.mass_kg),
+        v0=_lit(cartridge.chamber_volume_m3),
+        bore_area=_lit(bore_area),
+        net_area=_lit(bore_area * (1.0 - constants.friction_coeff)),
+        p_start=_lit(constants.p_start_pa),
+        wall_coeff=_lit(h_coeff * math.pi * cartridge.bore_diameter_m),
+        t_wall=_lit(t_wall),
+        molecular_weight=_lit(molecular_weight),
+        r_gas=_lit(_R_GAS),
+        denom_floor=_lit(_DENOM_FLOOR),
+    )
+    return model, source
+
+
+@lru_cache(maxsize=256)
+def _compile_source(source: str, model: str) -> tuple[Callable, Callable]:
+    namespace: dict = {}
+    exec(compile(source, f"<rhs-kernel-{model}>", "exec"), namespace)
+    return namespace["make_ignition"], namespace["make_tail"]
+
+
+def build_kernels(
+    powder, bullet, cartridge, h_coeff: float, constants, t_wall: float, molecular_weight: float,
+    burn_model: str = BURN_MODEL_Z,
+) -> RhsKernels:
+    """Generate and compile the RHS kernels for one component set.
+
+    Args:
+        powder, bullet, cartridge: Simulation parameters (solver dataclasses).
+        h_coeff: Convective heat transfer coefficient (W/m^2/K).
+        constants: Global model constants (friction, engraving pressure).
+        t_wall: Barrel wall temperature (K).
+        molecular_weight: Mean molecular weight of the propellant gas (kg/mol).
+        burn_model: BURN_MODEL_Z (Vieille law on burn depth) or BURN_MODEL_PSI
+            (GRT vivacity on the burnt fraction; needs powder.ba).
+    """
+    model, source = kernel_source(powder, bullet, cartridge, h_coeff, constants, t_wall, molecular_weight, burn_model)
+    make_ignition, make_tail = _compile_source(source, model)
+    return RhsKernels(model=model, source=source, ignition=make_ignition, tail=make_tail)
@@ -0,0 +1,260 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+A deliberately small subset of the Prometheus client model (counters, gauges
+and histograms with labels) so the API needs no extra dependency. Every update
+is a dict lookup and a few additions under a per-metric lock, cheap enough to
+leave on in production. The registry is per process: with several uvicorn
+workers, each exposes its own series (scrape them individually).
+
+The metrics the app records are defined at the bottom of this module and
+rendered by GET /api/v1/metrics.
+"""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Exposition lines: HELP, TYPE and one line per sample."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every recorded series."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (non-cumulative, last = +Inf), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = self._header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drop all recorded values (tests)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ============================================================================
+# Application metrics
+# ============================================================================
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    labelnames=("method", "route", "status"),
+))
+
+RATE_LIMIT_REJECTIONS = REGISTRY.register(Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter.",
+    labelnames=("route",),
+))
+
+SIMULATIONS_PER_REQUEST = REGISTRY.register(Histogram(
+    "simulations_per_request",
+    "Solver runs per simulation request.",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250, 500, 1000, 2500),
+    labelnames=("endpoint",),
+))
+
+SOLVER_NFEV = REGISTRY.register(Histogram(
+    "solver_nfev",
+    "Right-hand-side evaluations per simulation.",
+    buckets=(500, 1000, 2000, 3000, 5000, 7500, 10000, 20000, 50000),
+    labelnames=("endpoint",),
+))
+
+SOLVER_SECONDS = REGISTRY.register(Histogram(
+    "solver_integration_seconds",
+    "ODE integration wall time per simulation.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4),
+    labelnames=("endpoint",),
+))
+
+SIMULATION_SECONDS = REGISTRY.register(Histogram(
+    "simulation_seconds",
+    "Total simulate() wall time per simulation.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4),
+    labelnames=("endpoint",),
+))
+
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the database pool.",
+))
+
+DB_POOL_IN_USE = REGISTRY.register(Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the database pool.",
+))
+
+DB_POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection (includes opening new connections).",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+))
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total",
+    "In-process cache lookups by result (hit or miss).",
+    labelnames=("cache", "result"),
+))
+
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "cache_hit_ratio",
+    "Fraction of in-process cache lookups served from the cache since startup.",
+    labelnames=("cache",),
+))
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one cache lookup and refresh that cache's hit ratio."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+    hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+    misses = CACHE_REQUESTS.value(cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(hits / (hits + misses), cache=cache)
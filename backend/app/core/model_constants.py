@@ -0,0 +1,113 @@
+"""Global model constants of the lumped-parameter solver and their calibration file.
+
+The heat transfer coefficient, bore friction, primer seed and engraving pressure
+are not properties of any one powder or rifle: they close the model. They ship
+with hand-tuned defaults and can be re-fitted against the validation corpus
+with `python -m app.cli calibrate-constants`, which writes a versioned JSON file:
+
+  {
+    "version": 3,
+    "created_at": "2026-10-19T12:00:00+00:00",
+    "constants": {"h_coeff": 2000.0, "friction_coeff": 0.05, "z_primer": 0.01, "p_start_pa": 25e6},
+    ...fit metadata...
+  }
+
+The solver loads this file once at import. A missing or unreadable file falls
+back to the built-in defaults (version 0).
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONSTANTS_PATH = Path(__file__).parent / "model_constants.json"
+# Environment override for the calibration file location
+CONSTANTS_PATH_ENV = "MODEL_CONSTANTS_FILE"
+
+
+@dataclass(frozen=True)
+class ModelConstants:
+    h_coeff: float = 2000.0       # Thornhill convective coefficient (W/m^2/K)
+    friction_coeff: float = 0.05  # bore friction as a fraction of base-pressure force
+    z_primer: float = 0.01        # initial burn fraction representing primer ignition
+    p_start_pa: float = 25e6      # engraving (shot-start) pressure (Pa)
+
+
+# Physically sensible search ranges used by the calibration command
+CONSTANT_BOUNDS: dict[str, tuple[float, float]] = {
+    "h_coeff": (0.0, 10000.0),
+    "friction_coeff": (0.0, 0.15),
+    "z_primer": (0.002, 0.05),
+    "p_start_pa": (5e6, 60e6),
+}
+
+
+def constants_path() -> Path:
+    """Location of the calibration file (MODEL_CONSTANTS_FILE or the package default)."""
+    override = os.getenv(CONSTANTS_PATH_ENV)
+    return Path(override) if override else DEFAULT_CONSTANTS_PATH
+
+
+def load_model_constants(path: Path | None = None) -> tuple[ModelConstants, int]:
+    """Load model constants from a calibration file.
+
+    Args:
+        path: File to read (default: constants_path()).
+
+    Returns:
+        Tuple of (constants, version). Version 0 means built-in defaults.
+        Keys missing from the file keep their default; unknown keys are ignored.
+    """
+    path = path or constants_path()
+    if not path.exists():
+        return ModelConstants(), 0
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        known = {f.name for f in fields(ModelConstants)}
+        values = {k: float(v) for k, v in data.get("constants", {}).items() if k in known}
+        constants = ModelConstants(**values)
+        version = int(data.get("version", 0))
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.warning("Ignoring unreadable model constants file %s: %s", path, e)
+        return ModelConstants(), 0
+
+    logger.info("Loaded model constants v%d from %s", version, path)
+    return constants, version
+
+
+def save_model_constants(constants: ModelConstants, metadata: dict, path: Path | None = None) -> int:
+    """Write a new version of the calibration file.
+
+    The version number is one above the version currently stored at path.
+
+    Args:
+        constants: Calibrated constants.
+        metadata: Extra fit information stored alongside (corpus errors, optimizer stats).
+        path: File to write (default: constants_path()).
+
+    Returns:
+        The version number written.
+    """
+    path = path or constants_path()
+    _, previous_version = load_model_constants(path)
+    version = previous_version + 1
+
+    payload = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "constants": asdict(constants),
+        **metadata,
+    }
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return version
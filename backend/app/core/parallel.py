@@ -0,0 +1,100 @@
+"""Process pool for fanning independent solver runs across CPU cores.
+
+The ODE solver is pure Python on top of SciPy, so threads serialize on the GIL.
+Independent runs (finite-difference Jacobian columns, reference loads, charge
+sweeps) are dispatched to a shared ProcessPoolExecutor instead. The pool is
+created lazily on first use and reused for the lifetime of the process.
+
+Work items and the mapped function must be picklable: use module-level
+functions and dataclass arguments.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+
+
+def worker_count() -> int:
+    """Number of worker processes to use (settings.solver_workers, 0 = all cores)."""
+    if settings.solver_workers > 0:
+        return settings.solver_workers
+    return os.cpu_count() or 1
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the shared executor, recreating it if the requested size changed."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        # spawn: never fork a process that is running an event loop and DB threads
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _executor_workers = workers
+        logger.info("Started solver process pool with %d workers", workers)
+    return _executor
+
+
+def parallel_map(fn: Callable[[T], R], items: Iterable[T], max_workers: int | None = None) -> list[R]:
+    """Apply fn to every item, in parallel when more than one worker is available.
+
+    Results are returned in input order. With a single worker (or a single
+    item) the calls run serially in the current process, which avoids pool
+    start-up cost and keeps behaviour deterministic in tests.
+
+    Args:
+        fn: Picklable module-level function taking one item.
+        items: Work items.
+        max_workers: Override for the worker count (default: worker_count()).
+
+    Returns:
+        List of fn(item) results in the same order as items.
+    """
+    items = list(items)
+    workers = min(max_workers or worker_count(), len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+
+    chunksize = max(1, len(items) // (workers * 4))
+    return list(_get_executor(workers).map(fn, items, chunksize=chunksize))
+
+
+def parallel_imap(fn: Callable[[T], R], items: Iterable[T], max_workers: int | None = None) -> Iterator[R]:
+    """Like parallel_map, but yield each result as soon as it (and all earlier ones) is ready.
+
+    Lets callers stream results of long batches instead of holding them all.
+    Results are yielded in input order; the serial path runs lazily.
+    """
+    items = list(items)
+    workers = min(max_workers or worker_count(), len(items))
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    # Small chunks: results are released in order, so large chunks delay the stream
+    chunksize = max(1, min(16, len(items) // (workers * 4)))
+    yield from _get_executor(workers).map(fn, items, chunksize=chunksize)
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared process pool (called on application shutdown)."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
@@ -10,22 +10,56 @@ With algebraic relations:
   V_free = V_0 + A_b * x - omega * (1 - psi) / rho_p
   P_avg = f * omega * psi / (V_free - omega * psi * eta)
   P_s = P_avg / (1 + omega / (3 * m))
+
+The psi-state burn model (burn_model="psi") integrates the burnt fraction
+directly from the GRT vivacity Ba stored for imported powders:
+  dpsi/dt = Ba * phi(psi) * P_avg / 1 bar
+with phi the vivacity curve (vivacity_function / vivacity_function_3curve):
+the form function's slope d(psi)/dZ at psi, so where Ba * P / 1 bar equals
+the Vieille rate dZ/dt both models burn alike. The psi state starts at the
+burnt fraction the primer depth z_primer gives in the Z model.
+
+Integration stops at burnout (Z = 1) and continues on the reduced system
+[x, v, Q_loss] with psi = 1: no burn rate or form function, so the expansion
+tail takes a handful of steps.
+
+Absolute tolerances are per state component, a fixed fraction of each
+component's physical scale (see state_scales()), so Z, metres, m/s and joules
+are all resolved to the same relative precision. Most of the saving over the
+former 1e-6 s step cap comes from the cap itself (MAX_STEP): RK45's error
+control resolves the burn with either tolerance.
 """
 
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass, fields, replace
 
 import numpy as np
 from scipy.integrate import solve_ivp
 
+from app.core.diagnostics import SLOW_SIMULATION_MS, SimDiagnostics, log_slow_simulation, rk45_rejected_steps
 from app.core.harmonics import cantilever_frequency, ocw_barrel_times
 from app.core.heat_transfer import convective_area, wall_heat_flux
 from app.core.internal_ballistics import free_volume, lagrange_base_pressure, lagrange_breech_pressure
+from app.core.kernels import BURN_MODEL_PSI, BURN_MODEL_Z, BURN_MODELS, build_kernels
+from app.core.model_constants import ModelConstants, load_model_constants
 from app.core.structural import case_expansion, lame_hoop_stress, lawton_erosion
-from app.core.thermodynamics import form_function, form_function_3curve, noble_abel_pressure, vieille_burn_rate
+from app.core.thermodynamics import (
+    BA_PRESSURE_UNIT_PA,
+    form_function,
+    form_function_3curve,
+    noble_abel_pressure,
+    vieille_burn_rate,
+    vivacity_function,
+    vivacity_function_3curve,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change to the numerical model alters simulation results;
+# cached validation reports are keyed on it.
+SOLVER_VERSION = "3"
+
 GRAINS_TO_KG = 0.00006479891
 PSI_TO_PA = 6894.757
 PA_TO_PSI = 1.0 / PSI_TO_PA
@@ -36,9 +70,13 @@ CM3_TO_M3 = 1e-6
 GCM3_TO_KGM3 = 1000.0
 
 J_TO_FT_LBS = 0.737562  # Joules to foot-pounds conversion
-P_START_DEFAULT = 25e6  # 25 MPa default engraving pressure
-FRICTION_COEFF = 0.05   # k_f ~ 5% of base pressure as friction
-Z_PRIMER = 0.01         # Initial burn fraction representing primer ignition
+
+# Global model constants: built-in defaults, replaced by the calibration file
+# written by `python -m app.cli calibrate-constants` when one is present.
+MODEL_CONSTANTS, MODEL_CONSTANTS_VERSION = load_model_constants()
+P_START_DEFAULT = MODEL_CONSTANTS.p_start_pa      # default 25 MPa engraving pressure
+FRICTION_COEFF = MODEL_CONSTANTS.friction_coeff   # default k_f ~ 5% of base pressure as friction
+Z_PRIMER = MODEL_CONSTANTS.z_primer               # Initial burn fraction representing primer ignition
 
 
 @dataclass
@@ -66,6 +104,11 @@ class PowderParams:
         """Check if all 3-curve parameters are available."""
         return all(v is not None for v in [self.ba, self.bp, self.br, self.brp, self.z1, self.z2])
 
+    @property
+    def has_vivacity(self) -> bool:
+        """Check if a GRT vivacity Ba is available for the psi-state burn model."""
+        return self.ba is not None and self.ba > 0.0
+
 
 @dataclass
 class BulletParams:
@@ -108,12 +151,50 @@ BARREL_OUTER_DIAMETER_M = 0.025  # 25 mm typical barrel OD
 OBT_TOLERANCE_MS = 0.05   # tolerance for OBT match (ms)
 
 # Heat transfer defaults (Thornhill model)
-H_COEFF_DEFAULT = 2000.0  # Convective heat transfer coefficient (W/m^2/K)
+H_COEFF_DEFAULT = MODEL_CONSTANTS.h_coeff  # Convective heat transfer coefficient (W/m^2/K)
 T_WALL_DEFAULT = 300.0    # Ambient barrel wall temperature (K)
 # Mean molecular weight of propellant gas (typical nitrocellulose-based)
 GAS_MOLECULAR_WEIGHT = 0.026  # ~26 g/mol
 
 
+# Pre-flight verdicts, least to most severe
+PREFLIGHT_OK = "ok"
+PREFLIGHT_COMPRESSED = "compressed"      # fill ratio above 90%: assemblable but compressed
+PREFLIGHT_OVERPRESSURE = "overpressure"  # complete-burn lower bound already exceeds SAAMI max
+PREFLIGHT_OVERFILLED = "overfilled"      # bulk powder volume exceeds the case: cannot be assembled
+PREFLIGHT_IMPOSSIBLE = "impossible"      # gas covolume fills the chamber: the ODE has no free volume
+
+
+@dataclass
+class PreflightResult:
+    """Charge screening and analytic pressure bounds, computed without integrating.
+
+    Both bounds are breech pressures from noble_abel_pressure() with complete
+    combustion and no heat loss (Lagrange breech/average ratio applied):
+      upper: closed chamber (bullet never moves); None when the covolume
+             fills the chamber
+      lower: gas filling the whole bore (combustion finishing at the muzzle);
+             only a bound for loads that burn out in the barrel. A slow
+             powder or short barrel can exit with unburnt powder and peak
+             below it, so "overpressure" is advisory and still integrated.
+    """
+
+    verdict: str
+    fill_ratio: float
+    loading_density_kg_m3: float
+    pressure_upper_bound_psi: float | None
+    pressure_lower_bound_psi: float
+    warnings: list[str]
+
+    @property
+    def charge_unsafe(self) -> bool:
+        """Unsafe whatever the integrated pressure (overfilled or impossible).
+
+        Sweeps can report these charges without integrating.
+        """
+        return self.verdict in (PREFLIGHT_OVERFILLED, PREFLIGHT_IMPOSSIBLE)
+
+
 @dataclass
 class SimResult:
     peak_pressure_psi: float
@@ -136,6 +217,9 @@ class SimResult:
     energy_curve: list[dict] | None = None
     temperature_curve: list[dict] | None = None
     recoil_curve: list[dict] | None = None
+    diagnostics: SimDiagnostics | None = None
+    preflight: PreflightResult | None = None
+    burn_model: str = BURN_MODEL_Z
 
 
 def _build_ode_system(
@@ -144,8 +228,19 @@ def _build_ode_system(
     cartridge: CartridgeParams,
     load: LoadParams,
     h_coeff: float = H_COEFF_DEFAULT,
+    constants: ModelConstants = MODEL_CONSTANTS,
+    burn_model: str = BURN_MODEL_Z,
 ):
-    """Build the RHS function for the ODE system with Thornhill heat loss."""
+    """Build the RHS function for the ODE system with Thornhill heat loss.
+
+    With burn_model=BURN_MODEL_PSI the first state is the burnt fraction psi,
+    driven by the GRT vivacity instead of Vieille's law on Z.
+
+    Reference implementation: simulations run the equivalent generated kernel
+    (app.core.kernels), which tests and benchmarks compare against this.
+    """
+    friction_coeff = constants.friction_coeff
+    p_start = constants.p_start_pa
     omega = load.charge_mass_kg
     m = bullet.mass_kg
     m_eff = m + omega / 3.0
@@ -161,6 +256,11 @@ def _build_ode_system(
     theta = powder.theta
     T_flame = powder.flame_temp_k
 
+    # psi-state model: vivacity per Pa (Ba is quoted per bar)
+    use_psi_state = burn_model == BURN_MODEL_PSI
+    if use_psi_state:
+        vivacity = powder.ba / BA_PRESSURE_UNIT_PA
+
     # 3-curve dispatch: extract once, use in inner function
     use_3curve = powder.has_3curve
     if use_3curve:
@@ -174,7 +274,9 @@ def _build_ode_system(
         Z, x, v, Q_loss = y
 
         Z_c = min(max(Z, 0.0), 1.0)
-        if use_3curve:
+        if use_psi_state:
+            psi = Z_c
+        elif use_3curve:
             psi = form_function_3curve(Z_c, z1_val, z2_val, bp_val, br_val, brp_val)
         else:
             psi = form_function(Z_c, theta)
@@ -191,9 +293,15 @@ def _build_ode_system(
 
         P_s = lagrange_base_pressure(P_avg, omega, m)
 
-        F_fric = FRICTION_COEFF * P_s * bore_area
+        F_fric = friction_coeff * P_s * bore_area
 
-        if Z_c < 1.0:
+        if Z_c < 1.0 and use_psi_state:
+            if use_3curve:
+                phi = vivacity_function_3curve(psi, z1_val, z2_val, bp_val, br_val, brp_val)
+            else:
+                phi = vivacity_function(psi, theta)
+            dZ_dt = vivacity * max(P_avg, 0.0) * phi
+        elif Z_c < 1.0:
             r_b = vieille_burn_rate(P_avg, a1, n)
             dZ_dt = r_b / e1
         else:
@@ -201,7 +309,7 @@ def _build_ode_system(
 
         dx_dt = v
 
-        if P_s > P_START_DEFAULT or v > 0.0:
+        if P_s > p_start or v > 0.0:
             dv_dt = max(0.0, (P_s * bore_area - F_fric)) / m_eff
         else:
             dv_dt = 0.0
@@ -226,82 +334,448 @@ def _build_ode_system(
     return rhs, bore_area, m_eff
 
 
+def _build_tail_system(
+    powder: PowderParams,
+    bullet: BulletParams,
+    cartridge: CartridgeParams,
+    load: LoadParams,
+    h_coeff: float = H_COEFF_DEFAULT,
+    constants: ModelConstants = MODEL_CONSTANTS,
+):
+    """Build the post-burnout RHS for the reduced state [x, v, Q_loss].
+
+    Same equations as _build_ode_system with Z = psi = 1: all gas released,
+    no solid grain volume, and T_gas depends only on the remaining energy.
+    Reference implementation, like _build_ode_system.
+    """
+    friction_coeff = constants.friction_coeff
+    p_start = constants.p_start_pa
+    omega = load.charge_mass_kg
+    m = bullet.mass_kg
+    m_eff = m + omega / 3.0
+    bore_area = np.pi * (cartridge.bore_diameter_m / 2.0) ** 2
+    bore_d = cartridge.bore_diameter_m
+    total_energy = powder.force_j_kg * omega
+    # V_free - omega * eta at psi = 1, minus the bore term
+    gas_volume_0 = cartridge.chamber_volume_m3 - omega * powder.covolume_m3_kg
+    T_flame = powder.flame_temp_k
+    # T_gas = P * V_corrected * M / (omega * R) = effective_energy * M / (omega * R)
+    temp_per_joule = GAS_MOLECULAR_WEIGHT / (omega * 8.314)
+
+    def rhs(t, y):
+        x, v, Q_loss = y
+
+        effective_energy = max(total_energy - Q_loss, 0.0)
+        denom = gas_volume_0 + bore_area * x
+        if denom <= 0.0:
+            denom = 1e-12
+        P_avg = effective_energy / denom
+
+        P_s = lagrange_base_pressure(P_avg, omega, m)
+
+        if P_s > p_start or v > 0.0:
+            dv_dt = max(0.0, P_s * bore_area * (1.0 - friction_coeff)) / m_eff
+        else:
+            dv_dt = 0.0
+
+        if P_avg > 0.0 and denom > 1e-12:
+            T_gas = effective_energy * temp_per_joule
+        else:
+            T_gas = T_flame
+
+        A_wall = convective_area(bore_d, x)
+        dQ_dt = wall_heat_flux(T_gas, T_WALL_DEFAULT, h_coeff, A_wall)
+
+        return [v, dv_dt, dQ_dt]
+
+    return rhs
+
+
+# Integration tolerances: atol_i = ATOL_SCALE_FRACTION * state_scales()[i].
+# Steps are limited by the error control; the step cap only keeps the dense
+# output used for the 200-point curves well resolved. On the .308 reference
+# load, raising the cap from 1e-6 s to 5e-5 s takes nfev from ~5800 to ~610
+# with a uniform atol of 1e-10 (results equal to 1e-8 relative); the scaled
+# atol then saves another ~20% (~480) at the same cap.
+RTOL = 1e-8
+ATOL_SCALE_FRACTION = 1e-10
+MAX_STEP = 5e-5
+
+
+def state_scales(ctx: "CompiledLoadContext", charge_mass_kg: float) -> np.ndarray:
+    """Physical scale of each state [Z, x, v, Q_loss] for one charge.
+
+    Burn fraction 1, bore length, characteristic velocity sqrt(2 f omega / m_eff)
+    (all chemical energy as bullet kinetic energy) and chemical energy f omega.
+    Relative to a uniform atol this loosens v and Q_loss, which are large in
+    SI units, and tightens x (bore length < 1 m).
+    """
+    energy = ctx.powder.force_j_kg * charge_mass_kg
+    m_eff = ctx.bullet.mass_kg + charge_mass_kg / 3.0
+    return np.array([1.0, ctx.bore_length_m, np.sqrt(2.0 * energy / m_eff), energy])
+
+# Bulk (packing) density as a fraction of solid grain density, used for the
+# fill-ratio check (typical for extruded/ball powder granules).
+PACKING_FACTOR = 0.60
+
+
+class CompiledLoadContext:
+    """Charge-independent part of a simulation, derived once per component set.
+
+    Ladder, sensitivity and parametric sweeps vary only the charge, so bore
+    geometry, barrel harmonics, structural radii and the burn model are
+    computed here once and reused by every run().
+
+    Args:
+        powder, bullet, cartridge, rifle: Simulation parameters.
+        h_coeff: Heat transfer coefficient override (default: constants.h_coeff).
+        constants: Global model constants (default: the loaded MODEL_CONSTANTS).
+        extra_warnings: Warnings appended to every result (e.g. defaulted inputs).
+        burn_model: BURN_MODEL_Z (default) or BURN_MODEL_PSI; the psi-state
+            model needs a GRT vivacity (powder.ba).
+
+    Raises:
+        ValueError: On an unknown burn model, or "psi" without powder.ba.
+    """
+
+    def __init__(
+        self,
+        powder: PowderParams,
+        bullet: BulletParams,
+        cartridge: CartridgeParams,
+        rifle: RifleParams,
+        h_coeff: float | None = None,
+        constants: ModelConstants | None = None,
+        extra_warnings: list[str] | None = None,
+        burn_model: str = BURN_MODEL_Z,
+    ):
+        if burn_model not in BURN_MODELS:
+            raise ValueError(f"Unknown burn model {burn_model!r}; expected one of {list(BURN_MODELS)}")
+        if burn_model == BURN_MODEL_PSI and not powder.has_vivacity:
+            raise ValueError("The psi burn model needs the powder's GRT vivacity (ba)")
+        self.powder = powder
+        self.bullet = bullet
+        self.cartridge = cartridge
+        self.rifle = rifle
+        self.constants = constants or MODEL_CONSTANTS
+        self.h_coeff = self.constants.h_coeff if h_coeff is None else h_coeff
+        self.extra_warnings = list(extra_warnings or [])
+
+        # --- Bore geometry ---
+        bore_length = rifle.barrel_length_m - 0.051  # subtract approximate chamber length ~51mm
+        if bore_length <= 0:
+            bore_length = rifle.barrel_length_m * 0.9
+        self.bore_length_m = bore_length
+        self.bore_area_m2 = np.pi * (cartridge.bore_diameter_m / 2.0) ** 2
+        self.chamber_volume_m3 = cartridge.chamber_volume_m3
+        self.bulk_density_kg_m3 = powder.density_kg_m3 * PACKING_FACTOR
+
+        # --- Burn model and generated RHS kernels ---
+        self.burn_model = burn_model
+        self.use_3curve = powder.has_3curve
+        # Primer ignition: burn depth z_primer, or the burnt fraction it gives
+        z_primer = self.constants.z_primer
+        if burn_model == BURN_MODEL_Z:
+            self.initial_burn_state = z_primer
+        elif self.use_3curve:
+            self.initial_burn_state = form_function_3curve(z_primer, powder.z1, powder.z2, powder.bp, powder.br, powder.brp)
+        else:
+            self.initial_burn_state = form_function(z_primer, powder.theta)
+        self.kernels = build_kernels(
+            powder, bullet, cartridge, self.h_coeff, self.constants, T_WALL_DEFAULT, GAS_MOLECULAR_WEIGHT,
+            burn_model,
+        )
+
+        # --- Structural radii ---
+        self.case_inner_radius_m = cartridge.bore_diameter_m / 2.0
+        self.case_outer_radius_m = self.case_inner_radius_m + CASE_WALL_THICKNESS_M
+
+        # --- Barrel harmonics ---
+        bore_radius = cartridge.bore_diameter_m / 2.0
+        barrel_outer_r = BARREL_OUTER_DIAMETER_M / 2.0
+        # Second moment of area for annular cross-section: I = pi/4 * (R_o^4 - R_i^4)
+        self.barrel_second_moment_m4 = (np.pi / 4.0) * (barrel_outer_r**4 - bore_radius**4)
+        # Cross-section area
+        self.barrel_section_area_m2 = np.pi * (barrel_outer_r**2 - bore_radius**2)
+
+        # Mode 2 is typically the dominant vibration mode for rifle barrels
+        self.barrel_frequency_hz = cantilever_frequency(
+            mode=2,
+            length=rifle.barrel_length_m,
+            E=STEEL_E,
+            I=self.barrel_second_moment_m4,
+            rho=STEEL_RHO,
+            A=self.barrel_section_area_m2,
+        )
+        self.obt_list_ms = [t * 1000.0 for t in ocw_barrel_times(self.barrel_frequency_hz, n_nodes=6)]
+
+    def with_overrides(self, **overrides) -> "CompiledLoadContext":
+        """Return a new context with some inputs replaced.
+
+        Accepts h_coeff, barrel_length_m, or any PowderParams field name.
+
+        Raises:
+            ValueError: On an unknown override name.
+        """
+        powder_fields = {f.name for f in fields(PowderParams)}
+        unknown = set(overrides) - powder_fields - {"h_coeff", "barrel_length_m"}
+        if unknown:
+            raise ValueError(f"Unknown simulation overrides: {sorted(unknown)}")
+
+        powder = replace(self.powder, **{k: v for k, v in overrides.items() if k in powder_fields})
+        rifle = self.rifle
+        if "barrel_length_m" in overrides:
+            rifle = replace(rifle, barrel_length_m=overrides["barrel_length_m"])
+        return CompiledLoadContext(
+            powder, self.bullet, self.cartridge, rifle,
+            h_coeff=overrides.get("h_coeff", self.h_coeff),
+            constants=self.constants,
+            extra_warnings=self.extra_warnings,
+            burn_model=self.burn_model,
+        )
+
+    def preflight(self, charge_mass_kg: float) -> PreflightResult:
+        """Screen one charge weight without integrating (see PreflightResult)."""
+        return _preflight(self, charge_mass_kg)
+
+    def run(self, charge_mass_kg: float, overrides: dict | None = None) -> SimResult:
+        """Simulate one charge weight.
+
+        Args:
+            charge_mass_kg: Powder charge (kg).
+            overrides: Optional per-run input overrides (see with_overrides()).
+        """
+        if overrides:
+            return self.with_overrides(**overrides).run(charge_mass_kg)
+        result = _run_compiled(self, LoadParams(charge_mass_kg=charge_mass_kg))
+        result.warnings.extend(self.extra_warnings)
+        if result.diagnostics.total_ms > SLOW_SIMULATION_MS:
+            log_slow_simulation(result.diagnostics, {
+                "powder": asdict(self.powder),
+                "bullet": asdict(self.bullet),
+                "cartridge": asdict(self.cartridge),
+                "rifle": asdict(self.rifle),
+                "charge_mass_kg": charge_mass_kg,
+                "h_coeff": self.h_coeff,
+                "constants": asdict(self.constants),
+                "burn_model": self.burn_model,
+            })
+        return result
+
+
 def simulate(
     powder: PowderParams,
     bullet: BulletParams,
     cartridge: CartridgeParams,
     rifle: RifleParams,
     load: LoadParams,
-    h_coeff: float = H_COEFF_DEFAULT,
+    h_coeff: float | None = None,
+    constants: ModelConstants | None = None,
+    burn_model: str = BURN_MODEL_Z,
 ) -> SimResult:
     """Run a complete internal ballistics simulation.
 
     Integrates the ODE system from ignition until the bullet exits the muzzle.
     Includes Thornhill-type convective heat loss to reduce adiabatic overprediction.
+    For repeated runs with the same components, build a CompiledLoadContext once.
+
+    Args:
+        h_coeff: Heat transfer coefficient override (default: constants.h_coeff).
+        constants: Global model constants (default: the loaded MODEL_CONSTANTS).
+        burn_model: BURN_MODEL_Z (default) or BURN_MODEL_PSI (GRT vivacity).
     """
-    warnings: list[str] = []
+    ctx = CompiledLoadContext(
+        powder, bullet, cartridge, rifle, h_coeff=h_coeff, constants=constants, burn_model=burn_model,
+    )
+    return ctx.run(load.charge_mass_kg)
 
-    bore_length = rifle.barrel_length_m - 0.051  # subtract approximate chamber length ~51mm
-    if bore_length <= 0:
-        bore_length = rifle.barrel_length_m * 0.9
 
-    omega = load.charge_mass_kg
-    m = bullet.mass_kg
-    bore_area = np.pi * (cartridge.bore_diameter_m / 2.0) ** 2
+def _preflight(ctx: CompiledLoadContext, omega: float) -> PreflightResult:
+    """Charge density checks and Noble-Abel pressure bounds for one charge."""
+    powder = ctx.powder
+    warnings: list[str] = []
+    verdict = PREFLIGHT_OK
 
-    # --- Charge density safety checks ---
-    charge_density = omega / cartridge.chamber_volume_m3
-    charge_unsafe = False
+    charge_density = omega / ctx.chamber_volume_m3
 
     # Check 1: Bulk fill ratio — can the powder physically fit in the case?
     # Solid grain density is ~1600 kg/m3, but bulk (packing) density is ~60% of that.
-    # Use 0.60 packing factor (typical for extruded/ball powder granules).
-    PACKING_FACTOR = 0.60
-    bulk_density = powder.density_kg_m3 * PACKING_FACTOR
-    powder_bulk_volume = omega / bulk_density
-    fill_ratio = powder_bulk_volume / cartridge.chamber_volume_m3
+    powder_bulk_volume = omega / ctx.bulk_density_kg_m3
+    fill_ratio = powder_bulk_volume / ctx.chamber_volume_m3
 
     if fill_ratio > 1.05:
         warnings.append(
             f"DANGER: Carga fisicamente imposible — el volumen de polvora ({fill_ratio*100:.0f}% de la capacidad de la vaina) "
             f"excede el espacio disponible. Esta carga NO puede ensamblarse de forma segura."
         )
-        charge_unsafe = True
+        verdict = PREFLIGHT_OVERFILLED
     elif fill_ratio > 0.90:
         warnings.append(
             f"ATENCION: Densidad de carga muy alta ({fill_ratio*100:.0f}% de llenado). "
             f"Las cargas comprimidas requieren extrema precaucion."
         )
+        verdict = PREFLIGHT_COMPRESSED
 
     # Check 2: Covolume check — does the gas have room to expand?
     if charge_density * powder.covolume_m3_kg > 0.95:
         warnings.append("Densidad de carga demasiado alta: el volumen de gas se aproxima a cero")
-        charge_unsafe = True
+        verdict = PREFLIGHT_IMPOSSIBLE
+
+    # --- Analytic bounds (breech pressure, complete combustion, no heat loss) ---
+    m = ctx.bullet.mass_kg
+    breech_ratio = lagrange_breech_pressure(lagrange_base_pressure(1.0, omega, m), omega, m)
+    upper_pa = noble_abel_pressure(omega, ctx.chamber_volume_m3, powder.covolume_m3_kg, powder.force_j_kg, 1.0)
+    bore_volume = ctx.chamber_volume_m3 + ctx.bore_area_m2 * ctx.bore_length_m
+    lower_pa = noble_abel_pressure(omega, bore_volume, powder.covolume_m3_kg, powder.force_j_kg, 1.0)
+    upper_psi = upper_pa * breech_ratio * PA_TO_PSI if np.isfinite(upper_pa) else None
+    lower_psi = lower_pa * breech_ratio * PA_TO_PSI
+
+    if verdict in (PREFLIGHT_OK, PREFLIGHT_COMPRESSED) and lower_psi > ctx.cartridge.saami_max_pressure_psi:
+        verdict = PREFLIGHT_OVERPRESSURE
+
+    return PreflightResult(
+        verdict=verdict,
+        fill_ratio=fill_ratio,
+        loading_density_kg_m3=charge_density,
+        pressure_upper_bound_psi=upper_psi,
+        pressure_lower_bound_psi=lower_psi,
+        warnings=warnings,
+    )
+
+
+def _run_compiled(ctx: CompiledLoadContext, load: LoadParams) -> SimResult:
+    """Integrate and post-process one charge for a compiled context."""
+    t_start = time.perf_counter()
+    diag = SimDiagnostics()
+    powder, bullet, cartridge, rifle = ctx.powder, ctx.bullet, ctx.cartridge, ctx.rifle
+    constants = ctx.constants
+    warnings: list[str] = []
+
+    bore_length = ctx.bore_length_m
+
+    omega = load.charge_mass_kg
+    m = bullet.mass_kg
+    bore_area = ctx.bore_area_m2
+
+    # --- Pre-flight: charge density checks and analytic bounds ---
+    preflight = _preflight(ctx, omega)
+    warnings.extend(preflight.warnings)
+    if preflight.verdict == PREFLIGHT_IMPOSSIBLE:
+        # No free gas volume: integrating would only produce a clamped,
+        # artificially low pressure, so return the verdict right away. The
+        # peak is reported as the analytic lower bound (as the powder search
+        # does for screened charges); the velocity is not computed.
+        diag.setup_ms = (time.perf_counter() - t_start) * 1000.0
+        return SimResult(
+            peak_pressure_psi=preflight.pressure_lower_bound_psi,
+            muzzle_velocity_fps=0.0,
+            pressure_curve=[],
+            velocity_curve=[],
+            barrel_time_ms=0.0,
+            is_safe=False,
+            warnings=warnings,
+            barrel_frequency_hz=ctx.barrel_frequency_hz,
+            optimal_barrel_times=list(ctx.obt_list_ms),
+            burn_curve=[],
+            energy_curve=[],
+            temperature_curve=[],
+            recoil_curve=[],
+            diagnostics=_finish_diagnostics(diag, t_start),
+            preflight=preflight,
+            burn_model=ctx.burn_model,
+        )
+
+    rhs = ctx.kernels.ignition(omega)
+
+    event_calls = 0
+    event_s = 0.0
+    crossed_at: float | None = None  # wall clock when a step first ends past an event
 
-    rhs, _, m_eff = _build_ode_system(powder, bullet, cartridge, load, h_coeff)
+    def _watch(crossing: float) -> float:
+        # A terminal crossing seen at a step end starts event location: SciPy
+        # builds the step's dense output, root-solves on it and returns.
+        nonlocal event_calls, crossed_at
+        event_calls += 1
+        if crossing >= 0.0 and crossed_at is None:
+            crossed_at = time.perf_counter()
+        return crossing
+
+    def _located() -> float:
+        nonlocal crossed_at
+        elapsed = time.perf_counter() - crossed_at if crossed_at is not None else 0.0
+        crossed_at = None
+        return elapsed
 
     def bullet_exits(t, y):
-        return y[1] - bore_length
+        return _watch(y[1] - bore_length)
     bullet_exits.terminal = True
     bullet_exits.direction = 1
 
+    def burnout(t, y):
+        return _watch(y[0] - 1.0)
+    burnout.terminal = True
+    burnout.direction = 1
+
+    def tail_exits(t, y):
+        return _watch(y[0] - bore_length)
+    tail_exits.terminal = True
+    tail_exits.direction = 1
+
     t_max = 0.010  # 10 ms max integration time
-    y0 = [Z_PRIMER, 0.0, 0.0, 0.0]  # [Z, x, v, Q_loss]
+    y0 = [ctx.initial_burn_state, 0.0, 0.0, 0.0]  # [Z (or psi), x, v, Q_loss]
 
+    t_integrate = time.perf_counter()
+    diag.setup_ms = (t_integrate - t_start) * 1000.0
+    atol = ATOL_SCALE_FRACTION * state_scales(ctx, omega)
     sol = solve_ivp(
         rhs,
         [0.0, t_max],
         y0,
         method="RK45",
-        events=bullet_exits,
-        max_step=1e-6,
-        rtol=1e-8,
-        atol=1e-10,
+        events=[bullet_exits, burnout],
+        max_step=MAX_STEP,
+        rtol=RTOL,
+        atol=atol,
         dense_output=True,
     )
-
-    if sol.status == -1:
-        warnings.append(f"Integration failed: {sol.message}")
+    event_s += _located()
+    diag.nfev = int(sol.nfev)
+    diag.steps = max(int(sol.t.size) - 1, 0)
+    diag.rejected_steps = rk45_rejected_steps(diag.nfev, diag.steps)
+
+    # Burnout before muzzle exit: continue on the reduced [x, v, Q_loss] system
+    tail = None
+    t_burnout = None
+    if sol.status == 1 and sol.t_events[0].size == 0:
+        t_burnout = float(sol.t_events[1][0])
+        _, x_b, v_b, Q_b = sol.y_events[1][0]
+        tail_rhs = ctx.kernels.tail(omega)
+        tail = solve_ivp(
+            tail_rhs,
+            [t_burnout, t_max],
+            [x_b, v_b, Q_b],
+            method="RK45",
+            events=tail_exits,
+            max_step=MAX_STEP,
+            rtol=RTOL,
+            atol=atol[1:],
+            dense_output=True,
+        )
+        event_s += _located()
+        tail_steps = max(int(tail.t.size) - 1, 0)
+        diag.nfev += int(tail.nfev)
+        diag.steps += tail_steps
+        diag.rejected_steps += rk45_rejected_steps(int(tail.nfev), tail_steps)
+        diag.tail_steps = tail_steps
+        diag.burnout_ms = t_burnout * 1000.0
+
+    t_post = time.perf_counter()
+    diag.integration_ms = (t_post - t_integrate) * 1000.0
+    diag.event_ms = event_s * 1000.0
+    diag.event_calls = event_calls
+
+    if sol.status == -1 or (tail is not None and tail.status == -1):
+        warnings.append(f"Integration failed: {(tail if sol.status != -1 else sol).message}")
         return SimResult(
             peak_pressure_psi=0.0,
             muzzle_velocity_fps=0.0,
@@ -314,111 +788,92 @@ def simulate(
             energy_curve=[],
             temperature_curve=[],
             recoil_curve=[],
+            diagnostics=_finish_diagnostics(diag, t_start),
+            preflight=preflight,
+            burn_model=ctx.burn_model,
         )
 
-    if sol.t_events[0].size > 0:
-        t_exit = float(sol.t_events[0][0])
+    final = tail if tail is not None else sol
+    if final.t_events[0].size > 0:
+        t_exit = float(final.t_events[0][0])
     else:
-        t_exit = float(sol.t[-1])
+        t_exit = float(final.t[-1])
         warnings.append("Bullet did not exit barrel within integration time")
 
     n_points = 200
     t_eval = np.linspace(0.0, t_exit, n_points)
     y_eval = sol.sol(t_eval)
+    if tail is not None:
+        after = t_eval > t_burnout
+        y_eval[0, after] = 1.0
+        y_eval[1:, after] = tail.sol(t_eval[after])
 
     Z_arr = y_eval[0]
     x_arr = y_eval[1]
     v_arr = y_eval[2]
     Q_arr = y_eval[3]
 
-    V0 = cartridge.chamber_volume_m3
+    V0 = ctx.chamber_volume_m3
     rho_p = powder.density_kg_m3
 
-    pressure_curve = []
-    velocity_curve = []
-    burn_curve = []
-    energy_curve = []
-    temperature_curve = []
-    recoil_curve = []
-    peak_pressure_pa = 0.0
-
     # Compute dZ/dt array via finite differences for burn progress chart
     dZ_dt_arr = np.gradient(Z_arr, t_eval)
 
-    for i in range(n_points):
-        Z_c = min(max(Z_arr[i], 0.0), 1.0)
-        if powder.has_3curve:
-            psi = form_function_3curve(Z_c, powder.z1, powder.z2, powder.bp, powder.br, powder.brp)
-        else:
-            psi = form_function(Z_c, powder.theta)
-        V_f = free_volume(V0, bore_area, x_arr[i], omega, rho_p, psi)
-
-        # Heat-loss-corrected pressure (same as ODE uses)
-        total_energy = powder.force_j_kg * omega * psi
-        effective_energy = max(total_energy - Q_arr[i], 0.0)
-        denom = V_f - omega * psi * powder.covolume_m3_kg
-        if denom <= 0.0:
-            denom = 1e-12
-        P_avg = effective_energy / denom
-
-        P_breech = lagrange_breech_pressure(
-            lagrange_base_pressure(P_avg, omega, m), omega, m
-        )
-
-        if P_breech > peak_pressure_pa:
-            peak_pressure_pa = P_breech
-
-        pressure_curve.append({
-            "t_ms": float(t_eval[i] * 1000.0),
-            "p_psi": float(P_breech * PA_TO_PSI),
-        })
-        velocity_curve.append({
-            "x_mm": float(x_arr[i] / MM_TO_M),
-            "v_fps": float(v_arr[i] * MPS_TO_FPS),
-        })
-
-        # --- Burn progress curve ---
-        burn_curve.append({
-            "t_ms": float(t_eval[i] * 1000.0),
-            "z": float(Z_c),
-            "dz_dt": float(dZ_dt_arr[i]),
-            "psi": float(psi),
-        })
-
-        # --- Energy / momentum curve ---
-        ke_j = 0.5 * m * v_arr[i] ** 2
-        momentum_ns = m * float(v_arr[i])
-        energy_curve.append({
-            "t_ms": float(t_eval[i] * 1000.0),
-            "x_mm": float(x_arr[i] / MM_TO_M),
-            "ke_j": float(ke_j),
-            "ke_ft_lbs": float(ke_j * J_TO_FT_LBS),
-            "momentum_ns": float(momentum_ns),
-        })
-
-        # --- Temperature / heat loss curve ---
-        gas_mass = omega * psi
-        if gas_mass > 0.0 and P_avg > 0.0:
-            V_corrected = V_f - gas_mass * powder.covolume_m3_kg
-            if V_corrected > 0.0:
-                T_gas = P_avg * V_corrected * GAS_MOLECULAR_WEIGHT / (gas_mass * 8.314)
-            else:
-                T_gas = powder.flame_temp_k
-        else:
-            T_gas = powder.flame_temp_k * psi  # scale with burn fraction before gas exists
-
-        temperature_curve.append({
-            "t_ms": float(t_eval[i] * 1000.0),
-            "t_gas_k": float(T_gas),
-            "q_loss_j": float(Q_arr[i]),
-        })
+    # All 200 samples at once with the array kernels
+    Z_c = np.clip(Z_arr, 0.0, 1.0)
+    if ctx.burn_model == BURN_MODEL_PSI:
+        psi = Z_c
+    elif ctx.use_3curve:
+        psi = form_function_3curve(Z_c, powder.z1, powder.z2, powder.bp, powder.br, powder.brp)
+    else:
+        psi = form_function(Z_c, powder.theta)
+    V_f = free_volume(V0, bore_area, x_arr, omega, rho_p, psi)
+
+    # Heat-loss-corrected pressure (same as ODE uses)
+    effective_energy = np.maximum(powder.force_j_kg * omega * psi - Q_arr, 0.0)
+    denom = V_f - omega * psi * powder.covolume_m3_kg
+    denom = np.where(denom <= 0.0, 1e-12, denom)
+    P_avg = effective_energy / denom
+    P_breech = lagrange_breech_pressure(lagrange_base_pressure(P_avg, omega, m), omega, m)
+    peak_pressure_pa = max(float(P_breech.max()), 0.0)
+
+    # Gas temperature; scales with burn fraction before gas exists
+    gas_mass = omega * psi
+    V_corrected = V_f - gas_mass * powder.covolume_m3_kg
+    with np.errstate(divide="ignore", invalid="ignore"):
+        T_eos = P_avg * V_corrected * GAS_MOLECULAR_WEIGHT / (gas_mass * 8.314)
+    T_gas = np.where(
+        (gas_mass > 0.0) & (P_avg > 0.0),
+        np.where(V_corrected > 0.0, T_eos, powder.flame_temp_k),
+        powder.flame_temp_k * psi,
+    )
 
-        # --- Recoil impulse curve ---
-        impulse_ns = m * float(v_arr[i]) + omega * psi * 1.75 * float(v_arr[i])
-        recoil_curve.append({
-            "t_ms": float(t_eval[i] * 1000.0),
-            "impulse_ns": float(impulse_ns),
-        })
+    ke_j = 0.5 * m * v_arr ** 2
+    t_ms = (t_eval * 1000.0).tolist()
+    x_mm = (x_arr / MM_TO_M).tolist()
+    p_psi = (P_breech * PA_TO_PSI).tolist()
+    v_fps = (v_arr * MPS_TO_FPS).tolist()
+    z_list, dz_list, psi_list = Z_c.tolist(), dZ_dt_arr.tolist(), psi.tolist()
+    ke_list, ke_ft_lbs = ke_j.tolist(), (ke_j * J_TO_FT_LBS).tolist()
+    momentum = (m * v_arr).tolist()
+    t_gas_list, q_list = T_gas.tolist(), Q_arr.tolist()
+    impulse = (m * v_arr + omega * psi * 1.75 * v_arr).tolist()
+
+    pressure_curve = [{"t_ms": t, "p_psi": p} for t, p in zip(t_ms, p_psi)]
+    velocity_curve = [{"x_mm": x, "v_fps": v} for x, v in zip(x_mm, v_fps)]
+    burn_curve = [
+        {"t_ms": t, "z": z, "dz_dt": dz, "psi": ps}
+        for t, z, dz, ps in zip(t_ms, z_list, dz_list, psi_list)
+    ]
+    energy_curve = [
+        {"t_ms": t, "x_mm": x, "ke_j": ke, "ke_ft_lbs": ke_ft, "momentum_ns": p}
+        for t, x, ke, ke_ft, p in zip(t_ms, x_mm, ke_list, ke_ft_lbs, momentum)
+    ]
+    temperature_curve = [
+        {"t_ms": t, "t_gas_k": tg, "q_loss_j": q}
+        for t, tg, q in zip(t_ms, t_gas_list, q_list)
+    ]
+    recoil_curve = [{"t_ms": t, "impulse_ns": i} for t, i in zip(t_ms, impulse)]
 
     peak_pressure_psi = peak_pressure_pa * PA_TO_PSI
     muzzle_velocity_fps = float(v_arr[-1] * MPS_TO_FPS)
@@ -437,16 +892,16 @@ def simulate(
             f"WARNING: Peak pressure at {ratio*100:.1f}% of SAAMI max"
         )
 
-    # Override safety for physically impossible or dangerous charge densities.
-    # The volume clamp (denom = 1e-12) produces artificially LOW pressure for
-    # overcharged loads, making them appear safe when they are catastrophically
-    # dangerous. Force is_safe=False regardless of computed pressure.
-    if charge_unsafe:
+    # An overfilled case cannot be assembled: unsafe regardless of computed pressure.
+    if preflight.charge_unsafe:
         is_safe = False
 
+    t_structural = time.perf_counter()
+    diag.postprocess_ms = (t_structural - t_post) * 1000.0
+
     # --- Structural calculations ---
-    inner_radius = cartridge.bore_diameter_m / 2.0
-    outer_radius = inner_radius + CASE_WALL_THICKNESS_M
+    inner_radius = ctx.case_inner_radius_m
+    outer_radius = ctx.case_outer_radius_m
 
     hoop_stress_pa = lame_hoop_stress(
         peak_pressure_pa, inner_radius, outer_radius, inner_radius
@@ -464,26 +919,9 @@ def simulate(
     )
     erosion_per_shot_mm = erosion_m / MM_TO_M
 
-    # --- Barrel harmonics ---
-    bore_radius = cartridge.bore_diameter_m / 2.0
-    barrel_outer_r = BARREL_OUTER_DIAMETER_M / 2.0
-    # Second moment of area for annular cross-section: I = pi/4 * (R_o^4 - R_i^4)
-    I_barrel = (np.pi / 4.0) * (barrel_outer_r**4 - bore_radius**4)
-    # Cross-section area
-    A_barrel = np.pi * (barrel_outer_r**2 - bore_radius**2)
-
-    # Mode 2 is typically the dominant vibration mode for rifle barrels
-    barrel_freq = cantilever_frequency(
-        mode=2,
-        length=rifle.barrel_length_m,
-        E=STEEL_E,
-        I=I_barrel,
-        rho=STEEL_RHO,
-        A=A_barrel,
-    )
-
-    obt_list_s = ocw_barrel_times(barrel_freq, n_nodes=6)
-    obt_list_ms = [t * 1000.0 for t in obt_list_s]
+    # --- Barrel harmonics (precomputed per context) ---
+    barrel_freq = ctx.barrel_frequency_hz
+    obt_list_ms = list(ctx.obt_list_ms)
 
     obt_match = any(
         abs(barrel_time_ms - obt_ms) <= OBT_TOLERANCE_MS
@@ -502,6 +940,7 @@ def simulate(
         recoil_energy_j = 0.0
     recoil_energy_ft_lbs = recoil_energy_j * J_TO_FT_LBS
     recoil_velocity_fps = recoil_velocity_mps * MPS_TO_FPS
+    diag.structural_ms = (time.perf_counter() - t_structural) * 1000.0
 
     return SimResult(
         peak_pressure_psi=peak_pressure_psi,
@@ -524,9 +963,17 @@ def simulate(
         energy_curve=energy_curve,
         temperature_curve=temperature_curve,
         recoil_curve=recoil_curve,
+        diagnostics=_finish_diagnostics(diag, t_start),
+        preflight=preflight,
+        burn_model=ctx.burn_model,
     )
 
 
+def _finish_diagnostics(diag: SimDiagnostics, t_start: float) -> SimDiagnostics:
+    diag.total_ms = (time.perf_counter() - t_start) * 1000.0
+    return diag
+
+
 def simulate_from_db(powder_row, bullet_row, cartridge_row, rifle_row, load_row) -> SimResult:
     """Convenience wrapper that converts DB model rows to simulation params."""
     powder = PowderParams(
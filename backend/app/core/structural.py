@@ -2,15 +2,17 @@
 
 import numpy as np
 
+from app.core.arrays import FloatOrArray, ignore_fp_errors, scalar_or_array
+
 R_UNIVERSAL = 8.314  # J/(mol*K)
 
 
 def lame_hoop_stress(
-    internal_pressure: float,
-    inner_radius: float,
-    outer_radius: float,
-    eval_radius: float,
-) -> float:
+    internal_pressure: FloatOrArray,
+    inner_radius: FloatOrArray,
+    outer_radius: FloatOrArray,
+    eval_radius: FloatOrArray,
+) -> FloatOrArray:
     """Calculate hoop (circumferential) stress using Lame's equations for thick cylinder.
 
     sigma_theta(r) = (P_i * r_i^2) / (r_o^2 - r_i^2) * (1 + r_o^2 / r^2)
@@ -26,19 +28,19 @@ def lame_hoop_stress(
     Returns:
         Hoop stress sigma_theta (Pa).
     """
-    ri2 = inner_radius ** 2
-    ro2 = outer_radius ** 2
-    r2 = eval_radius ** 2
-    return (internal_pressure * ri2 / (ro2 - ri2)) * (1.0 + ro2 / r2)
+    ri2 = np.square(inner_radius)
+    ro2 = np.square(outer_radius)
+    r2 = np.square(eval_radius)
+    return scalar_or_array((internal_pressure * ri2 / (ro2 - ri2)) * (1.0 + ro2 / r2))
 
 
 def case_expansion(
-    internal_pressure: float,
-    inner_radius: float,
-    outer_radius: float,
-    youngs_modulus: float,
-    poisson_ratio: float,
-) -> float:
+    internal_pressure: FloatOrArray,
+    inner_radius: FloatOrArray,
+    outer_radius: FloatOrArray,
+    youngs_modulus: FloatOrArray,
+    poisson_ratio: FloatOrArray,
+) -> FloatOrArray:
     """Calculate radial expansion of outer surface of a thick-walled cylinder.
 
     u_r(r_o) = (P_i * r_i^2 * r_o) / (E * (r_o^2 - r_i^2)) * ((1 - nu) + (1 + nu))
@@ -54,17 +56,17 @@ def case_expansion(
     Returns:
         Radial displacement of outer surface (m).
     """
-    ri2 = inner_radius ** 2
-    ro2 = outer_radius ** 2
-    return (internal_pressure * ri2 * outer_radius * 2.0) / (youngs_modulus * (ro2 - ri2))
+    ri2 = np.square(inner_radius)
+    ro2 = np.square(outer_radius)
+    return scalar_or_array((internal_pressure * ri2 * outer_radius * 2.0) / (youngs_modulus * (ro2 - ri2)))
 
 
 def lawton_erosion(
-    erosivity: float,
-    exposure_time: float,
-    activation_energy: float,
-    surface_temp: float,
-) -> float:
+    erosivity: FloatOrArray,
+    exposure_time: FloatOrArray,
+    activation_energy: FloatOrArray,
+    surface_temp: FloatOrArray,
+) -> FloatOrArray:
     """Calculate barrel erosion per shot using Lawton's Arrhenius model.
 
     W = E_r * sqrt(t_exp) * exp(-E_a / (R_u * T_surf))
@@ -78,6 +80,6 @@ def lawton_erosion(
     Returns:
         Erosion depth per shot W (m).
     """
-    if surface_temp <= 0.0:
-        return 0.0
-    return erosivity * np.sqrt(exposure_time) * np.exp(-activation_energy / (R_UNIVERSAL * surface_temp))
+    with ignore_fp_errors():
+        erosion = erosivity * np.sqrt(exposure_time) * np.exp(-np.divide(activation_energy, R_UNIVERSAL * np.asarray(surface_temp)))
+    return scalar_or_array(np.where(np.asarray(surface_temp) <= 0.0, 0.0, erosion))
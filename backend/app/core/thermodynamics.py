@@ -1,17 +1,22 @@
-"""Thermodynamics of propellant combustion: Noble-Abel EOS, Vieille burn rate, form function."""
+"""Thermodynamics of propellant combustion: Noble-Abel EOS, Vieille burn rate, form and vivacity functions."""
 
 import numpy as np
 
+from app.core.arrays import FloatOrArray, ignore_fp_errors, scalar_or_array
+
 R_UNIVERSAL = 8.314  # J/(mol*K)
 
+# GRT vivacity Ba is quoted per bar: d(psi)/dt = Ba * phi(psi) * P / 1 bar
+BA_PRESSURE_UNIT_PA = 1e5
+
 
 def noble_abel_pressure(
-    mass_gas: float,
-    volume: float,
-    covolume: float,
-    force: float,
-    fraction_burned: float,
-) -> float:
+    mass_gas: FloatOrArray,
+    volume: FloatOrArray,
+    covolume: FloatOrArray,
+    force: FloatOrArray,
+    fraction_burned: FloatOrArray,
+) -> FloatOrArray:
     """Calculate gas pressure using the Noble-Abel equation of state.
 
     P = f * omega * psi / (V_free - omega * psi * eta)
@@ -26,16 +31,14 @@ def noble_abel_pressure(
     Returns:
         Pressure in Pa.
     """
-    if fraction_burned <= 0.0:
-        return 0.0
     numerator = force * mass_gas * fraction_burned
     denominator = volume - mass_gas * fraction_burned * covolume
-    if denominator <= 0.0:
-        return np.inf
-    return numerator / denominator
+    with ignore_fp_errors():
+        pressure = np.where(denominator <= 0.0, np.inf, np.divide(numerator, denominator))
+    return scalar_or_array(np.where(fraction_burned <= 0.0, 0.0, pressure))
 
 
-def vieille_burn_rate(pressure: float, coeff_a: float, exponent_n: float) -> float:
+def vieille_burn_rate(pressure: FloatOrArray, coeff_a: FloatOrArray, exponent_n: FloatOrArray) -> FloatOrArray:
     """Calculate linear regression rate using Vieille's (Saint-Robert's) law.
 
     r_b = a1 * P^n
@@ -48,12 +51,12 @@ def vieille_burn_rate(pressure: float, coeff_a: float, exponent_n: float) -> flo
     Returns:
         Linear burn rate in m/s.
     """
-    if pressure <= 0.0:
-        return 0.0
-    return coeff_a * (pressure ** exponent_n)
+    with ignore_fp_errors():
+        rate = coeff_a * np.power(pressure, exponent_n)
+    return scalar_or_array(np.where(pressure <= 0.0, 0.0, rate))
 
 
-def form_function(z: float, theta: float) -> float:
+def form_function(z: FloatOrArray, theta: FloatOrArray) -> FloatOrArray:
     """Calculate fraction of propellant burned from normalized burn depth.
 
     psi(Z) = (theta + 1) * Z - theta * Z^2   for 0 <= Z <= 1
@@ -67,11 +70,29 @@ def form_function(z: float, theta: float) -> float:
     """
     z_clamped = np.clip(z, 0.0, 1.0)
     psi = (theta + 1.0) * z_clamped - theta * z_clamped ** 2
-    return float(np.clip(psi, 0.0, 1.0))
+    return scalar_or_array(np.clip(psi, 0.0, 1.0))
+
+
+def three_curve_levels(z1: FloatOrArray, z2: FloatOrArray, bp: FloatOrArray,
+                       br: FloatOrArray, brp: FloatOrArray) -> tuple:
+    """Unnormalized 3-curve burnt fraction psi_raw at z1, z2 and 1.0.
+
+    form_function_3curve() divides psi_raw by the last value (psi_total) so
+    that psi(1.0) = 1.0; a non-positive psi_total means no burning.
 
+    Returns:
+        Tuple of (psi_z1, psi_z2, psi_total).
+    """
+    psi_z1 = z1 + bp * z1 ** 2
+    dz12 = z2 - z1
+    psi_z2 = psi_z1 + dz12 + brp * dz12 * (z2 + z1)
+    dz_tail = 1.0 - z2
+    psi_total = psi_z2 + dz_tail + br * dz_tail * (1.0 + z2)
+    return psi_z1, psi_z2, psi_total
 
-def form_function_3curve(z: float, z1: float, z2: float,
-                         bp: float, br: float, brp: float) -> float:
+
+def form_function_3curve(z: FloatOrArray, z1: FloatOrArray, z2: FloatOrArray,
+                         bp: FloatOrArray, br: FloatOrArray, brp: FloatOrArray) -> FloatOrArray:
     """Three-phase piecewise form function for GRT-style 3-curve burn model.
 
     Divides combustion into three phases:
@@ -92,38 +113,106 @@ def form_function_3curve(z: float, z1: float, z2: float,
     Returns:
         Fraction burned psi (0 to 1).
     """
-    z_c = float(np.clip(z, 0.0, 1.0))
+    z_c = np.clip(z, 0.0, 1.0)
+    psi_z1, psi_z2, psi_total = three_curve_levels(z1, z2, bp, br, brp)
 
     # Phase 1: 0 to z1
-    psi_z1 = z1 + bp * z1 ** 2
-
-    if z_c <= z1:
-        psi_raw = z_c + bp * z_c ** 2
-    elif z_c <= z2:
-        # Phase 2: z1 to z2 (transition using brp)
-        dz = z_c - z1
-        psi_raw = psi_z1 + dz + brp * dz * (z_c + z1)
-    else:
-        # Phase 3: z2 to 1.0 (tail-off using br)
-        dz12 = z2 - z1
-        psi_z2 = psi_z1 + dz12 + brp * dz12 * (z2 + z1)
-        dz = z_c - z2
-        psi_raw = psi_z2 + dz + br * dz * (z_c + z2)
+    phase1 = z_c + bp * z_c ** 2
+    # Phase 2: z1 to z2 (transition using brp)
+    dz = z_c - z1
+    phase2 = psi_z1 + dz + brp * dz * (z_c + z1)
+    # Phase 3: z2 to 1.0 (tail-off using br)
+    dz = z_c - z2
+    phase3 = psi_z2 + dz + br * dz * (z_c + z2)
+    psi_raw = np.where(z_c <= z1, phase1, np.where(z_c <= z2, phase2, phase3))
 
     # Normalize so psi(1.0) = 1.0
-    # Compute psi_raw at z=1.0
-    dz12 = z2 - z1
-    psi_z2_total = psi_z1 + dz12 + brp * dz12 * (z2 + z1)
-    dz_tail = 1.0 - z2
-    psi_total = psi_z2_total + dz_tail + br * dz_tail * (1.0 + z2)
+    with ignore_fp_errors():
+        psi = np.clip(psi_raw / psi_total, 0.0, 1.0)
+    return scalar_or_array(np.where(psi_total <= 0.0, 0.0, psi))
+
+
+def vivacity_function(psi: FloatOrArray, theta: FloatOrArray) -> FloatOrArray:
+    """Shape of the GRT vivacity curve for the 2-curve grain form.
+
+    phi(psi) = sqrt((theta + 1)^2 - 4 * theta * psi)
+
+    The slope d(psi)/dZ of form_function() at the burn depth Z where it
+    reaches psi (the quadratic inverted), so the psi-state burn model
+    d(psi)/dt = Ba * P * phi(psi) follows the same grain geometry as the Z
+    model: with Ba * P / 1 bar equal to the Vieille rate dZ/dt the two give
+    the same psi(t).
 
-    if psi_total <= 0.0:
-        return 0.0
+    Args:
+        psi: Fraction of propellant burned (0 to 1).
+        theta: Grain form factor (positive=regressive, 0=neutral, negative=progressive).
+
+    Returns:
+        Relative vivacity phi (>= 0; unit mean over Z in 0..1).
+    """
+    psi_c = np.clip(psi, 0.0, 1.0)
+    return scalar_or_array(np.sqrt(np.maximum((theta + 1.0) ** 2 - 4.0 * theta * psi_c, 0.0)))
+
+
+def vivacity_3curve_terms(z1: FloatOrArray, z2: FloatOrArray, bp: FloatOrArray,
+                          br: FloatOrArray, brp: FloatOrArray) -> tuple:
+    """Phase breakpoints and coefficients of vivacity_function_3curve().
+
+    Within each form_function_3curve() phase, psi_raw = c + z + k * z^2 for
+    the phase's factor k (bp, brp, br), so its slope 1 + 2 * k * z equals
+    sqrt(1 + 4 * k * (psi_raw - c)). With psi_raw = psi * psi_total that is
+    sqrt(a + b * psi) per phase, divided by psi_total.
+
+    Returns:
+        Tuple of (psi at z1, psi at z2, ((a, b) for each of the three phases),
+        psi_total). A non-positive psi_total means no burning.
+    """
+    psi_z1, psi_z2, psi_total = three_curve_levels(z1, z2, bp, br, brp)
+    # psi_raw - c at each phase start: 0, z1 + brp * z1^2, z2 + br * z2^2
+    phases = (
+        (1.0, 4.0 * bp * psi_total),
+        (1.0 + 4.0 * brp * (z1 + brp * z1 ** 2 - psi_z1), 4.0 * brp * psi_total),
+        (1.0 + 4.0 * br * (z2 + br * z2 ** 2 - psi_z2), 4.0 * br * psi_total),
+    )
+    with ignore_fp_errors():
+        return np.divide(psi_z1, psi_total), np.divide(psi_z2, psi_total), phases, psi_total
+
+
+def vivacity_function_3curve(psi: FloatOrArray, z1: FloatOrArray, z2: FloatOrArray,
+                             bp: FloatOrArray, br: FloatOrArray, brp: FloatOrArray) -> FloatOrArray:
+    """Three-phase GRT vivacity curve, the psi-state counterpart of form_function_3curve().
+
+    phi(psi) is the slope d(psi)/dZ of form_function_3curve() at the burn
+    depth where it reaches psi, each phase inverted on its own
+    (vivacity_3curve_terms):
+      Phase 1 (psi <= psi(z1)):          sqrt(1 + 4 * bp * psi_raw) / psi_total
+      Phase 2 (psi(z1) < psi <= psi(z2)): likewise with brp, from z1
+      Phase 3 (psi > psi(z2)):           likewise with br, from z2
+
+    The phases switch at the burnt fractions reached at z1 and z2, not at z1
+    and z2 themselves. Assumes a form function increasing in every phase.
+
+    Args:
+        psi: Fraction of propellant burned (0 to 1).
+        z1: Phase 1/2 transition point (burn depth).
+        z2: Phase 2/3 transition point (burn depth).
+        bp: Progressivity factor.
+        br: Brisance factor.
+        brp: Combined progressivity/brisance factor.
+
+    Returns:
+        Relative vivacity phi (>= 0; unit mean over Z in 0..1).
+    """
+    psi_c = np.clip(psi, 0.0, 1.0)
+    psi_1, psi_2, ((a1, b1), (a2, b2), (a3, b3)), psi_total = vivacity_3curve_terms(z1, z2, bp, br, brp)
+    square = np.where(psi_c <= psi_1, a1 + b1 * psi_c, np.where(psi_c <= psi_2, a2 + b2 * psi_c, a3 + b3 * psi_c))
 
-    return float(np.clip(psi_raw / psi_total, 0.0, 1.0))
+    with ignore_fp_errors():
+        phi = np.sqrt(np.maximum(square, 0.0)) / psi_total
+    return scalar_or_array(np.where(psi_total <= 0.0, 0.0, phi))
 
 
-def flame_temperature(force: float, molecular_weight: float) -> float:
+def flame_temperature(force: FloatOrArray, molecular_weight: FloatOrArray) -> FloatOrArray:
     """Calculate adiabatic flame temperature from propellant force.
 
     T_v = f * M_g / R_u
@@ -135,4 +224,4 @@ def flame_temperature(force: float, molecular_weight: float) -> float:
     Returns:
         Adiabatic flame temperature T_v (K).
     """
-    return force * molecular_weight / R_UNIVERSAL
+    return scalar_or_array(np.multiply(force, molecular_weight) / R_UNIVERSAL)
@@ -15,6 +15,7 @@ class. Slow powders (H1000, Retumbo) use larger web_thickness (0.5mm) to
 reflect their physically larger grain geometry.
 """
 
+from app.core.model_constants import ModelConstants
 from app.core.solver import (
     BulletParams,
     CartridgeParams,
@@ -534,11 +535,12 @@ _add_load(
 # Helper: run a single validation load through the solver
 # ============================================================================
 
-def run_validation_load(load: dict) -> dict:
+def run_validation_load(load: dict, constants: ModelConstants | None = None) -> dict:
     """Run the solver for a reference load and return accuracy metrics.
 
     Args:
         load: A dict from VALIDATION_LOADS.
+        constants: Global model constants override (default: the solver's loaded constants).
 
     Returns:
         Dict with keys: load_id, caliber, bullet_desc, powder_name,
@@ -579,7 +581,7 @@ def run_validation_load(load: dict) -> dict:
         charge_mass_kg=load["charge_gr"] * GRAINS_TO_KG,
     )
 
-    result = simulate(powder, bullet, cartridge, rifle, load_params)
+    result = simulate(powder, bullet, cartridge, rifle, load_params, constants=constants)
 
     predicted = result.muzzle_velocity_fps
     published = load["published_velocity_fps"]
@@ -16,6 +16,8 @@ import app.models.cartridge  # noqa: F401
 import app.models.rifle  # noqa: F401
 import app.models.load  # noqa: F401
 import app.models.simulation  # noqa: F401
+import app.models.calibration  # noqa: F401
+import app.models.table_version  # noqa: F401
 
 # Alembic Config object
 config = context.config
@@ -0,0 +1,46 @@
+"""Add powder_calibrations table for chronograph-fitted powder parameters
+
+Revision ID: 012_powder_calibrations
+Revises: 011_rifle_groove_twist
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "012_powder_calibrations"
+down_revision: Union[str, None] = "011_rifle_groove_twist"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "powder_calibrations",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("powder_id", UUID(as_uuid=True), sa.ForeignKey("powders.id"), nullable=False),
+        sa.Column("bullet_id", UUID(as_uuid=True), sa.ForeignKey("bullets.id"), nullable=True),
+        sa.Column("rifle_id", UUID(as_uuid=True), sa.ForeignKey("rifles.id"), nullable=True),
+        sa.Column("scope", sa.String(10), nullable=False, server_default="rifle"),
+        sa.Column("burn_rate_coeff", sa.Float(), nullable=False),
+        sa.Column("force_constant_j_kg", sa.Float(), nullable=False),
+        sa.Column("h_coeff", sa.Float(), nullable=False),
+        sa.Column("fitted_parameters", sa.JSON(), nullable=False),
+        sa.Column("rms_residual_fps", sa.Float(), nullable=False),
+        sa.Column("point_count", sa.Integer(), nullable=False),
+        sa.Column("points", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_powder_calibrations_powder_id", "powder_calibrations", ["powder_id"])
+    op.create_index("ix_powder_calibrations_rifle_id", "powder_calibrations", ["rifle_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_powder_calibrations_rifle_id", table_name="powder_calibrations")
+    op.drop_index("ix_powder_calibrations_powder_id", table_name="powder_calibrations")
+    op.drop_table("powder_calibrations")
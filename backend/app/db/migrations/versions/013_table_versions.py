@@ -0,0 +1,33 @@
+"""Add table_versions write counters for the in-process catalog snapshot
+
+Revision ID: 013_table_versions
+Revises: 012_powder_calibrations
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "013_table_versions"
+down_revision: Union[str, None] = "012_powder_calibrations"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(50), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.bulk_insert(table_versions, [
+        {"table_name": name, "version": 0} for name in ("powders", "bullets", "cartridges")
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
@@ -0,0 +1,30 @@
+"""Add import_hash columns to powders, bullets and cartridges
+
+Revision ID: 014_import_hashes
+Revises: 013_table_versions
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "014_import_hashes"
+down_revision: Union[str, None] = "013_table_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("powders", "bullets", "cartridges")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("import_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_column(table, "import_hash")
@@ -0,0 +1,82 @@
+"""Store simulation_results pressure/velocity curves as packed float32 blobs
+
+The curves were JSON arrays of {t_ms, p_psi} / {x_mm, v_fps} objects; they
+become compressed columnar blobs (app.core.curve_codec), about a tenth of
+the size. Existing rows are converted in batches.
+
+Revision ID: 015_packed_curves
+Revises: 014_import_hashes
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON, UUID
+
+from app.core.curve_codec import PackedCurve, encode_curve
+
+
+# revision identifiers, used by Alembic.
+revision: str = "015_packed_curves"
+down_revision: Union[str, None] = "014_import_hashes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows converted per batch
+BATCH = 500
+
+_CURVES = {
+    "pressure_curve": {"t_ms": "ms", "p_psi": "psi"},
+    "velocity_curve": {"x_mm": "mm", "v_fps": "fps"},
+}
+
+
+def _convert(source_type, target_type, convert) -> None:
+    """Fill <curve>_new columns from <curve> for every row, keyset-paginated by id."""
+    columns = [sa.column("id", UUID(as_uuid=True))]
+    columns += [sa.column(name, source_type) for name in _CURVES]
+    columns += [sa.column(f"{name}_new", target_type) for name in _CURVES]
+    results = sa.table("simulation_results", *columns)
+    bind = op.get_bind()
+    update = (
+        results.update()
+        .where(results.c.id == sa.bindparam("row_id"))
+        .values({f"{name}_new": sa.bindparam(f"{name}_value") for name in _CURVES})
+    )
+
+    last = None
+    while True:
+        query = sa.select(results.c.id, *(results.c[name] for name in _CURVES)).order_by(results.c.id).limit(BATCH)
+        if last is not None:
+            query = query.where(results.c.id > last)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        bind.execute(update, [
+            {"row_id": row.id, **{f"{name}_value": convert(row._mapping[name], units) for name, units in _CURVES.items()}}
+            for row in rows
+        ])
+        last = rows[-1].id
+
+
+def _swap(target_type) -> None:
+    with op.batch_alter_table("simulation_results") as batch:
+        for name in _CURVES:
+            batch.drop_column(name)
+            batch.alter_column(f"{name}_new", new_column_name=name, existing_type=target_type, nullable=False)
+
+
+def upgrade() -> None:
+    for name in _CURVES:
+        op.add_column("simulation_results", sa.Column(f"{name}_new", sa.LargeBinary(), nullable=True))
+    _convert(JSON, sa.LargeBinary(), lambda points, units: encode_curve(points or [], units))
+    _swap(sa.LargeBinary())
+
+
+def downgrade() -> None:
+    for name in _CURVES:
+        op.add_column("simulation_results", sa.Column(f"{name}_new", JSON, nullable=True))
+    _convert(sa.LargeBinary(), JSON, lambda blob, units: PackedCurve(bytes(blob)).to_list())
+    _swap(JSON)
@@ -1,8 +1,45 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.core.metrics import DB_POOL_CHECKOUTS, DB_POOL_IN_USE, DB_POOL_WAIT
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout wait time.
+
+    SQLAlchemy has no event before a checkout starts, so the wait is timed
+    around _do_get, the pool implementation hook that blocks on a full pool
+    or opens a new connection (instrument_pool adds the other pool metrics).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_pool(async_engine: AsyncEngine) -> None:
+    """Count pool checkouts and connections in use through the pool's events."""
+    pool = async_engine.sync_engine.pool
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_IN_USE.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.dec()
+
 
-engine = create_async_engine(settings.database_url, echo=False)
+engine = create_async_engine(settings.database_url, echo=False, poolclass=InstrumentedPool)
+instrument_pool(engine)
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
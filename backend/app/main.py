@@ -1,12 +1,17 @@
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
 from app.api.router import api_router
+from app.config import settings
+from app.core.parallel import shutdown_executor
+from app.core.solver import MODEL_CONSTANTS, MODEL_CONSTANTS_VERSION
 from app.db.session import async_session_factory, engine
 from app.middleware import setup_middleware
 from app.models.base import Base
@@ -18,8 +23,12 @@ import app.models.cartridge  # noqa: F401
 import app.models.rifle  # noqa: F401
 import app.models.load  # noqa: F401
 import app.models.simulation  # noqa: F401
+import app.models.calibration  # noqa: F401
+import app.models.table_version  # noqa: F401
 
 from app.seed.initial_data import seed_initial_data
+from app.services.catalog import build_catalog
+from app.services.validation import compute_validation_report
 
 logger = logging.getLogger(__name__)
 
@@ -66,8 +75,30 @@ async def lifespan(app: FastAPI):
     async with async_session_factory() as session:
         await seed_initial_data(session)
 
+    # Load the powder/bullet/cartridge snapshot served to lists and simulations
+    async with async_session_factory() as session:
+        await build_catalog(session)
+
+    logger.info("Solver model constants v%d: %s", MODEL_CONSTANTS_VERSION, MODEL_CONSTANTS)
+
+    # Warm the validation report cache without delaying startup
+    precompute_task = None
+    if settings.validation_precompute:
+        precompute_task = asyncio.create_task(_precompute_validation())
+
     yield
 
+    if precompute_task is not None:
+        precompute_task.cancel()
+    shutdown_executor()
+
+
+async def _precompute_validation() -> None:
+    try:
+        await run_in_threadpool(compute_validation_report)
+    except Exception as e:
+        logger.warning("Validation report precompute failed: %s", e)
+
 
 app = FastAPI(
     title="Simulador de Balística de Precisión",
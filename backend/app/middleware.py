@@ -10,6 +10,8 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from app.core.metrics import HTTP_REQUEST_DURATION, RATE_LIMIT_REJECTIONS
+
 logger = logging.getLogger(__name__)
 
 # Rate limiter: keyed by client IP
@@ -29,12 +31,23 @@ def _add_cors_headers(response: JSONResponse, origin: str | None) -> JSONRespons
     return response
 
 
+def _route_label(request: Request) -> str:
+    """Route template (e.g. /api/v1/powders/{powder_id}) so metric labels stay bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def _rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    RATE_LIMIT_REJECTIONS.inc(route=_route_label(request))
+    return _rate_limit_exceeded_handler(request, exc)
+
+
 def setup_middleware(app: FastAPI) -> None:
     """Register all middleware and exception handlers on the app."""
 
     # -- SlowAPI rate limiting --
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_handler)
 
     # -- Global exception handler --
     @app.exception_handler(Exception)
@@ -46,11 +59,20 @@ def setup_middleware(app: FastAPI) -> None:
         )
         return _add_cors_headers(response, request.headers.get("origin"))
 
-    # -- Request timing header --
+    # -- Request timing header and latency histogram --
     @app.middleware("http")
     async def add_process_time_header(request: Request, call_next):
         start = time.perf_counter()
-        response = await call_next(request)
-        elapsed_ms = (time.perf_counter() - start) * 1000
-        response.headers["X-Process-Time-Ms"] = f"{elapsed_ms:.1f}"
+        try:
+            response = await call_next(request)
+        except Exception:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=request.method, route=_route_label(request), status="500",
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        response.headers["X-Process-Time-Ms"] = f"{elapsed * 1000:.1f}"
+        HTTP_REQUEST_DURATION.observe(
+            elapsed, method=request.method, route=_route_label(request), status=str(response.status_code),
+        )
         return response
@@ -1,9 +1,11 @@
 from app.models.base import Base
 from app.models.bullet import Bullet
+from app.models.calibration import PowderCalibration
 from app.models.cartridge import Cartridge
 from app.models.load import Load
 from app.models.powder import Powder
 from app.models.rifle import Rifle
 from app.models.simulation import SimulationResult
+from app.models.table_version import TableVersion
 
-__all__ = ["Base", "Powder", "Bullet", "Cartridge", "Rifle", "Load", "SimulationResult"]
+__all__ = ["Base", "Powder", "Bullet", "Cartridge", "Rifle", "Load", "SimulationResult", "PowderCalibration", "TableVersion"]
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import Base, UUIDMixin
+
+
+class PowderCalibration(UUIDMixin, Base):
+    """Powder parameters fitted to chronograph data.
+
+    scope='rifle' records apply to one powder in one rifle (rifle_id set);
+    scope='powder' records apply to the powder in any rifle (rifle_id NULL).
+    """
+
+    __tablename__ = "powder_calibrations"
+
+    powder_id = Column(UUID(as_uuid=True), ForeignKey("powders.id"), nullable=False, index=True)
+    bullet_id = Column(UUID(as_uuid=True), ForeignKey("bullets.id"), nullable=True)
+    rifle_id = Column(UUID(as_uuid=True), ForeignKey("rifles.id"), nullable=True, index=True)
+    scope = Column(String(10), nullable=False, default="rifle")
+
+    # Fitted (or carried-over) model parameters
+    burn_rate_coeff = Column(Float, nullable=False)
+    force_constant_j_kg = Column(Float, nullable=False)
+    h_coeff = Column(Float, nullable=False)
+
+    # Fit quality and the measured data it came from
+    fitted_parameters = Column(JSON, nullable=False, default=list)
+    rms_residual_fps = Column(Float, nullable=False)
+    point_count = Column(Integer, nullable=False)
+    points = Column(JSON, nullable=False, default=list)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
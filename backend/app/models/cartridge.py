@@ -33,3 +33,5 @@ class Cartridge(UUIDMixin, Base):
     data_source = Column(String(20), nullable=False, default="manual")
     quality_score = Column(Integer, nullable=False, default=0)
     caliber_family = Column(String(20), nullable=True)
+    # Hash of the import payload that last wrote the row (None after manual edits)
+    import_hash = Column(String(64), nullable=True)
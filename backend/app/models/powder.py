@@ -34,3 +34,5 @@ class Powder(UUIDMixin, Base):
     data_source = Column(String(20), nullable=False, default="manual")
     quality_score = Column(Integer, nullable=False, default=0)
     web_thickness_mm = Column(Float, nullable=True)
+    # Hash of the import payload that last wrote the row (None after manual edits)
+    import_hash = Column(String(64), nullable=True)
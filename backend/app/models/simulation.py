@@ -2,9 +2,13 @@ from datetime import datetime, timezone
 
 from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey
 from sqlalchemy.dialects.postgresql import JSON, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.models.base import Base, UUIDMixin
+from app.models.types import CurveBlob
+
+# Curves are read only when asked for: query.options(undefer_group(CURVES))
+CURVES = "curves"
 
 
 class SimulationResult(UUIDMixin, Base):
@@ -13,8 +17,8 @@ class SimulationResult(UUIDMixin, Base):
     load_id = Column(UUID(as_uuid=True), ForeignKey("loads.id"), nullable=False)
     peak_pressure_psi = Column(Float, nullable=False)
     muzzle_velocity_fps = Column(Float, nullable=False)
-    pressure_curve = Column(JSON, nullable=False)
-    velocity_curve = Column(JSON, nullable=False)
+    pressure_curve = deferred(Column(CurveBlob(("t_ms", "ms"), ("p_psi", "psi")), nullable=False), group=CURVES)
+    velocity_curve = deferred(Column(CurveBlob(("x_mm", "mm"), ("v_fps", "fps")), nullable=False), group=CURVES)
     barrel_time_ms = Column(Float, nullable=False)
     is_safe = Column(Boolean, nullable=False)
     warnings = Column(JSON, nullable=False, default=list)
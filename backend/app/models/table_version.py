@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """Write counter for a table, bumped in the same transaction as each change.
+
+    In-process caches tag their copy of a table with the version they read
+    and compare it with this row to detect writes from any process.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
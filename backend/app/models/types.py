@@ -0,0 +1,34 @@
+"""Custom column types."""
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.core.curve_codec import PackedCurve, encode_curve
+
+
+class CurveBlob(TypeDecorator):
+    """A curve stored as a compressed columnar blob (see app.core.curve_codec).
+
+    Binds a list of point dicts (or a PackedCurve read earlier) and loads a
+    PackedCurve, which decodes its points only when they are accessed.
+
+    Args:
+        *columns: (name, unit) pairs, in storage order.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, *columns: tuple[str, str]):
+        super().__init__()
+        self.columns = columns
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, PackedCurve):
+            return value.blob
+        return encode_curve(value, dict(self.columns))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else PackedCurve(bytes(value))
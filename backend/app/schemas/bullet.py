@@ -154,10 +154,14 @@ class BulletResponse(BaseModel):
 
 
 class PaginatedBulletResponse(BaseModel):
+    """page/size mode sets total and page; keyset mode sets next_cursor (total on request)."""
+
     items: list[BulletResponse]
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     size: int
+    next_cursor: str | None = None
+    total_exact: bool | None = None  # False when total is a planner estimate
 
 
 class BulletImportRequest(BaseModel):
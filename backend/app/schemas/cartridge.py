@@ -139,10 +139,14 @@ class CartridgeResponse(BaseModel):
 
 
 class PaginatedCartridgeResponse(BaseModel):
+    """page/size mode sets total and page; keyset mode sets next_cursor (total on request)."""
+
     items: list[CartridgeResponse]
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     size: int
+    next_cursor: str | None = None
+    total_exact: bool | None = None  # False when total is a planner estimate
 
 
 class CartridgeImportRequest(BaseModel):
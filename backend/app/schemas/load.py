@@ -37,3 +37,13 @@ class LoadResponse(BaseModel):
     notes: str | None
 
     model_config = {"from_attributes": True}
+
+
+class PaginatedLoadResponse(BaseModel):
+    """A keyset page of loads ordered by name; total only on request."""
+
+    items: list[LoadResponse]
+    total: int | None = None
+    size: int
+    next_cursor: str | None = None
+    total_exact: bool | None = None  # False when total is a planner estimate
@@ -16,8 +16,11 @@ class ImportResult(BaseModel):
     """Shared base schema for batch import results."""
     created: int = 0
     updated: int = 0
+    unchanged: int = Field(default=0, description="Existing records that already held the imported content")
     skipped: list[str] = Field(default_factory=list)
     errors: list[str] = Field(default_factory=list)
+    skipped_truncated: int = Field(default=0, description="Skipped records counted but not listed in skipped")
+    errors_truncated: int = Field(default=0, description="Errors counted but not listed in errors")
 
 
 class PowderCreate(BaseModel):
@@ -162,16 +165,39 @@ class PowderResponse(BaseModel):
 
 
 class PaginatedPowderResponse(BaseModel):
+    """page/size mode sets total and page; keyset mode sets next_cursor (total on request)."""
+
     items: list[PowderResponse]
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     size: int
+    next_cursor: str | None = None
+    total_exact: bool | None = None  # False when total is a planner estimate
 
 
 class GrtImportResult(BaseModel):
     created: list[PowderResponse] = Field(default_factory=list)
     updated: list[PowderResponse] = Field(default_factory=list)
+    unchanged: int = Field(default=0, description="Existing powders that already held the imported content")
     skipped: list[str] = Field(default_factory=list, description="Names skipped (already exist)")
     errors: list[str] = Field(default_factory=list, description="Parse/conversion errors")
     mode: str = "skip"
     aliases_linked: int = Field(default=0, description="Number of powders that got alias_group set from powder_aliases.json")
+
+
+class GrtImportProgress(BaseModel):
+    """One line of a streamed GRT import (POST /powders/import-grt/stream, NDJSON).
+
+    Counts are cumulative; errors and skipped hold only the names and messages
+    of the batch just committed. The last line has status 'done', or 'failed'
+    (batches before the failure stay imported).
+    """
+    status: str = "running"
+    files_total: int
+    files_done: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    aliases_linked: int = 0
+    skipped: list[str] = Field(default_factory=list)
+    errors: list[str] = Field(default_factory=list)
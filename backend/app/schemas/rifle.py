@@ -58,3 +58,13 @@ class RifleResponse(BaseModel):
     twist_direction: str | None = None
 
     model_config = {"from_attributes": True}
+
+
+class PaginatedRifleResponse(BaseModel):
+    """A keyset page of rifles ordered by name; total only on request."""
+
+    items: list[RifleResponse]
+    total: int | None = None
+    size: int
+    next_cursor: str | None = None
+    total_exact: bool | None = None  # False when total is a planner estimate
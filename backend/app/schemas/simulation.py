@@ -1,7 +1,13 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+# z: Vieille law on the normalized burn depth; psi: GRT vivacity Ba on the burnt fraction
+BurnModelName = Literal["z", "psi"]
+_BURN_MODEL_DESCRIPTION = "Burn model: z (Vieille law on burn depth) or psi (GRT vivacity Ba; GRT-imported powders only)"
 
 
 class SimulationRequest(BaseModel):
@@ -17,6 +23,7 @@ class LadderTestRequest(BaseModel):
     charge_start_grains: float = Field(gt=0, le=200)
     charge_end_grains: float = Field(gt=0, le=200)
     charge_step_grains: float = Field(gt=0, le=2.0)
+    burn_model: BurnModelName = Field(default="z", description=_BURN_MODEL_DESCRIPTION)
 
 
 class SimulationResultResponse(BaseModel):
@@ -55,11 +62,38 @@ class DirectSimulationRequest(BaseModel):
     coal_mm: float = Field(gt=0, le=200, description="Cartridge overall length (mm)")
     seating_depth_mm: float = Field(gt=0, le=50, description="Bullet seating depth (mm)")
     barrel_length_mm_override: float | None = Field(default=None, gt=100, le=1500, description="Optional barrel length override (mm). If provided, overrides the rifle's barrel length for this simulation only.")
+    burn_model: BurnModelName = Field(default="z", description=_BURN_MODEL_DESCRIPTION)
+
+
+class SimulationDiagnostics(BaseModel):
+    """Per-phase wall time (ms) and solver statistics of one simulation."""
+    setup_ms: float
+    integration_ms: float
+    event_ms: float = Field(description="Time locating the muzzle-exit and burnout crossings: dense-output evaluation and root solve (part of integration_ms)")
+    postprocess_ms: float
+    structural_ms: float
+    serialization_ms: float = 0.0
+    total_ms: float = Field(description="Solver wall time, excluding serialization")
+    nfev: int = Field(description="Right-hand-side evaluations")
+    steps: int = Field(description="Accepted integration steps")
+    rejected_steps: int
+    event_calls: int = Field(description="Event function evaluations (step-end checks and root solve)")
+    tail_steps: int = Field(0, description="Accepted steps on the post-burnout reduced system (part of steps)")
+    burnout_ms: float | None = Field(None, description="Time of powder burnout; null if the bullet exits first")
+
+
+class PreflightScreening(BaseModel):
+    """Charge screening computed before integrating (no ODE solve)."""
+    verdict: str = Field(description="ok, compressed, overpressure, overfilled or impossible")
+    fill_ratio: float = Field(description="Bulk powder volume / case volume")
+    loading_density_kg_m3: float
+    pressure_upper_bound_psi: float | None = Field(None, description="Closed-chamber breech pressure; null when the covolume fills the chamber")
+    pressure_lower_bound_psi: float = Field(description="Breech pressure with the gas filling the whole bore (a bound only when the powder burns out in the barrel)")
 
 
 class DirectSimulationResponse(BaseModel):
-    peak_pressure_psi: float
-    muzzle_velocity_fps: float
+    peak_pressure_psi: float = Field(description="Peak breech pressure; the analytic lower bound when preflight.verdict is impossible")
+    muzzle_velocity_fps: float = Field(description="0 when preflight.verdict is impossible (the charge is not integrated)")
     pressure_curve: list[dict]
     velocity_curve: list[dict]
     barrel_time_ms: float
@@ -78,6 +112,9 @@ class DirectSimulationResponse(BaseModel):
     energy_curve: list[dict] = []
     temperature_curve: list[dict] = []
     recoil_curve: list[dict] = []
+    preflight: PreflightScreening | None = None
+    burn_model: BurnModelName = "z"
+    diagnostics: SimulationDiagnostics | None = None  # only when requested with ?diagnostics=true
 
 
 class SensitivityRequest(BaseModel):
@@ -89,6 +126,7 @@ class SensitivityRequest(BaseModel):
     seating_depth_mm: float = Field(gt=0, le=50, description="Bullet seating depth (mm)")
     charge_delta_grains: float = Field(default=0.3, gt=0, le=5.0, description="Charge variation +/- (grains)")
     barrel_length_mm_override: float | None = Field(default=None, gt=100, le=1500, description="Optional barrel length override (mm)")
+    burn_model: BurnModelName = Field(default="z", description=_BURN_MODEL_DESCRIPTION)
 
 
 class SensitivityResponse(BaseModel):
@@ -119,8 +157,9 @@ class ParametricSearchRequest(BaseModel):
 class PowderChargeResult(BaseModel):
     charge_grains: float
     peak_pressure_psi: float
-    muzzle_velocity_fps: float
+    muzzle_velocity_fps: float | None = None  # null when screened out without integrating
     is_safe: bool
+    screened: bool = Field(False, description="Rejected by pre-flight screening (overfilled or impossible); peak_pressure_psi is the analytic lower bound")
 
 
 class PowderSearchResult(BaseModel):
@@ -177,3 +216,95 @@ class ValidationResponse(BaseModel):
     mean_error_pct: float
     max_error_pct: float
     worst_load_id: str
+    cached: bool = False  # True when served from the validation report cache
+    cache_key: str = ""   # corpus hash + solver version + model constants
+    compute_time_ms: float = 0.0  # wall time of the (possibly cached) corpus run
+
+
+# ============================================================
+# Chronograph calibration
+# ============================================================
+
+CalibrationParameterName = Literal["burn_rate_coeff", "force_constant_j_kg", "h_coeff"]
+
+
+class CalibrationPoint(BaseModel):
+    charge_grains: float = Field(gt=0, le=200, description="Powder charge (grains)")
+    velocity_fps: float = Field(gt=0, le=5000, description="Measured mean muzzle velocity (fps)")
+    shot_count: int | None = Field(default=None, ge=1, description="Shots averaged into velocity_fps (informative)")
+
+
+class CalibrationRequest(BaseModel):
+    powder_id: uuid.UUID
+    bullet_id: uuid.UUID
+    rifle_id: uuid.UUID
+    points: list[CalibrationPoint] = Field(min_length=1, max_length=40, description="Measured velocity per charge")
+    fit_parameters: list[CalibrationParameterName] = Field(
+        default=["burn_rate_coeff", "force_constant_j_kg", "h_coeff"],
+        min_length=1,
+        description="Parameters to fit; the rest stay at their stored values. "
+        "burn_rate_coeff only applies to the z burn model and is left out of the default under psi",
+    )
+    confidence_level: float = Field(default=0.95, gt=0.5, lt=1.0, description="Two-sided confidence level")
+    barrel_length_mm_override: float | None = Field(default=None, gt=100, le=1500, description="Optional barrel length override (mm)")
+    burn_model: BurnModelName = Field(default="z", description=_BURN_MODEL_DESCRIPTION)
+    save: bool = Field(default=False, description="Persist the fitted values as a calibration record")
+    scope: Literal["rifle", "powder"] = Field(default="rifle", description="Calibration applies to this rifle only, or to the powder in any rifle")
+
+    @model_validator(mode="after")
+    def check_enough_points(self):
+        if self.burn_model == "psi" and "burn_rate_coeff" in self.fit_parameters:
+            if "fit_parameters" in self.model_fields_set:
+                raise ValueError("burn_rate_coeff cannot be fitted under the psi burn model (Ba sets the burn rate)")
+            self.fit_parameters = [name for name in self.fit_parameters if name != "burn_rate_coeff"]
+        n_params = len(set(self.fit_parameters))
+        if len(self.points) < n_params:
+            raise ValueError(f"Need at least {n_params} measured charges to fit {n_params} parameters")
+        return self
+
+
+class FittedParameter(BaseModel):
+    name: str
+    initial_value: float
+    value: float
+    std_error: float | None = None
+    ci_lower: float | None = None
+    ci_upper: float | None = None
+
+
+class CalibrationPointResult(BaseModel):
+    charge_grains: float
+    measured_velocity_fps: float
+    predicted_velocity_fps: float
+    residual_fps: float
+
+
+class CalibrationResponse(BaseModel):
+    parameters: list[FittedParameter]
+    points: list[CalibrationPointResult]
+    rms_residual_fps: float
+    degrees_of_freedom: int
+    confidence_level: float
+    converged: bool
+    message: str
+    solver_runs: int
+    warnings: list[str] = []
+    calibration_id: uuid.UUID | None = None
+
+
+class PowderCalibrationResponse(BaseModel):
+    id: uuid.UUID
+    powder_id: uuid.UUID
+    bullet_id: uuid.UUID | None = None
+    rifle_id: uuid.UUID | None = None
+    scope: str
+    burn_rate_coeff: float
+    force_constant_j_kg: float
+    h_coeff: float
+    fitted_parameters: list[str]
+    rms_residual_fps: float
+    point_count: int
+    points: list[dict]
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
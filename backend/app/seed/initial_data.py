@@ -26,6 +26,7 @@ from app.models.bullet import Bullet
 from app.models.cartridge import Cartridge
 from app.models.powder import Powder
 from app.models.rifle import Rifle
+from app.services.catalog import bump_version
 from app.services.search import derive_caliber_family
 
 logger = logging.getLogger(__name__)
@@ -239,10 +240,13 @@ async def seed_initial_data(db: AsyncSession):
                     if p:
                         p.alias_group = group_name
 
+        await bump_version(db, "powders")
         logger.info("Seeded %d powders", len(powder_objects))
 
     # ---- Bullets (count-based threshold) ----
     bullet_count = await _seed_bullets(db)
+    if bullet_count:
+        await bump_version(db, "bullets")
 
     # ---- Rifles re-seed (replace old data if <= 5 rifles without chamber data) ----
     rifle_result = await db.execute(select(func.count()).select_from(Rifle))
@@ -336,6 +340,7 @@ async def seed_initial_data(db: AsyncSession):
             )
             db.add(rifle)
 
+        await bump_version(db, "cartridges")
         logger.info(
             "Seeded %d cartridges and %d rifles",
             len(cartridge_objects),
@@ -0,0 +1,203 @@
+"""Set-based upsert of catalog imports (bullets, cartridges, GRT powders).
+
+An import resolves collisions by name, case-insensitively:
+- no existing row: the item is inserted
+- existing user-created row (data_source='manual'): never modified; the item
+  is imported under a renamed copy (name + copy_suffix) instead
+- otherwise the mode decides: skip, overwrite (every imported column but the
+  name) or merge (only columns that are NULL on the existing row)
+
+Every written row stores a hash of the normalised payload that wrote it
+(import_hash; cleared by manual edits). Overwriting or merging a row with
+the payload it already holds changes nothing, so such rows are counted as
+unchanged and not written: re-running the same catalog sync is a read.
+
+Only the rows whose names occur in the import are read (one SELECT per
+LOOKUP_BATCH names), the plan is made on plain dicts, and the writes are two
+statements per batch: INSERT ... ON CONFLICT (name) DO NOTHING for new rows
+and INSERT ... ON CONFLICT (name) DO UPDATE ... WHERE data_source <> 'manual'
+for changed ones, both with RETURNING. The conflict clauses keep the rules
+when another writer gets in between the read and the write: a name inserted
+meanwhile is reported as skipped, and a row made manual meanwhile is left
+alone (also skipped).
+"""
+
+import hashlib
+import json
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import Row, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.powder import ImportMode
+from app.services.catalog import bump_version, invalidate
+
+# Names per lookup SELECT
+LOOKUP_BATCH = 1000
+# Bound parameters per write statement (asyncpg and SQLite both allow 32766)
+MAX_BIND_PARAMS = 30_000
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@dataclass
+class UpsertResult:
+    created: list[Row] = field(default_factory=list)  # written rows, all columns
+    updated: list[Row] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    unchanged: int = 0  # existing rows already holding the imported content
+
+
+def content_hash(values: dict, merged: bool = False) -> str:
+    """sha256 of an import payload: its columns except the name, as canonical JSON.
+
+    merged marks the hash of a row written by a merge, which holds the
+    payload's non-NULL values but may keep others of its own.
+    """
+    payload = json.dumps(
+        {k: v for k, v in values.items() if k != "name"}, sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(f"{'merge:' if merged else ''}{payload}".encode()).hexdigest()
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model,
+    items: list[dict],
+    mode: ImportMode,
+    *,
+    copy_suffix: str,
+    derive: Callable[[dict], None],
+    source: str | None = None,
+) -> UpsertResult:
+    """Import items into a catalog table, in the caller's transaction.
+
+    Args:
+        db: Async database session (the caller commits).
+        model: ORM class of a table with a unique `name` and a `data_source` column.
+        items: Imported records keyed by column name (other keys are ignored).
+        mode: Collision handling for existing non-manual rows.
+        copy_suffix: Appended to the name of copies made instead of touching
+            manual rows.
+        derive: Fills derived columns (caliber family, quality score, ...) of
+            a complete row before it is written; errors it raises are
+            reported per item.
+        source: data_source written on inserted, copied and overwritten rows;
+            None keeps the imported value.
+    """
+    table = model.__table__
+    columns = [c.key for c in table.columns]
+    defaults = {
+        c.key: c.default.arg for c in table.columns if c.default is not None and c.default.is_scalar
+    }
+    result = UpsertResult()
+
+    candidates = {item["name"] for item in items}
+    candidates |= {f"{name}{copy_suffix}" for name in candidates}
+    planned = await _existing_rows(db, table, candidates)
+    new_keys: dict[str, None] = {}  # ordered sets of planned keys
+    changed_keys: dict[str, None] = {}
+
+    for item in items:
+        try:
+            values = {k: v for k, v in item.items() if k in columns and k not in ("id", "import_hash")}
+            name = values["name"]
+            digest = content_hash(values)
+            target = planned.get(name.lower())
+            if target is not None and target["data_source"] == "manual":
+                # Never overwrite user data -- import a renamed copy
+                name = f"{name}{copy_suffix}"
+                target = planned.get(name.lower())
+                if target is not None and target["data_source"] == "manual":
+                    result.skipped.append(item["name"])
+                    continue
+
+            if target is None:
+                row = {**dict.fromkeys(columns), **defaults, **values, "id": uuid.uuid4(), "name": name}
+                if source is not None:
+                    row["data_source"] = source
+            elif mode == ImportMode.skip:
+                result.skipped.append(item["name"])
+                continue
+            elif target["import_hash"] == digest or (
+                mode == ImportMode.merge and target["import_hash"] == content_hash(values, merged=True)
+            ):
+                result.unchanged += 1
+                continue
+            elif mode == ImportMode.overwrite:
+                row = {**target, **{k: v for k, v in values.items() if k != "name"}}
+                if source is not None:
+                    row["data_source"] = source
+            else:  # merge
+                row = {**target, **{k: v for k, v in values.items() if target[k] is None and v is not None}}
+                digest = content_hash(values, merged=True)
+            row["import_hash"] = digest
+            derive(row)
+        except Exception as e:
+            result.errors.append(f"{item.get('name', '?')}: {e}")
+            continue
+
+        key = name.lower()
+        planned[key] = row
+        if target is None:
+            new_keys[key] = None
+        elif key not in new_keys:  # a row added earlier in this import stays an insert
+            changed_keys[key] = None
+
+    new_rows = [planned[key] for key in new_keys]
+    changed_rows = [planned[key] for key in changed_keys]
+    insert = _INSERTS[db.get_bind().dialect.name]
+    batch = max(1, MAX_BIND_PARAMS // len(columns))
+
+    for start in range(0, len(new_rows), batch):
+        rows = new_rows[start:start + batch]
+        stmt = insert(table).values(rows).on_conflict_do_nothing(index_elements=["name"]).returning(*table.c)
+        written = (await db.execute(stmt)).all()
+        result.created.extend(written)
+        inserted = {r.name for r in written}
+        result.skipped.extend(r["name"] for r in rows if r["name"] not in inserted)
+
+    for start in range(0, len(changed_rows), batch):
+        rows = changed_rows[start:start + batch]
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={key: stmt.excluded[key] for key in columns if key not in ("id", "name")},
+            where=table.c.data_source != "manual",
+        ).returning(*table.c)
+        written = (await db.execute(stmt)).all()
+        result.updated.extend(written)
+        updated = {r.name for r in written}
+        result.skipped.extend(r["name"] for r in rows if r["name"] not in updated)
+
+    return result
+
+
+async def commit_import(db: AsyncSession, table: str, result: UpsertResult) -> None:
+    """Commit one bulk_upsert batch, bumping the table version when it wrote rows."""
+    if not (result.created or result.updated):
+        await db.rollback()
+        return
+    version = await bump_version(db, table)
+    await db.commit()
+    invalidate(table, version)
+
+
+async def _existing_rows(db: AsyncSession, table, names: set[str]) -> dict[str, dict]:
+    """Rows whose name matches one of names case-insensitively, keyed by lowercased name."""
+    names = sorted(names)
+    rows = {}
+    for start in range(0, len(names), LOOKUP_BATCH):
+        chunk = names[start:start + LOOKUP_BATCH]
+        lowered = sorted({n.lower() for n in chunk})
+        # Exact names too: SQLite's lower() only folds ASCII
+        result = await db.execute(
+            select(table).where(or_(func.lower(table.c.name).in_(lowered), table.c.name.in_(chunk)))
+        )
+        for row in result:
+            rows.setdefault(row.name.lower(), dict(row._mapping))
+    return rows
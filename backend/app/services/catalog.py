@@ -0,0 +1,237 @@
+"""Versioned in-process snapshot of the powder, bullet and cartridge catalogs.
+
+These tables are mostly seed data, yet every list and simulation reads them.
+Each process keeps a read-only copy of every catalog table, tagged with the
+table's version from table_versions. Writers bump the version in the same
+transaction as their change (bump_version) and, once committed, patch or
+drop the local copy (apply_upsert / apply_delete / invalidate). Readers
+compare each snapshot with the database version on every read (one small
+query, or columns folded into a query the caller runs anyway) and reload a
+stale table, so writes committed by other worker processes are picked up.
+
+The last version each table was read or written at is also remembered with
+its timestamp (recent_version), so conditional GETs can be answered from
+memory: this process's own writes update it on commit, other processes'
+writes are seen once the remembered value is older than the caller allows.
+
+Snapshot rows are plain attribute records holding the column values; they
+are shared between requests and must not be modified. compile_context() and
+the response models read them like ORM rows. In-memory orderings use the
+database listings' sort key (app.services.pagination.sort_value).
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import record_cache_lookup
+from app.models.bullet import Bullet
+from app.models.cartridge import Cartridge
+from app.models.powder import Powder
+from app.models.table_version import TableVersion
+from app.services.pagination import sort_value
+
+logger = logging.getLogger(__name__)
+
+CATALOG_MODELS = {"powders": Powder, "bullets": Bullet, "cartridges": Cartridge}
+CATALOG_TABLES = tuple(CATALOG_MODELS)
+
+# A snapshot row: the table's column values as attributes
+CatalogRecord = SimpleNamespace
+
+
+@dataclass
+class TableSnapshot:
+    """All rows of one catalog table as of `version`."""
+
+    version: int
+    rows: dict[uuid.UUID, CatalogRecord]
+    _orders: dict[tuple[str, bool], list[CatalogRecord]] = field(default_factory=dict, repr=False)
+
+    def get(self, row_id: uuid.UUID | None) -> CatalogRecord | None:
+        return self.rows.get(row_id)
+
+    def sorted_rows(self, column: str, descending: bool = False) -> list[CatalogRecord]:
+        """Rows ordered by (sort_value(column), id), the keyset pagination order; memoised per ordering."""
+        key = (column, descending)
+        ordered = self._orders.get(key)
+        if ordered is None:
+            ordered = sorted(
+                self.rows.values(), key=lambda row: (sort_value(getattr(row, column)), row.id), reverse=descending,
+            )
+            self._orders[key] = ordered
+        return ordered
+
+
+_snapshots: dict[str, TableSnapshot] = {}
+# Last version seen per table: (version, time.monotonic() when read or committed)
+_known_versions: dict[str, tuple[int, float]] = {}
+
+
+def _remember_version(table: str, version: int, written: bool = False) -> None:
+    known = _known_versions.get(table)
+    if written and known is not None and known[0] > version:
+        return  # a read already saw a later write
+    _known_versions[table] = (version, time.monotonic())
+
+
+def catalog_record(row) -> CatalogRecord:
+    """Snapshot record with the column values of an ORM row."""
+    return SimpleNamespace(**{c.key: getattr(row, c.key) for c in row.__table__.columns})
+
+
+def version_columns(tables: tuple[str, ...] = CATALOG_TABLES) -> list:
+    """Scalar subqueries selecting each table's version, to add to a caller's query.
+
+    A table that has never been written has no row and selects NULL (version 0).
+    """
+    return [
+        select(TableVersion.version).where(TableVersion.table_name == table).scalar_subquery().label(f"{table}_version")
+        for table in tables
+    ]
+
+
+async def read_versions(db: AsyncSession, tables: tuple[str, ...] = CATALOG_TABLES) -> dict[str, int]:
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )
+    versions = dict(result.all())
+    versions = {table: versions.get(table, 0) for table in tables}
+    for table, version in versions.items():
+        _remember_version(table, version)
+    return versions
+
+
+async def table_version(db: AsyncSession, table: str) -> int:
+    return (await read_versions(db, (table,)))[table]
+
+
+async def recent_version(db: AsyncSession, table: str, max_age: float) -> int:
+    """A table's version, from memory if it was read or written less than max_age seconds ago."""
+    known = _known_versions.get(table)
+    if known is not None and time.monotonic() - known[1] < max_age:
+        return known[0]
+    return await table_version(db, table)
+
+
+async def bump_version(db: AsyncSession, table: str) -> int:
+    """Increment a table's version in the caller's transaction and return the new value.
+
+    Call before committing the change it covers. The row lock taken by the
+    UPDATE serializes concurrent writers of the same table until they commit.
+    """
+    result = await db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name == table)
+        .values(version=TableVersion.version + 1)
+        .returning(TableVersion.version)
+        .execution_options(synchronize_session=False)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        db.add(TableVersion(table_name=table, version=1))
+        await db.flush()
+        version = 1
+    return version
+
+
+async def _load_table(db: AsyncSession, table: str, version: int) -> TableSnapshot:
+    """Read every row of a table (as plain records, outside the session's identity map)."""
+    result = await db.execute(select(CATALOG_MODELS[table].__table__))
+    rows = {row.id: SimpleNamespace(**row._asdict()) for row in result}
+    return TableSnapshot(version=version, rows=rows)
+
+
+async def snapshots_at(db: AsyncSession, versions: dict[str, int | None]) -> dict[str, TableSnapshot]:
+    """Snapshots matching the given database versions, reloading the stale ones.
+
+    versions holds values read by the caller, e.g. through version_columns();
+    None (no table_versions row) means 0.
+    """
+    snapshots = {}
+    for table, version in versions.items():
+        version = version or 0
+        _remember_version(table, version)
+        snapshot = _snapshots.get(table)
+        hit = snapshot is not None and snapshot.version == version
+        record_cache_lookup(f"catalog_{table}", hit=hit)
+        if not hit:
+            snapshot = await _load_table(db, table, version)
+            _snapshots[table] = snapshot
+        snapshots[table] = snapshot
+    return snapshots
+
+
+async def catalog_table(db: AsyncSession, table: str) -> TableSnapshot:
+    """The current snapshot of one catalog table, checked against the database version."""
+    return (await snapshots_at(db, await read_versions(db, (table,))))[table]
+
+
+def _patch(table: str, version: int, change) -> None:
+    _remember_version(table, version, written=True)
+    snapshot = _snapshots.get(table)
+    if snapshot is None or snapshot.version >= version:
+        return  # not loaded yet, or already reloaded past this write
+    if snapshot.version != version - 1:
+        # Missed another process's write: reload on the next read
+        _snapshots.pop(table, None)
+        return
+    rows = dict(snapshot.rows)
+    change(rows)
+    _snapshots[table] = TableSnapshot(version=version, rows=rows)
+
+
+def apply_upsert(table: str, version: int, row) -> None:
+    """Patch a committed insert or update into the snapshot.
+
+    Args:
+        table: Catalog table name.
+        version: The value bump_version() returned for this write.
+        row: The refreshed ORM row.
+    """
+    record = catalog_record(row)
+    _patch(table, version, lambda rows: rows.__setitem__(record.id, record))
+
+
+def apply_delete(table: str, version: int, row_id: uuid.UUID) -> None:
+    """Remove a committed delete from the snapshot."""
+    _patch(table, version, lambda rows: rows.pop(row_id, None))
+
+
+def invalidate(table: str, version: int) -> None:
+    """Drop a table's snapshot after a committed bulk write; the next read reloads it."""
+    _remember_version(table, version, written=True)
+    _snapshots.pop(table, None)
+
+
+def clear_catalog() -> None:
+    _snapshots.clear()
+    _known_versions.clear()
+
+
+async def build_catalog(db: AsyncSession) -> None:
+    """Create missing version rows and load every catalog table (at startup)."""
+    existing = await _existing_version_rows(db)
+    missing = [table for table in CATALOG_TABLES if table not in existing]
+    if missing:
+        db.add_all(TableVersion(table_name=table, version=0) for table in missing)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()  # another worker created them first
+    snapshots = await snapshots_at(db, await read_versions(db))
+    logger.info(
+        "Catalog snapshot: %s",
+        ", ".join(f"{len(s.rows)} {table} (v{s.version})" for table, s in snapshots.items()),
+    )
+
+
+async def _existing_version_rows(db: AsyncSession) -> set[str]:
+    result = await db.execute(select(TableVersion.table_name).where(TableVersion.table_name.in_(CATALOG_TABLES)))
+    return set(result.scalars().all())
@@ -0,0 +1,93 @@
+"""Count strategies for paginated totals.
+
+Counting a filtered listing re-scans the whole filtered set, which used to
+double the cost of every list request. Two strategies replace the plain
+COUNT(*):
+
+- estimated_total(): unfiltered tables on PostgreSQL use the planner's row
+  estimate (pg_class.reltuples). Small tables, tables the planner has no
+  statistics for yet, and other databases (SQLite) get an exact count.
+- exact_total(): filtered queries are counted exactly, memoised per (table
+  version, filter signature) when the caller passes the version of a table
+  with a write counter (app.services.catalog). Any write bumps the version,
+  so a memoised total is never served after the rows changed.
+
+Each Total records whether its value is exact or an estimate.
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import record_cache_lookup
+
+# Below this many estimated rows an exact count is cheap and preferred
+ESTIMATE_MIN_ROWS = 10_000
+# Memoised filtered totals kept (least recently used evicted first)
+COUNT_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class Total:
+    value: int
+    exact: bool
+
+
+_count_cache: OrderedDict[tuple[str, int], int] = OrderedDict()
+
+
+async def _count(db: AsyncSession, query) -> int:
+    return (await db.execute(select(func.count()).select_from(query.subquery()))).scalar() or 0
+
+
+def filter_signature(db: AsyncSession, query) -> str:
+    """Stable hash of a query's SQL and bound filter values."""
+    compiled = query.compile(dialect=db.get_bind().dialect)
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return hashlib.sha256(f"{compiled}|{params}".encode()).hexdigest()
+
+
+async def exact_total(db: AsyncSession, query, version: int | None = None) -> Total:
+    """Exact COUNT(*) of a query, memoised when the table version is known.
+
+    Args:
+        db: Async database session.
+        query: Select statement (filters applied; ordering is ignored).
+        version: Current write counter of the queried table, or None to
+            always count.
+    """
+    if version is None:
+        return Total(await _count(db, query), exact=True)
+
+    key = (filter_signature(db, query), version)
+    value = _count_cache.get(key)
+    record_cache_lookup("filtered_count", hit=value is not None)
+    if value is None:
+        value = await _count(db, query)
+        _count_cache[key] = value
+        if len(_count_cache) > COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+    else:
+        _count_cache.move_to_end(key)
+    return Total(value, exact=True)
+
+
+async def estimated_total(db: AsyncSession, model) -> Total:
+    """Row count of a whole table: planner estimate on PostgreSQL, exact elsewhere."""
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": model.__tablename__},
+        )
+        estimate = result.scalar()
+        # reltuples is -1 (PostgreSQL 14+) or 0 before the first VACUUM/ANALYZE
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            return Total(int(estimate), exact=False)
+    return Total(await _count(db, select(model)), exact=True)
+
+
+def clear_count_cache() -> None:
+    _count_cache.clear()
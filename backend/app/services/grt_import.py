@@ -0,0 +1,129 @@
+"""Streaming import of GRT .propellant files and archives into the powder catalog.
+
+The upload is spooled to an anonymous temporary file, so its size is bounded
+by disk rather than memory. ZIP members are read lazily, CHUNK_FILES at a
+time, and parsed and converted (convert_propellant_member) off the event
+loop: in a worker thread, or in the solver process pool for chunks holding
+at least PARALLEL_MIN_BYTES of XML (typical .propellant files of a few kB
+parse faster than they can be shipped to another process). Each chunk is
+then upserted (bulk_upsert) and committed, so progress survives a failure
+later in the archive and every batch can be reported as it completes.
+"""
+
+import asyncio
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.grt_converter import convert_propellant_member
+from app.core.grt_parser import propellant_member_names
+from app.core.parallel import parallel_map
+from app.models.powder import Powder
+from app.schemas.powder import ImportMode
+from app.services.bulk_import import UpsertResult, bulk_upsert, commit_import
+
+# Files parsed, converted and committed per batch
+CHUNK_FILES = 250
+# XML per chunk from which parsing is spread over the process pool
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+# Bytes copied per read while spooling an upload
+SPOOL_READ_SIZE = 1024 * 1024
+
+
+class PropellantSource:
+    """The .propellant files of a spooled upload: one file, or the members of a ZIP."""
+
+    def __init__(self, spool: BinaryIO, filename: str):
+        self._spool = spool
+        self._archive: zipfile.ZipFile | None = None
+        if filename.lower().endswith(".zip"):
+            try:
+                self._archive = zipfile.ZipFile(spool)
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"Invalid ZIP file: {e}") from e
+            self.names = propellant_member_names(self._archive)
+        elif filename.lower().endswith(".propellant"):
+            self.names = [filename]
+        else:
+            raise ValueError("Unsupported file type. Use .propellant or .zip")
+
+    def read(self, name: str) -> bytes:
+        if self._archive is not None:
+            return self._archive.read(name)
+        self._spool.seek(0)
+        return self._spool.read()
+
+    def close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+        self._spool.close()
+
+
+@dataclass
+class GrtImportBatch:
+    """Outcome of one committed batch of files."""
+
+    files_done: int
+    files_total: int
+    result: UpsertResult  # errors include the batch's parse and conversion errors
+
+
+async def spool_upload(upload, filename: str) -> PropellantSource:
+    """Copy an upload (anything with an async read(size)) to disk and open it.
+
+    Raises:
+        ValueError: Empty, unsupported or unreadable file.
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        size = 0
+        while chunk := await upload.read(SPOOL_READ_SIZE):
+            size += len(chunk)
+            await asyncio.to_thread(spool.write, chunk)
+        if not size:
+            raise ValueError("Empty file")
+        spool.seek(0)
+        return await asyncio.to_thread(PropellantSource, spool, filename)
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _convert_chunk(source: PropellantSource, names: list[str]) -> list[tuple[dict | None, str | None]]:
+    members = [(name, source.read(name)) for name in names]
+    workers = None if sum(len(content) for _, content in members) >= PARALLEL_MIN_BYTES else 1
+    return parallel_map(convert_propellant_member, members, max_workers=workers)
+
+
+async def import_propellants(
+    db: AsyncSession,
+    source: PropellantSource,
+    mode: ImportMode,
+    derive: Callable[[dict], None],
+) -> AsyncIterator[GrtImportBatch]:
+    """Import every file of source, yielding after each committed batch.
+
+    Args:
+        db: Async database session; each batch is committed on it.
+        source: Spooled upload (see spool_upload); the caller closes it.
+        mode: Collision handling for existing powders.
+        derive: Fills derived powder columns (quality score, alias group)
+            before a row is written.
+    """
+    total = len(source.names)
+    for start in range(0, total, CHUNK_FILES):
+        names = source.names[start:start + CHUNK_FILES]
+        converted = await asyncio.to_thread(_convert_chunk, source, names)
+        items = [data for data, _ in converted if data is not None]
+        errors = [error for _, error in converted if error is not None]
+
+        result = await bulk_upsert(
+            db, Powder, items, mode, copy_suffix=" (GRT Import)", derive=derive, source="grt_community",
+        )
+        result.errors[:0] = errors
+        await commit_import(db, "powders", result)
+        yield GrtImportBatch(files_done=start + len(names), files_total=total, result=result)
@@ -0,0 +1,112 @@
+"""Catalog import from an NDJSON body (one JSON record per line), as it streams in.
+
+Lines are split off the request stream, validated one by one against the
+create schema, and every NDJSON_CHUNK valid records are upserted
+(bulk_upsert) and committed. Memory is bounded by one chunk of records plus
+one line (MAX_LINE_BYTES), whatever the size of the body. Invalid lines are
+reported by line number and do not stop the import; only the first
+MAX_REPORTED messages of each kind are kept, the rest are counted
+(errors_truncated / skipped_truncated), so a systematic error does not make
+the result grow with the input.
+"""
+
+from collections.abc import AsyncIterator, Callable
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.powder import ImportMode, ImportResult
+from app.services.bulk_import import bulk_upsert, commit_import
+
+# Valid records upserted and committed per batch
+NDJSON_CHUNK = 500
+# Longest accepted line; longer ones are reported and skipped unread
+MAX_LINE_BYTES = 1024 * 1024
+# Error and skip messages kept per import; later ones are only counted
+MAX_REPORTED = 100
+
+
+async def ndjson_lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes | None]]:
+    """(line number, line) pairs of a byte stream; the line is None when it exceeds MAX_LINE_BYTES."""
+    number = 0
+    pending = b""
+    oversized = False
+    async for chunk in body:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, None if oversized or len(line) > MAX_LINE_BYTES else line
+            oversized = False
+        if len(pending) > MAX_LINE_BYTES:
+            oversized, pending = True, b""
+    if pending or oversized:
+        yield number + 1, None if oversized else pending
+
+
+def _report(result: ImportResult, kind: str, messages: list[str]) -> None:
+    """Append messages to result.<kind> up to MAX_REPORTED, counting the overflow in <kind>_truncated."""
+    kept = getattr(result, kind)
+    room = max(MAX_REPORTED - len(kept), 0)
+    kept.extend(messages[:room])
+    overflow = max(len(messages) - room, 0)
+    setattr(result, f"{kind}_truncated", getattr(result, f"{kind}_truncated") + overflow)
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    )
+
+
+async def import_ndjson(
+    db: AsyncSession,
+    body: AsyncIterator[bytes],
+    schema: type[BaseModel],
+    model,
+    mode: ImportMode,
+    *,
+    derive: Callable[[dict], None],
+    copy_suffix: str = " (Import)",
+) -> ImportResult:
+    """Validate and import every record of an NDJSON body, committing each chunk.
+
+    Args:
+        db: Async database session; each chunk is committed on it.
+        body: The request body as a byte stream.
+        schema: Create schema each line is validated against.
+        model: Catalog ORM class (see bulk_upsert).
+        mode: Collision handling for existing rows.
+        derive: Fills derived columns before a row is written.
+        copy_suffix: Name suffix of copies made next to manual rows.
+    """
+    table = model.__tablename__
+    totals = ImportResult()
+    items: list[dict] = []
+
+    async def flush() -> None:
+        result = await bulk_upsert(db, model, items, mode, copy_suffix=copy_suffix, derive=derive)
+        await commit_import(db, table, result)
+        totals.created += len(result.created)
+        totals.updated += len(result.updated)
+        totals.unchanged += result.unchanged
+        _report(totals, "skipped", result.skipped)
+        _report(totals, "errors", result.errors)
+        items.clear()
+
+    async for number, line in ndjson_lines(body):
+        if line is None:
+            _report(totals, "errors", [f"line {number}: longer than {MAX_LINE_BYTES} bytes"])
+            continue
+        if not line.strip():
+            continue
+        try:
+            items.append(schema.model_validate_json(line).model_dump())
+        except ValidationError as e:
+            _report(totals, "errors", [f"line {number}: {_describe(e)}"])
+            continue
+        if len(items) >= NDJSON_CHUNK:
+            await flush()
+    if items:
+        await flush()
+    return totals
@@ -1,10 +1,37 @@
-"""Reusable async pagination helper for SQLAlchemy queries."""
+"""Reusable async pagination helpers for SQLAlchemy queries.
 
+Two modes:
+- page/size (paginate, paginate_rows): OFFSET/LIMIT with a total count.
+- keyset (paginate_keyset, keyset_rows): rows strictly after an opaque
+  cursor in (sort column, id) order, so deep pages cost the same as the
+  first. The total is only counted on request.
+
+Database totals come from app.services.counts (memoised exact counts, or
+planner estimates for whole tables); total_exact says which one a page has.
+
+Keyset sort columns must be NOT NULL; id breaks ties so the order is total.
+Text columns sort case-insensitively, on lower() in SQL and str.lower() in
+memory (sort_expression / sort_value), so database pages and pages of the
+in-process catalog snapshot come in the same order. Outside ASCII letters
+(accents, punctuation) a database collation other than C may still order
+a few names differently from the snapshot.
+"""
+
+import base64
+import binascii
+import json
+import uuid
 from dataclasses import dataclass
 
-from sqlalchemy import func, select
+from sqlalchemy import String, func, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.counts import Total, estimated_total, exact_total
+
+
+class InvalidCursor(ValueError):
+    """A cursor that cannot be decoded or was issued for another ordering."""
+
 
 @dataclass
 class PaginatedResult:
@@ -14,6 +41,18 @@ class PaginatedResult:
     total: int
     page: int
     size: int
+    total_exact: bool = True
+
+
+@dataclass
+class CursorPage:
+    """One keyset page; next_cursor is None on the last page."""
+
+    items: list
+    next_cursor: str | None
+    size: int
+    total: int | None = None
+    total_exact: bool | None = None
 
 
 async def paginate(
@@ -21,6 +60,7 @@ async def paginate(
     query,
     page: int = 1,
     size: int = 50,
+    version: int | None = None,
 ) -> PaginatedResult:
     """Wrap a SQLAlchemy query with count + offset/limit pagination.
 
@@ -29,15 +69,154 @@ async def paginate(
         query: SQLAlchemy select statement to paginate.
         page: 1-based page number (default 1).
         size: Items per page (default 50).
+        version: Write counter of the queried table; memoises the count.
 
     Returns:
         PaginatedResult with items, total count, page, and size.
     """
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
+    total = await exact_total(db, query, version)
 
     offset = (page - 1) * size
     result = await db.execute(query.offset(offset).limit(size))
     items = list(result.scalars().all())
 
-    return PaginatedResult(items=items, total=total, page=page, size=size)
+    return PaginatedResult(items=items, total=total.value, page=page, size=size, total_exact=total.exact)
+
+
+def paginate_rows(rows: list, page: int = 1, size: int = 50) -> PaginatedResult:
+    """Offset/limit pagination over an already ordered in-memory list."""
+    offset = (page - 1) * size
+    return PaginatedResult(items=rows[offset:offset + size], total=len(rows), page=page, size=size)
+
+
+def sort_expression(column):
+    """SQL sort key of a column (or bound value): lower() for text, the value itself otherwise."""
+    return func.lower(column) if isinstance(column.type, String) else column
+
+
+def sort_value(value):
+    """In-memory counterpart of sort_expression() for one value."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def order_by_sort(query, model, sort: str, descending: bool = False):
+    """Order a select over `model` by (sort_expression(sort column), id)."""
+    sort_col = sort_expression(getattr(model, sort))
+    if descending:
+        return query.order_by(sort_col.desc(), model.id.desc())
+    return query.order_by(sort_col.asc(), model.id.asc())
+
+
+def encode_cursor(sort: str, descending: bool, row) -> str:
+    """Opaque cursor pointing just past `row` in (sort, id) order."""
+    payload = {"s": sort, "d": descending, "v": getattr(row, sort), "id": row.id.hex}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool) -> tuple | None:
+    """(sort value, id) a cursor points past; None for the empty first-page cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or was issued for a different
+            sort column or direction.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        key = (payload["v"], uuid.UUID(hex=payload["id"]))
+        issued_for = (payload["s"], payload["d"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if issued_for != (sort, descending):
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return key
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    query,
+    model,
+    sort: str,
+    descending: bool = False,
+    cursor: str = "",
+    size: int = 50,
+    include_total: bool = False,
+    version: int | None = None,
+    estimate_total: bool = False,
+) -> CursorPage:
+    """Keyset pagination of a select over `model` ordered by (sort_expression(sort), id).
+
+    Args:
+        db: Async database session.
+        query: SQLAlchemy select statement with filters but no ORDER BY.
+        model: ORM model selected by the query (must have an id column).
+        sort: Name of a NOT NULL column to order by.
+        descending: Order direction for both sort and id.
+        cursor: next_cursor of the previous page, or "" for the first page.
+        size: Items per page.
+        include_total: Also count the rows matching the query's filters.
+        version: Write counter of the queried table; memoises the count.
+        estimate_total: The query is unfiltered: count with estimated_total().
+
+    Raises:
+        InvalidCursor: See decode_cursor().
+    """
+    after = decode_cursor(cursor, sort, descending)
+    total = None
+    if include_total:
+        total = await estimated_total(db, model) if estimate_total else await exact_total(db, query, version)
+
+    sort_col = getattr(model, sort)
+    if after is not None:
+        key = tuple_(sort_expression(sort_col), model.id)
+        bound = tuple_(sort_expression(literal(after[0], sort_col.type)), after[1])
+        query = query.where(key < bound if descending else key > bound)
+    query = order_by_sort(query, model, sort, descending)
+
+    result = await db.execute(query.limit(size + 1))
+    items = list(result.scalars().all())
+    return _cursor_page(items, sort, descending, size, total)
+
+
+def keyset_rows(
+    rows: list,
+    sort: str,
+    descending: bool = False,
+    cursor: str = "",
+    size: int = 50,
+    include_total: bool = False,
+) -> CursorPage:
+    """Keyset pagination over an in-memory list already ordered by (sort_value(sort), id).
+
+    Raises:
+        InvalidCursor: See decode_cursor().
+    """
+    after = decode_cursor(cursor, sort, descending)
+    start = 0
+    if after is not None:
+        after = (sort_value(after[0]), after[1])
+        # Binary search for the first row strictly past the cursor key
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = (sort_value(getattr(rows[mid], sort)), rows[mid].id)
+            if (key < after) if descending else (key > after):
+                hi = mid
+            else:
+                lo = mid + 1
+        start = lo
+    total = Total(len(rows), exact=True) if include_total else None
+    return _cursor_page(rows[start:start + size + 1], sort, descending, size, total)
+
+
+def _cursor_page(items: list, sort: str, descending: bool, size: int, total: Total | None) -> CursorPage:
+    """Trim the one look-ahead row and mint the cursor for the next page."""
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(sort, descending, items[-1])
+    if total is None:
+        return CursorPage(items=items, next_cursor=next_cursor, size=size)
+    return CursorPage(items=items, next_cursor=next_cursor, size=size, total=total.value, total_exact=total.exact)
@@ -0,0 +1,210 @@
+"""Loading and conversion of stored components to solver inputs.
+
+fetch_inputs() / fetch_load_inputs() resolve everything a simulation needs
+(a powder, bullet, rifle and the rifle's cartridge, optionally through a
+saved load) with one query for the rifle (and load) row plus the catalog
+versions; powders, bullets and cartridges come from the in-process catalog
+snapshot (app.services.catalog). compile_context() turns those rows (or any
+objects with the same attribute names, such as seed fixture entries) into a
+CompiledLoadContext. The API handlers and the offline batch CLI share it so
+both apply the same unit conversions and defaults.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, raiseload
+
+from app.core.solver import (
+    BURN_MODEL_Z,
+    GCM3_TO_KGM3,
+    GRAINS_TO_KG,
+    MM3_TO_M3,
+    MM_TO_M,
+    BulletParams,
+    CartridgeParams,
+    CompiledLoadContext,
+    PowderParams,
+    RifleParams,
+)
+from app.models.load import Load
+from app.models.rifle import Rifle
+from app.services.catalog import CATALOG_TABLES, CatalogRecord, TableSnapshot, snapshots_at, version_columns
+
+
+class SimulationInputNotFound(LookupError):
+    """A referenced load, powder, bullet, rifle or cartridge does not exist."""
+
+
+@dataclass
+class SimulationInputs:
+    """The rows one simulation request resolves to (catalog rows are snapshot records)."""
+
+    powder: CatalogRecord
+    bullet: CatalogRecord
+    cartridge: CatalogRecord
+    rifle: Rifle
+    load: Load | None = None
+
+    @property
+    def components(self) -> tuple[CatalogRecord, CatalogRecord, CatalogRecord, Rifle]:
+        """Rows in compile_context() argument order."""
+        return self.powder, self.bullet, self.cartridge, self.rifle
+
+
+def _checked_inputs(load, powder, bullet, rifle, cartridges: TableSnapshot) -> SimulationInputs:
+    """Build SimulationInputs from resolved rows, naming the first missing entity."""
+    for entity, row in (("Powder", powder), ("Bullet", bullet), ("Rifle", rifle)):
+        if row is None:
+            raise SimulationInputNotFound(f"{entity} not found")
+    cartridge = cartridges.get(rifle.cartridge_id)
+    if cartridge is None:
+        raise SimulationInputNotFound("Cartridge not found for rifle")
+    return SimulationInputs(powder=powder, bullet=bullet, cartridge=cartridge, rifle=rifle, load=load)
+
+
+async def _rifle_and_catalog(db: AsyncSession, rifle_id: uuid.UUID) -> tuple[Rifle | None, dict[str, TableSnapshot]]:
+    """A rifle (None if missing) and the catalog snapshots, read with one query.
+
+    The rifle is outer-joined to a one-row anchor so a missing rifle still
+    returns the catalog versions; stale snapshots are reloaded.
+    """
+    anchor = select(literal(1).label("anchor")).subquery()
+    stmt = (
+        select(Rifle, *version_columns())
+        .select_from(anchor)
+        .outerjoin(Rifle, Rifle.id == rifle_id)
+        .options(raiseload(Rifle.cartridge))
+    )
+    rifle, *versions = (await db.execute(stmt)).one()
+    return rifle, await snapshots_at(db, dict(zip(CATALOG_TABLES, versions)))
+
+
+async def fetch_inputs(
+    db: AsyncSession, powder_id: uuid.UUID, bullet_id: uuid.UUID, rifle_id: uuid.UUID,
+) -> SimulationInputs:
+    """Resolve a (powder, bullet, rifle) triple and the rifle's cartridge.
+
+    One query reads the rifle together with the catalog versions; the
+    catalog rows come from the snapshot (reloaded first if stale).
+
+    Raises:
+        SimulationInputNotFound: Naming the missing entity.
+    """
+    rifle, catalog = await _rifle_and_catalog(db, rifle_id)
+    return _checked_inputs(
+        None, catalog["powders"].get(powder_id), catalog["bullets"].get(bullet_id), rifle, catalog["cartridges"],
+    )
+
+
+async def fetch_search_inputs(
+    db: AsyncSession, rifle_id: uuid.UUID, bullet_id: uuid.UUID, cartridge_id: uuid.UUID,
+) -> tuple[Rifle, CatalogRecord, CatalogRecord, list[CatalogRecord]]:
+    """Resolve the fixed rifle, bullet and cartridge of a parametric search.
+
+    Returns:
+        (rifle, bullet, cartridge, powders), with every powder ordered by
+        name as GET /powders?sort=name lists them (case-insensitive).
+
+    Raises:
+        SimulationInputNotFound: Naming the missing entity.
+    """
+    rifle, catalog = await _rifle_and_catalog(db, rifle_id)
+    bullet, cartridge = catalog["bullets"].get(bullet_id), catalog["cartridges"].get(cartridge_id)
+    for entity, row in (("Rifle", rifle), ("Bullet", bullet), ("Cartridge", cartridge)):
+        if row is None:
+            raise SimulationInputNotFound(f"{entity} not found")
+    return rifle, bullet, cartridge, catalog["powders"].sorted_rows("name")
+
+
+async def fetch_load_inputs(db: AsyncSession, load_id: uuid.UUID) -> SimulationInputs:
+    """Resolve a saved load with its powder, bullet, rifle and cartridge.
+
+    One query reads the load, its rifle and the catalog versions; the
+    catalog rows come from the snapshot.
+
+    Raises:
+        SimulationInputNotFound: Naming the missing entity.
+    """
+    stmt = (
+        select(Load, *version_columns())
+        .outerjoin(Rifle, Rifle.id == Load.rifle_id)
+        .options(
+            raiseload(Load.powder),
+            raiseload(Load.bullet),
+            contains_eager(Load.rifle).raiseload(Rifle.cartridge),
+        )
+        .where(Load.id == load_id)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise SimulationInputNotFound("Load not found")
+    load, *versions = row
+    catalog = await snapshots_at(db, dict(zip(CATALOG_TABLES, versions)))
+    return _checked_inputs(
+        load, catalog["powders"].get(load.powder_id), catalog["bullets"].get(load.bullet_id), load.rifle,
+        catalog["cartridges"],
+    )
+
+
+def compile_context(
+    powder_row, bullet_row, cartridge_row, rifle_row, barrel_length_mm_override: float | None = None,
+    burn_model: str = BURN_MODEL_Z,
+) -> CompiledLoadContext:
+    """Convert DB rows to a CompiledLoadContext, reusable for every charge weight.
+
+    Unit conversions, the default web-thickness warning and all charge-independent
+    derived quantities are computed once here; call ctx.run(charge_kg) per charge.
+
+    Raises:
+        ValueError: If burn_model is "psi" and the powder has no GRT vivacity (ba).
+    """
+    extra_warnings: list[str] = []
+    case_capacity_m3 = cartridge_row.case_capacity_grains_h2o * GRAINS_TO_KG / 1000.0
+    chamber_vol = rifle_row.chamber_volume_mm3 * MM3_TO_M3 if rifle_row.chamber_volume_mm3 > 0 else case_capacity_m3
+
+    # Read per-powder web_thickness from DB, with fallback to legacy default
+    if powder_row.web_thickness_mm is not None:
+        web_thickness_m = powder_row.web_thickness_mm * 0.001
+    else:
+        web_thickness_m = 0.0004  # legacy default
+        extra_warnings.append(
+            "Usando espesor de alma predeterminado (0.4 mm). "
+            "Para mayor precision, configure web_thickness en la polvora."
+        )
+
+    powder = PowderParams(
+        force_j_kg=powder_row.force_constant_j_kg,
+        covolume_m3_kg=powder_row.covolume_m3_kg,
+        burn_rate_coeff=powder_row.burn_rate_coeff,
+        burn_rate_exp=powder_row.burn_rate_exp,
+        gamma=powder_row.gamma,
+        density_kg_m3=powder_row.density_g_cm3 * GCM3_TO_KGM3,
+        flame_temp_k=powder_row.flame_temp_k,
+        web_thickness_m=web_thickness_m,
+        # 3-curve fields (None if not present -> 2-curve fallback)
+        ba=powder_row.ba,
+        bp=powder_row.bp,
+        br=powder_row.br,
+        brp=powder_row.brp,
+        z1=powder_row.z1,
+        z2=powder_row.z2,
+    )
+    bullet = BulletParams(
+        mass_kg=bullet_row.weight_grains * GRAINS_TO_KG,
+        diameter_m=bullet_row.diameter_mm * MM_TO_M,
+    )
+    cart = CartridgeParams(
+        saami_max_pressure_psi=cartridge_row.saami_max_pressure_psi,
+        chamber_volume_m3=chamber_vol,
+        bore_diameter_m=cartridge_row.bore_diameter_mm * MM_TO_M,
+    )
+    barrel_length_m = (barrel_length_mm_override * MM_TO_M) if barrel_length_mm_override else (rifle_row.barrel_length_mm * MM_TO_M)
+    rif = RifleParams(
+        barrel_length_m=barrel_length_m,
+        twist_rate_m=rifle_row.twist_rate_mm * MM_TO_M,
+        rifle_mass_kg=rifle_row.weight_kg if rifle_row.weight_kg else 3.5,
+    )
+    return CompiledLoadContext(powder, bullet, cart, rif, extra_warnings=extra_warnings, burn_model=burn_model)
@@ -0,0 +1,100 @@
+"""Cached, parallel runner for the validation corpus.
+
+The corpus (app.core.validation_loads) is only re-simulated when its content,
+the solver version or the loaded model constants change; otherwise the report
+is served from an in-process cache keyed on all three. Loads run through the
+shared solver process pool.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from app.core.metrics import record_cache_lookup
+from app.core.parallel import parallel_map
+from app.core.solver import MODEL_CONSTANTS, SOLVER_VERSION
+from app.core.validation_loads import VALIDATION_LOADS, run_validation_load
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ValidationReport:
+    """Per-load results of one full corpus run."""
+
+    cache_key: str
+    results: list[dict]
+    elapsed_ms: float
+
+
+_cache: dict[str, ValidationReport] = {}
+# Serializes corpus runs so concurrent callers wait for one computation
+_lock = threading.Lock()
+
+
+def corpus_hash(loads: list[dict] = VALIDATION_LOADS) -> str:
+    """Stable SHA-256 of the corpus definition (order-sensitive)."""
+    payload = json.dumps(loads, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def validation_cache_key() -> str:
+    """Cache key: corpus hash + solver version + model constants."""
+    constants = json.dumps(asdict(MODEL_CONSTANTS), sort_keys=True).encode()
+    return f"{corpus_hash()[:16]}-s{SOLVER_VERSION}-c{hashlib.sha256(constants).hexdigest()[:8]}"
+
+
+def get_cached_report() -> ValidationReport | None:
+    """Return the report for the current cache key if it has been computed."""
+    return _cache.get(validation_cache_key())
+
+
+def compute_validation_report(max_workers: int | None = None) -> tuple[ValidationReport, bool]:
+    """Return the corpus report, simulating it only on a cache miss.
+
+    Blocking: call from a worker thread (run_in_threadpool) in async code.
+
+    Args:
+        max_workers: Override for the process pool size.
+
+    Returns:
+        Tuple of (report, cached) where cached is True if no simulation ran.
+    """
+    key = validation_cache_key()
+    report = _cache.get(key)
+    if report is not None:
+        record_cache_lookup("validation_report", hit=True)
+        return report, True
+
+    with _lock:
+        report = _cache.get(key)
+        # A caller that waited on another's computation still counts as a hit
+        record_cache_lookup("validation_report", hit=report is not None)
+        if report is not None:
+            return report, True
+
+        start = time.perf_counter()
+        results = parallel_map(run_validation_load, VALIDATION_LOADS, max_workers)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        report = ValidationReport(cache_key=key, results=results, elapsed_ms=round(elapsed_ms, 1))
+        _cache.clear()  # only the current key can ever be requested again
+        _cache[key] = report
+
+    logger.info("Validation corpus: %d loads in %.0f ms (key %s)", len(results), elapsed_ms, key)
+    return report, False
+
+
+def filter_results(results: list[dict], caliber: str | None = None, powder: str | None = None) -> list[dict]:
+    """Filter report rows by caliber (exact, case-insensitive) and powder name (substring)."""
+    if caliber:
+        results = [r for r in results if r["caliber"].lower() == caliber.lower()]
+    if powder:
+        results = [r for r in results if powder.lower() in r["powder_name"].lower()]
+    return results
+
+
+def clear_validation_cache() -> None:
+    _cache.clear()
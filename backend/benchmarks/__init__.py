@@ -0,0 +1,14 @@
+"""Solver and import-pipeline benchmark suite.
+
+Run from backend/:
+
+  python -m benchmarks run --output benchmarks/results/current.json
+  python -m benchmarks run --only single_2curve ladder_40 --baseline benchmarks/results/baseline.json
+  python -m benchmarks compare benchmarks/results/baseline.json benchmarks/results/current.json
+
+Every workload is fixed and seeded, so two runs on the same machine differ only
+by timing noise. For each workload the suite records wall time (min and median
+over --repeat runs), solver statistics (solve_ivp calls, RHS evaluations,
+accepted steps) and peak traced memory, and writes them to a JSON baseline.
+API workloads run against an in-memory SQLite database.
+"""
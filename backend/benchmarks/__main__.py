@@ -0,0 +1,115 @@
+"""Entry point for `python -m benchmarks` (run from backend/)."""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Hermetic: API workloads use their own in-memory database
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+
+from benchmarks.burn_models import compare_burn_models, format_summary, runs_as_dicts, summarize  # noqa: E402
+from benchmarks.harness import build_baseline, compare_baselines, format_comparison, measure  # noqa: E402
+from benchmarks.workloads import WORKLOADS  # noqa: E402
+
+DEFAULT_SEED = 20240601
+
+
+def _load(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    names = args.only or list(WORKLOADS)
+    unknown = set(names) - set(WORKLOADS)
+    if unknown:
+        print(f"Unknown workloads: {sorted(unknown)}; available: {list(WORKLOADS)}", file=sys.stderr)
+        return 2
+
+    results = []
+    for name in names:
+        workload = WORKLOADS[name]
+        print(f"[{name}] {workload.description}", flush=True)
+        result = measure(workload, seed=args.seed, repeat=args.repeat, trace_memory=not args.no_memory)
+        stats = result.to_dict()
+        print(
+            f"    {stats['wall_s_min']:.3f} s min / {stats['wall_s_median']:.3f} s median, "
+            f"{stats['items']} items, nfev={stats['nfev']}, steps={stats['steps']}, "
+            f"peak={stats['peak_memory_mb']} MB",
+            flush=True,
+        )
+        results.append(result)
+
+    baseline = build_baseline(results, seed=args.seed, repeat=args.repeat)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        comparisons = compare_baselines(_load(args.baseline), baseline, threshold=args.threshold)
+        print(format_comparison(comparisons))
+        if any(c.regression for c in comparisons):
+            return 1
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    comparisons = compare_baselines(_load(args.baseline), _load(args.current), threshold=args.threshold)
+    print(format_comparison(comparisons))
+    return 1 if any(c.regression for c in comparisons) else 0
+
+
+def cmd_burn_models(args: argparse.Namespace) -> int:
+    runs = compare_burn_models(seed=args.seed, n_powders=args.powders, charge_gr=args.charge_gr)
+    summary = summarize(runs)
+    print(format_summary(summary))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "charge_gr": args.charge_gr, "summary": summary, "runs": runs_as_dicts(runs)},
+                      f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.output}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Solver benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run workloads and record a baseline")
+    run.add_argument("--only", nargs="+", metavar="WORKLOAD", help=f"Subset of: {', '.join(WORKLOADS)}")
+    run.add_argument("--repeat", type=int, default=3, help="Timed runs per workload (default 3)")
+    run.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for synthetic workloads")
+    run.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory pass")
+    run.add_argument("--output", type=Path, help="Write the baseline JSON here")
+    run.add_argument("--baseline", type=Path, help="Compare against this previous baseline")
+    run.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as regression")
+    run.set_defaults(handler=cmd_run)
+
+    compare = subparsers.add_parser("compare", help="Compare two recorded baselines")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as regression")
+    compare.set_defaults(handler=cmd_compare)
+
+    burn = subparsers.add_parser("burn-models", help="Psi-state vs Z burn model on GRT-sourced powders")
+    burn.add_argument("--powders", type=int, default=24, help="Synthetic GRT powders (default 24)")
+    burn.add_argument("--charge-gr", type=float, default=40.0, help=".308 Win charge weight (default 40 gr)")
+    burn.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the synthetic powders")
+    burn.add_argument("--output", type=Path, help="Write per-powder runs and the summary as JSON")
+    burn.set_defaults(handler=cmd_burn_models)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
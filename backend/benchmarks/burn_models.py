@@ -0,0 +1,146 @@
+"""Speed and accuracy of the psi-state burn model against the Z model.
+
+Both models run on the same GRT-sourced powders (workloads.grt_powders). For
+each model and powder this records solver time and RHS evaluations at the
+production tolerances, and the numerical error of the muzzle velocity and
+barrel time against the same model integrated in one phase with the
+reference RHS at REFERENCE_RTOL. The psi - Z velocity and pressure deltas
+show how far the Vieille conversion of the GRT vivacity moves the result.
+"""
+
+import random
+import statistics
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from app.core.kernels import BURN_MODEL_PSI, BURN_MODEL_Z, BURN_MODELS
+from app.core.solver import (
+    GRAINS_TO_KG,
+    MAX_STEP,
+    MPS_TO_FPS,
+    CompiledLoadContext,
+    LoadParams,
+    _build_ode_system,
+    state_scales,
+)
+from benchmarks.workloads import GRT_CHARGE_GR, _308_components, grt_powders
+
+REFERENCE_RTOL = 1e-11
+REFERENCE_ATOL_FRACTION = 1e-13
+TIMED_RUNS = 3
+
+
+@dataclass
+class BurnModelRun:
+    powder: int
+    model: str
+    solve_ms: float  # fastest of TIMED_RUNS
+    nfev: int
+    muzzle_velocity_fps: float
+    peak_pressure_psi: float
+    velocity_error: float     # relative, against the tight-tolerance reference
+    barrel_time_error: float  # relative
+
+
+def reference_exit(ctx: CompiledLoadContext, charge_mass_kg: float) -> tuple[float, float]:
+    """Muzzle exit (barrel time s, velocity m/s) of the reference RHS at REFERENCE_RTOL."""
+    load = LoadParams(charge_mass_kg=charge_mass_kg)
+    rhs, _, _ = _build_ode_system(
+        ctx.powder, ctx.bullet, ctx.cartridge, load, h_coeff=ctx.h_coeff, constants=ctx.constants,
+        burn_model=ctx.burn_model,
+    )
+
+    def exits(t, y):
+        return y[1] - ctx.bore_length_m
+    exits.terminal = True
+    exits.direction = 1
+
+    sol = solve_ivp(
+        rhs, [0.0, 0.010], [ctx.initial_burn_state, 0.0, 0.0, 0.0], method="RK45", events=exits,
+        max_step=MAX_STEP, rtol=REFERENCE_RTOL, atol=REFERENCE_ATOL_FRACTION * state_scales(ctx, charge_mass_kg),
+    )
+    if sol.t_events[0].size == 0:
+        return float(sol.t[-1]), float(sol.y[2, -1])
+    return float(sol.t_events[0][0]), float(sol.y_events[0][0][2])
+
+
+def run_model(index: int, ctx: CompiledLoadContext, charge_mass_kg: float) -> BurnModelRun:
+    results = [ctx.run(charge_mass_kg) for _ in range(TIMED_RUNS)]
+    result = results[0]
+    t_ref, v_ref = reference_exit(ctx, charge_mass_kg)
+    return BurnModelRun(
+        powder=index,
+        model=ctx.burn_model,
+        solve_ms=min(r.diagnostics.total_ms for r in results),
+        nfev=result.diagnostics.nfev,
+        muzzle_velocity_fps=result.muzzle_velocity_fps,
+        peak_pressure_psi=result.peak_pressure_psi,
+        velocity_error=abs(result.muzzle_velocity_fps / (v_ref * MPS_TO_FPS) - 1.0),
+        barrel_time_error=abs(result.barrel_time_ms / (t_ref * 1000.0) - 1.0),
+    )
+
+
+def compare_burn_models(seed: int, n_powders: int, charge_gr: float = GRT_CHARGE_GR) -> list[BurnModelRun]:
+    """Run both burn models on n_powders synthetic GRT powders (.308 Win, 168 gr)."""
+    _, bullet, cartridge, rifle = _308_components()
+    charge_mass_kg = charge_gr * GRAINS_TO_KG
+    runs = []
+    for index, powder in enumerate(grt_powders(random.Random(seed), n_powders)):
+        for model in BURN_MODELS:
+            ctx = CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model=model)
+            runs.append(run_model(index, ctx, charge_mass_kg))
+    return runs
+
+
+def summarize(runs: list[BurnModelRun]) -> dict:
+    """Per-model speed and error statistics, plus the psi - Z result deltas."""
+    summary: dict = {"models": {}}
+    for model in BURN_MODELS:
+        rows = [r for r in runs if r.model == model]
+        summary["models"][model] = {
+            "powders": len(rows),
+            "solve_ms_median": statistics.median(r.solve_ms for r in rows),
+            "nfev_mean": statistics.mean(r.nfev for r in rows),
+            "velocity_error_max": max(r.velocity_error for r in rows),
+            "barrel_time_error_max": max(r.barrel_time_error for r in rows),
+        }
+
+    by_powder = {(r.powder, r.model): r for r in runs}
+    pairs = [
+        (by_powder[i, BURN_MODEL_Z], by_powder[i, BURN_MODEL_PSI])
+        for i in sorted({r.powder for r in runs})
+        if (i, BURN_MODEL_Z) in by_powder and (i, BURN_MODEL_PSI) in by_powder
+    ]
+    if pairs:
+        velocity = np.array([psi.muzzle_velocity_fps / z.muzzle_velocity_fps - 1.0 for z, psi in pairs])
+        pressure = np.array([psi.peak_pressure_psi / z.peak_pressure_psi - 1.0 for z, psi in pairs])
+        summary["psi_vs_z"] = {
+            "velocity_delta_median": float(np.median(velocity)),
+            "velocity_delta_max_abs": float(np.abs(velocity).max()),
+            "pressure_delta_median": float(np.median(pressure)),
+            "pressure_delta_max_abs": float(np.abs(pressure).max()),
+        }
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f"{'model':<6} {'powders':>7} {'solve ms':>9} {'nfev':>7} {'max v err':>10} {'max t err':>10}"]
+    for model, stats in summary["models"].items():
+        lines.append(
+            f"{model:<6} {stats['powders']:>7} {stats['solve_ms_median']:>9.2f} {stats['nfev_mean']:>7.0f} "
+            f"{stats['velocity_error_max']:>10.2e} {stats['barrel_time_error_max']:>10.2e}"
+        )
+    delta = summary.get("psi_vs_z")
+    if delta:
+        lines.append(
+            f"psi vs z: velocity {delta['velocity_delta_median'] * 100:+.1f}% median "
+            f"({delta['velocity_delta_max_abs'] * 100:.1f}% max), peak pressure "
+            f"{delta['pressure_delta_median'] * 100:+.1f}% median ({delta['pressure_delta_max_abs'] * 100:.1f}% max)"
+        )
+    return "\n".join(lines)
+
+
+def runs_as_dicts(runs: list[BurnModelRun]) -> list[dict]:
+    return [asdict(r) for r in runs]
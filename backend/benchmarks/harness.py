@@ -0,0 +1,197 @@
+"""Measurement and baseline comparison for the benchmark suite."""
+
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import numpy as np
+import scipy
+
+import app.core.solver as solver_module
+
+BASELINE_SCHEMA = 1
+
+# Metrics compared between baselines: name -> relative increase that counts as a regression
+# (None = use the --threshold given on the command line)
+COMPARED_METRICS: dict[str, float | None] = {
+    "wall_s_min": None,
+    "peak_memory_mb": None,
+    "nfev": 0.01,   # deterministic: any real increase is a change in solver work
+    "steps": 0.01,
+}
+
+
+@dataclass
+class Workload:
+    """A fixed, seeded benchmark workload.
+
+    setup(seed) builds the inputs and is not timed; run(state) is timed and
+    returns the number of items processed (simulations, records, ...).
+    """
+
+    name: str
+    description: str
+    setup: Callable[[int], Any]
+    run: Callable[[Any], int]
+
+
+@dataclass
+class SolverCounters:
+    calls: int = 0
+    nfev: int = 0
+    steps: int = 0
+
+
+@contextmanager
+def count_solver_work():
+    """Count solve_ivp calls, RHS evaluations and accepted steps made in-process.
+
+    Work done in solver worker processes is not visible here, which is why
+    the suite runs with a single worker by default.
+    """
+    counters = SolverCounters()
+    original = solver_module.solve_ivp
+
+    def counting_solve_ivp(*args, **kwargs):
+        sol = original(*args, **kwargs)
+        counters.calls += 1
+        counters.nfev += int(sol.nfev)
+        counters.steps += max(int(sol.t.size) - 1, 0)
+        return sol
+
+    solver_module.solve_ivp = counting_solve_ivp
+    try:
+        yield counters
+    finally:
+        solver_module.solve_ivp = original
+
+
+@dataclass
+class WorkloadResult:
+    name: str
+    items: int
+    wall_s: list[float] = field(default_factory=list)
+    nfev: int = 0
+    steps: int = 0
+    solver_calls: int = 0
+    peak_memory_mb: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "runs": len(self.wall_s),
+            "wall_s_min": round(min(self.wall_s), 6),
+            "wall_s_median": round(statistics.median(self.wall_s), 6),
+            "wall_s_per_item": round(min(self.wall_s) / self.items, 6) if self.items else None,
+            "solver_calls": self.solver_calls,
+            "nfev": self.nfev,
+            "steps": self.steps,
+            "peak_memory_mb": self.peak_memory_mb,
+        }
+
+
+def measure(workload: Workload, seed: int, repeat: int, trace_memory: bool = True) -> WorkloadResult:
+    """Run a workload repeat times (plus one traced run for peak memory).
+
+    Solver counters come from the first run; they are identical across runs
+    because the workloads are deterministic.
+    """
+    result = WorkloadResult(name=workload.name, items=0)
+    for i in range(repeat):
+        state = workload.setup(seed)
+        with count_solver_work() as counters:
+            start = time.perf_counter()
+            items = workload.run(state)
+            result.wall_s.append(time.perf_counter() - start)
+        if i == 0:
+            result.items = items
+            result.nfev, result.steps, result.solver_calls = counters.nfev, counters.steps, counters.calls
+
+    if trace_memory:
+        # Separate pass: tracemalloc slows allocation-heavy code and would skew wall time
+        state = workload.setup(seed)
+        tracemalloc.start()
+        try:
+            workload.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result.peak_memory_mb = round(peak / 1e6, 3)
+    return result
+
+
+def environment_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "solver_version": solver_module.SOLVER_VERSION,
+        "model_constants_version": solver_module.MODEL_CONSTANTS_VERSION,
+    }
+
+
+def build_baseline(results: list[WorkloadResult], seed: int, repeat: int) -> dict:
+    return {
+        "schema": BASELINE_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "seed": seed,
+        "repeat": repeat,
+        "environment": environment_info(),
+        "workloads": {r.name: r.to_dict() for r in results},
+    }
+
+
+@dataclass
+class Comparison:
+    workload: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # relative: current / baseline - 1
+    regression: bool
+
+
+def compare_baselines(baseline: dict, current: dict, threshold: float = 0.10) -> list[Comparison]:
+    """Compare two baselines metric by metric for the workloads they share.
+
+    Args:
+        baseline: Reference baseline dict.
+        current: New baseline dict.
+        threshold: Relative increase in wall time or memory that counts as a regression.
+
+    Returns:
+        One Comparison per (workload, metric) present in both baselines.
+    """
+    comparisons = []
+    for name, cur in current.get("workloads", {}).items():
+        ref = baseline.get("workloads", {}).get(name)
+        if ref is None:
+            continue
+        for metric, metric_threshold in COMPARED_METRICS.items():
+            old, new = ref.get(metric), cur.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new / old - 1.0) if old else (0.0 if new == old else float("inf"))
+            limit = threshold if metric_threshold is None else metric_threshold
+            comparisons.append(Comparison(name, metric, old, new, change, change > limit))
+    return comparisons
+
+
+def format_comparison(comparisons: list[Comparison]) -> str:
+    lines = [f"{'workload':<22} {'metric':<16} {'baseline':>14} {'current':>14} {'change':>9}"]
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regression else ""
+        lines.append(
+            f"{c.workload:<22} {c.metric:<16} {c.baseline:>14.6g} {c.current:>14.6g} {c.change * 100:>+8.1f}%{flag}"
+        )
+    regressions = sum(c.regression for c in comparisons)
+    lines.append(f"{regressions} regression(s) in {len(comparisons)} comparisons")
+    return "\n".join(lines)
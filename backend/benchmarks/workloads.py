@@ -0,0 +1,375 @@
+"""Fixed, seeded benchmark workloads.
+
+Solver workloads call app.core directly. API workloads (parametric sweep and
+import pipelines) go through the FastAPI app with an httpx ASGI client and an
+in-memory SQLite database that is rebuilt in every (untimed) setup, so they
+include routing, validation, ORM and serialization cost.
+"""
+
+import asyncio
+import io
+import random
+import zipfile
+
+from app.core.grt_converter import convert_grt_to_powder
+from app.core.grt_parser import parse_propellant_file
+from app.core.kernels import BURN_MODEL_PSI, BURN_MODEL_Z
+from app.core.parallel import parallel_map
+from app.core.solver import (
+    GRAINS_TO_KG,
+    MM_TO_M,
+    BulletParams,
+    CartridgeParams,
+    CompiledLoadContext,
+    LoadParams,
+    PowderParams,
+    RifleParams,
+    _build_ode_system,
+    simulate,
+)
+from app.core.validation_loads import VALIDATION_LOADS, run_validation_load
+from benchmarks.harness import Workload
+
+LADDER_STEPS = 40
+RHS_EVALUATIONS = 20_000
+IMPORT_BULLETS = 1000
+IMPORT_CARTRIDGES = 300
+IMPORT_GRT_FILES = 200
+GRT_POWDERS = 24
+GRT_CHARGE_GR = 40.0
+
+
+# ============================================================================
+# Solver workloads
+# ============================================================================
+
+def _308_components(three_curve: bool = False):
+    """.308 Win / 168 gr / Varget-like set used across the solver tests."""
+    curve = dict(ba=0.496, bp=0.1717, br=0.1259, brp=0.1506, z1=0.3391, z2=0.4215) if three_curve else {}
+    powder = PowderParams(
+        force_j_kg=950_000,
+        covolume_m3_kg=0.001,
+        burn_rate_coeff=1.6e-8,
+        burn_rate_exp=0.86,
+        gamma=1.24,
+        density_kg_m3=920.0,
+        flame_temp_k=4050.0,
+        web_thickness_m=0.0004,
+        theta=-0.2,
+        **curve,
+    )
+    bullet = BulletParams(mass_kg=168 * GRAINS_TO_KG, diameter_m=7.82 * MM_TO_M)
+    cartridge = CartridgeParams(saami_max_pressure_psi=62_000, chamber_volume_m3=3.63e-6, bore_diameter_m=7.62 * MM_TO_M)
+    rifle = RifleParams(barrel_length_m=610 * MM_TO_M, twist_rate_m=254 * MM_TO_M)
+    return powder, bullet, cartridge, rifle
+
+
+def _run_single(components) -> int:
+    simulate(*components, LoadParams(charge_mass_kg=44 * GRAINS_TO_KG))
+    return 1
+
+
+def _run_ladder(components) -> int:
+    ctx = CompiledLoadContext(*components)
+    for i in range(LADDER_STEPS):
+        ctx.run((40.0 + 0.2 * i) * GRAINS_TO_KG)
+    return LADDER_STEPS
+
+
+def _setup_rhs(three_curve: bool, generated: bool, burn_model: str = BURN_MODEL_Z):
+    """RHS under test plus states sampled along a real trajectory (Z in 0.01..1)."""
+    def setup(seed: int):
+        powder, bullet, cartridge, rifle = _308_components(three_curve)
+        load = LoadParams(charge_mass_kg=44 * GRAINS_TO_KG)
+        if generated:
+            ctx = CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model=burn_model)
+            rhs = ctx.kernels.ignition(load.charge_mass_kg)
+        else:
+            rhs, _, _ = _build_ode_system(powder, bullet, cartridge, load, burn_model=burn_model)
+        rng = random.Random(seed)
+        states = [
+            [rng.uniform(0.01, 1.0), rng.uniform(0.0, 0.5), rng.uniform(0.0, 900.0), rng.uniform(0.0, 500.0)]
+            for _ in range(200)
+        ]
+        return rhs, states * (RHS_EVALUATIONS // len(states))
+    return setup
+
+
+def _run_rhs(state) -> int:
+    rhs, states = state
+    for y in states:
+        rhs(0.0, y)
+    return len(states)
+
+
+def grt_powders(rng: random.Random, n: int) -> list[PowderParams]:
+    """Synthetic GRT-sourced powders, parsed and converted as the .propellant import does.
+
+    Web thickness is left at the 0.4 mm default, as for imported powders.
+    """
+    powders = []
+    for i in range(n):
+        data = convert_grt_to_powder(parse_propellant_file(_synthetic_grt_xml(rng, i)))
+        powders.append(PowderParams(
+            force_j_kg=data["force_constant_j_kg"],
+            covolume_m3_kg=data["covolume_m3_kg"],
+            burn_rate_coeff=data["burn_rate_coeff"],
+            burn_rate_exp=data["burn_rate_exp"],
+            gamma=data["gamma"],
+            density_kg_m3=data["density_g_cm3"] * 1000.0,
+            flame_temp_k=data["flame_temp_k"],
+            ba=data["ba"], bp=data["bp"], br=data["br"], brp=data["brp"], z1=data["z1"], z2=data["z2"],
+        ))
+    return powders
+
+
+def _setup_grt_powders(seed: int) -> list[tuple]:
+    _, bullet, cartridge, rifle = _308_components()
+    return [(powder, bullet, cartridge, rifle) for powder in grt_powders(random.Random(seed), GRT_POWDERS)]
+
+
+def _run_grt_powders(burn_model: str):
+    def run(components) -> int:
+        for powder, bullet, cartridge, rifle in components:
+            CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model=burn_model).run(GRT_CHARGE_GR * GRAINS_TO_KG)
+        return len(components)
+    return run
+
+
+def _run_validation(loads) -> int:
+    # Single worker: keeps solver counters in-process and timings comparable across machines
+    parallel_map(run_validation_load, loads, max_workers=1)
+    return len(loads)
+
+
+# ============================================================================
+# API workloads (in-memory SQLite)
+# ============================================================================
+
+_loop: asyncio.AbstractEventLoop | None = None
+_api = None
+
+
+def _run_async(coro):
+    """Run a coroutine on the suite's single event loop (the DB engine is bound to it)."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def _get_api():
+    """Import the app lazily with an in-memory SQLite engine patched in."""
+    global _api
+    if _api is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        import app.db.session as db_session_module
+
+        engine = create_async_engine("sqlite+aiosqlite://", echo=False)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        db_session_module.engine = engine
+        db_session_module.async_session_factory = session_factory
+
+        from app.db.session import get_db
+        from app.main import app
+        from app.models.base import Base
+
+        async def _override_get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _override_get_db
+        _api = {"app": app, "engine": engine, "session_factory": session_factory, "base": Base}
+    return _api
+
+
+async def _reset_database(seed_catalog: bool) -> None:
+    from app.middleware import limiter
+    from app.seed.initial_data import seed_initial_data
+
+    api = _get_api()
+    async with api["engine"].begin() as conn:
+        await conn.run_sync(api["base"].metadata.drop_all)
+        await conn.run_sync(api["base"].metadata.create_all)
+    if seed_catalog:
+        async with api["session_factory"]() as session:
+            await seed_initial_data(session)
+    limiter.reset()
+
+
+async def _post(path: str, **kwargs):
+    from httpx import ASGITransport, AsyncClient
+
+    transport = ASGITransport(app=_get_api()["app"])
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        resp = await client.post(path, **kwargs)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _setup_parametric(seed: int) -> dict:
+    from sqlalchemy import select
+
+    from app.models.bullet import Bullet
+    from app.models.powder import Powder
+    from app.models.rifle import Rifle
+
+    async def _setup():
+        await _reset_database(seed_catalog=True)
+        async with _get_api()["session_factory"]() as session:
+            rifle = (await session.execute(
+                select(Rifle).where(Rifle.name.like("%.308%")).order_by(Rifle.name)
+            )).scalars().first()
+            bullet = (await session.execute(
+                select(Bullet)
+                .where(Bullet.diameter_mm.between(7.80, 7.84), Bullet.weight_grains == 168)
+                .order_by(Bullet.name)
+            )).scalars().first()
+            powder_count = len((await session.execute(select(Powder.id))).all())
+        return {
+            "rifle_id": str(rifle.id),
+            "bullet_id": str(bullet.id),
+            "cartridge_id": str(rifle.cartridge_id),
+            "coal_mm": 71.1,
+            "powders": powder_count,
+        }
+
+    return _run_async(_setup())
+
+
+def _run_parametric(state: dict) -> int:
+    body = {k: v for k, v in state.items() if k != "powders"}
+    data = _run_async(_post("/api/v1/simulate/parametric", json=body))
+    return data["total_powders_tested"]
+
+
+def _synthetic_bullets(rng: random.Random, n: int) -> list[dict]:
+    calibers = [(5.70, 55), (6.72, 140), (7.82, 168), (8.59, 250)]
+    bullets = []
+    for i in range(n):
+        diameter, base_weight = rng.choice(calibers)
+        weight = round(base_weight * rng.uniform(0.8, 1.25), 1)
+        bullets.append({
+            "name": f"Bench Bullet {i:05d}",
+            "manufacturer": rng.choice(["Sierra", "Hornady", "Berger", "Nosler"]),
+            "weight_grains": weight,
+            "diameter_mm": diameter,
+            "length_mm": round(rng.uniform(20.0, 45.0), 2),
+            "bc_g1": round(rng.uniform(0.2, 0.8), 3),
+            "bc_g7": round(rng.uniform(0.1, 0.4), 3),
+            "sectional_density": round(weight / 7000.0 / (diameter / 25.4) ** 2, 3),
+            "data_source": "manufacturer",
+        })
+    return bullets
+
+
+def _synthetic_cartridges(rng: random.Random, n: int) -> list[dict]:
+    cartridges = []
+    for i in range(n):
+        bore = rng.choice([5.56, 6.50, 7.62, 8.38])
+        cartridges.append({
+            "name": f"Bench Cartridge {i:04d}",
+            "saami_max_pressure_psi": rng.choice([52_000, 60_000, 62_000, 65_000]),
+            "case_capacity_grains_h2o": round(rng.uniform(25.0, 95.0), 1),
+            "case_length_mm": round(rng.uniform(40.0, 70.0), 2),
+            "overall_length_mm": round(rng.uniform(55.0, 95.0), 2),
+            "bore_diameter_mm": bore,
+            "groove_diameter_mm": round(bore + 0.2, 2),
+            "data_source": "manufacturer",
+        })
+    return cartridges
+
+
+def _synthetic_grt_xml(rng: random.Random, i: int) -> str:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<data>
+  <propellantfile>
+    <var name="pname" value="Bench Powder {i:04d}" />
+    <var name="mname" value="BenchMfg" />
+    <var name="Qex" value="{rng.uniform(3500, 4200):.1f}" />
+    <var name="k" value="{rng.uniform(1.21, 1.26):.4f}" />
+    <var name="Ba" value="{rng.uniform(0.4, 2.0):.4f}" />
+    <var name="Bp" value="{rng.uniform(0.05, 0.3):.4f}" />
+    <var name="Br" value="{rng.uniform(0.05, 0.3):.4f}" />
+    <var name="Brp" value="{rng.uniform(0.05, 0.3):.4f}" />
+    <var name="z1" value="{rng.uniform(0.2, 0.4):.4f}" />
+    <var name="z2" value="{rng.uniform(0.45, 0.7):.4f}" />
+    <var name="a0" value="{rng.uniform(2.0, 8.0):.3f}" />
+    <var name="eta" value="1.0" />
+    <var name="pc" value="1600" />
+  </propellantfile>
+</data>"""
+
+
+def _synthetic_grt_zip(rng: random.Random, n: int) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(n):
+            zf.writestr(f"bench_{i:04d}.propellant", _synthetic_grt_xml(rng, i))
+    return buf.getvalue()
+
+
+def _setup_import(build):
+    def setup(seed: int):
+        _run_async(_reset_database(seed_catalog=False))
+        return build(random.Random(seed))
+    return setup
+
+
+def _run_import(path: str, key: str):
+    def run(payload) -> int:
+        data = _run_async(_post(path, json={key: payload}))
+        return data["created"] + data["updated"]
+    return run
+
+
+def _run_grt_import(zip_bytes: bytes) -> int:
+    data = _run_async(_post(
+        "/api/v1/powders/import-grt",
+        files={"file": ("bench.zip", zip_bytes, "application/zip")},
+    ))
+    return len(data["created"]) + len(data["updated"])
+
+
+# ============================================================================
+# Registry (run order)
+# ============================================================================
+
+WORKLOADS: dict[str, Workload] = {w.name: w for w in [
+    Workload("single_2curve", "One .308 Win solve, 2-curve Vieille burn",
+             lambda seed: _308_components(), _run_single),
+    Workload("single_3curve", "One .308 Win solve, GRT 3-curve form function",
+             lambda seed: _308_components(three_curve=True), _run_single),
+    Workload("ladder_40", f"{LADDER_STEPS}-step ladder (40.0-47.8 gr) on a compiled context",
+             lambda seed: _308_components(), _run_ladder),
+    Workload("rhs_2curve_reference", f"{RHS_EVALUATIONS} evaluations of the reference 2-curve RHS closure",
+             _setup_rhs(three_curve=False, generated=False), _run_rhs),
+    Workload("rhs_2curve_kernel", f"{RHS_EVALUATIONS} evaluations of the generated 2-curve kernel",
+             _setup_rhs(three_curve=False, generated=True), _run_rhs),
+    Workload("rhs_3curve_reference", f"{RHS_EVALUATIONS} evaluations of the reference 3-curve RHS closure",
+             _setup_rhs(three_curve=True, generated=False), _run_rhs),
+    Workload("rhs_3curve_kernel", f"{RHS_EVALUATIONS} evaluations of the generated 3-curve kernel",
+             _setup_rhs(three_curve=True, generated=True), _run_rhs),
+    Workload("rhs_psi_reference", f"{RHS_EVALUATIONS} evaluations of the reference psi-state 3-curve RHS closure",
+             _setup_rhs(three_curve=True, generated=False, burn_model=BURN_MODEL_PSI), _run_rhs),
+    Workload("rhs_psi_kernel", f"{RHS_EVALUATIONS} evaluations of the generated psi-state 3-curve kernel",
+             _setup_rhs(three_curve=True, generated=True, burn_model=BURN_MODEL_PSI), _run_rhs),
+    Workload("grt_powders_z", f"{GRT_POWDERS} GRT-sourced powders, .308 Win {GRT_CHARGE_GR} gr, Z burn model",
+             _setup_grt_powders, _run_grt_powders(BURN_MODEL_Z)),
+    Workload("grt_powders_psi", f"{GRT_POWDERS} GRT-sourced powders, .308 Win {GRT_CHARGE_GR} gr, psi-state burn model",
+             _setup_grt_powders, _run_grt_powders(BURN_MODEL_PSI)),
+    Workload("validation_corpus", f"{len(VALIDATION_LOADS)} reference loads, single worker",
+             lambda seed: list(VALIDATION_LOADS), _run_validation),
+    Workload("parametric_208", "POST /simulate/parametric over the seeded powder catalog (.308 Win, 168 gr)",
+             _setup_parametric, _run_parametric),
+    Workload("import_bullets", f"POST /bullets/import with {IMPORT_BULLETS} synthetic bullets",
+             _setup_import(lambda rng: _synthetic_bullets(rng, IMPORT_BULLETS)),
+             _run_import("/api/v1/bullets/import", "bullets")),
+    Workload("import_cartridges", f"POST /cartridges/import with {IMPORT_CARTRIDGES} synthetic cartridges",
+             _setup_import(lambda rng: _synthetic_cartridges(rng, IMPORT_CARTRIDGES)),
+             _run_import("/api/v1/cartridges/import", "cartridges")),
+    Workload("import_grt_zip", f"POST /powders/import-grt with a ZIP of {IMPORT_GRT_FILES} .propellant files",
+             _setup_import(lambda rng: _synthetic_grt_zip(rng, IMPORT_GRT_FILES)),
+             _run_grt_import),
+]}
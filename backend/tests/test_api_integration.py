@@ -8,7 +8,11 @@ so it must be run as a standalone test module (not mixed with other app imports)
 """
 
 import io
+import json
 import os
+import uuid
+from contextlib import contextmanager
+from unittest.mock import patch
 
 # Override DATABASE_URL before any app module is imported
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
@@ -16,7 +20,9 @@ os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import undefer_group
 
 # Now we can import app modules -- they'll pick up the SQLite URL
 # But session.py creates engine at import time with the original asyncpg URL.
@@ -31,6 +37,8 @@ import app.models.cartridge  # noqa: F401
 import app.models.rifle  # noqa: F401
 import app.models.load  # noqa: F401
 import app.models.simulation  # noqa: F401
+import app.models.calibration  # noqa: F401
+import app.models.table_version  # noqa: F401
 
 # Create test engine and session factory
 test_engine = create_async_engine("sqlite+aiosqlite://", echo=False)
@@ -43,7 +51,13 @@ db_session_module.async_session_factory = TestSessionFactory
 
 # Now import the app
 from app.main import app  # noqa: E402
+from app.config import settings  # noqa: E402
 from app.db.session import get_db  # noqa: E402
+from app.core.curve_codec import PackedCurve  # noqa: E402
+from app.models.powder import Powder  # noqa: E402
+from app.models.simulation import CURVES, SimulationResult  # noqa: E402
+from app.services.catalog import bump_version, clear_catalog  # noqa: E402
+from app.services.counts import clear_count_cache  # noqa: E402
 
 
 async def _override_get_db():
@@ -59,6 +73,9 @@ async def _override_get_db():
 @pytest_asyncio.fixture(autouse=True)
 async def setup_database():
     """Create all tables before each test and drop them after."""
+    # version counters restart with the fresh tables
+    clear_catalog()
+    clear_count_cache()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -151,6 +168,22 @@ async def _create_rifle(client, cartridge_id):
     return resp.json()
 
 
+@contextmanager
+def _recorded_selects():
+    """Collect the SELECT statements the test engine executes inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
 async def _create_full_test_data(client):
     """Create powder, bullet, cartridge, and rifle; return their dicts."""
     powder = await _create_powder(client)
@@ -174,6 +207,53 @@ async def test_health_endpoint(client):
     assert "version" in data
 
 
+# ---------------------------------------------------------------------------
+# Tests: Metrics (2 tests)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_route_latency(client):
+    """GET /metrics exposes latency histograms labelled by route template."""
+    resp = await client.get("/api/v1/powders/00000000-0000-0000-0000-000000000000")
+    assert resp.status_code == 404
+
+    resp = await client.get("/api/v1/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'route="/api/v1/powders/{powder_id}",status="404"' in body
+    assert "# TYPE solver_nfev histogram" in body
+    assert "# TYPE db_pool_wait_seconds histogram" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_counts_rate_limit_rejections(client):
+    """Requests rejected with 429 are counted per route."""
+    from app.core.metrics import RATE_LIMIT_REJECTIONS
+
+    route = "/api/v1/simulate/ladder"
+    before = RATE_LIMIT_REJECTIONS.value(route=route)
+    body = {
+        "powder_id": "00000000-0000-0000-0000-000000000001",
+        "bullet_id": "00000000-0000-0000-0000-000000000002",
+        "rifle_id": "00000000-0000-0000-0000-000000000003",
+        "coal_mm": 71.0,
+        "seating_depth_mm": 5.0,
+        "charge_start_grains": 40.0,
+        "charge_end_grains": 41.0,
+        "charge_step_grains": 0.5,
+    }
+    statuses = [(await client.post(route, json=body)).status_code for _ in range(6)]
+    assert statuses[:5] == [404] * 5
+    assert statuses[5] == 429
+    assert RATE_LIMIT_REJECTIONS.value(route=route) == before + 1
+
+    resp = await client.get("/api/v1/metrics")
+    assert f'rate_limit_rejections_total{{route="{route}"}}' in resp.text
+
+
 # ---------------------------------------------------------------------------
 # Tests: Powders CRUD (5 tests)
 # ---------------------------------------------------------------------------
@@ -232,6 +312,124 @@ async def test_delete_powder(client):
     assert resp2.status_code == 404
 
 
+# ---------------------------------------------------------------------------
+# Tests: Catalog snapshot
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_list_served_from_catalog(client):
+    for name in ("Varget", "H4350", "N150"):
+        resp = await client.post("/api/v1/powders", json={**POWDER_DATA, "name": name})
+        assert resp.status_code == 201
+    resp = await client.get("/api/v1/powders?sort=name&order=asc")
+    assert [p["name"] for p in resp.json()["items"]] == ["H4350", "N150", "Varget"]
+
+    with _recorded_selects() as statements:
+        resp = await client.get("/api/v1/powders?sort=name&order=desc&size=2&page=2")
+    body = resp.json()
+    assert (body["total"], [p["name"] for p in body["items"]]) == (3, ["H4350"])
+    assert len(statements) == 1  # only the version check
+
+    # A filter goes to the database
+    resp = await client.get("/api/v1/powders?manufacturer=Nobody")
+    assert resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_catalog_patched_by_writes(client):
+    created = await _create_powder(client)
+    await client.get("/api/v1/powders")
+
+    with _recorded_selects() as statements:
+        await client.put(f"/api/v1/powders/{created['id']}", json={"name": "Renamed"})
+        statements.clear()
+        resp = await client.get("/api/v1/powders")
+    assert [p["name"] for p in resp.json()["items"]] == ["Renamed"]
+    assert len(statements) == 1  # patched in place, no reload
+
+    await client.delete(f"/api/v1/powders/{created['id']}")
+    resp = await client.get("/api/v1/powders")
+    assert resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_catalog_reloads_after_write_from_another_process(client):
+    created = await _create_powder(client)
+    await client.get("/api/v1/powders")
+
+    # Simulate another worker: change the row and bump the version directly
+    async with TestSessionFactory() as db:
+        powder = await db.get(Powder, uuid.UUID(created["id"]))
+        powder.name = "Changed elsewhere"
+        await bump_version(db, "powders")
+        await db.commit()
+
+    resp = await client.get("/api/v1/powders")
+    assert [p["name"] for p in resp.json()["items"]] == ["Changed elsewhere"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: Conditional GET (ETag / If-None-Match)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_catalog_reads_answer_304_without_queries(client):
+    await _create_powder(client)
+    for url in ("/api/v1/powders/manufacturers", "/api/v1/powders?sort=name&size=10"):
+        resp = await client.get(url)
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == "no-cache"
+        etag = resp.headers["etag"]
+        assert etag.startswith('"powders-v1-')
+
+        with _recorded_selects() as statements:
+            resp = await client.get(url, headers={"If-None-Match": etag})
+        assert (resp.status_code, resp.content, resp.headers["etag"]) == (304, b"", etag)
+        assert statements == []
+
+    # Each URL has its own tag
+    first = await client.get("/api/v1/powders?sort=name&size=10")
+    other = await client.get("/api/v1/powders?sort=name&size=20")
+    assert first.headers["etag"] != other.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_etag_changes_on_write(client):
+    await _create_bullet(client)
+    resp = await client.get("/api/v1/bullets/manufacturers")
+    etag = resp.headers["etag"]
+
+    await client.post("/api/v1/bullets", json={**BULLET_DATA, "name": "Other", "manufacturer": "Berger"})
+    resp = await client.get("/api/v1/bullets/manufacturers", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert "Berger" in resp.json()
+    assert resp.headers["etag"] != etag
+
+    # Other tables keep their tags
+    resp = await client.get("/api/v1/cartridges/caliber-families")
+    resp = await client.get("/api/v1/cartridges/caliber-families", headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_sees_other_process_writes_after_max_age(client):
+    await _create_powder(client)
+    etag = (await client.get("/api/v1/powders/manufacturers")).headers["etag"]
+
+    async with TestSessionFactory() as db:
+        await bump_version(db, "powders")
+        await db.commit()
+
+    resp = await client.get("/api/v1/powders/manufacturers", headers={"If-None-Match": etag})
+    assert resp.status_code == 304  # remembered version is still recent
+    with patch.object(settings, "catalog_version_max_age", 0.0):
+        resp = await client.get("/api/v1/powders/manufacturers", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('"powders-v2-')
+
+
 # ---------------------------------------------------------------------------
 # Tests: Bullets CRUD (3 tests)
 # ---------------------------------------------------------------------------
@@ -288,7 +486,7 @@ async def test_list_cartridges(client):
 
 
 # ---------------------------------------------------------------------------
-# Tests: Direct Simulation (2 tests)
+# Tests: Direct Simulation (3 tests)
 # ---------------------------------------------------------------------------
 
 
@@ -338,6 +536,53 @@ async def test_direct_simulation(client):
     assert isinstance(data["obt_match"], bool)
 
 
+@pytest.mark.asyncio
+async def test_direct_simulation_diagnostics_opt_in(client):
+    """POST /simulate/direct?diagnostics=true adds per-phase timings and solver stats."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+    sim_req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0,
+        "coal_mm": 71.0,
+        "seating_depth_mm": 5.0,
+    }
+
+    resp = await client.post("/api/v1/simulate/direct", json=sim_req)
+    assert resp.status_code == 200
+    assert resp.json()["diagnostics"] is None
+
+    resp = await client.post("/api/v1/simulate/direct", params={"diagnostics": "true"}, json=sim_req)
+    assert resp.status_code == 200
+    diag = resp.json()["diagnostics"]
+    assert diag["nfev"] > diag["steps"] > 0
+    assert diag["integration_ms"] > 0
+    assert diag["serialization_ms"] >= 0
+    assert diag["total_ms"] >= diag["integration_ms"]
+
+
+@pytest.mark.asyncio
+async def test_direct_simulation_preflight(client):
+    """POST /simulate/direct reports the pre-flight verdict and pressure bounds."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+    resp = await client.post("/api/v1/simulate/direct", json={
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0,
+        "coal_mm": 71.0,
+        "seating_depth_mm": 5.0,
+    })
+    assert resp.status_code == 200
+    data = resp.json()
+    preflight = data["preflight"]
+    assert preflight["verdict"] in ("ok", "compressed", "overpressure", "overfilled", "impossible")
+    assert preflight["fill_ratio"] > 0
+    assert preflight["pressure_lower_bound_psi"] < preflight["pressure_upper_bound_psi"]
+    assert data["peak_pressure_psi"] < preflight["pressure_upper_bound_psi"]
+
+
 @pytest.mark.asyncio
 async def test_direct_simulation_extended_curves(client):
     """POST /simulate/direct returns the new burn/energy/temperature/recoil curves."""
@@ -470,7 +715,7 @@ async def test_invalid_simulation_negative_charge(client):
 
 
 # ---------------------------------------------------------------------------
-# Tests: Chrono Import (2 tests)
+# Tests: Chrono Import (4 tests)
 # ---------------------------------------------------------------------------
 
 
@@ -497,6 +742,67 @@ async def test_chrono_import_too_few_shots(client):
     assert resp.status_code == 422
 
 
+LABRADAR_REPORT = """sep=;
+Device ID;LBR-0012345;;
+Series No;0007;;
+Units velocity;m/s;;
+Units distances;m;;
+Stats - Average;800,00;m/s;
+Shot ID;V0;V1;Date;Time
+0001;800,0;790,0;10-05-2024;10:00:01
+0002;801,0;791,0;10-05-2024;10:00:41
+0003;799,0;789,0;10-05-2024;10:01:21
+Device ID;LBR-0012345;;
+Series No;0008;;
+Units velocity;fps;;
+Shot ID;V0;V1;Date;Time
+0001;2650;2600;10-05-2024;10:05:01
+0002;2660;2610;10-05-2024;10:05:41
+"""
+
+
+@pytest.mark.asyncio
+async def test_chrono_import_labradar_series(client):
+    """A Labradar report is split per series, muzzle velocities converted to fps."""
+    files = {"file": ("SR0007.csv", io.BytesIO(LABRADAR_REPORT.encode()), "text/csv")}
+    resp = await client.post("/api/v1/chrono/import", files=files)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [s["name"] for s in data["series"]] == ["SR0007.csv - Series 0007", "SR0007.csv - Series 0008"]
+    first, second = data["series"]
+    assert first["device"] == "labradar"
+    assert first["shot_count"] == 3
+    assert first["average_fps"] == pytest.approx(800 * 3.28084, abs=0.1)
+    assert first["sd_fps"] == pytest.approx(3.3, abs=0.1)
+    assert second["velocities_fps"] == [2650.0, 2660.0]
+    assert data["shot_count"] == 5
+    assert data["max_fps"] == 2660.0
+
+
+@pytest.mark.asyncio
+async def test_chrono_import_several_files_without_velocities(client):
+    """Several MagnetoSpeed / plain files in one request; statistics only."""
+    magnetospeed = (
+        "Series,1,Shots:,3\nMin,2640,Max,2660\nAvg,2650,ES,20\nSD,10\n"
+        "Shot,Speed,Del\n1,2640,-\n2,2650,10\n3,2660,10\n"
+        "Series,2,Shots:,2\nShot,Speed,Del\n1,2700,-\n2,2710,10\n"
+    )
+    files = [
+        ("files", ("ms.csv", io.BytesIO(magnetospeed.encode()), "text/csv")),
+        ("files", ("plain.csv", io.BytesIO(b"2800\n2810\n"), "text/csv")),
+    ]
+    resp = await client.post("/api/v1/chrono/import?include_velocities=false", files=files)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [(s["file"], s["device"], s["shot_count"]) for s in data["series"]] == [
+        ("ms.csv", "magnetospeed", 3), ("ms.csv", "magnetospeed", 2), ("plain.csv", None, 2),
+    ]
+    assert data["series"][0]["sd_fps"] == 10.0
+    assert data["velocities_fps"] is None
+    assert data["shot_count"] == 7
+    assert data["es_fps"] == 170.0
+
+
 # ---------------------------------------------------------------------------
 # Tests: 404 on missing resources (1 test)
 # ---------------------------------------------------------------------------
@@ -827,6 +1133,93 @@ async def test_sensitivity_missing_powder_404(client):
     assert resp.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_simulation_inputs_fetched_in_one_query(client):
+    """With the catalog snapshot loaded, simulations read their inputs in a single SELECT."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+    load = (await client.post("/api/v1/loads", json={
+        "name": "One query load", "powder_id": powder["id"], "bullet_id": bullet["id"], "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0, "coal_mm": 71.0, "seating_depth_mm": 5.0,
+    })).json()
+    direct = {
+        "powder_id": powder["id"], "bullet_id": bullet["id"], "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0, "coal_mm": 71.0, "seating_depth_mm": 5.0,
+    }
+
+    with _recorded_selects() as statements:
+        resp = await client.post("/api/v1/simulate/direct", json=direct)
+        assert resp.status_code == 200
+        # rifle + versions, then one load per catalog table
+        assert len(statements) == 4
+
+        statements.clear()
+        resp = await client.post("/api/v1/simulate/direct", json=direct)
+        assert resp.status_code == 200
+        assert len(statements) == 1
+
+        statements.clear()
+        resp = await client.post("/api/v1/simulate", json={"load_id": load["id"]})
+        assert resp.status_code == 201
+        # the load/rifle/versions query; the stored result is not read back
+        assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_simulation_curves_packed_and_deferred(client):
+    """Stored curves are compact blobs, skipped by plain loads and decoded for the CSV export."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+    load = (await client.post("/api/v1/loads", json={
+        "name": "Packed curves load", "powder_id": powder["id"], "bullet_id": bullet["id"], "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0, "coal_mm": 71.0, "seating_depth_mm": 5.0,
+    })).json()
+    resp = await client.post("/api/v1/simulate", json={"load_id": load["id"]})
+    assert resp.status_code == 201
+    stored = resp.json()
+    points = len(stored["pressure_curve"])
+    assert points > 10
+
+    async with TestSessionFactory() as session:
+        with _recorded_selects() as statements:
+            sim = await session.get(SimulationResult, uuid.UUID(stored["id"]))
+        assert "pressure_curve" not in statements[0]
+        assert "pressure_curve" not in sim.__dict__
+
+        sim = (await session.execute(
+            select(SimulationResult).options(undefer_group(CURVES)).execution_options(populate_existing=True)
+        )).scalar_one()
+        assert isinstance(sim.pressure_curve, PackedCurve)
+        assert sim.pressure_curve.units == {"t_ms": "ms", "p_psi": "psi"}
+        assert len(sim.velocity_curve) == len(stored["velocity_curve"])
+        assert len(sim.pressure_curve.blob) * 5 < len(json.dumps(stored["pressure_curve"]))
+        assert sim.pressure_curve[-1]["p_psi"] == pytest.approx(stored["pressure_curve"][-1]["p_psi"], rel=1e-6)
+
+    resp = await client.get(f"/api/v1/simulate/export/{stored['id']}")
+    assert resp.status_code == 200
+    lines = resp.text.splitlines()
+    pressure_rows = lines[lines.index("t_ms,p_psi") + 1:lines.index("# Velocity Curve") - 1]
+    assert len(pressure_rows) == points
+    t_ms, p_psi = pressure_rows[-1].split(",")
+    assert float(p_psi) == pytest.approx(stored["pressure_curve"][-1]["p_psi"], abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_missing_simulation_input_named_in_404(client):
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+    missing = "00000000-0000-0000-0000-000000000099"
+    base = {
+        "powder_id": powder["id"], "bullet_id": bullet["id"], "rifle_id": rifle["id"],
+        "powder_charge_grains": 44.0, "coal_mm": 71.0, "seating_depth_mm": 5.0,
+    }
+    for field, detail in (("powder_id", "Powder not found"), ("bullet_id", "Bullet not found"), ("rifle_id", "Rifle not found")):
+        resp = await client.post("/api/v1/simulate/direct", json={**base, field: missing})
+        assert resp.status_code == 404
+        assert resp.json()["detail"] == detail
+
+    resp = await client.post("/api/v1/simulate", json={"load_id": missing})
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Load not found"
+
+
 @pytest.mark.asyncio
 async def test_direct_simulation_with_3curve_powder(client):
     """Direct simulation with a 3-curve powder works end-to-end."""
@@ -857,6 +1250,189 @@ async def test_direct_simulation_with_3curve_powder(client):
     assert data["muzzle_velocity_fps"] > 0
     assert data["barrel_time_ms"] > 0
     assert isinstance(data["is_safe"], bool)
+    assert data["burn_model"] == "z"
+
+    resp = await client.post("/api/v1/simulate/direct", json={**sim_req, "burn_model": "psi"})
+    assert resp.status_code == 200
+    psi = resp.json()
+    assert psi["burn_model"] == "psi"
+    assert psi["muzzle_velocity_fps"] > 0
+    assert psi["muzzle_velocity_fps"] != data["muzzle_velocity_fps"]
+
+
+@pytest.mark.asyncio
+async def test_psi_burn_model_needs_grt_vivacity(client):
+    """burn_model=psi on a powder without Ba is rejected with 422."""
+    powder = await _create_powder(client)
+    bullet = await _create_bullet(client)
+    cartridge = await _create_cartridge(client)
+    rifle = await _create_rifle(client, cartridge["id"])
+    req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "charge_start_grains": 42.0,
+        "charge_end_grains": 43.0,
+        "charge_step_grains": 0.5,
+        "coal_mm": 71.0,
+        "seating_depth_mm": 5.0,
+        "burn_model": "psi",
+    }
+    resp = await client.post("/api/v1/simulate/ladder", json=req)
+    assert resp.status_code == 422
+    assert "vivacity" in resp.json()["detail"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: Validation report (1 test)
+# ---------------------------------------------------------------------------
+
+
+def _fake_validation_map(fn, loads, max_workers=None):
+    """Stand-in corpus run: every load predicted 2% fast."""
+    return [
+        {
+            "load_id": load["id"],
+            "caliber": load["caliber"],
+            "bullet_desc": load["bullet_desc"],
+            "powder_name": load["powder_name"],
+            "charge_gr": load["charge_gr"],
+            "barrel_length_mm": load["barrel_length_mm"],
+            "published_velocity_fps": load["published_velocity_fps"],
+            "predicted_velocity_fps": round(load["published_velocity_fps"] * 1.02, 1),
+            "error_pct": 2.0,
+            "is_pass": True,
+            "source": load["source"],
+        }
+        for load in loads
+    ]
+
+
+@pytest.mark.asyncio
+async def test_validation_report_cached_and_filtered(client):
+    """POST /simulate/validate serves the cached report and filters by caliber."""
+    from app.core.validation_loads import VALIDATION_LOADS
+    from app.services import validation as validation_service
+
+    validation_service.clear_validation_cache()
+    try:
+        with patch.object(validation_service, "parallel_map", side_effect=_fake_validation_map) as pm:
+            resp = await client.post("/api/v1/simulate/validate")
+            assert resp.status_code == 200
+            full = resp.json()
+            assert full["cached"] is False
+            assert full["total_loads"] == len(VALIDATION_LOADS)
+
+            caliber = VALIDATION_LOADS[0]["caliber"]
+            resp = await client.post("/api/v1/simulate/validate", params={"caliber": caliber})
+            assert resp.status_code == 200
+            filtered = resp.json()
+        assert pm.call_count == 1
+        assert filtered["cached"] is True
+        assert filtered["cache_key"] == full["cache_key"]
+        assert filtered["total_loads"] == sum(1 for load in VALIDATION_LOADS if load["caliber"] == caliber)
+        assert all(r["caliber"] == caliber for r in filtered["results"])
+        assert filtered["mean_error_pct"] == 2.0
+    finally:
+        validation_service.clear_validation_cache()
+
+
+# ---------------------------------------------------------------------------
+# Tests: Chronograph calibration (4 tests)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_calibration_fits_and_saves(client):
+    """POST /simulate/calibrate fits h_coeff, saves a record, and lists it."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+
+    req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "points": [
+            {"charge_grains": 42.0, "velocity_fps": 2600.0},
+            {"charge_grains": 44.0, "velocity_fps": 2700.0},
+        ],
+        "fit_parameters": ["h_coeff"],
+        "save": True,
+    }
+    resp = await client.post("/api/v1/simulate/calibrate", json=req)
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert [p["name"] for p in data["parameters"]] == ["h_coeff"]
+    h = data["parameters"][0]
+    assert 0.0 <= h["value"] <= 5.0 * h["initial_value"]
+    assert h["ci_lower"] is not None and h["ci_lower"] <= h["value"] <= h["ci_upper"]
+    assert len(data["points"]) == 2
+    assert data["degrees_of_freedom"] == 1
+    assert data["solver_runs"] > 0
+    assert data["calibration_id"] is not None
+
+    resp = await client.get("/api/v1/simulate/calibrations", params={"rifle_id": rifle["id"]})
+    assert resp.status_code == 200
+    records = resp.json()
+    assert len(records) == 1
+    assert records[0]["id"] == data["calibration_id"]
+    assert records[0]["h_coeff"] == pytest.approx(h["value"])
+    assert records[0]["fitted_parameters"] == ["h_coeff"]
+
+
+@pytest.mark.asyncio
+async def test_calibration_requires_enough_points(client):
+    """Fitting 3 parameters from 2 charges is rejected by validation."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+
+    req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "points": [
+            {"charge_grains": 42.0, "velocity_fps": 2600.0},
+            {"charge_grains": 44.0, "velocity_fps": 2700.0},
+        ],
+    }
+    resp = await client.post("/api/v1/simulate/calibrate", json=req)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_calibration_psi_rejects_burn_rate_coeff(client):
+    """burn_rate_coeff does not enter the psi burn law, so fitting it there is a 422."""
+    powder, bullet, cartridge, rifle = await _create_full_test_data(client)
+
+    req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": rifle["id"],
+        "points": [
+            {"charge_grains": 42.0, "velocity_fps": 2600.0},
+            {"charge_grains": 43.0, "velocity_fps": 2650.0},
+        ],
+        "fit_parameters": ["burn_rate_coeff", "h_coeff"],
+        "burn_model": "psi",
+    }
+    resp = await client.post("/api/v1/simulate/calibrate", json=req)
+    assert resp.status_code == 422
+    assert "psi" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_calibration_missing_rifle_404(client):
+    powder = await _create_powder(client)
+    bullet = await _create_bullet(client)
+
+    req = {
+        "powder_id": powder["id"],
+        "bullet_id": bullet["id"],
+        "rifle_id": "00000000-0000-0000-0000-000000000099",
+        "points": [{"charge_grains": 42.0, "velocity_fps": 2600.0}],
+        "fit_parameters": ["h_coeff"],
+    }
+    resp = await client.post("/api/v1/simulate/calibrate", json=req)
+    assert resp.status_code == 404
 
 
 # ---------------------------------------------------------------------------
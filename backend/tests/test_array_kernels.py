@@ -0,0 +1,125 @@
+"""Array inputs to the app.core physics kernels must match element-wise scalar calls.
+
+Each case samples the inputs across the kernel's guards (zero/negative
+pressure, burn fraction, displacement, temperatures) so both np.where
+branches are exercised.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.harmonics import cantilever_frequency, muzzle_deflection, ocw_barrel_times
+from app.core.heat_transfer import convective_area, gas_temperature, wall_heat_flux
+from app.core.internal_ballistics import (
+    bullet_acceleration,
+    free_volume,
+    lagrange_base_pressure,
+    lagrange_breech_pressure,
+)
+from app.core.structural import case_expansion, lame_hoop_stress, lawton_erosion
+from app.core.thermodynamics import (
+    flame_temperature,
+    form_function,
+    form_function_3curve,
+    noble_abel_pressure,
+    vieille_burn_rate,
+    vivacity_function,
+    vivacity_function_3curve,
+)
+
+N = 64
+_rng = np.random.default_rng(1234)
+
+
+def _samples(low, high):
+    return _rng.uniform(low, high, N)
+
+
+# (kernel, array arguments); scalars broadcast against the arrays
+CASES = [
+    (noble_abel_pressure, (0.003, _samples(-1e-6, 4e-6), 0.001, 950_000.0, _samples(-0.2, 1.0))),
+    (vieille_burn_rate, (_samples(-5e7, 4e8), 1.6e-8, 0.86)),
+    (form_function, (_samples(-0.2, 1.2), -0.2)),
+    (form_function_3curve, (_samples(-0.2, 1.2), 0.3, 0.7, 0.2, -0.1, 0.05)),
+    (form_function_3curve, (0.5, _samples(0.1, 0.4), _samples(0.5, 0.9), 0.2, -0.1, 0.05)),
+    (vivacity_function, (_samples(-0.2, 1.2), _samples(-0.6, 0.6))),
+    (vivacity_function_3curve, (_samples(-0.2, 1.2), 0.3, 0.7, 0.2, -0.1, 0.05)),
+    (vivacity_function_3curve, (0.5, _samples(0.1, 0.4), _samples(0.5, 0.9), 0.2, -0.1, 0.05)),
+    (flame_temperature, (_samples(8e5, 1.1e6), 0.0245)),
+    (lagrange_base_pressure, (_samples(0.0, 4e8), 0.003, _samples(0.005, 0.015))),
+    (lagrange_breech_pressure, (_samples(0.0, 4e8), _samples(0.001, 0.005), 0.011)),
+    (bullet_acceleration, (_samples(-1e6, 4e8), 4.56e-5, _samples(0.0, 5e3), 0.012)),
+    (free_volume, (3.6e-6, 4.56e-5, _samples(0.0, 0.6), 0.003, 1600.0, _samples(0.0, 1.0))),
+    (wall_heat_flux, (_samples(100.0, 4000.0), 300.0, 2000.0, _samples(0.0, 1e-2))),
+    (convective_area, (7.62e-3, _samples(-0.1, 0.6))),
+    (gas_temperature, (_samples(0.0, 4e8), _samples(1e-6, 2e-5), _samples(-1e-3, 4e-3), 0.001, 0.0245)),
+    (lame_hoop_stress, (_samples(0.0, 4e8), 4.5e-3, 6.0e-3, _samples(4.5e-3, 6.0e-3))),
+    (case_expansion, (_samples(0.0, 4e8), 4.5e-3, 6.0e-3, 110e9, 0.34)),
+    (lawton_erosion, (2e-3, _samples(1e-4, 2e-3), 80_000.0, _samples(-500.0, 4000.0))),
+    (cantilever_frequency, (np.arange(1, N + 1) % 7 + 1, _samples(0.4, 0.8), 200e9, 1.5e-9, 7850.0, 4e-4)),
+]
+
+
+def _elementwise(fn, args):
+    arrays = [np.broadcast_to(a, (N,)) for a in args]
+    return np.array([fn(*(a[i].item() for a in arrays)) for i in range(N)])
+
+
+@pytest.mark.parametrize("fn,args", CASES, ids=[f"{fn.__name__}-{i}" for i, (fn, _) in enumerate(CASES)])
+def test_array_matches_scalar_calls(fn, args):
+    vectorized = fn(*args)
+    assert isinstance(vectorized, np.ndarray)
+    assert vectorized.shape == (N,)
+    np.testing.assert_allclose(vectorized, _elementwise(fn, args), rtol=1e-15, atol=0.0)
+
+
+@pytest.mark.parametrize("fn,args", CASES, ids=[f"{fn.__name__}-{i}" for i, (fn, _) in enumerate(CASES)])
+def test_scalar_inputs_return_float(fn, args):
+    scalars = [np.broadcast_to(a, (N,))[0].item() for a in args]
+    assert type(fn(*scalars)) is float
+
+
+def test_guards_keep_scalar_values():
+    assert noble_abel_pressure(0.003, 1e-6, 0.001, 950_000.0, 1.0) == np.inf
+    assert noble_abel_pressure(0.003, 3e-6, 0.001, 950_000.0, 0.0) == 0.0
+    assert vieille_burn_rate(-1.0, 1.6e-8, 0.86) == 0.0
+    assert gas_temperature(1e8, 1e-6, 0.0, 0.001, 0.0245) == 0.0
+
+
+def test_muzzle_deflection_over_time_array():
+    amplitudes, frequencies = [1e-4, 2e-5, 5e-6], [90.0, 560.0, 1570.0]
+    times = np.linspace(0.0, 5e-3, N)
+    vectorized = muzzle_deflection(amplitudes, frequencies, times, 0.6)
+    expected = [muzzle_deflection(amplitudes, frequencies, float(t), 0.6) for t in times]
+    np.testing.assert_allclose(vectorized, expected, rtol=1e-12, atol=1e-20)
+
+
+def test_ocw_barrel_times_per_frequency():
+    frequencies = np.array([450.0, 520.0, 610.0])
+    times = ocw_barrel_times(frequencies, n_nodes=4)
+    assert times.shape == (3, 4)
+    for row, f in zip(times, frequencies):
+        np.testing.assert_allclose(row, ocw_barrel_times(float(f), n_nodes=4), rtol=1e-15)
+
+
+@pytest.mark.parametrize("form, shape", [
+    (lambda z: form_function(z, -0.2), lambda psi: vivacity_function(psi, -0.2)),
+    (lambda z: form_function(z, 0.3), lambda psi: vivacity_function(psi, 0.3)),
+    (
+        lambda z: form_function_3curve(z, 0.3391, 0.4215, 0.1717, 0.1259, 0.1506),
+        lambda psi: vivacity_function_3curve(psi, 0.3391, 0.4215, 0.1717, 0.1259, 0.1506),
+    ),
+    (
+        lambda z: form_function_3curve(z, 0.3, 0.7, 0.2, -0.1, 0.05),
+        lambda psi: vivacity_function_3curve(psi, 0.3, 0.7, 0.2, -0.1, 0.05),
+    ),
+])
+def test_vivacity_curve_is_form_function_slope(form, shape):
+    """phi(psi(Z)) is d(psi)/dZ of the matching form function, so 1/phi integrates to 1 over psi."""
+    z = np.linspace(0.0, 1.0, 200_001)
+    psi = form(z)
+    slope = np.gradient(psi, z)
+    inner = (z > 1e-3) & (z < 1.0 - 1e-3) & (np.abs(z - 0.3391) > 1e-3) & (np.abs(z - 0.4215) > 1e-3)
+    inner &= (np.abs(z - 0.3) > 1e-3) & (np.abs(z - 0.7) > 1e-3)
+    np.testing.assert_allclose(shape(psi)[inner], slope[inner], rtol=1e-6)
+    assert np.trapezoid(1.0 / shape(psi), psi) == pytest.approx(1.0, abs=1e-6)
@@ -0,0 +1,110 @@
+"""Tests for the benchmark harness: solver counters, API workloads and baseline comparison."""
+
+import pytest
+
+from benchmarks.harness import Workload, compare_baselines, count_solver_work, format_comparison, measure
+from benchmarks.workloads import WORKLOADS, _308_components, _run_single
+
+
+def _baseline(**workloads) -> dict:
+    return {"schema": 1, "workloads": workloads}
+
+
+class TestSolverCounters:
+
+    def test_counts_single_solve(self):
+        with count_solver_work() as counters:
+            _run_single(_308_components())
+        assert counters.calls == 2  # ignition phase + post-burnout tail
+        assert counters.nfev > counters.steps > 0
+
+    def test_measure_records_stats(self):
+        workload = Workload("noop", "no solver work", lambda seed: seed, lambda state: 3)
+        result = measure(workload, seed=7, repeat=2, trace_memory=True).to_dict()
+        assert result["items"] == 3
+        assert result["runs"] == 2
+        assert result["nfev"] == 0
+        assert result["peak_memory_mb"] is not None
+
+    def test_registry_covers_requested_workloads(self):
+        assert {"single_2curve", "single_3curve", "ladder_40", "parametric_208",
+                "validation_corpus", "import_bullets", "import_cartridges", "import_grt_zip",
+                "rhs_2curve_reference", "rhs_2curve_kernel", "rhs_psi_kernel",
+                "grt_powders_z", "grt_powders_psi"} <= set(WORKLOADS)
+
+
+@pytest.fixture
+def bench_api(monkeypatch):
+    """The workloads module, with its API database patches undone afterwards."""
+    import app.db.session as db_session_module
+    from app.db.session import get_db
+    from app.main import app
+    from benchmarks import workloads
+
+    monkeypatch.setattr(db_session_module, "engine", db_session_module.engine)
+    monkeypatch.setattr(db_session_module, "async_session_factory", db_session_module.async_session_factory)
+    monkeypatch.setattr(workloads, "_api", None)
+    monkeypatch.setattr(workloads, "_loop", None)
+    yield workloads
+    if workloads._api is not None:
+        workloads._run_async(workloads._api["engine"].dispose())
+        app.dependency_overrides.pop(get_db, None)
+    if workloads._loop is not None:
+        workloads._loop.close()
+
+
+class TestApiWorkloads:
+
+    @pytest.mark.parametrize("name, size_constant", [
+        ("import_bullets", "IMPORT_BULLETS"),
+        ("import_cartridges", "IMPORT_CARTRIDGES"),
+        ("import_grt_zip", "IMPORT_GRT_FILES"),
+    ])
+    def test_import_workload_runs_at_tiny_size(self, bench_api, monkeypatch, name, size_constant):
+        monkeypatch.setattr(bench_api, size_constant, 3)
+        result = measure(WORKLOADS[name], seed=1, repeat=1, trace_memory=False)
+        assert result.items == 3
+        assert result.nfev == 0
+
+
+class TestBurnModelComparison:
+
+    def test_both_models_accurate_on_grt_powders(self):
+        from benchmarks.burn_models import compare_burn_models, format_summary, summarize
+
+        runs = compare_burn_models(seed=3, n_powders=1)
+        assert [r.model for r in runs] == ["z", "psi"]
+        summary = summarize(runs)
+        for stats in summary["models"].values():
+            assert stats["nfev_mean"] > 0
+            assert stats["velocity_error_max"] < 1e-4
+            assert stats["barrel_time_error_max"] < 1e-4
+        assert "psi vs z" in format_summary(summary)
+
+
+class TestCompareBaselines:
+
+    def test_flags_slowdown_over_threshold(self):
+        old = _baseline(ladder_40={"wall_s_min": 10.0, "nfev": 1000, "steps": 100, "peak_memory_mb": 1.0})
+        new = _baseline(ladder_40={"wall_s_min": 12.0, "nfev": 1000, "steps": 100, "peak_memory_mb": 1.0})
+        comparisons = {c.metric: c for c in compare_baselines(old, new, threshold=0.10)}
+        assert comparisons["wall_s_min"].regression
+        assert comparisons["wall_s_min"].change == pytest.approx(0.2)
+        assert not comparisons["nfev"].regression
+        assert "1 regression(s)" in format_comparison(list(comparisons.values()))
+
+    def test_speedup_and_noise_not_flagged(self):
+        old = _baseline(single_2curve={"wall_s_min": 0.40, "nfev": 5800})
+        new = _baseline(single_2curve={"wall_s_min": 0.42, "nfev": 3000})
+        assert not any(c.regression for c in compare_baselines(old, new, threshold=0.10))
+
+    def test_solver_work_increase_flagged(self):
+        old = _baseline(single_2curve={"nfev": 5800, "steps": 950})
+        new = _baseline(single_2curve={"nfev": 6000, "steps": 950})
+        flagged = [c.metric for c in compare_baselines(old, new) if c.regression]
+        assert flagged == ["nfev"]
+
+    def test_only_shared_workloads_compared(self):
+        old = _baseline(a={"wall_s_min": 1.0})
+        new = _baseline(b={"wall_s_min": 5.0})
+        assert compare_baselines(old, new) == []
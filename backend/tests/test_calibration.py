@@ -0,0 +1,228 @@
+"""Unit tests for app.core.calibration and the model constants file.
+
+The solver is replaced by a cheap analytic velocity model so the optimizer,
+finite-difference Jacobian and confidence-interval math can be checked quickly
+and deterministically (max_workers=1 keeps everything in-process).
+"""
+
+import json
+import math
+from unittest.mock import patch
+
+import pytest
+
+from app.core.calibration import calibrate_model_constants, calibrate_powder
+from app.core.model_constants import ModelConstants, load_model_constants, save_model_constants
+from app.core.solver import (
+    GRAINS_TO_KG,
+    MM_TO_M,
+    BulletParams,
+    CartridgeParams,
+    LoadParams,
+    PowderParams,
+    RifleParams,
+    simulate,
+)
+
+
+def make_params():
+    powder = PowderParams(
+        force_j_kg=950_000,
+        covolume_m3_kg=0.001,
+        burn_rate_coeff=1.6e-8,
+        burn_rate_exp=0.86,
+        gamma=1.24,
+        density_kg_m3=1600.0,
+        flame_temp_k=4050.0,
+    )
+    bullet = BulletParams(mass_kg=168 * GRAINS_TO_KG, diameter_m=7.82 * MM_TO_M)
+    cartridge = CartridgeParams(saami_max_pressure_psi=62_000, chamber_volume_m3=3.63e-6, bore_diameter_m=7.62 * MM_TO_M)
+    rifle = RifleParams(barrel_length_m=0.61, twist_rate_m=0.254)
+    return powder, bullet, cartridge, rifle
+
+
+def fake_velocity(task) -> float:
+    """Smooth, identifiable stand-in for the solver's muzzle velocity (fps)."""
+    powder, _bullet, _cartridge, _rifle, charge_kg, h_coeff, _burn_model = task
+    charge_gr = charge_kg / GRAINS_TO_KG
+    return (
+        2600.0 * math.sqrt(powder.force_j_kg / 950_000)
+        * (1.0 + 0.08 * math.log(powder.burn_rate_coeff / 1.6e-8))
+        * (charge_gr / 44.0) ** 0.6
+        - 0.04 * h_coeff * (charge_gr / 44.0)
+    )
+
+
+CHARGES_GR = [41.0, 42.0, 43.0, 44.0, 45.0, 46.0]
+
+
+def synthetic_measurements(burn_rate_coeff, force_j_kg, h_coeff):
+    powder, bullet, cartridge, rifle = make_params()
+    powder.burn_rate_coeff = burn_rate_coeff
+    powder.force_j_kg = force_j_kg
+    return [
+        fake_velocity((powder, bullet, cartridge, rifle, c * GRAINS_TO_KG, h_coeff, "z"))
+        for c in CHARGES_GR
+    ]
+
+
+class TestCalibratePowder:
+
+    def test_recovers_single_parameter(self):
+        """Fitting only h_coeff recovers the value used to generate the data."""
+        measured = synthetic_measurements(1.6e-8, 950_000, 3500.0)
+        with patch("app.core.calibration._predict_velocity", side_effect=fake_velocity):
+            fit = calibrate_powder(
+                *make_params(),
+                [c * GRAINS_TO_KG for c in CHARGES_GR],
+                measured,
+                fit_parameters=("h_coeff",),
+                max_workers=1,
+            )
+        assert fit.parameters["h_coeff"] == pytest.approx(3500.0, rel=1e-3)
+        assert fit.rms_residual_fps < 0.5
+        assert fit.degrees_of_freedom == len(CHARGES_GR) - 1
+
+    def test_noisy_fit_interval_contains_truth(self):
+        """With noisy data the 95% interval brackets the true parameter."""
+        measured = synthetic_measurements(2.0e-8, 950_000, 2000.0)
+        noise = [4.0, -3.0, 2.5, -5.0, 3.5, -2.0]
+        measured = [v + n for v, n in zip(measured, noise)]
+        with patch("app.core.calibration._predict_velocity", side_effect=fake_velocity):
+            fit = calibrate_powder(
+                *make_params(),
+                [c * GRAINS_TO_KG for c in CHARGES_GR],
+                measured,
+                fit_parameters=("burn_rate_coeff",),
+                max_workers=1,
+            )
+        lo, hi = fit.confidence_intervals["burn_rate_coeff"]
+        assert lo < 2.0e-8 < hi
+        assert fit.std_errors["burn_rate_coeff"] > 0
+        assert len(fit.residuals_fps) == len(CHARGES_GR)
+
+    def test_parameters_respect_bounds(self):
+        """Data that would need an out-of-range force pins it at the bound."""
+        measured = [v * 1.5 for v in synthetic_measurements(1.6e-8, 950_000, 2000.0)]
+        with patch("app.core.calibration._predict_velocity", side_effect=fake_velocity):
+            fit = calibrate_powder(
+                *make_params(),
+                [c * GRAINS_TO_KG for c in CHARGES_GR],
+                measured,
+                fit_parameters=("force_j_kg",),
+                max_workers=1,
+            )
+        assert fit.parameters["force_j_kg"] <= 950_000 * 1.25 + 1e-6
+        assert any("limite" in w for w in fit.warnings)
+
+    def test_no_degrees_of_freedom_has_no_intervals(self):
+        """With as many points as parameters, intervals cannot be estimated."""
+        measured = synthetic_measurements(1.6e-8, 950_000, 2500.0)[:1]
+        with patch("app.core.calibration._predict_velocity", side_effect=fake_velocity):
+            fit = calibrate_powder(
+                *make_params(),
+                [CHARGES_GR[0] * GRAINS_TO_KG],
+                measured,
+                fit_parameters=("h_coeff",),
+                max_workers=1,
+            )
+        assert fit.degrees_of_freedom == 0
+        assert fit.confidence_intervals["h_coeff"] is None
+        assert fit.warnings
+
+    def test_unknown_parameter_rejected(self):
+        with pytest.raises(ValueError, match="Unknown"):
+            calibrate_powder(*make_params(), [0.003], [2700.0], fit_parameters=("gamma",))
+
+    def test_psi_model_rejects_burn_rate_coeff(self):
+        with pytest.raises(ValueError, match="psi"):
+            calibrate_powder(
+                *make_params(), [0.003, 0.0031, 0.0032], [2700.0, 2750.0, 2800.0],
+                fit_parameters=("burn_rate_coeff",), burn_model="psi",
+            )
+
+    def test_burn_model_reaches_predictions(self):
+        """Every solver run is made under the requested burn model."""
+        measured = synthetic_measurements(1.6e-8, 950_000, 3500.0)
+        seen = set()
+
+        def recording_velocity(task):
+            seen.add(task[-1])
+            return fake_velocity(task)
+
+        with patch("app.core.calibration._predict_velocity", side_effect=recording_velocity):
+            calibrate_powder(
+                *make_params(),
+                [c * GRAINS_TO_KG for c in CHARGES_GR],
+                measured,
+                fit_parameters=("h_coeff",),
+                max_workers=1,
+                burn_model="psi",
+            )
+        assert seen == {"psi"}
+
+    def test_too_few_points_rejected(self):
+        with pytest.raises(ValueError, match="at least 3"):
+            calibrate_powder(*make_params(), [0.003, 0.0031], [2700.0, 2750.0])
+
+
+# ============================================================================
+# Global model constants
+# ============================================================================
+
+REFERENCE_LOADS = [
+    {"id": f"ref-{i}", "published_velocity_fps": 2800.0 + 50.0 * i, "k": 1.0 + 0.02 * i}
+    for i in range(6)
+]
+
+
+def fake_reference_velocity(task) -> float:
+    """Stand-in corpus model whose published velocities are met at friction 0.08."""
+    load, constants = task
+    return load["published_velocity_fps"] * (1.0 - load["k"] * (constants.friction_coeff - 0.08))
+
+
+class TestModelConstantsFile:
+
+    def test_missing_file_gives_defaults(self, tmp_path):
+        constants, version = load_model_constants(tmp_path / "missing.json")
+        assert constants == ModelConstants()
+        assert version == 0
+
+    def test_save_increments_version_and_round_trips(self, tmp_path):
+        path = tmp_path / "model_constants.json"
+        assert save_model_constants(ModelConstants(friction_coeff=0.06), {"fitted": ["friction_coeff"]}, path) == 1
+        assert save_model_constants(ModelConstants(friction_coeff=0.07), {}, path) == 2
+        constants, version = load_model_constants(path)
+        assert version == 2
+        assert constants.friction_coeff == pytest.approx(0.07)
+        assert constants.h_coeff == ModelConstants().h_coeff
+
+    def test_unreadable_file_falls_back(self, tmp_path):
+        path = tmp_path / "model_constants.json"
+        path.write_text(json.dumps({"version": 4, "constants": {"h_coeff": "hot"}}))
+        assert load_model_constants(path) == (ModelConstants(), 0)
+
+    def test_simulate_uses_constants(self):
+        """Extra bore friction lowers muzzle velocity."""
+        powder, bullet, cartridge, rifle = make_params()
+        load = LoadParams(charge_mass_kg=44.0 * GRAINS_TO_KG)
+        base = simulate(powder, bullet, cartridge, rifle, load)
+        rough = simulate(powder, bullet, cartridge, rifle, load, constants=ModelConstants(friction_coeff=0.12))
+        assert rough.muzzle_velocity_fps < base.muzzle_velocity_fps
+
+
+class TestCalibrateModelConstants:
+
+    def test_recovers_friction(self):
+        fit = calibrate_model_constants(
+            REFERENCE_LOADS, fake_reference_velocity, fit_constants=("friction_coeff",), max_workers=1,
+        )
+        assert fit.constants.friction_coeff == pytest.approx(0.08, abs=1e-3)
+        assert fit.mean_error_pct_after < fit.mean_error_pct_before
+        assert fit.constants.h_coeff == ModelConstants().h_coeff
+        assert set(fit.load_errors_pct) == {load["id"] for load in REFERENCE_LOADS}
+
+    def test_unknown_constant_rejected(self):
+        with pytest.raises(ValueError, match="Unknown"):
+            calibrate_model_constants(REFERENCE_LOADS, fake_reference_velocity, fit_constants=("gamma",))
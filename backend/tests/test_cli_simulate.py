@@ -0,0 +1,191 @@
+"""Tests for the offline batch simulation CLI (python -m app.cli simulate)."""
+
+import csv
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.cli import simulate as batch
+from app.cli.__main__ import main
+from app.models.base import Base
+from app.models.bullet import Bullet
+from app.models.cartridge import Cartridge
+from app.models.load import Load
+from app.models.powder import Powder
+from app.models.rifle import Rifle
+
+FIXTURE_ROW = {
+    "id": "varget-44",
+    "powder": "Hodgdon Varget",
+    "bullet": "Sierra 168gr HPBT MK .308",
+    "cartridge": ".308 Winchester",
+    "rifle_barrel_length_mm": 610,
+    "rifle_twist_rate_mm": 254,
+    "charge_gr": 44.0,
+}
+
+INLINE_ROW = {
+    "powder_force_constant_j_kg": 950000,
+    "powder_covolume_m3_kg": 0.001,
+    "powder_burn_rate_coeff": 1.35e-8,
+    "powder_burn_rate_exp": 0.86,
+    "powder_gamma": 1.24,
+    "powder_density_g_cm3": 1.6,
+    "powder_flame_temp_k": 4050,
+    "powder_web_thickness_mm": 0.4,
+    "bullet_weight_grains": 168,
+    "bullet_diameter_mm": 7.82,
+    "cartridge_saami_max_pressure_psi": 62000,
+    "cartridge_case_capacity_grains_h2o": 56,
+    "cartridge_bore_diameter_mm": 7.62,
+    "rifle_barrel_length_mm": 610,
+    "rifle_twist_rate_mm": 254,
+    "charge_gr": 44.0,
+}
+
+
+def _run_cli(tmp_path, rows, input_name="loads.json", output_name="results.ndjson"):
+    source = tmp_path / input_name
+    if source.suffix == ".csv":
+        with open(source, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=sorted({k for row in rows for k in row}))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        source.write_text(json.dumps(rows))
+    output = tmp_path / output_name
+    code = main(["simulate", str(source), "--output", str(output), "--workers", "1"])
+    return code, output
+
+
+class TestResolveRows:
+
+    def test_fixture_names_and_inline_fields(self):
+        charge, components = batch.resolve_row(FIXTURE_ROW, {})
+        powder, bullet, cartridge, rifle = (dict(c) for c in components)
+        assert charge == 44.0
+        assert powder["density_g_cm3"] == 1.6
+        assert bullet["weight_grains"] == 168
+        assert cartridge["saami_max_pressure_psi"] == 62000
+        assert rifle == {"barrel_length_mm": 610, "twist_rate_mm": 254, "chamber_volume_mm3": 0.0, "weight_kg": None}
+
+    def test_inline_field_overrides_reference(self):
+        _, components = batch.resolve_row({**FIXTURE_ROW, "powder_burn_rate_coeff": "2e-8"}, {})
+        assert dict(components[0])["burn_rate_coeff"] == 2e-8
+
+    def test_saved_load_supplies_components_and_charge(self):
+        powder_id, bullet_id, rifle_id, cartridge_id, load_id = (uuid.uuid4() for _ in range(5))
+        powder = SimpleNamespace(**{k: 1.0 for k in batch.COMPONENT_FIELDS["powder"]})
+        db_rows = {
+            ("load", load_id): SimpleNamespace(powder_id=powder_id, bullet_id=bullet_id, rifle_id=rifle_id, powder_charge_grains=43.5),
+            ("powder", powder_id): powder,
+            ("bullet", bullet_id): SimpleNamespace(weight_grains=168, diameter_mm=7.82),
+            ("rifle", rifle_id): SimpleNamespace(cartridge_id=cartridge_id, barrel_length_mm=610, twist_rate_mm=254, chamber_volume_mm3=0.0, weight_kg=4.2),
+            ("cartridge", cartridge_id): SimpleNamespace(saami_max_pressure_psi=62000, case_capacity_grains_h2o=56, bore_diameter_mm=7.62),
+        }
+        charge, components = batch.resolve_row({"load": str(load_id)}, db_rows)
+        assert charge == 43.5
+        assert dict(components[3])["weight_kg"] == 4.2
+        assert dict(components[2])["case_capacity_grains_h2o"] == 56
+
+    def test_row_errors_are_reported_per_row(self):
+        rows = [
+            {**FIXTURE_ROW, "powder": "No Such Powder"},
+            {**FIXTURE_ROW, "powder_force_j_kg": 1.0},
+            {k: v for k, v in FIXTURE_ROW.items() if k != "rifle_twist_rate_mm"},
+            {**FIXTURE_ROW, "charge_gr": None},
+            {**FIXTURE_ROW, "load": str(uuid.uuid4())},
+            FIXTURE_ROW,
+        ]
+        errors = [task.error for task in batch.build_batch(rows)]
+        assert "not found in the seed fixtures" in errors[0]
+        assert "Unknown column 'powder_force_j_kg'" in errors[1]
+        assert errors[2] == "rifle: missing twist_rate_mm"
+        assert "positive charge" in errors[3]
+        assert "not found" in errors[4]
+        assert errors[5] is None
+
+
+class TestSimulateCommand:
+
+    def test_streams_ndjson_with_timings(self, tmp_path):
+        rows = [FIXTURE_ROW, {**INLINE_ROW, "id": "inline"}, {**FIXTURE_ROW, "id": "bad", "powder": "Nope"}]
+        code, output = _run_cli(tmp_path, rows)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert code == 1  # one row failed
+        assert [r["id"] for r in records] == ["varget-44", "inline", "bad"]
+        ok = records[0]
+        assert ok["status"] == "ok"
+        assert 2500 < ok["muzzle_velocity_fps"] < 3500
+        assert ok["pressure_lower_bound_psi"] < ok["peak_pressure_psi"] < ok["pressure_upper_bound_psi"]
+        assert ok["nfev"] > 0
+        assert 0 < ok["solve_ms"] <= ok["elapsed_ms"]
+        assert records[1]["status"] == "ok"
+        assert records[2]["status"] == "error"
+        assert records[2]["charge_gr"] == 44.0
+
+    def test_matches_api_context(self, tmp_path):
+        """The CLI result equals running the same components through the API's compile_context()."""
+        from app.services.simulation_inputs import compile_context
+
+        code, output = _run_cli(tmp_path, [FIXTURE_ROW], input_name="loads.csv", output_name="results.csv")
+        assert code == 0
+        with open(output, newline="") as f:
+            (record,) = list(csv.DictReader(f))
+        _, components = batch.resolve_row(FIXTURE_ROW, {})
+        ctx = compile_context(*(SimpleNamespace(**dict(c)) for c in components))
+        expected = ctx.run(44.0 * batch.GRAINS_TO_KG)
+        assert float(record["muzzle_velocity_fps"]) == round(expected.muzzle_velocity_fps, 1)
+        assert record["is_safe"] == str(expected.is_safe)
+        assert "web_thickness" in record["warnings"]
+
+
+class TestDatabaseReferences:
+
+    @pytest.mark.asyncio
+    async def test_fetches_saved_load_and_related_rows(self):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            cartridge = Cartridge(
+                name=".308 Test", saami_max_pressure_psi=62000, case_capacity_grains_h2o=56,
+                case_length_mm=51.2, overall_length_mm=71.1, bore_diameter_mm=7.62, groove_diameter_mm=7.82,
+            )
+            powder = Powder(
+                name="Test Varget", manufacturer="Hodgdon", burn_rate_relative=82, force_constant_j_kg=950000,
+                covolume_m3_kg=0.001, flame_temp_k=4050, gamma=1.24, density_g_cm3=1.6,
+                burn_rate_coeff=1.35e-8, burn_rate_exp=0.86,
+            )
+            bullet = Bullet(
+                name="Test 168", manufacturer="Sierra", weight_grains=168, diameter_mm=7.82,
+                bc_g1=0.462, sectional_density=0.253,
+            )
+            db.add_all([cartridge, powder, bullet])
+            await db.flush()
+            rifle = Rifle(name="Test 700", barrel_length_mm=610, twist_rate_mm=254, cartridge_id=cartridge.id, chamber_volume_mm3=0.0)
+            db.add(rifle)
+            await db.flush()
+            load = Load(
+                name="Test load", powder_id=powder.id, bullet_id=bullet.id, rifle_id=rifle.id,
+                powder_charge_grains=44.0, coal_mm=71.0, seating_depth_mm=5.0,
+            )
+            db.add(load)
+            await db.commit()
+            load_id = load.id
+
+        with patch.object(batch.db_session, "engine", engine), \
+                patch.object(batch.db_session, "async_session_factory", factory):
+            db_rows = await batch._fetch_db_components([{"load": str(load_id)}])
+
+        assert {kind for kind, _ in db_rows} == {"load", "powder", "bullet", "rifle", "cartridge"}
+        (task,) = batch.build_batch([{"load": str(load_id)}], db_rows)
+        assert task.error is None
+        record = batch.simulate_batch_load(task)
+        assert record["status"] == "ok"
+        assert record["charge_gr"] == 44.0
@@ -9,7 +9,11 @@ Covers:
 - Quality scoring on import
 """
 
+import io
+import json
 import os
+import zipfile
+from unittest.mock import patch
 
 # Override DATABASE_URL before any app module is imported
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
@@ -17,7 +21,7 @@ os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.models.base import Base
@@ -29,6 +33,7 @@ import app.models.cartridge  # noqa: F401
 import app.models.rifle  # noqa: F401
 import app.models.load  # noqa: F401
 import app.models.simulation  # noqa: F401
+import app.models.table_version  # noqa: F401
 
 # Create test engine and session factory
 test_engine = create_async_engine("sqlite+aiosqlite://", echo=False)
@@ -42,6 +47,9 @@ db_session_module.async_session_factory = TestSessionFactory
 # Now import the app
 from app.main import app  # noqa: E402
 from app.db.session import get_db  # noqa: E402
+from app.services import grt_import, ndjson_import  # noqa: E402
+from app.services.catalog import clear_catalog  # noqa: E402
+from app.services.counts import clear_count_cache  # noqa: E402
 from app.models.powder import Powder
 from app.models.bullet import Bullet
 from app.models.cartridge import Cartridge
@@ -61,6 +69,9 @@ async def _override_get_db():
 @pytest_asyncio.fixture(autouse=True)
 async def setup_database():
     """Create all tables before each test and drop them after."""
+    # version counters restart with the fresh tables
+    clear_catalog()
+    clear_count_cache()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -258,7 +269,7 @@ async def test_powder_aliases_endpoint_404(client):
 
 
 # ===========================================================================
-# Section 3: Bullet import endpoint tests (5 tests)
+# Section 3: Bullet import endpoint tests (9 tests)
 # ===========================================================================
 
 
@@ -403,6 +414,104 @@ async def test_import_bullets_merge_mode(client):
     assert updated["bc_g1"] == 0.505  # Was non-null, NOT overwritten
 
 
+@pytest.mark.asyncio
+async def test_import_bullets_in_a_few_statements(client):
+    """A large import reads only the colliding rows and writes set-based."""
+    resp = await client.post("/api/v1/bullets", json={**BULLET_DATA, "data_source": "manufacturer"})
+    existing = resp.json()
+    bullets = [{**BULLET_DATA, "name": f"Bulk Bullet {i}", "data_source": "manufacturer"} for i in range(300)]
+    # Case-insensitive collision with the existing bullet
+    bullets.append({**BULLET_DATA, "name": BULLET_DATA["name"].upper(), "bc_g1": 0.5, "data_source": "manufacturer"})
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": bullets})
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+    result = resp.json()
+    assert (result["created"], result["updated"], result["skipped"]) == (300, 1, [])
+    # Lookup, inserts, update, version bump
+    assert statements.count("SELECT") == 1
+    assert statements.count("INSERT") == 2
+    assert len(statements) <= 5
+
+    resp = await client.get(f"/api/v1/bullets/{existing['id']}")
+    assert (resp.json()["name"], resp.json()["bc_g1"]) == (BULLET_DATA["name"], 0.5)
+    resp = await client.get("/api/v1/bullets?manufacturer=Sierra&size=1")
+    assert resp.json()["total"] == 301
+    assert resp.json()["items"][0]["caliber_family"] == ".308"
+
+
+@pytest.mark.asyncio
+async def test_import_bullets_updates_existing_import_copy(client):
+    """A second import next to a manual bullet updates its renamed copy instead of duplicating it."""
+    await client.post("/api/v1/bullets", json=BULLET_DATA)
+    first = {**BULLET_DATA, "bc_g1": 0.6, "data_source": "manufacturer"}
+    resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": [first]})
+    assert (resp.json()["created"], resp.json()["updated"]) == (1, 0)
+
+    second = {**first, "bc_g1": 0.7}
+    resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": [second]})
+    assert (resp.json()["created"], resp.json()["updated"]) == (0, 1)
+    items = (await client.get("/api/v1/bullets?sort=name&order=asc")).json()["items"]
+    assert [(b["name"], b["bc_g1"]) for b in items] == [
+        (BULLET_DATA["name"], BULLET_DATA["bc_g1"]),
+        (f"{BULLET_DATA['name']} (Import)", 0.7),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reimport_of_unchanged_bullets_writes_nothing(client):
+    """Rows already holding the imported content are counted as unchanged, not rewritten."""
+    bullets = [{**BULLET_DATA, "name": f"Sync Bullet {i}", "data_source": "manufacturer"} for i in range(3)]
+    resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": bullets})
+    assert resp.json()["created"] == 3
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for mode in ("overwrite", "merge"):
+            resp = await client.post(f"/api/v1/bullets/import?mode={mode}", json={"bullets": bullets})
+            assert (resp.json()["created"], resp.json()["updated"], resp.json()["unchanged"]) == (0, 0, 3)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+    assert set(statements) == {"SELECT"}
+
+    # A changed record and a manually edited one are written again
+    items = (await client.get("/api/v1/bullets?sort=name&order=asc")).json()["items"]
+    await client.put(f"/api/v1/bullets/{items[2]['id']}", json={"bc_g1": 0.3})
+    bullets[0] = {**bullets[0], "bc_g1": 0.6}
+    resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": bullets})
+    assert (resp.json()["updated"], resp.json()["unchanged"]) == (2, 1)
+    resp = await client.get(f"/api/v1/bullets/{items[2]['id']}")
+    assert resp.json()["bc_g1"] == BULLET_DATA["bc_g1"]
+
+
+@pytest.mark.asyncio
+async def test_overwrite_after_merge_rewrites_row(client):
+    """A merged row may keep values the payload lacks, so overwriting with that payload still writes."""
+    base = {**BULLET_DATA, "name": "Merge Then Overwrite", "data_source": "manufacturer"}
+    await client.post("/api/v1/bullets", json={**base, "model_number": "MT-1"})
+    payload = {**base, "bc_g7": None}
+    resp = await client.post("/api/v1/bullets/import?mode=merge", json={"bullets": [payload]})
+    assert resp.json()["updated"] == 1  # first import: no stored hash yet
+    resp = await client.post("/api/v1/bullets/import?mode=merge", json={"bullets": [payload]})
+    assert resp.json()["unchanged"] == 1
+    resp = await client.post("/api/v1/bullets/import?mode=overwrite", json={"bullets": [payload]})
+    assert resp.json()["updated"] == 1
+    items = (await client.get("/api/v1/bullets")).json()["items"]
+    assert (items[0]["model_number"], items[0]["bc_g7"]) == (None, None)
+
+
 # ===========================================================================
 # Section 4: Cartridge import endpoint tests (4 tests)
 # ===========================================================================
@@ -689,3 +798,159 @@ async def test_grt_import_alias_case_insensitive(client):
 
     created_powder = result["created"][0]
     assert created_powder["alias_group"] == "h4350-ar2209"
+
+
+# ===========================================================================
+# Section 7: Streaming GRT archive import (3 tests)
+# ===========================================================================
+
+
+def _make_grt_zip(names: list[str], broken: int = 0) -> bytes:
+    """ZIP of .propellant files, plus `broken` files with invalid XML."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i, name in enumerate(names):
+            zf.writestr(f"powders/{i:03d}.propellant", _make_grt_propellant_xml(name))
+        for i in range(broken):
+            zf.writestr(f"powders/broken{i}.propellant", b"<data><propellantfile>")
+        zf.writestr("readme.txt", b"not a propellant")
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_grt_zip_import_streams_progress_per_batch(client):
+    content = _make_grt_zip([f"Stream Powder {i}" for i in range(5)], broken=1)
+    with patch.object(grt_import, "CHUNK_FILES", 2):
+        resp = await client.post(
+            "/api/v1/powders/import-grt/stream",
+            files={"file": ("archive.zip", content, "application/zip")},
+        )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert [line["files_done"] for line in lines] == [2, 4, 6, 6]
+    assert all(line["files_total"] == 6 for line in lines)
+    assert [line["status"] for line in lines] == ["running"] * 3 + ["done"]
+    assert lines[-1]["created"] == 5
+    errors = [e for line in lines for e in line["errors"]]
+    assert len(errors) == 1 and errors[0].startswith("powders/broken0.propellant: Invalid XML")
+
+    resp = await client.get("/api/v1/powders")
+    assert resp.json()["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_grt_zip_import_commits_in_batches(client):
+    await client.post("/api/v1/powders", json={**POWDER_DATA, "name": "Batch Powder 3"})
+    content = _make_grt_zip([f"Batch Powder {i}" for i in range(4)])
+    with patch.object(grt_import, "CHUNK_FILES", 3):
+        resp = await client.post(
+            "/api/v1/powders/import-grt?mode=overwrite",
+            files={"file": ("archive.zip", content, "application/zip")},
+        )
+    assert resp.status_code == 200
+    result = resp.json()
+    # The manual powder gets a renamed copy
+    assert sorted(p["name"] for p in result["created"]) == [
+        "Batch Powder 0", "Batch Powder 1", "Batch Powder 2", "Batch Powder 3 (GRT Import)",
+    ]
+    assert (result["updated"], result["skipped"], result["errors"]) == ([], [], [])
+
+    # Re-importing the same archive changes nothing
+    resp = await client.post(
+        "/api/v1/powders/import-grt?mode=overwrite",
+        files={"file": ("archive.zip", content, "application/zip")},
+    )
+    result = resp.json()
+    assert (result["created"], result["updated"], result["unchanged"]) == ([], [], 4)
+
+
+@pytest.mark.asyncio
+async def test_grt_import_rejects_unreadable_uploads(client):
+    for filename, content in [("archive.zip", b"not a zip"), ("notes.txt", b"x"), ("empty.zip", b"")]:
+        resp = await client.post(
+            "/api/v1/powders/import-grt/stream",
+            files={"file": (filename, content, "application/octet-stream")},
+        )
+        assert resp.status_code == 400
+
+    resp = await client.post(
+        "/api/v1/powders/import-grt",
+        files={"file": ("archive.zip", _make_grt_zip([], broken=2), "application/zip")},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("All files failed to parse")
+
+
+# ===========================================================================
+# Section 8: NDJSON import endpoints (4 tests)
+# ===========================================================================
+
+
+def _ndjson(*records) -> bytes:
+    return b"\n".join(r if isinstance(r, bytes) else json.dumps(r).encode() for r in records)
+
+
+@pytest.mark.asyncio
+async def test_import_bullets_ndjson_in_chunks_with_line_errors(client):
+    body = _ndjson(
+        {**BULLET_DATA, "name": "Line Bullet 1", "data_source": "manufacturer"},
+        b"{not json",
+        {**BULLET_DATA, "name": "Line Bullet 3", "bc_g1": 7},
+        b"",
+        {**BULLET_DATA, "name": "Line Bullet 5", "data_source": "manufacturer"},
+        {**BULLET_DATA, "name": "Line Bullet 6", "data_source": "manufacturer"},
+    )
+    with patch.object(ndjson_import, "NDJSON_CHUNK", 2):
+        resp = await client.post(
+            "/api/v1/bullets/import-ndjson?mode=skip", content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["created"] == 3
+    assert [e.split(":")[0] for e in result["errors"]] == ["line 2", "line 3"]
+    assert "bc_g1: Input should be less than or equal to 2" in result["errors"][1]
+
+    resp = await client.get("/api/v1/bullets?sort=name&order=asc")
+    assert [b["name"] for b in resp.json()["items"]] == ["Line Bullet 1", "Line Bullet 5", "Line Bullet 6"]
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_caps_reported_errors(client):
+    """A systematic error keeps MAX_REPORTED messages and counts the rest."""
+    bad = {**BULLET_DATA, "name": "Renamed", "bc_g1": 7}
+    body = _ndjson(*[bad] * 12, {**BULLET_DATA, "name": "Good Bullet", "data_source": "manufacturer"})
+    with patch.object(ndjson_import, "MAX_REPORTED", 5), patch.object(ndjson_import, "NDJSON_CHUNK", 1):
+        resp = await client.post("/api/v1/bullets/import-ndjson", content=body)
+    result = resp.json()
+    assert result["created"] == 1
+    assert [e.split(":")[0] for e in result["errors"]] == [f"line {i}" for i in range(1, 6)]
+    assert result["errors_truncated"] == 7
+
+
+@pytest.mark.asyncio
+async def test_import_cartridges_and_powders_ndjson(client):
+    body = _ndjson({**CARTRIDGE_DATA, "data_source": "saami"}) + b"\n"
+    resp = await client.post("/api/v1/cartridges/import-ndjson", content=body)
+    assert (resp.json()["created"], resp.json()["errors"]) == (1, [])
+    resp = await client.post("/api/v1/cartridges/import-ndjson?mode=overwrite", content=body)
+    assert resp.json()["unchanged"] == 1
+
+    body = _ndjson({**POWDER_DATA, "name": "Hodgdon Varget", "data_source": "manufacturer"})
+    resp = await client.post("/api/v1/powders/import-ndjson", content=body)
+    assert resp.json()["created"] == 1
+    powder = (await client.get("/api/v1/powders")).json()["items"][0]
+    assert (powder["alias_group"], powder["quality_score"] > 0) == ("varget-ar2208", True)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_split_stream_chunks():
+    async def body(*chunks):
+        for chunk in chunks:
+            yield chunk
+
+    with patch.object(ndjson_import, "MAX_LINE_BYTES", 8):
+        lines = [pair async for pair in ndjson_import.ndjson_lines(body(b'{"a"', b':1}\r\n{"b":2}\nxxxxxxx', b"xxxxxxxxx\nlast"))]
+    assert lines == [(1, b'{"a":1}\r'), (2, b'{"b":2}'), (3, None), (4, b"last")]
@@ -0,0 +1,79 @@
+"""Tests for the generated RHS kernels against the reference closures."""
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from app.core.kernels import BURN_MODEL_PSI, BURN_MODEL_Z, build_kernels
+from app.core.solver import (
+    GAS_MOLECULAR_WEIGHT,
+    GRAINS_TO_KG,
+    MODEL_CONSTANTS,
+    T_WALL_DEFAULT,
+    CompiledLoadContext,
+    LoadParams,
+    _build_ode_system,
+    _build_tail_system,
+)
+from benchmarks.workloads import _308_components
+
+
+def _states(n: int, seed: int = 1) -> list[list[float]]:
+    rng = random.Random(seed)
+    # Include Z outside [0, 1], zero displacement and large heat loss
+    return [
+        [rng.uniform(-0.1, 1.1), rng.choice([0.0, rng.uniform(0.0, 0.6)]), rng.uniform(0.0, 1000.0),
+         rng.uniform(0.0, 3000.0)]
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("three_curve", [False, True])
+class TestKernelMatchesReference:
+
+    @pytest.mark.parametrize("burn_model", [BURN_MODEL_Z, BURN_MODEL_PSI])
+    def test_ignition_rhs(self, three_curve, burn_model):
+        powder, bullet, cartridge, rifle = _308_components(three_curve)
+        if burn_model == BURN_MODEL_PSI and not three_curve:
+            powder = replace(powder, ba=0.496)  # vivacity with the 2-curve grain form
+        load = LoadParams(charge_mass_kg=44 * GRAINS_TO_KG)
+        reference, _, _ = _build_ode_system(powder, bullet, cartridge, load, burn_model=burn_model)
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model=burn_model)
+        kernel = ctx.kernels.ignition(load.charge_mass_kg)
+        for y in _states(500):
+            assert kernel(0.0, y) == pytest.approx(reference(0.0, y), rel=1e-12, abs=1e-300)
+
+    def test_tail_rhs(self, three_curve):
+        powder, bullet, cartridge, rifle = _308_components(three_curve)
+        load = LoadParams(charge_mass_kg=44 * GRAINS_TO_KG)
+        reference = _build_tail_system(powder, bullet, cartridge, load)
+        kernel = CompiledLoadContext(powder, bullet, cartridge, rifle).kernels.tail(load.charge_mass_kg)
+        for y in _states(500):
+            assert kernel(0.0, y[1:]) == pytest.approx(reference(0.0, y[1:]), rel=1e-12, abs=1e-300)
+
+
+class TestKernelGeneration:
+
+    def test_model_selected_by_powder(self):
+        two = CompiledLoadContext(*_308_components()).kernels
+        three = CompiledLoadContext(*_308_components(three_curve=True)).kernels
+        assert two.model == "2curve"
+        assert three.model == "3curve"
+        assert "psi_raw" in three.source and "psi_raw" not in two.source
+
+    def test_psi_model_skips_vieille_and_form_function(self):
+        psi = CompiledLoadContext(*_308_components(three_curve=True), burn_model=BURN_MODEL_PSI).kernels
+        assert psi.model == "psi-3curve"
+        assert "**" not in psi.source and "psi_raw" not in psi.source
+
+    def test_parameters_folded_as_literals(self):
+        powder, bullet, cartridge, _ = _308_components()
+        kernels = build_kernels(powder, bullet, cartridge, 2000.0, MODEL_CONSTANTS, T_WALL_DEFAULT, GAS_MOLECULAR_WEIGHT)
+        assert repr(powder.force_j_kg) in kernels.source
+        assert "form_function" not in kernels.source
+
+    def test_identical_components_share_compiled_code(self):
+        a = CompiledLoadContext(*_308_components()).kernels
+        b = CompiledLoadContext(*_308_components()).kernels
+        assert a.ignition is b.ignition
@@ -0,0 +1,103 @@
+"""Tests for the in-process metrics registry and its Prometheus rendering."""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.metrics import (
+    CACHE_HIT_RATIO,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_IN_USE,
+    DB_POOL_WAIT,
+    REGISTRY,
+    SIMULATIONS_PER_REQUEST,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    record_cache_lookup,
+)
+
+
+class TestRegistryRendering:
+
+    def test_counter_and_gauge_with_labels(self):
+        registry = MetricsRegistry()
+        hits = registry.register(Counter("hits_total", "Hits.", labelnames=("route",)))
+        in_use = registry.register(Gauge("in_use", "In use."))
+        hits.inc(route="/a")
+        hits.inc(2, route='/b"x')
+        in_use.inc()
+        in_use.inc()
+        in_use.dec()
+        text = registry.render()
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{route="/a"} 1' in text
+        assert 'hits_total{route="/b\\"x"} 2' in text
+        assert "# TYPE in_use gauge\nin_use 1\n" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 3.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_wrong_labels_rejected(self):
+        counter = Counter("c_total", "C.", labelnames=("route",))
+        with pytest.raises(ValueError):
+            counter.inc(endpoint="x")
+
+    def test_metric_base_is_abstract(self):
+        from app.core.metrics import _Metric
+
+        with pytest.raises(TypeError):
+            _Metric("m", "M.")
+
+    def test_duplicate_registration_rejected(self):
+        registry = MetricsRegistry()
+        registry.register(Counter("c_total", "C."))
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(Counter("c_total", "C."))
+
+
+class TestApplicationMetrics:
+
+    def test_cache_hit_ratio(self):
+        record_cache_lookup("test_cache", hit=False)
+        record_cache_lookup("test_cache", hit=True)
+        record_cache_lookup("test_cache", hit=True)
+        record_cache_lookup("test_cache", hit=True)
+        assert CACHE_HIT_RATIO.value(cache="test_cache") == pytest.approx(0.75)
+
+    def test_simulations_feed_solver_histograms(self):
+        from app.core.diagnostics import SimDiagnostics, record_simulations, reset_endpoint_stats
+
+        before = SIMULATIONS_PER_REQUEST.count(endpoint="metrics_test")
+        record_simulations("metrics_test", [SimDiagnostics(total_ms=120.0, integration_ms=90.0, nfev=5800)] * 3)
+        reset_endpoint_stats()
+        assert SIMULATIONS_PER_REQUEST.count(endpoint="metrics_test") == before + 1
+        text = REGISTRY.render()
+        assert 'solver_nfev_bucket{endpoint="metrics_test",le="7500"} 3' in text
+        assert 'simulations_per_request_sum{endpoint="metrics_test"} 3' in text
+
+    @pytest.mark.asyncio
+    async def test_instrumented_pool_records_checkouts(self, tmp_path):
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from app.db.session import InstrumentedPool, instrument_pool
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedPool)
+        instrument_pool(engine)
+        waits, checkouts, in_use = DB_POOL_WAIT.count(), DB_POOL_CHECKOUTS.value(), DB_POOL_IN_USE.value()
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert DB_POOL_IN_USE.value() == in_use + 1
+        await engine.dispose()
+        assert DB_POOL_WAIT.count() == waits + 1
+        assert DB_POOL_CHECKOUTS.value() == checkouts + 1
+        assert DB_POOL_IN_USE.value() == in_use
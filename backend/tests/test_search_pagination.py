@@ -15,6 +15,7 @@ os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.models.base import Base
@@ -26,6 +27,7 @@ import app.models.cartridge  # noqa: F401
 import app.models.rifle  # noqa: F401
 import app.models.load  # noqa: F401
 import app.models.simulation  # noqa: F401
+import app.models.table_version  # noqa: F401
 
 # Create test engine and session factory
 test_engine = create_async_engine("sqlite+aiosqlite://", echo=False)
@@ -39,6 +41,9 @@ db_session_module.async_session_factory = TestSessionFactory
 # Now import the app
 from app.main import app  # noqa: E402
 from app.db.session import get_db  # noqa: E402
+from app.models.rifle import Rifle  # noqa: E402
+from app.services.catalog import clear_catalog  # noqa: E402
+from app.services.counts import Total, clear_count_cache, estimated_total  # noqa: E402
 
 
 async def _override_get_db():
@@ -54,6 +59,9 @@ async def _override_get_db():
 @pytest_asyncio.fixture(autouse=True)
 async def setup_database():
     """Create all tables before each test and drop them after."""
+    # version counters restart with the fresh tables
+    clear_catalog()
+    clear_count_cache()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -221,6 +229,145 @@ async def test_cartridges_pagination_default(client):
     assert body["page"] == 1
 
 
+# ---------------------------------------------------------------------------
+# Keyset (cursor) pagination tests
+# ---------------------------------------------------------------------------
+
+
+async def _walk_cursor(client, path, params):
+    """Follow next_cursor from the first page; return every page body."""
+    pages = []
+    cursor = ""
+    while cursor is not None:
+        resp = await client.get(path, params={**params, "cursor": cursor})
+        assert resp.status_code == 200, resp.text
+        pages.append(resp.json())
+        cursor = pages[-1]["next_cursor"]
+    return pages
+
+
+@pytest.mark.asyncio
+async def test_powders_cursor_walks_every_row_once(client):
+    """Equal quality scores tie-break on id, so no row is skipped or repeated."""
+    created = [await create_powder(client, {"name": f"Powder {i}"}) for i in range(5)]
+
+    pages = await _walk_cursor(client, "/api/v1/powders", {"size": 2})
+    ids = [p["id"] for page in pages for p in page["items"]]
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert sorted(ids) == sorted(p["id"] for p in created)
+    assert all(page["total"] is None and page["page"] is None for page in pages)
+
+    resp = await client.get("/api/v1/powders", params={"cursor": "", "size": 2, "include_total": True})
+    assert resp.json()["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_filtered_cursor_matches_page_mode(client):
+    """Filtered listings page through the database in (sort, id) order."""
+    for name in ("Delta", "Alpha", "Echo", "Charlie", "Bravo"):
+        await create_powder(client, {"name": name, "manufacturer": "Hodgdon"})
+    await create_powder(client, {"name": "Other", "manufacturer": "Alliant"})
+
+    params = {"manufacturer": "Hodgdon", "sort": "name", "order": "asc"}
+    pages = await _walk_cursor(client, "/api/v1/powders", {**params, "size": 2, "include_total": True})
+    names = [p["name"] for page in pages for p in page["items"]]
+    assert names == ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+    assert pages[0]["total"] == 5
+
+    resp = await client.get("/api/v1/powders", params={**params, "size": 50})
+    assert [p["name"] for p in resp.json()["items"]] == names
+
+    # Default quality_score DESC: every powder ties, id keeps the walk exact
+    pages = await _walk_cursor(client, "/api/v1/powders", {"manufacturer": "Hodgdon", "size": 2})
+    assert sorted(p["name"] for page in pages for p in page["items"]) == names
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_database_orders_agree(client):
+    """Name order is case-insensitive whether pages come from the snapshot or the database."""
+    for name in ("delta", "Alpha", "echo", "Charlie", "bravo"):
+        await create_powder(client, {"name": name, "manufacturer": "Hodgdon"})
+    expected = ["Alpha", "bravo", "Charlie", "delta", "echo"]
+
+    for params in ({"sort": "name", "order": "asc"}, {"sort": "name", "order": "asc", "manufacturer": "Hodgdon"}):
+        pages = await _walk_cursor(client, "/api/v1/powders", {**params, "size": 2})
+        assert [p["name"] for page in pages for p in page["items"]] == expected
+        resp = await client.get("/api/v1/powders", params={**params, "size": 50})
+        assert [p["name"] for p in resp.json()["items"]] == expected
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejected_for_other_ordering(client):
+    for i in range(3):
+        await create_bullet(client, {"name": f"Bullet {i}"})
+    first = (await client.get("/api/v1/bullets", params={"cursor": "", "size": 1, "sort": "name"})).json()
+
+    resp = await client.get("/api/v1/bullets", params={"cursor": first["next_cursor"], "sort": "manufacturer"})
+    assert resp.status_code == 400
+    resp = await client.get("/api/v1/bullets", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+    resp = await client.get("/api/v1/bullets", params={"cursor": "", "q": "bullet"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_rifles_and_loads_cursor_mode(client):
+    """Without a cursor rifles and loads keep returning the full list."""
+    cartridge = await create_cartridge(client)
+    for name in ("Rifle C", "Rifle A", "Rifle B"):
+        resp = await client.post("/api/v1/rifles", json={
+            "name": name, "barrel_length_mm": 610.0, "twist_rate_mm": 254.0,
+            "cartridge_id": cartridge["id"], "chamber_volume_mm3": 4500.0,
+        })
+        assert resp.status_code == 201
+
+    resp = await client.get("/api/v1/rifles")
+    assert [r["name"] for r in resp.json()] == ["Rifle A", "Rifle B", "Rifle C"]
+
+    pages = await _walk_cursor(client, "/api/v1/rifles", {"size": 2})
+    assert [[r["name"] for r in page["items"]] for page in pages] == [["Rifle A", "Rifle B"], ["Rifle C"]]
+
+    resp = await client.get("/api/v1/loads", params={"cursor": "", "include_total": True})
+    assert resp.json() == {"items": [], "total": 0, "size": 50, "next_cursor": None, "total_exact": True}
+
+
+@pytest.mark.asyncio
+async def test_filtered_total_memoised_per_table_version(client):
+    """A repeated filter reuses its count until a write bumps the table version."""
+    await create_powder(client, {"name": "Hodgdon A", "manufacturer": "Hodgdon"})
+    await create_powder(client, {"name": "Alliant A", "manufacturer": "Alliant"})
+    counts = []
+
+    def record(conn, cursor, statement, *args):
+        if "count(" in statement.lower():
+            counts.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(2):
+            body = (await client.get("/api/v1/powders", params={"manufacturer": "Hodgdon"})).json()
+            assert (body["total"], body["total_exact"]) == (1, True)
+        assert len(counts) == 1
+
+        await create_powder(client, {"name": "Hodgdon B", "manufacturer": "Hodgdon"})
+        body = (await client.get("/api/v1/powders", params={"manufacturer": "Hodgdon"})).json()
+        assert body["total"] == 2
+        assert len(counts) == 2
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_totals_are_exact_on_sqlite(client):
+    await create_powder(client)
+    body = (await client.get("/api/v1/powders")).json()
+    assert (body["total"], body["total_exact"]) == (1, True)
+
+    async with TestSessionFactory() as db:
+        total = await estimated_total(db, Rifle)
+    assert total == Total(0, exact=True)
+
+
 # ---------------------------------------------------------------------------
 # Filter tests
 # ---------------------------------------------------------------------------
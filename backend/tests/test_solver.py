@@ -6,8 +6,10 @@ exercise the full integration patch the initial Z to a small positive value (0.0
 to represent primer ignition.  A dedicated test documents this known limitation.
 """
 
+from dataclasses import replace
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from app.core.solver import (
@@ -15,6 +17,7 @@ from app.core.solver import (
     MM_TO_M,
     BulletParams,
     CartridgeParams,
+    CompiledLoadContext,
     LoadParams,
     PowderParams,
     RifleParams,
@@ -73,10 +76,12 @@ def simulate_with_primer(powder, bullet, cartridge, rifle, load, z0=Z_PRIMER):
     from scipy.integrate import solve_ivp as real_solve_ivp
 
     def patched_solve_ivp(rhs, t_span, y0, **kwargs):
-        # Replace the first element (Z) with a small primer seed
-        # ODE state vector is [Z, x, v, Q_loss]
-        y0_seeded = [z0, y0[1], y0[2], y0[3]]
-        return real_solve_ivp(rhs, t_span, y0_seeded, **kwargs)
+        # Replace the first element (Z) with a small primer seed in the
+        # ignition phase; ODE state vector is [Z, x, v, Q_loss]. The
+        # post-burnout tail ([x, v, Q_loss]) starts from the burnout state.
+        if t_span[0] == 0.0:
+            y0 = [z0, y0[1], y0[2], y0[3]]
+        return real_solve_ivp(rhs, t_span, y0, **kwargs)
 
     with patch("app.core.solver.solve_ivp", side_effect=patched_solve_ivp):
         return simulate(powder, bullet, cartridge, rifle, load)
@@ -673,3 +678,293 @@ class TestExtendedCurves:
         assert result.peak_pressure_psi == pytest.approx(96880.44677292932, rel=1e-3)
         assert result.muzzle_velocity_fps == pytest.approx(3258.1299761938285, rel=1e-3)
         assert result.barrel_time_ms == pytest.approx(0.9396475304600503, rel=1e-3)
+
+
+# ---------------------------------------------------------------------------
+# Tests: CompiledLoadContext reuse across charges
+# ---------------------------------------------------------------------------
+
+
+class TestCompiledLoadContext:
+
+    def test_run_matches_simulate(self):
+        """A compiled context reproduces simulate() for the same charge."""
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle, extra_warnings=["nota"])
+        direct = simulate(powder, bullet, cartridge, rifle, load)
+        compiled = ctx.run(load.charge_mass_kg)
+        assert compiled.peak_pressure_psi == direct.peak_pressure_psi
+        assert compiled.muzzle_velocity_fps == direct.muzzle_velocity_fps
+        assert compiled.optimal_barrel_times == direct.optimal_barrel_times
+        assert compiled.warnings == direct.warnings + ["nota"]
+
+    def test_charge_independent_quantities(self):
+        powder, bullet, cartridge, rifle, _load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle)
+        assert ctx.bore_length_m == pytest.approx(rifle.barrel_length_m - 0.051)
+        assert ctx.barrel_frequency_hz > 0
+        assert len(ctx.obt_list_ms) == 6
+        assert ctx.use_3curve is False
+
+    def test_overrides_build_new_context(self):
+        powder, bullet, cartridge, rifle, _load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle)
+        longer = ctx.with_overrides(barrel_length_m=0.71, h_coeff=0.0, burn_rate_coeff=2e-8)
+        assert longer.barrel_frequency_hz < ctx.barrel_frequency_hz
+        assert longer.h_coeff == 0.0
+        assert longer.powder.burn_rate_coeff == 2e-8
+        assert ctx.powder.burn_rate_coeff == powder.burn_rate_coeff
+
+    def test_unknown_override_rejected(self):
+        powder, bullet, cartridge, rifle, _load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle)
+        with pytest.raises(ValueError, match="Unknown"):
+            ctx.run(44 * GRAINS_TO_KG, overrides={"mass_kg": 0.01})
+
+
+class TestSimDiagnostics:
+
+    def test_phases_and_solver_stats_populated(self):
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        diag = simulate(powder, bullet, cartridge, rifle, load).diagnostics
+        assert diag is not None
+        assert diag.nfev > diag.steps > 0
+        assert diag.event_calls > diag.steps
+        assert 0 < diag.event_ms < diag.integration_ms
+        assert 0 < diag.integration_ms <= diag.total_ms
+        assert diag.setup_ms + diag.integration_ms + diag.postprocess_ms + diag.structural_ms <= diag.total_ms * 1.01
+
+    def test_rejected_steps_from_nfev(self):
+        from app.core.diagnostics import rk45_rejected_steps
+        # 2 startup evaluations + 6 per attempt: 12 attempts, 10 accepted
+        assert rk45_rejected_steps(2 + 6 * 12, 10) == 2
+        assert rk45_rejected_steps(2 + 6 * 10, 10) == 0
+        assert rk45_rejected_steps(0, 0) == 0
+
+    def test_endpoint_aggregation(self):
+        from app.core.diagnostics import SimDiagnostics, endpoint_stats, record_simulations, reset_endpoint_stats
+        reset_endpoint_stats()
+        try:
+            runs = [SimDiagnostics(total_ms=100.0, integration_ms=80.0, nfev=600, steps=95, rejected_steps=2)] * 3
+            record_simulations("ladder", runs, {"serialization": 4.0})
+            record_simulations("ladder", runs[:1], {"serialization": 1.0})
+            stats = endpoint_stats()["ladder"]
+            assert stats.requests == 2
+            assert stats.simulations == 4
+            assert stats.nfev == 2400
+            assert stats.integration_ms == pytest.approx(320.0)
+            assert stats.phase_ms == {"serialization": pytest.approx(5.0)}
+        finally:
+            reset_endpoint_stats()
+
+
+class TestBurnoutTail:
+
+    def test_tail_matches_full_system(self):
+        """The reduced post-burnout system reproduces integrating the full system to the muzzle."""
+        from scipy.integrate import solve_ivp
+
+        from app.core.solver import ATOL_SCALE_FRACTION, MAX_STEP, RTOL, _build_ode_system, state_scales
+
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle)
+        result = ctx.run(load.charge_mass_kg)
+
+        rhs, _, _ = _build_ode_system(powder, bullet, cartridge, load)
+
+        def exits(t, y):
+            return y[1] - ctx.bore_length_m
+        exits.terminal = True
+        exits.direction = 1
+
+        atol = ATOL_SCALE_FRACTION * state_scales(ctx, load.charge_mass_kg)
+        full = solve_ivp(rhs, [0.0, 0.010], [Z_PRIMER, 0.0, 0.0, 0.0], method="RK45", events=exits,
+                         max_step=MAX_STEP, rtol=RTOL, atol=atol)
+        assert result.barrel_time_ms == pytest.approx(full.t_events[0][0] * 1000.0, rel=1e-7)
+        assert result.muzzle_velocity_fps == pytest.approx(full.y_events[0][0][2] * 3.28084, rel=1e-7)
+
+    def test_tail_takes_few_steps(self):
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        diag = simulate(powder, bullet, cartridge, rifle, load).diagnostics
+        assert diag.burnout_ms is not None
+        assert 0.0 < diag.burnout_ms
+        assert 0 < diag.tail_steps < 20
+
+    def test_no_tail_when_bullet_exits_before_burnout(self):
+        """A very slow powder leaves the barrel unburnt: no burnout, single phase."""
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        slow = CompiledLoadContext(powder, bullet, cartridge, rifle).with_overrides(burn_rate_coeff=powder.burn_rate_coeff / 4)
+        result = slow.run(load.charge_mass_kg)
+        assert result.diagnostics.burnout_ms is None
+        assert result.diagnostics.tail_steps == 0
+        assert result.burn_curve[-1]["z"] < 1.0
+
+
+class TestScaledTolerances:
+    """Per-component atol and the 5e-5 s step cap against uniform atol=1e-10."""
+
+    TOLERANCE = 1e-6  # relative, on muzzle velocity, peak pressure and barrel time
+
+    def test_matches_uniform_tolerance_with_fewer_evaluations(self):
+        """The current settings reproduce the former uniform atol, max_step=1e-6 run."""
+        import app.core.solver as solver_module
+
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        scaled = simulate(powder, bullet, cartridge, rifle, load)
+        with patch.object(solver_module, "state_scales", lambda ctx, omega: np.ones(4)), \
+                patch.object(solver_module, "MAX_STEP", 1e-6):
+            uniform = simulate(powder, bullet, cartridge, rifle, load)
+
+        assert scaled.muzzle_velocity_fps == pytest.approx(uniform.muzzle_velocity_fps, rel=self.TOLERANCE)
+        assert scaled.peak_pressure_psi == pytest.approx(uniform.peak_pressure_psi, rel=self.TOLERANCE)
+        assert scaled.barrel_time_ms == pytest.approx(uniform.barrel_time_ms, rel=self.TOLERANCE)
+        assert scaled.diagnostics.nfev * 5 < uniform.diagnostics.nfev
+
+    def test_scaled_atol_saves_evaluations_at_same_step_cap(self):
+        """At a fixed MAX_STEP, state_scales atol alone cuts nfev without moving results."""
+        import app.core.solver as solver_module
+
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        scaled = simulate(powder, bullet, cartridge, rifle, load)
+        with patch.object(solver_module, "state_scales", lambda ctx, omega: np.ones(4)):
+            uniform = simulate(powder, bullet, cartridge, rifle, load)
+
+        assert scaled.muzzle_velocity_fps == pytest.approx(uniform.muzzle_velocity_fps, rel=self.TOLERANCE)
+        assert scaled.peak_pressure_psi == pytest.approx(uniform.peak_pressure_psi, rel=self.TOLERANCE)
+        assert scaled.barrel_time_ms == pytest.approx(uniform.barrel_time_ms, rel=self.TOLERANCE)
+        assert scaled.diagnostics.nfev < 0.9 * uniform.diagnostics.nfev
+
+    def test_state_scales(self):
+        from app.core.solver import state_scales
+
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle)
+        z, x, v, q = state_scales(ctx, load.charge_mass_kg)
+        assert z == 1.0
+        assert x == ctx.bore_length_m
+        assert 500.0 < v < 2000.0
+        assert q == pytest.approx(powder.force_j_kg * load.charge_mass_kg)
+
+
+# ---------------------------------------------------------------------------
+# Tests: pre-flight screening and analytic pressure bounds
+# ---------------------------------------------------------------------------
+
+
+class TestPreflight:
+
+    @staticmethod
+    def _solid_density_ctx():
+        """Reference load with a solid grain density like the seeded powders (fill ratio ~89%)."""
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        ctx = CompiledLoadContext(powder, bullet, cartridge, rifle).with_overrides(density_kg_m3=1600.0)
+        return ctx, load
+
+    def test_bounds_bracket_integrated_peak(self):
+        ctx, load = self._solid_density_ctx()
+        for factor in (0.8, 1.0, 1.1):
+            omega = load.charge_mass_kg * factor
+            screen = ctx.preflight(omega)
+            result = ctx.run(omega)
+            assert screen.verdict in ("ok", "compressed")
+            assert screen.pressure_lower_bound_psi < result.peak_pressure_psi < screen.pressure_upper_bound_psi
+            assert result.preflight == screen
+
+    def test_overfilled_case_still_integrated_but_unsafe(self):
+        """The reference fixture's bulk volume exceeds the case: flagged, integrated, never safe."""
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        result = CompiledLoadContext(powder, bullet, cartridge, rifle).run(load.charge_mass_kg)
+        assert result.preflight.verdict == "overfilled"
+        assert result.preflight.charge_unsafe
+        assert result.diagnostics.nfev > 0
+        assert result.is_safe is False
+
+    def test_impossible_charge_returns_without_integrating(self):
+        ctx, _load = self._solid_density_ctx()
+        omega = 0.96 * ctx.chamber_volume_m3 / ctx.powder.covolume_m3_kg
+        result = ctx.run(omega)
+        assert result.preflight.verdict == "impossible"
+        assert result.preflight.pressure_upper_bound_psi > 10 * ctx.cartridge.saami_max_pressure_psi
+        assert result.diagnostics.nfev == 0
+        assert result.is_safe is False
+        assert result.pressure_curve == []
+        assert result.peak_pressure_psi == result.preflight.pressure_lower_bound_psi
+
+    def test_overpressure_verdict_is_advisory(self):
+        """The complete-burn bound is not a bound when powder leaves the muzzle unburnt."""
+        ctx, load = self._solid_density_ctx()
+        short = ctx.with_overrides(barrel_length_m=0.1)
+        screen = short.preflight(load.charge_mass_kg)
+        assert screen.verdict == "overpressure"
+        assert not screen.charge_unsafe
+        result = short.run(load.charge_mass_kg)
+        assert result.diagnostics.nfev > 0
+        assert result.diagnostics.burnout_ms is None
+        assert result.peak_pressure_psi < screen.pressure_lower_bound_psi
+
+
+class TestPsiBurnModel:
+    """GRT vivacity integrated on the burnt fraction (burn_model="psi")."""
+
+    @staticmethod
+    def _grt_ctx(burn_model: str = "psi", **overrides):
+        """H380-like GRT powder at a solid grain density (fill ratio ~89%)."""
+        powder, bullet, cartridge, rifle, load = make_308_params()
+        grt = dict(ba=0.496, bp=0.1717, br=0.1259, brp=0.1506, z1=0.3391, z2=0.4215)
+        powder = replace(powder, density_kg_m3=1600.0, **{**grt, **overrides})
+        return CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model=burn_model), load
+
+    def test_requires_grt_vivacity(self):
+        powder, bullet, cartridge, rifle, _ = make_308_params()
+        with pytest.raises(ValueError, match="vivacity"):
+            CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model="psi")
+        with pytest.raises(ValueError, match="Unknown burn model"):
+            CompiledLoadContext(powder, bullet, cartridge, rifle, burn_model="grt")
+
+    def test_burns_out_with_plausible_ballistics(self):
+        ctx, load = self._grt_ctx()
+        result = ctx.run(load.charge_mass_kg)
+        assert result.burn_model == "psi"
+        assert ctx.kernels.model == "psi-3curve"
+        assert 2500 < result.muzzle_velocity_fps < 3100
+        assert 35_000 < result.peak_pressure_psi < 65_000
+        assert result.diagnostics.burnout_ms is not None
+        psi = [p["psi"] for p in result.burn_curve]
+        assert psi == [p["z"] for p in result.burn_curve]  # the burn state is psi itself
+        assert np.all(np.diff(psi) >= -1e-12)
+        assert psi[-1] == 1.0
+
+    def test_faster_vivacity_burns_out_sooner(self):
+        slow, load = self._grt_ctx()
+        fast = slow.with_overrides(ba=2 * slow.powder.ba)
+        assert fast.burn_model == "psi"
+        slow_result, fast_result = slow.run(load.charge_mass_kg), fast.run(load.charge_mass_kg)
+        assert fast_result.diagnostics.burnout_ms < slow_result.diagnostics.burnout_ms
+        assert fast_result.peak_pressure_psi > slow_result.peak_pressure_psi
+
+    def test_two_curve_shape_without_3curve_params(self):
+        """A powder with only Ba uses the 2-curve grain form for phi(psi)."""
+        ctx, load = self._grt_ctx(bp=None, br=None, brp=None, z1=None, z2=None)
+        assert ctx.kernels.model == "psi-2curve"
+        result = ctx.run(load.charge_mass_kg)
+        assert result.muzzle_velocity_fps > 2000
+
+    def test_z_model_ignores_vivacity(self):
+        ctx, load = self._grt_ctx(burn_model="z")
+        assert ctx.kernels.model == "3curve"
+        assert ctx.run(load.charge_mass_kg).burn_model == "z"
+
+    @pytest.mark.parametrize("three_curve", [False, True])
+    def test_matches_z_model_for_matched_powder(self, three_curve):
+        """With n = 1 and Ba * P / 1 bar equal to the Vieille dZ/dt, both models give the same shot."""
+        overrides = {} if three_curve else dict(bp=None, br=None, brp=None, z1=None, z2=None)
+        z_ctx, load = self._grt_ctx(burn_model="z", **overrides)
+        a1 = 1.0e-9  # m/(s Pa): a 30-90 kpsi peak at n = 1
+        matched = dict(burn_rate_exp=1.0, burn_rate_coeff=a1, ba=a1 / (z_ctx.powder.web_thickness_m / 2.0) * 1e5)
+        z_ctx = z_ctx.with_overrides(**matched)
+        psi_ctx, _ = self._grt_ctx(**{**overrides, **matched})
+        z_result, psi_result = z_ctx.run(load.charge_mass_kg), psi_ctx.run(load.charge_mass_kg)
+        assert 30_000 < z_result.peak_pressure_psi < 90_000
+        assert psi_result.peak_pressure_psi == pytest.approx(z_result.peak_pressure_psi, rel=1e-3)
+        assert psi_result.muzzle_velocity_fps == pytest.approx(z_result.muzzle_velocity_fps, rel=1e-3)
+        assert psi_result.barrel_time_ms == pytest.approx(z_result.barrel_time_ms, rel=1e-3)
@@ -7,11 +7,31 @@ and asserts that the solver meets accuracy targets:
   - No systematic bias (mean signed error < 3%)
   - All loads produce valid results (no crashes)
   - At least 20 reference loads defined
+
+The corpus is simulated once per module through the cached runner
+(app.services.validation), the same path used by /simulate/validate.
 """
 
+from unittest.mock import patch
+
 import pytest
 
-from tests.fixtures.validation_loads import VALIDATION_LOADS, run_validation_load
+from app.core.validation_loads import VALIDATION_LOADS
+from app.services import validation as validation_service
+from app.services.validation import (
+    clear_validation_cache,
+    compute_validation_report,
+    corpus_hash,
+    filter_results,
+    validation_cache_key,
+)
+
+
+@pytest.fixture(scope="module")
+def corpus_results() -> dict[str, dict]:
+    """Validation report rows keyed by load id."""
+    report, _ = compute_validation_report()
+    return {r["load_id"]: r for r in report.results}
 
 
 def test_validation_load_count():
@@ -19,18 +39,18 @@ def test_validation_load_count():
     assert len(VALIDATION_LOADS) >= 20, f"Only {len(VALIDATION_LOADS)} loads, need 20+"
 
 
-def test_validation_all_loads_produce_results():
+def test_validation_all_loads_produce_results(corpus_results):
     """Every reference load should produce a valid simulation (no crashes)."""
     for load in VALIDATION_LOADS:
-        result = run_validation_load(load)
+        result = corpus_results[load["id"]]
         assert result["predicted_velocity_fps"] > 0, f"Load {load['id']} failed"
 
 
-def test_validation_mean_error_below_5_percent():
+def test_validation_mean_error_below_5_percent(corpus_results):
     """Mean velocity error across all loads must be below 5%."""
     errors = []
     for load in VALIDATION_LOADS:
-        result = run_validation_load(load)
+        result = corpus_results[load["id"]]
         errors.append(result["error_pct"])
     mean_error = sum(errors) / len(errors)
     assert mean_error < 5.0, (
@@ -39,20 +59,20 @@ def test_validation_mean_error_below_5_percent():
     )
 
 
-def test_validation_max_error_below_8_percent():
+def test_validation_max_error_below_8_percent(corpus_results):
     """No single load should have error above 8%."""
     for load in VALIDATION_LOADS:
-        result = run_validation_load(load)
+        result = corpus_results[load["id"]]
         assert result["error_pct"] < 8.0, (
             f"Load {load['id']} error {result['error_pct']:.2f}% exceeds 8%"
         )
 
 
-def test_validation_no_systematic_bias():
+def test_validation_no_systematic_bias(corpus_results):
     """Mean signed error should be near zero (no consistent over/under-prediction)."""
     signed_errors = []
     for load in VALIDATION_LOADS:
-        result = run_validation_load(load)
+        result = corpus_results[load["id"]]
         signed = (
             (result["predicted_velocity_fps"] - result["published_velocity_fps"])
             / result["published_velocity_fps"]
@@ -69,11 +89,11 @@ def test_validation_all_calibers_represented():
     assert len(calibers) >= 4, f"Only {len(calibers)} calibers: {calibers}"
 
 
-def test_validation_per_caliber_accuracy():
+def test_validation_per_caliber_accuracy(corpus_results):
     """Each caliber should independently meet the 5% mean error threshold."""
     caliber_errors: dict[str, list[float]] = {}
     for load in VALIDATION_LOADS:
-        result = run_validation_load(load)
+        result = corpus_results[load["id"]]
         cal = load["caliber"]
         caliber_errors.setdefault(cal, []).append(result["error_pct"])
 
@@ -83,3 +103,45 @@ def test_validation_per_caliber_accuracy():
             f"{cal}: mean error {mean_err:.2f}% exceeds 5%. "
             f"Errors: {[f'{e:.1f}%' for e in errors]}"
         )
+
+
+# ============================================================================
+# Cached corpus runner
+# ============================================================================
+
+def _fake_parallel_map(fn, items, max_workers=None):
+    return [
+        {"load_id": load["id"], "caliber": load["caliber"], "powder_name": load["powder_name"], "error_pct": 1.0}
+        for load in items
+    ]
+
+
+class TestValidationRunner:
+
+    def test_cache_key_tracks_corpus(self):
+        assert corpus_hash() == corpus_hash(list(VALIDATION_LOADS))
+        changed = [dict(VALIDATION_LOADS[0], charge_gr=VALIDATION_LOADS[0]["charge_gr"] + 0.1)] + VALIDATION_LOADS[1:]
+        assert corpus_hash(changed) != corpus_hash()
+        assert validation_cache_key() == validation_cache_key()
+
+    def test_second_run_is_cached(self):
+        clear_validation_cache()
+        try:
+            with patch.object(validation_service, "parallel_map", side_effect=_fake_parallel_map) as pm:
+                first, first_cached = compute_validation_report()
+                second, second_cached = compute_validation_report()
+            assert pm.call_count == 1
+            assert (first_cached, second_cached) == (False, True)
+            assert second is first
+        finally:
+            clear_validation_cache()
+
+    def test_filter_by_caliber_and_powder(self):
+        rows = _fake_parallel_map(None, VALIDATION_LOADS)
+        caliber = VALIDATION_LOADS[0]["caliber"]
+        by_caliber = filter_results(rows, caliber=caliber.upper())
+        assert by_caliber and all(r["caliber"] == caliber for r in by_caliber)
+        powder = VALIDATION_LOADS[0]["powder_name"]
+        by_powder = filter_results(rows, powder=powder[:4].lower())
+        assert all(powder[:4].lower() in r["powder_name"].lower() for r in by_powder)
+        assert filter_results(rows, caliber="nonexistent") == []
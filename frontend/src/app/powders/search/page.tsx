@@ -106,7 +106,8 @@ function ExpandedRow({
   const chartData = result.all_results.map((r) => ({
     charge: r.charge_grains,
     displayPressure: formatPressure(r.peak_pressure_psi).value,
-    displayVelocity: formatVelocity(r.muzzle_velocity_fps).value,
+    // Screened charges were not integrated: no velocity point
+    displayVelocity: r.muzzle_velocity_fps !== null ? formatVelocity(r.muzzle_velocity_fps).value : null,
     pressure_psi: r.peak_pressure_psi,
     velocity_fps: r.muzzle_velocity_fps,
     is_safe: r.is_safe,
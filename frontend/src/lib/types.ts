@@ -35,12 +35,26 @@ export interface Powder {
 export interface GrtImportResult {
   created: Powder[];
   updated: Powder[];
+  unchanged: number;
   skipped: string[];
   errors: string[];
   mode: string;
   aliases_linked: number;
 }
 
+/** One NDJSON line of POST /powders/import-grt/stream (counts are cumulative). */
+export interface GrtImportProgress {
+  status: 'running' | 'done' | 'failed';
+  files_total: number;
+  files_done: number;
+  created: number;
+  updated: number;
+  unchanged: number;
+  aliases_linked: number;
+  skipped: string[];
+  errors: string[];
+}
+
 export interface PowderCreate {
   name: string;
   manufacturer: string;
@@ -306,6 +320,33 @@ export interface RecoilCurvePoint {
   impulse_ns: number;
 }
 
+export interface SimulationDiagnostics {
+  setup_ms: number;
+  integration_ms: number;
+  event_ms: number;
+  postprocess_ms: number;
+  structural_ms: number;
+  serialization_ms: number;
+  total_ms: number;
+  nfev: number;
+  steps: number;
+  rejected_steps: number;
+  event_calls: number;
+  tail_steps: number;
+  burnout_ms: number | null;
+}
+
+export interface PreflightScreening {
+  verdict: 'ok' | 'compressed' | 'overpressure' | 'overfilled' | 'impossible';
+  fill_ratio: number;
+  loading_density_kg_m3: number;
+  pressure_upper_bound_psi: number | null;
+  pressure_lower_bound_psi: number;
+}
+
+// z: Vieille law on burn depth; psi: GRT vivacity Ba (GRT-imported powders only)
+export type BurnModel = 'z' | 'psi';
+
 export interface SimulationResult {
   id?: string;
   load_id?: string;
@@ -331,6 +372,9 @@ export interface SimulationResult {
   recoil_energy_ft_lbs: number;
   recoil_impulse_ns: number;
   recoil_velocity_fps: number;
+  preflight?: PreflightScreening | null;
+  burn_model?: BurnModel;
+  diagnostics?: SimulationDiagnostics | null;
 }
 
 export interface SimulationInput {
@@ -342,6 +386,7 @@ export interface SimulationInput {
   coal_mm?: number;
   seating_depth_mm?: number;
   barrel_length_mm_override?: number;
+  burn_model?: BurnModel;
 }
 
 export interface LadderTestInput {
@@ -353,6 +398,7 @@ export interface LadderTestInput {
   charge_start_grains: number;
   charge_end_grains: number;
   charge_step_grains: number;
+  burn_model?: BurnModel;
 }
 
 // ============================================================
@@ -368,6 +414,16 @@ export interface PaginatedResponse<T> {
   total: number;
   page: number;
   size: number;
+  total_exact?: boolean;  // false when total is a planner estimate
+}
+
+// Keyset mode (?cursor=): pass next_cursor back until it is null
+export interface CursorPage<T> {
+  items: T[];
+  total: number | null;  // only with include_total=true
+  total_exact: boolean | null;
+  size: number;
+  next_cursor: string | null;
 }
 
 // ============================================================
@@ -377,8 +433,9 @@ export interface PaginatedResponse<T> {
 export interface PowderChargeResult {
   charge_grains: number;
   peak_pressure_psi: number;
-  muzzle_velocity_fps: number;
+  muzzle_velocity_fps: number | null;
   is_safe: boolean;
+  screened: boolean;
 }
 
 export interface PowderSearchResult {
@@ -436,6 +493,7 @@ export interface SensitivityInput {
   seating_depth_mm: number;
   charge_delta_grains?: number;
   barrel_length_mm_override?: number;
+  burn_model?: BurnModel;
 }
 
 export interface SensitivityResponse {
@@ -505,4 +563,7 @@ export interface ValidationResponse {
   mean_error_pct: number;
   max_error_pct: number;
   worst_load_id: string;
+  cached: boolean;
+  cache_key: string;
+  compute_time_ms: number;
 }